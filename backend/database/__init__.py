@@ -11,7 +11,19 @@ from .db_utils import (
     DatabaseManager,
     query,
     query_one,
-    DEFAULT_DB_PATH
+    DEFAULT_DB_PATH,
+    ConnectionPool,
+    connection_pool,
+    get_pooled_connection,
+    get_pool_stats,
+    close_pooled_connections
+)
+from .async_db import (
+    DatabaseExecutor,
+    db_executor,
+    get_db_executor,
+    run_in_db,
+    get_executor_stats
 )
 
 __all__ = [
@@ -20,5 +32,15 @@ __all__ = [
     'DatabaseManager',
     'query',
     'query_one',
-    'DEFAULT_DB_PATH'
+    'DEFAULT_DB_PATH',
+    'ConnectionPool',
+    'connection_pool',
+    'get_pooled_connection',
+    'get_pool_stats',
+    'close_pooled_connections',
+    'DatabaseExecutor',
+    'db_executor',
+    'get_db_executor',
+    'run_in_db',
+    'get_executor_stats'
 ]
@@ -0,0 +1,178 @@
+"""
+Async Database Access
+AgTools v6.13.5
+
+Runs blocking SQLite service calls on a bounded thread pool so async
+FastAPI endpoints never execute queries on the event loop thread.
+
+The executor owns a fixed set of long-lived worker threads. Because the
+connection pool is keyed per (thread, database), each worker keeps its own
+configured connections and reuses them across requests, and SQLite never
+sees more concurrent connections than there are workers.
+
+Usage in a router:
+    from database.async_db import DatabaseExecutor, get_db_executor
+
+    @router.get("/reports/dashboard")
+    async def get_dashboard(db: DatabaseExecutor = Depends(get_db_executor)):
+        return await db.run(get_reporting_service().get_dashboard_summary)
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+# Worker threads (and therefore concurrent SQLite connections) per process
+DB_EXECUTOR_WORKERS = int(os.environ.get('AGTOOLS_DB_WORKERS', '8'))
+
+
+class DatabaseExecutor:
+    """
+    Bounded thread pool for blocking database work.
+
+    Calls beyond the worker count queue inside the executor instead of
+    opening more connections; queue wait and run time are tracked so the
+    pool can be sized from /api/v1/system/db-pool.
+    """
+
+    def __init__(self, max_workers: int = DB_EXECUTOR_WORKERS, thread_name_prefix: str = "agtools-db"):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "run_seconds_total": 0.0,
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the worker pool on first use (after any fork)."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=self.thread_name_prefix
+                    )
+        return self._executor
+
+    def _call(self, func: Callable[..., T], submitted_at: float) -> T:
+        started = time.perf_counter()
+        wait = started - submitted_at
+        with self._lock:
+            self._stats["wait_seconds_total"] += wait
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], wait)
+
+        ok = False
+        try:
+            result = func()
+            ok = True
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._stats["in_flight"] -= 1
+                self._stats["run_seconds_total"] += elapsed
+                self._stats["completed" if ok else "failed"] += 1
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run func(*args, **kwargs) on a database worker and await the result.
+
+        Exceptions raised by func (including HTTPException) propagate to the
+        caller unchanged.
+        """
+        with self._lock:
+            self._stats["submitted"] += 1
+            self._stats["in_flight"] += 1
+            self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._stats["in_flight"])
+
+        call = functools.partial(func, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._get_executor(), self._call, call, time.perf_counter())
+        except RuntimeError:
+            # Executor shut down underneath us; nothing was scheduled
+            with self._lock:
+                self._stats["in_flight"] -= 1
+                self._stats["failed"] += 1
+            raise
+        return await future
+
+    async def iter_progress(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        """
+        Run func on a database worker with a progress= callback.
+
+        Yields each event func passes to the callback as it is reported,
+        then func's return value. Used to stream long imports to clients.
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        finished = object()
+
+        def report(event: Any) -> None:
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        task = asyncio.ensure_future(self.run(func, *args, progress=report, **kwargs))
+        task.add_done_callback(lambda _: events.put_nowait(finished))
+
+        while True:
+            event = await events.get()
+            if event is finished:
+                break
+            yield event
+        yield task.result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads; the next run() starts a fresh pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return executor configuration and call counters."""
+        with self._lock:
+            stats = dict(self._stats)
+        finished = stats["completed"] + stats["failed"]
+        return {
+            "max_workers": self.max_workers,
+            **stats,
+            "wait_seconds_total": round(stats["wait_seconds_total"], 4),
+            "wait_seconds_max": round(stats["wait_seconds_max"], 4),
+            "run_seconds_total": round(stats["run_seconds_total"], 4),
+            "avg_wait_ms": round(stats["wait_seconds_total"] / finished * 1000, 3) if finished else 0.0,
+            "avg_run_ms": round(stats["run_seconds_total"] / finished * 1000, 3) if finished else 0.0,
+        }
+
+
+# Process-wide executor shared by all routers
+db_executor = DatabaseExecutor()
+
+
+def get_db_executor() -> DatabaseExecutor:
+    """FastAPI dependency returning the shared database executor."""
+    return db_executor
+
+
+async def run_in_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking database call on the shared executor."""
+    return await db_executor.run(func, *args, **kwargs)
+
+
+def get_executor_stats() -> Dict[str, Any]:
+    """Return shared executor statistics (see DatabaseExecutor.get_stats)."""
+    return db_executor.get_stats()
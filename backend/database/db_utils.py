@@ -4,13 +4,20 @@ AgTools v6.13.5
 
 Provides context managers and utilities for safe database connection handling.
 Ensures connections are properly closed even when exceptions occur.
+
+Connections are served from a per-thread, per-database pool. Each pooled
+connection is configured once (WAL journaling, synchronous=NORMAL, cache and
+mmap sizing, busy timeout) and calling close() returns it to the pool instead
+of tearing it down.
 """
 
 import os
 import sys
 import sqlite3
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
-from typing import Generator, Optional
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
 
 def get_default_db_path() -> str:
@@ -46,13 +53,328 @@ def get_default_db_path() -> str:
 DEFAULT_DB_PATH = get_default_db_path()
 
 
+# ============================================================================
+# CONNECTION POOL
+# ============================================================================
+
+# Applied once when a pooled connection is first opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",      # ~16 MB page cache
+    "PRAGMA mmap_size = 134217728",    # 128 MB memory-mapped I/O
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Seconds a connection waits on a locked database before raising
+BUSY_TIMEOUT_SECONDS = float(os.environ.get('AGTOOLS_DB_BUSY_TIMEOUT', '30'))
+
+# Idle connections kept per (thread, database) and across the whole process
+MAX_IDLE_PER_THREAD = int(os.environ.get('AGTOOLS_DB_POOL_IDLE', '4'))
+MAX_IDLE_TOTAL = int(os.environ.get('AGTOOLS_DB_POOL_IDLE_TOTAL', '64'))
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    sqlite3 connection that returns itself to its ConnectionPool on close().
+
+    Leaving the outermost ``with conn:`` block commits (or rolls back) as
+    usual and then releases the connection, matching the existing
+    ``with self._get_connection() as conn:`` idiom used by the services.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool: Optional["ConnectionPool"] = None
+        self._pool_key: Optional[Tuple[int, str]] = None
+        self._checked_out = False
+        self._with_depth = 0
+        self._foreign_keys = False
+
+    def __enter__(self):
+        self._with_depth += 1
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            return super().__exit__(exc_type, exc_value, traceback)
+        finally:
+            self._with_depth -= 1
+            if self._with_depth == 0:
+                self.close()
+
+    def close(self) -> None:
+        """Return the connection to its pool (or close it if unpooled)."""
+        if self._pool is not None:
+            self._pool.release(self)
+        else:
+            super().close()
+
+    def close_physical(self) -> None:
+        """Close the underlying SQLite handle, bypassing the pool."""
+        self._pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Per-thread, per-database pool of configured SQLite connections.
+
+    SQLite connections are cheap to keep but comparatively expensive to open
+    and configure, so the pool keeps a small LIFO stack of idle connections
+    for each (thread, db_path). A connection is only ever handed back to the
+    thread that opened it, so nested callers in the same thread still get
+    independent connections and transaction boundaries are unchanged.
+
+    Usage:
+        conn = connection_pool.acquire("agtools.db", row_factory=sqlite3.Row)
+        try:
+            conn.execute("SELECT 1")
+        finally:
+            conn.close()  # returns to pool
+    """
+
+    def __init__(
+        self,
+        max_idle_per_thread: int = MAX_IDLE_PER_THREAD,
+        max_idle_total: int = MAX_IDLE_TOTAL,
+        timeout: float = BUSY_TIMEOUT_SECONDS
+    ):
+        self.max_idle_per_thread = max_idle_per_thread
+        self.max_idle_total = max_idle_total
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[int, str], List[PooledConnection]] = {}
+        self._idle_lru: "OrderedDict[int, PooledConnection]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def _is_poolable(db_path: str) -> bool:
+        """In-memory databases are private to one connection and never pooled."""
+        return bool(db_path) and db_path != ':memory:' and 'mode=memory' not in db_path
+
+    def _path_stats(self, db_path: str) -> Dict[str, int]:
+        stats = self._stats.get(db_path)
+        if stats is None:
+            stats = self._stats[db_path] = {
+                "opened": 0,
+                "reused": 0,
+                "released": 0,
+                "discarded": 0,
+                "in_use": 0,
+            }
+        return stats
+
+    def _open(self, db_path: str) -> PooledConnection:
+        """Open and configure a new pooled connection."""
+        conn = sqlite3.connect(
+            db_path,
+            timeout=self.timeout,
+            factory=PooledConnection,
+            check_same_thread=False
+        )
+        for pragma in CONNECTION_PRAGMAS:
+            try:
+                conn.execute(pragma)
+            except sqlite3.DatabaseError:
+                # Read-only or exotic filesystems may refuse WAL/mmap
+                pass
+        return conn
+
+    def acquire(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        row_factory: Any = None,
+        foreign_keys: bool = False
+    ) -> sqlite3.Connection:
+        """
+        Check out a connection for the current thread.
+
+        Args:
+            db_path: Path to the SQLite database file
+            row_factory: Row factory to install (e.g. sqlite3.Row)
+            foreign_keys: Enable foreign key enforcement on this checkout
+
+        Returns:
+            Connection whose close() returns it to the pool
+        """
+        if not self._is_poolable(db_path):
+            conn = sqlite3.connect(db_path, timeout=self.timeout)
+            conn.row_factory = row_factory
+            if foreign_keys:
+                conn.execute("PRAGMA foreign_keys = ON")
+            return conn
+
+        key = (threading.get_ident(), db_path)
+        conn = None
+        with self._lock:
+            stats = self._path_stats(db_path)
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                self._idle_lru.pop(id(conn), None)
+                stats["reused"] += 1
+            else:
+                stats["opened"] += 1
+            stats["in_use"] += 1
+
+        if conn is None:
+            conn = self._open(db_path)
+            conn._pool_key = key
+
+        conn._pool = self
+        conn._checked_out = True
+        conn.row_factory = row_factory
+        if conn._foreign_keys != foreign_keys:
+            conn.execute(f"PRAGMA foreign_keys = {'ON' if foreign_keys else 'OFF'}")
+            conn._foreign_keys = foreign_keys
+        return conn
+
+    def release(self, conn: PooledConnection) -> None:
+        """
+        Return a connection to the idle stack of the thread that opened it.
+
+        Any open transaction is rolled back, as sqlite3's close() would do.
+        Releasing twice is a no-op.
+        """
+        if not conn._checked_out:
+            return
+        conn._checked_out = False
+        key = conn._pool_key
+        db_path = key[1]
+
+        keep = key[0] == threading.get_ident()
+        if keep:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.row_factory = None
+                conn.text_factory = str
+                conn.isolation_level = ""
+            except sqlite3.Error:
+                keep = False
+
+        evicted: List[PooledConnection] = []
+        with self._lock:
+            stats = self._path_stats(db_path)
+            stats["in_use"] = max(0, stats["in_use"] - 1)
+            idle = self._idle.setdefault(key, [])
+            if keep and len(idle) < self.max_idle_per_thread:
+                idle.append(conn)
+                self._idle_lru[id(conn)] = conn
+                stats["released"] += 1
+                while len(self._idle_lru) > self.max_idle_total:
+                    _, oldest = self._idle_lru.popitem(last=False)
+                    oldest_idle = self._idle.get(oldest._pool_key)
+                    if oldest_idle and oldest in oldest_idle:
+                        oldest_idle.remove(oldest)
+                    self._path_stats(oldest._pool_key[1])["discarded"] += 1
+                    evicted.append(oldest)
+            else:
+                stats["discarded"] += 1
+                evicted.append(conn)
+
+        for stale in evicted:
+            try:
+                stale.close_physical()
+            except sqlite3.Error:
+                pass
+
+    def close_all(self, db_path: Optional[str] = None) -> int:
+        """
+        Close idle connections (optionally only those for one database).
+
+        Checked-out connections are left alone and are closed when released
+        if the pool no longer has room for them.
+
+        Returns:
+            Number of connections closed
+        """
+        closing: List[PooledConnection] = []
+        with self._lock:
+            for key in list(self._idle):
+                if db_path is not None and key[1] != db_path:
+                    continue
+                for conn in self._idle.pop(key):
+                    self._idle_lru.pop(id(conn), None)
+                    closing.append(conn)
+
+        for conn in closing:
+            try:
+                conn.close_physical()
+            except sqlite3.Error:
+                pass
+        return len(closing)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool configuration and per-database counters."""
+        with self._lock:
+            idle_by_path: Dict[str, int] = {}
+            for (_, path), conns in self._idle.items():
+                idle_by_path[path] = idle_by_path.get(path, 0) + len(conns)
+
+            databases = {}
+            for path, stats in self._stats.items():
+                checkouts = stats["opened"] + stats["reused"]
+                databases[path] = {
+                    **stats,
+                    "idle": idle_by_path.get(path, 0),
+                    "reuse_rate": round(stats["reused"] / checkouts, 4) if checkouts else 0.0,
+                }
+
+            return {
+                "max_idle_per_thread": self.max_idle_per_thread,
+                "max_idle_total": self.max_idle_total,
+                "busy_timeout_seconds": self.timeout,
+                "pragmas": list(CONNECTION_PRAGMAS),
+                "total_idle": len(self._idle_lru),
+                "databases": databases,
+            }
+
+
+# Process-wide pool shared by all services
+connection_pool = ConnectionPool()
+
+
+def get_pooled_connection(
+    db_path: str = DEFAULT_DB_PATH,
+    row_factory: Any = None,
+    foreign_keys: bool = False
+) -> sqlite3.Connection:
+    """
+    Drop-in replacement for sqlite3.connect() that draws from the pool.
+
+    Call close() (or leave a ``with conn:`` block) to hand the connection
+    back. No row factory is set unless one is passed, matching sqlite3.connect.
+
+    Args:
+        db_path: Path to the SQLite database file
+        row_factory: Optional row factory (e.g. sqlite3.Row)
+        foreign_keys: Enable PRAGMA foreign_keys for this checkout
+
+    Returns:
+        Pooled sqlite3.Connection
+    """
+    return connection_pool.acquire(db_path, row_factory=row_factory, foreign_keys=foreign_keys)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Return connection pool statistics (see ConnectionPool.get_stats)."""
+    return connection_pool.get_stats()
+
+
+def close_pooled_connections(db_path: Optional[str] = None) -> int:
+    """Close idle pooled connections, e.g. before deleting a database file."""
+    return connection_pool.close_all(db_path)
+
+
 @contextmanager
 def get_db_connection(db_path: str = DEFAULT_DB_PATH) -> Generator[sqlite3.Connection, None, None]:
     """
     Context manager for database connections.
 
-    Ensures the connection is properly closed even if an exception occurs.
-    Sets row_factory to sqlite3.Row for dict-like access.
+    Ensures the connection is returned to the pool even if an exception
+    occurs. Sets row_factory to sqlite3.Row for dict-like access.
 
     Usage:
         with get_db_connection() as conn:
@@ -69,8 +391,7 @@ def get_db_connection(db_path: str = DEFAULT_DB_PATH) -> Generator[sqlite3.Conne
     """
     conn = None
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = get_pooled_connection(db_path, row_factory=sqlite3.Row)
         yield conn
     finally:
         if conn:
@@ -116,7 +437,7 @@ class DatabaseManager:
     """
     Database manager class for services that need persistent connection management.
 
-    Provides context manager methods and connection pooling-like behavior.
+    Provides context manager methods backed by the shared connection pool.
 
     Usage:
         class MyService:
@@ -0,0 +1,103 @@
+"""
+Schema Versioning
+AgTools v6.13.5
+
+Records which service schemas have been applied to a database so table
+creation and default seeding run once per database instead of on every
+process start.
+
+Each service owns a component name and an integer schema version. When a
+service changes its tables (new table, ALTER TABLE, new seed data) it bumps
+its version and the init steps run again on the next start.
+
+Usage:
+    ensure_schema(self.db_path, "genfin_core", 1,
+                  self._init_tables, self._initialize_chart_of_accounts)
+"""
+
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict
+
+from .db_utils import get_pooled_connection
+
+
+SCHEMA_VERSIONS_TABLE = "schema_versions"
+
+_lock = threading.Lock()
+
+
+def _ensure_versions_table(conn: sqlite3.Connection) -> None:
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SCHEMA_VERSIONS_TABLE} (
+            component TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+
+
+def get_schema_version(db_path: str, component: str) -> int:
+    """Applied schema version for a component (0 if never applied)."""
+    conn = get_pooled_connection(db_path)
+    try:
+        _ensure_versions_table(conn)
+        row = conn.execute(
+            f"SELECT version FROM {SCHEMA_VERSIONS_TABLE} WHERE component = ?",
+            (component,)
+        ).fetchone()
+        return row[0] if row else 0
+    finally:
+        conn.close()
+
+
+def get_schema_versions(db_path: str) -> Dict[str, int]:
+    """All applied component versions in a database."""
+    conn = get_pooled_connection(db_path)
+    try:
+        _ensure_versions_table(conn)
+        rows = conn.execute(f"SELECT component, version FROM {SCHEMA_VERSIONS_TABLE}").fetchall()
+        return {component: version for component, version in rows}
+    finally:
+        conn.close()
+
+
+def ensure_schema(db_path: str, component: str, version: int, *steps: Callable[[], None]) -> bool:
+    """
+    Run a component's schema steps unless this version is already applied.
+
+    Steps run in order and must be idempotent (CREATE TABLE IF NOT EXISTS,
+    seed-if-empty), since a database created before versioning existed
+    will run them once more to record its version.
+
+    Args:
+        db_path: Path to the SQLite database file
+        component: Stable component name, e.g. "genfin_core"
+        version: Current schema version of the component
+        *steps: Callables that create tables and seed defaults
+
+    Returns:
+        True if the steps ran, False if the schema was already current
+    """
+    if get_schema_version(db_path, component) >= version:
+        return False
+
+    with _lock:
+        # Another thread may have applied it while we waited
+        if get_schema_version(db_path, component) >= version:
+            return False
+
+        for step in steps:
+            step()
+
+        conn = get_pooled_connection(db_path)
+        try:
+            conn.execute(f"""
+                INSERT OR REPLACE INTO {SCHEMA_VERSIONS_TABLE} (component, version, applied_at)
+                VALUES (?, ?, ?)
+            """, (component, version, datetime.now(timezone.utc).isoformat()))
+            conn.commit()
+        finally:
+            conn.close()
+    return True
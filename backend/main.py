@@ -6,21 +6,26 @@ Version 6.13.0 - Refactored to FastAPI Routers Architecture
 
 import sys
 import os
+import io
 import json
 
 # Add parent directory to path so we can import from database/
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Depends, Request, Form, Query
+from fastapi import FastAPI, HTTPException, UploadFile, File, Depends, Request, Form, Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from datetime import date, datetime, timezone
 from enum import Enum
 import uvicorn
 
+from database.db_utils import get_pool_stats
+from database.async_db import DatabaseExecutor, get_db_executor, get_executor_stats
+from services.registry import lazy_service, get_registry_stats
+
 # Rate limiting (shared module for all routers)
 from middleware.rate_limiter import limiter
 from slowapi import _rate_limit_exceeded_handler
@@ -42,7 +47,8 @@ from services.auth_service import (
     UserResponse,
     Token,
     LoginRequest,
-    PasswordChange
+    PasswordChange,
+    get_auth_cache_stats
 )
 from services.user_service import (
     get_user_service,
@@ -154,6 +160,8 @@ from services.profitability_service import (
     InputROIResponse,
     ScenarioRequest,
     ScenarioResponse,
+    RiskSimulationRequest,
+    RiskSimulationResponse,
     BudgetTrackerRequest,
     BudgetTrackerResponse
 )
@@ -661,6 +669,18 @@ class IrrigationSeasonRequest(BaseModel):
     expected_rainfall_inches: float = Field(default=15, ge=0)
     soil_water_holding_capacity_inches: float = Field(default=2.0, ge=0.5, le=4.0)
     pumping_depth_ft: float = Field(default=150, ge=20, le=500)
+    daily_reference_et: Optional[List[float]] = Field(default=None, description="Known reference ET (in/day) from season_start")
+    daily_rainfall: Optional[List[float]] = Field(default=None, description="Known rainfall (in/day) from season_start")
+
+class IrrigationFieldSeason(IrrigationSeasonRequest):
+    field_id: Optional[str] = None
+    initial_depletion_inches: float = Field(default=0, ge=0)
+    application_inches: Optional[float] = Field(default=None, gt=0, le=3.0)
+
+class BatchIrrigationScheduleRequest(BaseModel):
+    fields: List[IrrigationFieldSeason] = Field(..., min_length=1)
+    allowable_depletion: float = Field(default=0.5, ge=0.1, le=0.9)
+    min_days_between_events: int = Field(default=3, ge=1, le=14)
 
 class WaterSavingsAnalysisRequest(BaseModel):
     current_usage_acre_inches: float
@@ -786,6 +806,17 @@ class FindSprayWindowsRequest(BaseModel):
     product_name: Optional[str] = None
 
 
+class FieldForecastInput(BaseModel):
+    field_id: str
+    forecast: List[WeatherConditionInput]
+
+
+class BatchSprayWindowsRequest(BaseModel):
+    fields: List[FieldForecastInput] = Field(..., min_length=1)
+    spray_types: List[SprayTypeEnum] = Field(..., min_length=1)
+    min_window_hours: float = Field(default=3.0, ge=1.0, le=12.0)
+
+
 class CostOfWaitingRequest(BaseModel):
     current_conditions: WeatherConditionInput
     forecast: List[WeatherConditionInput]
@@ -890,6 +921,25 @@ class MultiNutrientOptimizationRequest(BaseModel):
     yield_goal: Optional[float] = None
 
 
+class FieldOptimumInput(BaseModel):
+    field_id: Optional[str] = None
+    crop: CropType
+    nutrient: NutrientType
+    soil_test_level: Optional[SoilTestLevel] = None
+    previous_crop: Optional[str] = None
+    grain_price_per_bu: Optional[float] = Field(default=None, gt=0, description="Defaults to the crop's price")
+    acres: float = Field(default=1.0, ge=0)
+
+
+class BatchEconomicOptimumRequest(BaseModel):
+    fields: List[FieldOptimumInput] = Field(..., description="Fields to solve")
+    price_ratios: List[float] = Field(
+        default=[0.05, 0.08, 0.10, 0.12, 0.15, 0.18, 0.20, 0.25, 0.30],
+        description="Nutrient price per lb / grain price per bu"
+    )
+    application_cost: Optional[float] = Field(default=None, ge=0, description="$/acre per application")
+
+
 # ============================================================================
 # API ROUTES
 # ============================================================================
@@ -904,6 +954,24 @@ async def root():
         "description": "Professional-grade pest/disease identification and spray recommendation system"
     }
 
+
+@app.get("/api/v1/system/db-pool", tags=["System"])
+async def get_db_pool_stats(admin: AuthenticatedUser = Depends(require_admin)):
+    """SQLite connection pool and database executor statistics (admin only)."""
+    return {**get_pool_stats(), "executor": get_executor_stats()}
+
+
+@app.get("/api/v1/system/services", tags=["System"])
+async def get_service_registry_stats(admin: AuthenticatedUser = Depends(require_admin)):
+    """Which lazily constructed services are initialized, with init times (admin only)."""
+    return get_registry_stats()
+
+
+@app.get("/api/v1/system/auth-cache", tags=["System"])
+async def get_auth_cache_statistics(admin: AuthenticatedUser = Depends(require_admin)):
+    """Authenticated-user cache hit rate and size (admin only)."""
+    return get_auth_cache_stats()
+
 @app.get("/api/v1/crops")
 async def get_crops():
     """Get list of supported crops"""
@@ -1361,6 +1429,9 @@ async def optimize_irrigation_season(request: IrrigationSeasonRequest):
 
     optimizer = get_irrigation_optimizer()
 
+    if request.season_end < request.season_start:
+        raise HTTPException(status_code=400, detail="season_end must not be before season_start")
+
     result = optimizer.optimize_irrigation_schedule(
         crop=request.crop.value,
         acres=request.acres,
@@ -1370,7 +1441,46 @@ async def optimize_irrigation_season(request: IrrigationSeasonRequest):
         season_end=request.season_end,
         expected_rainfall_inches=request.expected_rainfall_inches,
         soil_water_holding_capacity=request.soil_water_holding_capacity_inches,
-        pumping_depth_ft=request.pumping_depth_ft
+        pumping_depth_ft=request.pumping_depth_ft,
+        daily_reference_et=request.daily_reference_et,
+        daily_rainfall=request.daily_rainfall
+    )
+
+    return result
+
+
+@app.post("/api/v1/optimize/irrigation/batch-schedule")
+async def schedule_irrigation_batch(request: BatchIrrigationScheduleRequest):
+    """
+    Plan irrigation events for many fields and seasons in one simulation
+    Returns event dates, water balance and costs per field plus farm totals
+    """
+    from services.irrigation_optimizer import get_irrigation_optimizer
+
+    optimizer = get_irrigation_optimizer()
+
+    result = optimizer.schedule_irrigation_batch(
+        fields=[
+            {
+                "field_id": f.field_id,
+                "crop": f.crop.value,
+                "acres": f.acres,
+                "irrigation_type": f.irrigation_type.value,
+                "water_source": f.water_source.value,
+                "season_start": f.season_start,
+                "season_end": f.season_end,
+                "expected_rainfall_inches": f.expected_rainfall_inches,
+                "soil_water_holding_capacity": f.soil_water_holding_capacity_inches,
+                "pumping_depth_ft": f.pumping_depth_ft,
+                "daily_reference_et": f.daily_reference_et,
+                "daily_rainfall": f.daily_rainfall,
+                "initial_depletion_inches": f.initial_depletion_inches,
+                "application_inches": f.application_inches
+            }
+            for f in request.fields
+        ],
+        allowable_depletion=request.allowable_depletion,
+        min_days_between_events=request.min_days_between_events
     )
 
     return result
@@ -1820,6 +1930,47 @@ async def find_spray_windows(request: FindSprayWindowsRequest):
     return result
 
 
+@app.post("/api/v1/spray-timing/batch-windows")
+async def find_spray_windows_batch(request: BatchSprayWindowsRequest):
+    """
+    Find spray windows for many fields and spray types in one pass
+    Returns windows, best window and recommendation per field and spray type
+    """
+    from services.spray_timing_optimizer import (
+        get_spray_timing_optimizer,
+        WeatherCondition,
+        SprayType
+    )
+
+    optimizer = get_spray_timing_optimizer()
+
+    forecasts = {
+        field.field_id: [
+            WeatherCondition(
+                datetime=w.datetime,
+                temp_f=w.temp_f,
+                humidity_pct=w.humidity_pct,
+                wind_mph=w.wind_mph,
+                wind_direction=w.wind_direction,
+                precip_chance_pct=w.precip_chance_pct,
+                precip_amount_in=w.precip_amount_in,
+                cloud_cover_pct=w.cloud_cover_pct,
+                dew_point_f=w.dew_point_f
+            )
+            for w in field.forecast
+        ]
+        for field in request.fields
+    }
+
+    result = optimizer.scan_spray_windows(
+        forecasts=forecasts,
+        spray_types=[SprayType(s.value) for s in dict.fromkeys(request.spray_types)],
+        min_window_hours=request.min_window_hours
+    )
+
+    return result
+
+
 @app.post("/api/v1/spray-timing/cost-of-waiting")
 async def calculate_cost_of_waiting(request: CostOfWaitingRequest):
     """
@@ -2157,6 +2308,40 @@ async def get_price_ratio_guide(
     return result
 
 
+@app.post("/api/v1/yield-response/batch-optimum")
+async def batch_economic_optimum(request: BatchEconomicOptimumRequest):
+    """
+    Economic optimum rates for many fields across many price ratios
+    Solves every field/price-ratio combination in one vectorized call
+    """
+    from services.yield_response_optimizer import (
+        get_yield_response_optimizer,
+        SOIL_TEST_PPM,
+        SoilTestLevel as STL
+    )
+
+    optimizer = get_yield_response_optimizer()
+
+    fields = [
+        {
+            "field_id": field.field_id,
+            "crop": field.crop.value,
+            "nutrient": field.nutrient.value,
+            "soil_test_level": SOIL_TEST_PPM[STL(field.soil_test_level.value)] if field.soil_test_level else None,
+            "previous_crop": field.previous_crop,
+            "commodity_price": field.grain_price_per_bu,
+            "acres": field.acres,
+        }
+        for field in request.fields
+    ]
+
+    return optimizer.batch_economic_optimum(
+        fields,
+        price_ratios=request.price_ratios,
+        application_cost=request.application_cost
+    )
+
+
 # ============================================================================
 # AUTHENTICATION ENDPOINTS
 # ============================================================================
@@ -3610,16 +3795,14 @@ async def import_csv(
     category_column: Optional[str] = None,
     reference_column: Optional[str] = None,
     default_tax_year: Optional[int] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """
     Import expenses from CSV file.
 
     Provide column mapping for your QuickBooks export format.
     """
-    content = await file.read()
-    csv_text = content.decode('utf-8')
-
     mapping = ColumnMapping(
         amount=amount_column,
         date=date_column,
@@ -3629,14 +3812,20 @@ async def import_csv(
         reference=reference_column
     )
 
+    # Parse the spooled upload in chunks rather than reading it into memory
     cost_service = get_cost_tracking_service()
-    return cost_service.import_csv(
-        csv_text,
-        mapping,
-        user.id,
-        file.filename or "upload.csv",
-        default_tax_year
-    )
+    csv_stream = io.TextIOWrapper(file.file, encoding='utf-8-sig', newline='')
+    try:
+        return await db.run(
+            cost_service.import_csv_stream,
+            csv_stream,
+            mapping,
+            user.id,
+            file.filename or "upload.csv",
+            default_tax_year
+        )
+    finally:
+        csv_stream.detach()
 
 
 @app.post("/api/v1/costs/import/scan", response_model=OCRScanResult, tags=["Cost Tracking"])
@@ -4039,7 +4228,7 @@ async def preview_accounting_import(
     qb_service = get_qb_import_service()
     content = await file.read()
     csv_content = content.decode("utf-8-sig")  # Handle BOM from Excel
-    return qb_service.preview_import(csv_content, current_user.user_id)
+    return qb_service.preview_import(csv_content, current_user.id)
 
 
 @app.post("/api/v1/accounting-import/import", response_model=QBImportSummary, tags=["Accounting Import"])
@@ -4048,7 +4237,9 @@ async def import_accounting_data(
     account_mappings: str = Form(...),  # JSON string of account -> category mappings
     tax_year: Optional[int] = Form(None),
     save_mappings: bool = Form(True),
-    current_user: AuthenticatedUser = Depends(get_current_active_user)
+    stream_progress: bool = Form(False),
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """
     Import expenses from an accounting software CSV export.
@@ -4060,6 +4251,8 @@ async def import_accounting_data(
     - Auto-filters to expense transactions only (skips deposits, transfers)
     - Duplicate detection by reference number + date + amount
     - Saves mappings for future imports if save_mappings=true
+    - stream_progress=true answers with newline-delimited JSON: one
+      progress line per batch written, then the import summary
     """
     import json
 
@@ -4075,14 +4268,22 @@ async def import_accounting_data(
     content = await file.read()
     csv_content = content.decode("utf-8-sig")
 
-    return qb_service.import_quickbooks(
+    import_args = dict(
         csv_content=csv_content,
-        user_id=current_user.user_id,
+        user_id=current_user.id,
         account_mappings=mappings,
         source_file=file.filename or "accounting_export.csv",
         tax_year=tax_year,
         save_mappings=save_mappings
     )
+    if stream_progress:
+        async def progress_lines():
+            async for event in db.iter_progress(qb_service.import_quickbooks, **import_args):
+                yield event.model_dump_json() + "\n"
+
+        return StreamingResponse(progress_lines(), media_type="application/x-ndjson")
+
+    return await db.run(qb_service.import_quickbooks, **import_args)
 
 
 @app.get("/api/v1/accounting-import/mappings", response_model=List[QBAccountMapping], tags=["Accounting Import"])
@@ -4091,7 +4292,7 @@ async def get_accounting_mappings(
 ):
     """Get user's saved accounting software account mappings."""
     qb_service = get_qb_import_service()
-    return qb_service.get_all_user_mappings(current_user.user_id)
+    return qb_service.get_all_user_mappings(current_user.id)
 
 
 @app.post("/api/v1/accounting-import/mappings", tags=["Accounting Import"])
@@ -4106,7 +4307,7 @@ async def save_accounting_mappings(
     Example: {"Farm Expense:Seed": "seed", "Farm Expense:Fertilizer": "fertilizer"}
     """
     qb_service = get_qb_import_service()
-    saved = qb_service.save_user_mappings(current_user.user_id, mappings)
+    saved = qb_service.save_user_mappings(current_user.id, mappings)
     return {"message": f"Saved {saved} mappings", "count": saved}
 
 
@@ -4117,7 +4318,7 @@ async def delete_accounting_mapping(
 ):
     """Delete an accounting software account mapping."""
     qb_service = get_qb_import_service()
-    if qb_service.delete_user_mapping(current_user.user_id, mapping_id):
+    if qb_service.delete_user_mapping(current_user.id, mapping_id):
         return {"message": "Mapping deleted"}
     raise HTTPException(status_code=404, detail="Mapping not found")
 
@@ -4199,6 +4400,31 @@ async def run_scenarios(
     return profit_service.run_scenarios(request)
 
 
+@app.post("/api/v1/profitability/risk", response_model=RiskSimulationResponse, tags=["Profitability"])
+async def simulate_profit_risk(
+    request: RiskSimulationRequest,
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
+):
+    """
+    Monte Carlo downside-risk analysis across fields.
+
+    Draws correlated price and yield samples (100,000 by default) and reports:
+    - Profit distribution and probability of loss
+    - Value at Risk and CVaR (expected shortfall)
+    - Break-even price and yield percentiles
+
+    per field, per crop and for the whole farm. Distributions can be normal,
+    lognormal, triangular or historical values; unset ones use the crop's
+    typical range. Repeat requests are served from cache.
+    """
+    profit_service = get_profitability_service()
+    try:
+        return await db.run(profit_service.simulate_profit_risk, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.post("/api/v1/profitability/budget", response_model=BudgetTrackerResponse, tags=["Profitability"])
 async def track_budget(
     request: BudgetTrackerRequest,
@@ -4432,6 +4658,19 @@ async def list_ai_models():
     return get_model_info()
 
 
+@app.post("/api/v1/ai/models/reload", tags=["AI Intelligence"])
+async def reload_ai_model(
+    current_user: AuthenticatedUser = Depends(require_admin)
+):
+    """
+    Reload the local AI model after retraining (Admin only)
+
+    Cached image results from the previous local model are discarded.
+    """
+    ai_service = get_ai_image_service()
+    return ai_service.reload_local_model()
+
+
 # ============================================================================
 # CROP HEALTH SCORING (v3.0 Phase 2)
 # ============================================================================
@@ -13207,6 +13446,14 @@ class GenFinScenarioCreate(BaseModel):
     adjustments: Dict[str, float]
     description: str = ""
 
+class GenFinInventorySaleLine(BaseModel):
+    item_id: str
+    quantity: float = Field(..., gt=0)
+    sale_date: str
+
+class GenFinInventorySaleBatch(BaseModel):
+    sales: List[GenFinInventorySaleLine] = Field(..., min_length=1)
+
 
 # ------------ GenFin Core - Chart of Accounts & General Ledger ------------
 
@@ -13324,6 +13571,16 @@ async def get_trial_balance(
     """Get trial balance"""
     return genfin_core_service.get_trial_balance(as_of_date)
 
+@app.get("/api/v1/genfin/account-balances/verify", tags=["GenFin Core"])
+async def verify_account_balances(user: AuthenticatedUser = Depends(require_admin)):
+    """Check materialized account balances against the raw journal lines (admin only)"""
+    return genfin_core_service.verify_account_balances()
+
+@app.post("/api/v1/genfin/account-balances/rebuild", tags=["GenFin Core"])
+async def rebuild_account_balances(user: AuthenticatedUser = Depends(require_admin)):
+    """Rebuild materialized account balances from the raw journal lines (admin only)"""
+    return genfin_core_service.rebuild_account_balances()
+
 
 # ------------ GenFin Payables - Vendors, Bills, Payments ------------
 
@@ -14134,7 +14391,8 @@ async def get_profit_loss(
     compare_prior_year: bool = False,
     group_by_month: bool = False,
     class_id: Optional[str] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get Profit & Loss Statement"""
     from datetime import date
@@ -14142,7 +14400,8 @@ async def get_profit_loss(
         end_date = date.today().isoformat()
     if not start_date:
         start_date = f"{date.today().year}-01-01"
-    return genfin_reports_service.get_profit_loss(
+    return await db.run(
+        genfin_reports_service.get_profit_loss,
         start_date, end_date, compare_prior_period, compare_prior_year, group_by_month, class_id
     )
 
@@ -14154,7 +14413,8 @@ async def get_income_statement(
     compare_prior_year: bool = False,
     group_by_month: bool = False,
     class_id: Optional[str] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get Income Statement (alias for Profit & Loss)"""
     from datetime import date
@@ -14162,7 +14422,8 @@ async def get_income_statement(
         end_date = date.today().isoformat()
     if not start_date:
         start_date = f"{date.today().year}-01-01"
-    return genfin_reports_service.get_profit_loss(
+    return await db.run(
+        genfin_reports_service.get_profit_loss,
         start_date, end_date, compare_prior_period, compare_prior_year, group_by_month, class_id
     )
 
@@ -14170,19 +14431,21 @@ async def get_income_statement(
 async def get_balance_sheet(
     as_of_date: Optional[str] = None,
     compare_prior_year: bool = False,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get Balance Sheet"""
     from datetime import date
     if not as_of_date:
         as_of_date = date.today().isoformat()
-    return genfin_reports_service.get_balance_sheet(as_of_date, compare_prior_year=compare_prior_year)
+    return await db.run(genfin_reports_service.get_balance_sheet, as_of_date, compare_prior_year=compare_prior_year)
 
 @app.get("/api/v1/genfin/reports/cash-flow", tags=["GenFin Reports"])
 async def get_cash_flow(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get Cash Flow Statement"""
     from datetime import date
@@ -14190,25 +14453,27 @@ async def get_cash_flow(
         end_date = date.today().isoformat()
     if not start_date:
         start_date = f"{date.today().year}-01-01"
-    return genfin_reports_service.get_cash_flow(start_date, end_date)
+    return await db.run(genfin_reports_service.get_cash_flow, start_date, end_date)
 
 @app.get("/api/v1/genfin/reports/financial-ratios", tags=["GenFin Reports"])
 async def get_financial_ratios(
     as_of_date: str = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get Financial Ratios"""
     from datetime import date
     if as_of_date is None:
         as_of_date = date.today().isoformat()
-    return genfin_reports_service.get_financial_ratios(as_of_date)
+    return await db.run(genfin_reports_service.get_financial_ratios, as_of_date)
 
 @app.get("/api/v1/genfin/reports/general-ledger", tags=["GenFin Reports"])
 async def get_general_ledger_report(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     account_ids: Optional[List[str]] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get General Ledger Report"""
     from datetime import date
@@ -14216,25 +14481,27 @@ async def get_general_ledger_report(
         end_date = date.today().isoformat()
     if not start_date:
         start_date = f"{date.today().year}-01-01"
-    return genfin_reports_service.get_general_ledger(start_date, end_date, account_ids)
+    return await db.run(genfin_reports_service.get_general_ledger, start_date, end_date, account_ids)
 
 @app.get("/api/v1/genfin/reports/income-by-customer", tags=["GenFin Reports"])
 async def get_income_by_customer(
     start_date: str,
     end_date: str,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get Income by Customer Report"""
-    return genfin_reports_service.get_income_by_customer(start_date, end_date)
+    return await db.run(genfin_reports_service.get_income_by_customer, start_date, end_date)
 
 @app.get("/api/v1/genfin/reports/expenses-by-vendor", tags=["GenFin Reports"])
 async def get_expenses_by_vendor(
     start_date: str,
     end_date: str,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get Expenses by Vendor Report"""
-    return genfin_reports_service.get_expenses_by_vendor(start_date, end_date)
+    return await db.run(genfin_reports_service.get_expenses_by_vendor, start_date, end_date)
 
 
 # ------------ GenFin Budget - Budgets, Forecasts, Scenarios ------------
@@ -14586,6 +14853,14 @@ async def sell_inventory(
     """Sell inventory (reduce quantity, calculate COGS)"""
     return genfin_inventory_service.sell_inventory(item_id, quantity, sale_date)
 
+@app.post("/api/v1/genfin/inventory/sell-batch", tags=["GenFin Inventory"])
+async def sell_inventory_batch(
+    request: GenFinInventorySaleBatch,
+    user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """Post many inventory sales at once, in the order given"""
+    return genfin_inventory_service.sell_inventory_batch([sale.model_dump() for sale in request.sales])
+
 @app.post("/api/v1/genfin/inventory/adjust", tags=["GenFin Inventory"])
 async def adjust_inventory(
     item_id: str,
@@ -15331,6 +15606,18 @@ async def categorize_transaction(
     """Categorize an imported transaction"""
     return genfin_bank_feeds_service.categorize_transaction(transaction_id, category_account, memo)
 
+@app.get("/api/v1/genfin/bank-feeds/transactions/{transaction_id}/candidates", tags=["GenFin Bank Feeds"])
+async def get_match_candidates(
+    transaction_id: str,
+    limit: int = Query(5, ge=1, le=25),
+    user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """Ranked existing transactions, bills and payments an imported line may match"""
+    result = genfin_bank_feeds_service.get_match_candidates(transaction_id, limit)
+    if not result.get("success"):
+        raise HTTPException(status_code=404, detail=result.get("error", "Transaction not found"))
+    return result
+
 @app.put("/api/v1/genfin/bank-feeds/transactions/{transaction_id}/match", tags=["GenFin Bank Feeds"])
 async def match_transaction(
     transaction_id: str,
@@ -15367,8 +15654,14 @@ async def create_category_rule(
     user: AuthenticatedUser = Depends(get_current_active_user)
 ):
     """Create an auto-categorization rule"""
+    if match_field == "memo":
+        match = {"match_memo_contains": pattern}
+    elif pattern_type == "exact":
+        match = {"match_name_exact": pattern}
+    else:
+        match = {"match_name_contains": pattern}
     return genfin_bank_feeds_service.create_category_rule(
-        rule_name, pattern, category_account, pattern_type, match_field, priority
+        name=rule_name, assign_account_id=category_account, priority=priority, **match
     )
 
 @app.get("/api/v1/genfin/bank-feeds/rules", tags=["GenFin Bank Feeds"])
@@ -15392,6 +15685,14 @@ async def auto_categorize_transactions(
     """Apply auto-categorization rules to pending transactions"""
     return genfin_bank_feeds_service.auto_categorize_all(import_id)
 
+@app.post("/api/v1/genfin/bank-feeds/auto-match", tags=["GenFin Bank Feeds"])
+async def auto_match_transactions(
+    import_id: Optional[str] = None,
+    user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """Match pending imported transactions against existing GenFin records"""
+    return genfin_bank_feeds_service.auto_match_all(import_id)
+
 
 # ============================================================================
 # GENFIN FIXED ASSETS (v6.2)
@@ -15549,7 +15850,7 @@ async def get_asset_register_report(
 
 from services.genfin_entity_service import get_entity_service, EntityCreate, EntityType
 
-genfin_entity_service = get_entity_service()
+genfin_entity_service = lazy_service("genfin_entity", get_entity_service)
 
 @app.get("/api/v1/genfin/entities/summary", tags=["GenFin Entities"])
 async def get_entity_service_summary(
@@ -15703,7 +16004,7 @@ from services.seed_planting_service import (
     PlantingRecordCreate, PlantingRecordUpdate, EmergenceRecordCreate
 )
 
-seed_planting_service = get_seed_planting_service()
+seed_planting_service = lazy_service("seed_planting", get_seed_planting_service)
 
 
 @app.get("/api/v1/seeds/summary", tags=["Seeds & Planting"])
@@ -16073,9 +16374,13 @@ from services.gis_service import (
     BoundaryUpdate,
     ImportRequest,
     ImportResult,
+    ImportJobInfo,
     ExportRequest,
     ExportResult,
     AreaResult,
+    AreaBatchRequest,
+    AcreageRecalculationRequest,
+    AcreageRecalculationResult,
     QGISProjectResult
 )
 from services.gis_layers_service import (
@@ -16089,20 +16394,42 @@ from services.gis_layers_service import (
     FeatureResponse,
     GeoJSONFeatureCollection as LayerFeatureCollection
 )
+from services.spatial_index import parse_bbox, MAX_VIEWPORT_FEATURE_LIMIT
+
+
+def _viewport_bbox(bbox: Optional[str]):
+    """Parse an optional bbox query parameter, answering 400 if malformed."""
+    if bbox is None:
+        return None
+    try:
+        return parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/api/v1/gis/fields/boundaries", tags=["GIS"])
 async def get_field_boundaries(
     field_ids: Optional[str] = Query(None, description="Comma-separated field IDs"),
     farm_name: Optional[str] = None,
+    bbox: Optional[str] = Query(None, description="Visible area as west,south,east,north"),
+    zoom: Optional[int] = Query(None, ge=0, le=24, description="Map zoom; simplifies boundaries and thins sub-pixel fields"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_VIEWPORT_FEATURE_LIMIT),
     user: AuthenticatedUser = Depends(get_current_active_user)
 ):
-    """Get field boundaries as GeoJSON FeatureCollection."""
+    """
+    Get field boundaries as GeoJSON FeatureCollection.
+
+    With bbox, only fields in view are returned (via the spatial index) and
+    truncated reports whether the limit cut the result short.
+    With zoom, geometries are simplified for that zoom level and cached.
+    """
     service = get_gis_service()
     ids = None
     if field_ids:
         ids = [int(x.strip()) for x in field_ids.split(",")]
-    return service.get_field_boundaries(field_ids=ids, farm_name=farm_name)
+    return service.get_field_boundaries(
+        field_ids=ids, farm_name=farm_name, bbox=_viewport_bbox(bbox), zoom=zoom, limit=limit
+    )
 
 
 @app.put("/api/v1/gis/fields/{field_id}/boundary", tags=["GIS"])
@@ -16123,37 +16450,128 @@ async def update_field_boundary(
     return {"success": True, "message": "Boundary updated"}
 
 
-@app.post("/api/v1/gis/import", response_model=ImportResult, tags=["GIS"])
+@app.post("/api/v1/gis/import", response_model=Union[ImportResult, ImportJobInfo], tags=["GIS"])
 async def import_gis_file(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     file_type: str = Form(default="auto"),
     match_by: str = Form(default="name"),
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    layer_id: Optional[int] = Form(None),
+    bbox: Optional[str] = Form(None),
+    stream_progress: bool = Form(False),
+    background: bool = Form(False),
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
-    """Import shapefile, KML, or GeoJSON."""
+    """
+    Import shapefile (.shp or zipped), GeoPackage, KML, or GeoJSON.
+
+    Features are read and written in chunks, so large files import in
+    flat memory without blocking the server.
+
+    - match_by: name, location (boundary overlap) or none
+    - layer_id: save features not matched to a field in this GIS layer
+    - bbox: "west,south,east,north" to import only features in that area
+    - stream_progress=true answers with newline-delimited JSON: one
+      progress line per chunk, then the import result
+    - background=true starts the import and returns its job; poll
+      /api/v1/gis/import/jobs/{job_id} and cancel via .../cancel
+    """
     import tempfile
     import os
+    import shutil
+
+    area = _viewport_bbox(bbox)
 
-    # Save uploaded file temporarily
+    # Save uploaded file temporarily, without holding it all in memory
     suffix = os.path.splitext(file.filename)[1] if file.filename else ".tmp"
     with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        content = await file.read()
-        tmp.write(content)
+        shutil.copyfileobj(file.file, tmp, 1024 * 1024)
         tmp_path = tmp.name
 
+    service = get_gis_service()
+    import_args = dict(
+        file_path=tmp_path,
+        file_type=file_type,
+        match_by=match_by,
+        user_id=user.id,
+        layer_id=layer_id,
+        bbox=area
+    )
+
+    if background:
+        job = service.create_import_job(user.id)
+
+        async def run_import():
+            try:
+                await db.run(service.import_file, job=job, **import_args)
+            finally:
+                os.unlink(tmp_path)
+
+        background_tasks.add_task(run_import)
+        return job.info()
+
+    if stream_progress:
+        job = service.create_import_job(user.id)
+
+        def import_then_remove(**kwargs):
+            # Runs on the worker, so the file outlives a client that goes away
+            try:
+                return service.import_file(**kwargs)
+            finally:
+                os.unlink(tmp_path)
+
+        async def progress_lines():
+            try:
+                async for event in db.iter_progress(import_then_remove, job=job, **import_args):
+                    yield event.model_dump_json() + "\n"
+            finally:
+                # No-op once finished; after a disconnect, stops the import after its current chunk
+                job.cancel()
+
+        return StreamingResponse(progress_lines(), media_type="application/x-ndjson")
+
     try:
-        service = get_gis_service()
-        result = service.import_file(
-            file_path=tmp_path,
-            file_type=file_type,
-            match_by=match_by,
-            user_id=user.id
-        )
-        return result
+        return await db.run(service.import_file, **import_args)
     finally:
         os.unlink(tmp_path)
 
 
+@app.get("/api/v1/gis/import/jobs/{job_id}", response_model=ImportJobInfo, tags=["GIS"])
+async def get_gis_import_job(
+    job_id: str,
+    user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """
+    Progress, and once finished the result, of a background GIS import.
+
+    Jobs are only visible to the user who started them. They are kept in
+    memory by the worker process that runs the import, so with several
+    workers a poll routed to another process answers 404.
+    """
+    job = get_gis_service().get_import_job(job_id, user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.info()
+
+
+@app.post("/api/v1/gis/import/jobs/{job_id}/cancel", response_model=ImportJobInfo, tags=["GIS"])
+async def cancel_gis_import_job(
+    job_id: str,
+    user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """
+    Stop a background GIS import after its current chunk; chunks already written are kept.
+
+    Like polling, this only reaches jobs the user started in the same worker process.
+    """
+    job = get_gis_service().get_import_job(job_id, user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    job.cancel()
+    return job.info()
+
+
 @app.post("/api/v1/gis/export", response_model=ExportResult, tags=["GIS"])
 async def export_gis_data(
     data: ExportRequest,
@@ -16197,10 +16615,37 @@ async def calculate_area(
     service = get_gis_service()
     try:
         return service.calculate_area(geometry)
+    except (RuntimeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/api/v1/gis/calculate/areas", response_model=List[Optional[AreaResult]], tags=["GIS"])
+async def calculate_areas(
+    data: AreaBatchRequest,
+    user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """Calculate areas of many GeoJSON geometries; null where a geometry is empty or invalid."""
+    service = get_gis_service()
+    try:
+        return service.calculate_areas(data.geometries)
     except RuntimeError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post("/api/v1/gis/fields/recalculate-acreage", response_model=AcreageRecalculationResult, tags=["GIS"])
+async def recalculate_field_acreage(
+    data: AcreageRecalculationRequest,
+    user: AuthenticatedUser = Depends(get_current_active_user)
+):
+    """Recompute field acreage from boundaries (e.g. after importing CLU boundaries)."""
+    service = get_gis_service()
+    return service.recalculate_field_acreage(
+        field_ids=data.field_ids,
+        farm_name=data.farm_name,
+        user_id=user.id
+    )
+
+
 @app.post("/api/v1/gis/validate/boundary", tags=["GIS"])
 async def validate_boundary(
     boundary: str,
@@ -16309,11 +16754,20 @@ async def toggle_layer_visibility(
 @app.get("/api/v1/gis/layers/{layer_id}/features", tags=["GIS Layers"])
 async def get_layer_features(
     layer_id: int,
+    bbox: Optional[str] = Query(None, description="Visible area as west,south,east,north"),
+    zoom: Optional[int] = Query(None, ge=0, le=24, description="Map zoom; simplifies geometries and thins sub-pixel features"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_VIEWPORT_FEATURE_LIMIT),
     user: AuthenticatedUser = Depends(get_current_active_user)
 ):
-    """Get all features in a layer as GeoJSON FeatureCollection."""
+    """
+    Get features in a layer as GeoJSON FeatureCollection.
+
+    With bbox, only features in view are returned (via the spatial index)
+    and truncated reports whether the limit cut the result short.
+    With zoom, geometries are simplified for that zoom level and cached.
+    """
     service = get_gis_layers_service()
-    return service.get_layer_features(layer_id)
+    return service.get_layer_features(layer_id, bbox=_viewport_bbox(bbox), zoom=zoom, limit=limit)
 
 
 @app.post("/api/v1/gis/layers/{layer_id}/features", response_model=FeatureResponse, tags=["GIS Layers"])
@@ -13,6 +13,8 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 
 from services.auth_service import (
+    AuthService,
+    TokenData,
     UserRole,
     get_auth_service
 )
@@ -70,6 +72,41 @@ class AuthenticatedUser(BaseModel):
         return self.role in roles
 
 
+# ============================================================================
+# USER RESOLUTION
+# ============================================================================
+
+def _load_user(user_id: int) -> Optional[AuthenticatedUser]:
+    """Load a user from the database as an AuthenticatedUser."""
+    user = get_user_service().get_user_by_id(user_id)
+
+    if not user:
+        return None
+
+    return AuthenticatedUser(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        role=user.role,
+        is_active=user.is_active
+    )
+
+
+def _cache_user(auth_service: AuthService, token: str, token_data: TokenData) -> Optional[AuthenticatedUser]:
+    """Load the token's user and remember it for later requests."""
+    generation = auth_service.user_cache.generation(token_data.user_id)
+    user = _load_user(token_data.user_id)
+    if user:
+        auth_service.user_cache.put(
+            token, user.id, user,
+            token_expires=token_data.exp,
+            generation=generation
+        )
+    return user
+
+
 # ============================================================================
 # DEPENDENCY FUNCTIONS
 # ============================================================================
@@ -94,27 +131,17 @@ async def get_current_user(
         return None
 
     auth_service = get_auth_service()
+    user = auth_service.user_cache.get(credentials.credentials)
+    if user:
+        return user
+
     token_data = auth_service.validate_access_token(credentials.credentials)
 
     if not token_data:
         return None
 
     # Get full user info from database
-    user_service = get_user_service()
-    user = user_service.get_user_by_id(token_data.user_id)
-
-    if not user:
-        return None
-
-    return AuthenticatedUser(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        role=user.role,
-        is_active=user.is_active
-    )
+    return _cache_user(auth_service, credentials.credentials, token_data)
 
 
 async def get_current_active_user(
@@ -150,25 +177,27 @@ async def get_current_active_user(
         )
 
     auth_service = get_auth_service()
-    token_data = auth_service.validate_access_token(credentials.credentials)
+    user = auth_service.user_cache.get(credentials.credentials)
 
-    if not token_data:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
+    if not user:
+        token_data = auth_service.validate_access_token(credentials.credentials)
 
-    # Get full user info from database
-    user_service = get_user_service()
-    user = user_service.get_user_by_id(token_data.user_id)
+        if not token_data:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
 
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
+        # Get full user info from database
+        user = _cache_user(auth_service, credentials.credentials, token_data)
+
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
 
     if not user.is_active:
         raise HTTPException(
@@ -176,15 +205,7 @@ async def get_current_active_user(
             detail="Account is disabled"
         )
 
-    return AuthenticatedUser(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        role=user.role,
-        is_active=user.is_active
-    )
+    return user
 
 
 def require_role(allowed_roles: List[UserRole]):
@@ -21,6 +21,7 @@ from slowapi.util import get_remote_address
 # Rate limiter for mobile routes
 limiter = Limiter(key_func=get_remote_address)
 
+from database.async_db import run_in_db
 from .auth import (
     get_session_user,
     set_session_cookie,
@@ -232,7 +233,8 @@ async def task_list(
         priority_filter = TaskPriority(priority)
 
     # Get tasks for this user
-    tasks = task_service.list_tasks(
+    tasks = await run_in_db(
+        task_service.list_tasks,
         status=status_filter,
         priority=priority_filter,
         user_id=user["id"],
@@ -273,6 +275,27 @@ async def task_list(
     )
 
 
+def _load_task_detail(task_id: int, user: dict):
+    """
+    Load everything the task detail page needs in one database job.
+
+    Returns None if the task does not exist or the user may not view it.
+    """
+    task_service = get_task_service()
+    task = task_service.get_task_by_id(task_id)
+    if not task or not task_service.can_view_task(task_id, user["id"], user["role"]):
+        return None
+
+    can_edit = task_service.can_edit_task(task_id, user["id"], user["role"])
+
+    time_service = get_time_entry_service()
+    time_entries = time_service.list_entries_for_task(task_id, limit=10)
+    time_summary = time_service.get_task_time_summary(task_id)
+
+    photos = get_photo_service().list_photos_for_task(task_id)
+    return task, can_edit, time_entries, time_summary, photos
+
+
 @router.get("/tasks/{task_id}", response_class=HTMLResponse)
 async def task_detail(
     request: Request,
@@ -292,17 +315,11 @@ async def task_detail(
     if not user:
         return RedirectResponse(url=f"/m/login?next=/m/tasks/{task_id}", status_code=302)
 
-    task_service = get_task_service()
-    task = task_service.get_task_by_id(task_id)
-
-    if not task:
-        # Task not found - redirect to list
-        return RedirectResponse(url="/m/tasks", status_code=302)
-
-    # Check permission
-    can_view = task_service.can_view_task(task_id, user["id"], user["role"])
-    if not can_view:
+    detail = await run_in_db(_load_task_detail, task_id, user)
+    if detail is None:
+        # Task not found or not visible - redirect to list
         return RedirectResponse(url="/m/tasks", status_code=302)
+    task, can_edit, time_entries, time_summary, photos = detail
 
     task_dict = task.model_dump() if hasattr(task, 'model_dump') else task.__dict__
     task_dict["priority_class"] = get_priority_class(task_dict.get("priority", "medium"))
@@ -311,7 +328,6 @@ async def task_detail(
     task_dict["is_overdue"] = is_overdue(task_dict.get("due_date"), task_dict.get("status", ""))
 
     # Determine available actions
-    can_edit = task_service.can_edit_task(task_id, user["id"], user["role"])
     current_status = task_dict.get("status", "todo")
 
     # Available status transitions
@@ -326,20 +342,12 @@ async def task_detail(
     elif current_status == "completed":
         next_statuses = [("in_progress", "Reopen", "btn-warning")]
 
-    # Get time entries for this task
-    time_service = get_time_entry_service()
-    time_entries = time_service.list_entries_for_task(task_id, limit=10)
-    time_summary = time_service.get_task_time_summary(task_id)
-
     # Convert time entries to dicts
     time_entries_data = []
     for entry in time_entries:
         entry_dict = entry.model_dump() if hasattr(entry, 'model_dump') else entry.__dict__
         time_entries_data.append(entry_dict)
 
-    # Get photos for this task
-    photo_service = get_photo_service()
-    photos = photo_service.list_photos_for_task(task_id)
     photos_data = []
     for photo in photos:
         photo_dict = photo.model_dump() if hasattr(photo, 'model_dump') else photo.__dict__
@@ -21,6 +21,7 @@ from datetime import date
 from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel
 
+from database.async_db import DatabaseExecutor, get_db_executor
 from middleware.auth_middleware import get_current_active_user, require_manager, AuthenticatedUser
 from middleware.rate_limiter import limiter, RATE_MODERATE, RATE_RELAXED
 
@@ -696,12 +697,13 @@ async def update_tax_withholding(
 async def get_trial_balance(
     request: Request,
     as_of_date: Optional[date] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get trial balance report. Rate limited: 30/minute."""
     from services.genfin_reports_service import genfin_reports_service
 
-    return genfin_reports_service.get_trial_balance(as_of_date=as_of_date)
+    return await db.run(genfin_reports_service.get_trial_balance, as_of_date=as_of_date)
 
 
 @router.get("/reports/balance-sheet", response_model=BalanceSheetResponse, tags=["Reports"])
@@ -709,12 +711,13 @@ async def get_trial_balance(
 async def get_balance_sheet(
     request: Request,
     as_of_date: Optional[date] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get balance sheet report. Rate limited: 30/minute."""
     from services.genfin_reports_service import genfin_reports_service
 
-    return genfin_reports_service.get_balance_sheet(as_of_date=as_of_date)
+    return await db.run(genfin_reports_service.get_balance_sheet, as_of_date=as_of_date)
 
 
 @router.get("/reports/profit-loss", response_model=ProfitLossResponse, tags=["Reports"])
@@ -723,12 +726,14 @@ async def get_profit_loss(
     request: Request,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get profit and loss statement. Rate limited: 30/minute."""
     from services.genfin_reports_service import genfin_reports_service
 
-    return genfin_reports_service.get_profit_loss(
+    return await db.run(
+        genfin_reports_service.get_profit_loss,
         start_date=start_date,
         end_date=end_date
     )
@@ -740,12 +745,14 @@ async def get_cash_flow_report(
     request: Request,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get cash flow report. Rate limited: 30/minute."""
     from services.genfin_reports_service import genfin_reports_service
 
-    return genfin_reports_service.get_cash_flow(
+    return await db.run(
+        genfin_reports_service.get_cash_flow,
         start_date=start_date,
         end_date=end_date
     )
@@ -756,12 +763,13 @@ async def get_cash_flow_report(
 async def get_ar_aging(
     request: Request,
     as_of_date: Optional[date] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get accounts receivable aging report. Rate limited: 30/minute."""
     from services.genfin_receivables_service import genfin_receivables_service
 
-    return genfin_receivables_service.get_ar_aging(as_of_date=as_of_date)
+    return await db.run(genfin_receivables_service.get_ar_aging, as_of_date=as_of_date)
 
 
 @router.get("/reports/ap-aging", response_model=AgingReportResponse, tags=["Reports"])
@@ -769,12 +777,13 @@ async def get_ar_aging(
 async def get_ap_aging(
     request: Request,
     as_of_date: Optional[date] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get accounts payable aging report. Rate limited: 30/minute."""
     from services.genfin_payables_service import genfin_payables_service
 
-    return genfin_payables_service.get_ap_aging(as_of_date=as_of_date)
+    return await db.run(genfin_payables_service.get_ap_aging, as_of_date=as_of_date)
 
 
 # ============================================================================
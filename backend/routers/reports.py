@@ -9,12 +9,14 @@ Handles:
 - Dashboard export
 """
 
+import io
 from typing import List, Optional, Dict, Any
 from datetime import date, timezone
 
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Request
 from pydantic import BaseModel
 
+from database.async_db import DatabaseExecutor, get_db_executor
 from middleware.auth_middleware import get_current_active_user, AuthenticatedUser
 from middleware.rate_limiter import limiter, RATE_MODERATE
 from services.reporting_service import (
@@ -60,11 +62,12 @@ async def get_operations_report(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     field_id: Optional[int] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get operations report with aggregations. Rate limited: 30/minute."""
     report_service = get_reporting_service()
-    return report_service.get_operations_report(date_from, date_to, field_id)
+    return await db.run(report_service.get_operations_report, date_from, date_to, field_id)
 
 
 @router.get("/reports/financial", response_model=FinancialReport, tags=["Reports"])
@@ -73,11 +76,12 @@ async def get_financial_report(
     request: Request,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get financial analysis report. Rate limited: 30/minute."""
     report_service = get_reporting_service()
-    return report_service.get_financial_report(date_from, date_to)
+    return await db.run(report_service.get_financial_report, date_from, date_to)
 
 
 @router.get("/reports/equipment", response_model=EquipmentReport, tags=["Reports"])
@@ -86,39 +90,43 @@ async def get_equipment_report(
     request: Request,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get equipment utilization report. Rate limited: 30/minute."""
     report_service = get_reporting_service()
-    return report_service.get_equipment_report(date_from, date_to)
+    return await db.run(report_service.get_equipment_report, date_from, date_to)
 
 
 @router.get("/reports/inventory", response_model=InventoryReport, tags=["Reports"])
 async def get_inventory_report(
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get inventory status report."""
     report_service = get_reporting_service()
-    return report_service.get_inventory_report()
+    return await db.run(report_service.get_inventory_report)
 
 
 @router.get("/reports/fields", response_model=FieldPerformanceReport, tags=["Reports"])
 async def get_field_performance_report(
     year: Optional[int] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get field performance report."""
     report_service = get_reporting_service()
-    return report_service.get_field_performance_report(year)
+    return await db.run(report_service.get_field_performance_report, year)
 
 
 @router.get("/reports/dashboard", response_model=DashboardSummary, tags=["Reports"])
 async def get_dashboard_summary(
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get dashboard summary with KPIs."""
     report_service = get_reporting_service()
-    return report_service.get_dashboard_summary()
+    return await db.run(report_service.get_dashboard_summary)
 
 
 # ============================================================================
@@ -135,11 +143,13 @@ async def list_expenses(
     unallocated_only: bool = False,
     limit: int = 100,
     offset: int = 0,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """List expenses with optional filters."""
     cost_service = get_cost_tracking_service()
-    return cost_service.list_expenses(
+    return await db.run(
+        cost_service.list_expenses,
         user_id=user.id,
         category=category,
         vendor=vendor,
@@ -156,11 +166,12 @@ async def list_expenses(
 async def create_expense(
     request: Request,
     expense_data: ExpenseCreate,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Create a new expense. Rate limited: 30/minute."""
     cost_service = get_cost_tracking_service()
-    expense, error = cost_service.create_expense(expense_data, user.id)
+    expense, error = await db.run(cost_service.create_expense, expense_data, user.id)
 
     if error:
         raise HTTPException(status_code=400, detail=error)
@@ -171,11 +182,12 @@ async def create_expense(
 @router.get("/costs/expenses/{expense_id}", response_model=ExpenseWithAllocations, tags=["Cost Tracking"])
 async def get_expense(
     expense_id: int,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get expense with allocations."""
     cost_service = get_cost_tracking_service()
-    expense = cost_service.get_expense_with_allocations(expense_id)
+    expense = await db.run(cost_service.get_expense_with_allocations, expense_id)
 
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
@@ -187,11 +199,12 @@ async def get_expense(
 async def update_expense(
     expense_id: int,
     expense_data: ExpenseUpdate,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Update an expense."""
     cost_service = get_cost_tracking_service()
-    expense, error = cost_service.update_expense(expense_id, expense_data, user.id)
+    expense, error = await db.run(cost_service.update_expense, expense_id, expense_data, user.id)
 
     if error:
         raise HTTPException(status_code=400, detail=error)
@@ -202,11 +215,12 @@ async def update_expense(
 @router.delete("/costs/expenses/{expense_id}", tags=["Cost Tracking"])
 async def delete_expense(
     expense_id: int,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Delete an expense."""
     cost_service = get_cost_tracking_service()
-    success = cost_service.delete_expense(expense_id, user.id)
+    success = await db.run(cost_service.delete_expense, expense_id, user.id)
 
     if not success:
         raise HTTPException(status_code=404, detail="Expense not found or already deleted")
@@ -221,22 +235,24 @@ async def delete_expense(
 @router.get("/costs/expenses/{expense_id}/allocations", response_model=List[AllocationResponse], tags=["Cost Tracking"])
 async def get_expense_allocations(
     expense_id: int,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get allocations for an expense."""
     cost_service = get_cost_tracking_service()
-    return cost_service.get_allocations(expense_id)
+    return await db.run(cost_service.get_allocations, expense_id)
 
 
 @router.post("/costs/expenses/{expense_id}/allocations", response_model=List[AllocationResponse], tags=["Cost Tracking"])
 async def create_allocations(
     expense_id: int,
     allocations: List[AllocationCreate],
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Create allocations for an expense."""
     cost_service = get_cost_tracking_service()
-    result, error = cost_service.set_allocations(expense_id, allocations, user.id)
+    result, error = await db.run(cost_service.set_allocations, expense_id, allocations, user.id)
 
     if error:
         raise HTTPException(status_code=400, detail=error)
@@ -313,38 +329,41 @@ async def auto_categorize_expense(
 async def get_cost_per_acre_report(
     year: Optional[int] = None,
     field_id: Optional[int] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get cost per acre report."""
     from datetime import datetime
     cost_service = get_cost_tracking_service()
     crop_year = year if year else datetime.now(timezone.utc).year
     field_ids = [field_id] if field_id else None
-    return cost_service.get_cost_per_acre_report(crop_year=crop_year, field_ids=field_ids)
+    return await db.run(cost_service.get_cost_per_acre_report, crop_year=crop_year, field_ids=field_ids)
 
 
 @router.get("/costs/reports/by-category", response_model=List[CategoryBreakdown], tags=["Cost Tracking"])
 async def get_costs_by_category(
     year: Optional[int] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get costs broken down by category."""
     from datetime import datetime
     cost_service = get_cost_tracking_service()
     crop_year = year if year else datetime.now(timezone.utc).year
-    return cost_service.get_category_breakdown(crop_year=crop_year)
+    return await db.run(cost_service.get_category_breakdown, crop_year=crop_year)
 
 
 @router.get("/costs/reports/by-crop", response_model=List[CropCostSummary], tags=["Cost Tracking"])
 async def get_costs_by_crop(
     year: Optional[int] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Get costs broken down by crop."""
     from datetime import datetime
     cost_service = get_cost_tracking_service()
     crop_year = year if year else datetime.now(timezone.utc).year
-    return cost_service.get_cost_by_crop(crop_year=crop_year)
+    return await db.run(cost_service.get_cost_by_crop, crop_year=crop_year)
 
 
 @router.get("/costs/categories", tags=["Cost Tracking"])
@@ -362,13 +381,14 @@ async def get_expense_categories(
 @router.post("/costs/import/csv/preview", response_model=ImportPreview, tags=["Cost Tracking"])
 async def preview_csv_import(
     file: UploadFile = File(...),
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Preview CSV import before processing."""
     cost_service = get_cost_tracking_service()
 
     content = await file.read()
-    result = cost_service.preview_csv_import(content.decode('utf-8'), file.filename)
+    result = await db.run(cost_service.preview_csv_import, content.decode('utf-8'), file.filename)
 
     return result
 
@@ -379,35 +399,46 @@ async def import_csv(
     request: Request,
     file: UploadFile = File(...),
     mapping: Optional[ColumnMapping] = None,
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """Import expenses from CSV file. Rate limited: 30/minute."""
+    if mapping is None:
+        raise HTTPException(status_code=400, detail="Column mapping is required")
+
     cost_service = get_cost_tracking_service()
 
-    content = await file.read()
-    result = cost_service.import_csv(
-        content.decode('utf-8'),
-        file.filename,
-        mapping,
-        user.id
-    )
+    # Parse the spooled upload in chunks rather than reading it into memory
+    csv_stream = io.TextIOWrapper(file.file, encoding='utf-8-sig', newline='')
+    try:
+        result = await db.run(
+            cost_service.import_csv_stream,
+            csv_stream,
+            mapping,
+            user.id,
+            file.filename or "upload.csv"
+        )
+    finally:
+        csv_stream.detach()
 
     return result
 
 
 @router.get("/costs/imports", response_model=List[ImportBatchResponse], tags=["Cost Tracking"])
 async def list_import_batches(
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """List import batch history."""
     cost_service = get_cost_tracking_service()
-    return cost_service.list_import_batches()
+    return await db.run(cost_service.list_import_batches)
 
 
 @router.get("/costs/mappings", response_model=List[SavedMappingResponse], tags=["Cost Tracking"])
 async def list_saved_mappings(
-    user: AuthenticatedUser = Depends(get_current_active_user)
+    user: AuthenticatedUser = Depends(get_current_active_user),
+    db: DatabaseExecutor = Depends(get_db_executor)
 ):
     """List saved column mappings."""
     cost_service = get_cost_tracking_service()
-    return cost_service.list_saved_mappings()
+    return await db.run(cost_service.list_saved_mappings)
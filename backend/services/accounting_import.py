@@ -18,15 +18,18 @@ import sqlite3
 import re
 from datetime import datetime, date
 from enum import Enum
-from typing import Optional, List, Tuple, Dict, Any
+from typing import Optional, List, Tuple, Dict, Any, Callable
 
 from pydantic import BaseModel
 
 from services.cost_tracking_service import (
+    IMPORT_BATCH_SIZE,
     ExpenseCategory,
+    ImportProgress,
     ImportStatus,
     get_cost_tracking_service
 )
+from database.db_utils import get_pooled_connection
 
 
 # ============================================================================
@@ -97,7 +100,7 @@ class QBImportPreview(BaseModel):
     expense_rows: int
     skipped_rows: int  # Non-expense transactions
     date_range: Dict[str, str]  # min_date, max_date
-    accounts_found: List[Dict[str, Any]]  # account, count, suggested_category
+    accounts_found: List[Dict[str, Any]]  # account, count, suggested_category, suggestion_source
     unmapped_accounts: List[str]
     sample_transactions: List[Dict[str, Any]]
     warnings: List[str]
@@ -254,7 +257,7 @@ class AccountingImportService:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -385,6 +388,7 @@ class AccountingImportService:
         skipped_count = 0
         dates = []
         sample_transactions = []
+        account_context: Dict[str, List[str]] = {}  # unmapped account -> payee/memo samples
 
         for row in rows:
             trans_type = row.get("type", "").lower()
@@ -406,10 +410,15 @@ class AccountingImportService:
                         "account": account,
                         "count": 0,
                         "total": 0.0,
-                        "suggested_category": suggested.value if suggested else None
+                        "suggested_category": suggested.value if suggested else None,
+                        "suggestion_source": "mapping" if suggested else None
                     }
                 accounts[account]["count"] += 1
                 accounts[account]["total"] += row.get("amount", 0)
+                if accounts[account]["suggested_category"] is None:
+                    context = account_context.setdefault(account, [])
+                    if len(context) < 5:
+                        context.append(" ".join(filter(None, [row.get("name"), row.get("memo")])))
 
             # Track date range
             if row.get("date"):
@@ -419,6 +428,19 @@ class AccountingImportService:
             if len(sample_transactions) < 10:
                 sample_transactions.append(row)
 
+        # Ask the expense categorizer about accounts the mappings missed,
+        # using the account name plus a few of its payees and memos
+        if account_context:
+            names = list(account_context)
+            suggestions = self.cost_service.suggest_categories(
+                [(None, " ".join([name] + account_context[name]), None) for name in names],
+                fallback=False
+            )
+            for name, suggested in zip(names, suggestions):
+                if suggested:
+                    accounts[name]["suggested_category"] = suggested.value
+                    accounts[name]["suggestion_source"] = "categorizer"
+
         # Find unmapped accounts
         unmapped = [
             acc for acc, data in accounts.items()
@@ -740,11 +762,15 @@ class AccountingImportService:
         account_mappings: Dict[str, str],
         source_file: str = "quickbooks_export.csv",
         tax_year: Optional[int] = None,
-        save_mappings: bool = True
+        save_mappings: bool = True,
+        progress: Optional[Callable[[ImportProgress], None]] = None
     ) -> QBImportSummary:
         """
         Import expenses from Accounting Software CSV export.
 
+        Expenses are written IMPORT_BATCH_SIZE at a time through
+        CostTrackingService.write_imported_expenses, in one transaction.
+
         Args:
             csv_content: Raw CSV string
             user_id: User performing import
@@ -752,6 +778,7 @@ class AccountingImportService:
             source_file: Original filename
             tax_year: Tax year (derived from dates if not provided)
             save_mappings: Save mappings for future imports
+            progress: Optional callback given an ImportProgress per batch
 
         Returns:
             QBImportSummary with results
@@ -787,6 +814,35 @@ class AccountingImportService:
             by_category: Dict[str, int] = {}
             by_account: Dict[str, float] = {}
             total_amount = 0.0
+            seen_keys = set()
+            records = []
+            record_accounts = []
+
+            def write_batch(rows_processed: int):
+                nonlocal successful, duplicates, total_amount
+                inserted = self.cost_service.write_imported_expenses(cursor, records, seen_keys)
+                successful += len(inserted)
+                duplicates += len(records) - len(inserted)
+
+                # Track stats
+                for index in inserted:
+                    category_value, amount = records[index][0], records[index][3]
+                    total_amount += amount
+                    by_category[category_value] = by_category.get(category_value, 0) + 1
+                    orig_account = record_accounts[index]
+                    by_account[orig_account] = by_account.get(orig_account, 0) + amount
+                records.clear()
+                record_accounts.clear()
+
+                if progress:
+                    progress(ImportProgress(
+                        batch_id=batch_id,
+                        rows_processed=rows_processed,
+                        total_rows=len(rows),
+                        successful=successful,
+                        failed=failed,
+                        duplicates_skipped=duplicates
+                    ))
 
             # Convert mappings to lowercase for matching
             mappings_lower = {k.lower(): v for k, v in account_mappings.items()}
@@ -843,28 +899,10 @@ class AccountingImportService:
                     reference = row.get("num", "")
                     vendor = row.get("name", "")
 
-                    # Check for duplicates
-                    if reference:
-                        cursor.execute("""
-                            SELECT id FROM expenses
-                            WHERE quickbooks_id = ? AND expense_date = ? AND amount = ?
-                            AND is_active = 1
-                        """, (reference, expense_date.isoformat(), amount))
-                        if cursor.fetchone():
-                            duplicates += 1
-                            continue
-
                     # Derive tax year
                     year = tax_year or expense_date.year
 
-                    # Insert expense
-                    cursor.execute("""
-                        INSERT INTO expenses (
-                            category, vendor, description, amount, expense_date, tax_year,
-                            source_type, source_reference, import_batch_id, quickbooks_id,
-                            notes, created_by_user_id
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
+                    records.append((
                         category.value,
                         vendor or None,
                         row.get("memo") or None,
@@ -878,19 +916,17 @@ class AccountingImportService:
                         f"QB Account: {row.get('account', 'Unknown')}" if row.get('account') else None,
                         user_id
                     ))
-
-                    successful += 1
-                    total_amount += amount
-
-                    # Track stats
-                    by_category[category.value] = by_category.get(category.value, 0) + 1
-                    orig_account = row.get("account", "Unknown")
-                    by_account[orig_account] = by_account.get(orig_account, 0) + amount
+                    record_accounts.append(row.get("account", "Unknown"))
 
                 except Exception as e:
                     errors.append(f"Row {i}: {str(e)}")
                     failed += 1
 
+                if len(records) >= IMPORT_BATCH_SIZE:
+                    write_batch(i)
+
+            write_batch(len(rows))
+
             # Update batch record
             status = ImportStatus.COMPLETED.value
             error_msg = "; ".join(errors[:10]) if errors else None
@@ -4,10 +4,12 @@ Phase 1 of AgTools AI/ML Intelligence Suite (v3.0)
 
 Features:
 - Cloud API integration (Hugging Face Inference API - free tier)
-- Local TensorFlow model inference (when trained model available)
+- Local TensorFlow model inference (when trained model available), batched
+  across concurrent requests by a background worker
 - Training data collection pipeline
 - Integration with existing pest/disease knowledge base
 - Confidence scoring with top-N predictions
+- Read-through result cache keyed by image hash (optionally perceptual hash)
 """
 
 import logging
@@ -16,10 +18,9 @@ import io
 import json
 import base64
 import hashlib
-import sqlite3
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from enum import Enum
 from pathlib import Path
 
@@ -27,6 +28,9 @@ import httpx
 from PIL import Image
 import numpy as np
 
+from database.db_utils import get_pooled_connection
+from services.inference_worker import BatchInferenceWorker, letterbox_image
+
 logger = logging.getLogger(__name__)
 
 # Import existing knowledge base
@@ -134,7 +138,9 @@ class AIImageService:
                  google_api_key: Optional[str] = None,
                  db_path: str = "agtools.db",
                  models_dir: str = "models",
-                 training_data_dir: str = "training_data"):
+                 training_data_dir: str = "training_data",
+                 cache_ttl_hours: Optional[float] = None,
+                 perceptual_cache_distance: Optional[int] = None):
         """
         Initialize AI Image Service
 
@@ -144,9 +150,20 @@ class AIImageService:
             db_path: Path to SQLite database
             models_dir: Directory for local models
             training_data_dir: Directory for training data collection
+            cache_ttl_hours: How long analysis results are reused (0 disables
+                the result cache; default AI_IMAGE_CACHE_TTL_HOURS or 168)
+            perceptual_cache_distance: Max perceptual-hash bit distance for a
+                near-duplicate image to reuse a cached result (None disables;
+                default AI_IMAGE_PHASH_DISTANCE)
         """
         self.hf_api_key = hf_api_key or os.environ.get("HUGGINGFACE_API_KEY", "")
         self.google_api_key = google_api_key or os.environ.get("GOOGLE_VISION_API_KEY", "")
+        if cache_ttl_hours is None:
+            cache_ttl_hours = float(os.environ.get("AI_IMAGE_CACHE_TTL_HOURS", "168"))
+        self.cache_ttl_hours = cache_ttl_hours
+        if perceptual_cache_distance is None and os.environ.get("AI_IMAGE_PHASH_DISTANCE"):
+            perceptual_cache_distance = int(os.environ["AI_IMAGE_PHASH_DISTANCE"])
+        self.perceptual_cache_distance = perceptual_cache_distance
         self.db_path = db_path
         self.models_dir = Path(models_dir)
         self.training_data_dir = Path(training_data_dir)
@@ -161,8 +178,11 @@ class AIImageService:
         # Initialize database tables for training data
         self._init_db()
 
-        # Check for local trained model
+        # Check for local trained model (loaded by the inference worker on first use)
         self.local_model = None
+        self.local_model_path = None
+        self.local_model_version = None
+        self._inference_worker: Optional[BatchInferenceWorker] = None
         self._load_local_model()
 
     def _build_knowledge_base(self):
@@ -197,7 +217,7 @@ class AIImageService:
 
     def _init_db(self):
         """Initialize database tables for AI training data"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         try:
             cursor = conn.cursor()
 
@@ -244,6 +264,23 @@ class AIImageService:
                 )
             """)
 
+            # Analysis results reused for repeat uploads of the same image
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ai_result_cache (
+                    image_hash TEXT NOT NULL,
+                    crop TEXT NOT NULL,
+                    model_version TEXT NOT NULL,
+                    perceptual_hash TEXT,
+                    result_json TEXT NOT NULL,
+                    created_at TIMESTAMP NOT NULL,
+                    PRIMARY KEY (image_hash, crop, model_version)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ai_result_cache_lookup
+                ON ai_result_cache(crop, model_version, created_at)
+            """)
+
             # Model versions table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS ai_models (
@@ -266,43 +303,203 @@ class AIImageService:
             conn.close()
 
     def _load_local_model(self):
-        """Load local TensorFlow model if available"""
+        """
+        Find the most recent local TensorFlow model if available
+
+        Loading TensorFlow is deferred to the inference worker, so service
+        construction (and backend startup) stays fast.
+        """
         # Check for crop-specific models
         model_files = list(self.models_dir.glob("*.h5")) + list(self.models_dir.glob("*.keras"))
 
         if model_files:
+            model_path = sorted(model_files, key=lambda x: x.stat().st_mtime)[-1]
+            self.local_model_path = model_path
+            # A retrained model gets a new version, so its old cached results stop matching
+            self.local_model_version = f"{model_path.name}@{int(model_path.stat().st_mtime)}"
+
+    def _predict_local(self, batch: np.ndarray) -> np.ndarray:
+        """Run the local model on a batch; called on the inference worker thread"""
+        if self.local_model is None:
+            model_path = self.local_model_path
             try:
                 import tensorflow as tf
-                # Load most recent model
-                model_path = sorted(model_files, key=lambda x: x.stat().st_mtime)[-1]
                 self.local_model = tf.keras.models.load_model(str(model_path))
-                self.local_model_path = model_path
                 logger.info(f"Loaded local model: {model_path.name}")
             except Exception as e:
                 logger.warning(f"Could not load local model: {e}")
-                self.local_model = None
+                # Stop routing requests to a model that cannot load
+                if self.local_model_path == model_path:
+                    self.local_model_path = None
+                    self.local_model_version = None
+                raise
+        return self.local_model.predict(batch)
+
+    def _get_inference_worker(self) -> BatchInferenceWorker:
+        """Micro-batching worker for the local model, started on first use"""
+        if self._inference_worker is None:
+            self._inference_worker = BatchInferenceWorker(self._predict_local)
+        return self._inference_worker
+
+    def reload_local_model(self) -> Dict:
+        """
+        Reload the newest local model, e.g. after retraining
+
+        Cached local-model results are dropped.
+
+        Returns:
+            Loaded model version (None if no model) and invalidated entry count
+        """
+        if self._inference_worker is not None:
+            self._inference_worker.stop()
+            self._inference_worker = None
+        self.local_model = None
+        self.local_model_path = None
+        self.local_model_version = None
+        self._load_local_model()
+        invalidated = self.invalidate_result_cache(AIProvider.LOCAL_MODEL)
+        return {"model_version": self.local_model_version, "invalidated": invalidated}
 
     def _hash_image(self, image_bytes: bytes) -> str:
         """Generate hash for image deduplication"""
         return hashlib.sha256(image_bytes).hexdigest()[:16]
 
-    def _preprocess_image(self, image_bytes: bytes, target_size: Tuple[int, int] = (224, 224)) -> Image.Image:
-        """Preprocess image for model input"""
-        image = Image.open(io.BytesIO(image_bytes))
+    def _perceptual_hash(self, image_bytes: bytes) -> Optional[str]:
+        """
+        64-bit difference hash of the image
 
-        # Convert to RGB if needed
-        if image.mode != "RGB":
-            image = image.convert("RGB")
+        Resized or re-compressed copies hash within a few bits of each
+        other. Returns None if the image cannot be decoded.
+        """
+        try:
+            image = Image.open(io.BytesIO(image_bytes))
+            image.draft("L", (64, 64))  # Let JPEG decode at reduced size
+            image = image.convert("L").resize((9, 8), Image.Resampling.LANCZOS)
+        except Exception:
+            return None
+
+        pixels = np.asarray(image, dtype=np.int16)
+        bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+        value = 0
+        for bit in bits:
+            value = (value << 1) | int(bit)
+        return f"{value:016x}"
+
+    def _result_cache_version(self, provider: AIProvider) -> str:
+        """Cache key component naming the model that produced a result"""
+        if provider == AIProvider.LOCAL_MODEL:
+            return f"{AIProvider.LOCAL_MODEL.value}:{self.local_model_version}"
+        return f"{provider.value}:{self.HF_MODELS['plant_disease']}"
+
+    def _get_cached_result(self, image_hash: str, crop: str, model_versions: List[str],
+                           perceptual_hash: Optional[str]) -> Optional[Tuple[ImageAnalysisResult, str]]:
+        """
+        Look up a fresh cached result for this image, or a near-duplicate of it
 
-        # Resize maintaining aspect ratio
-        image.thumbnail(target_size, Image.Resampling.LANCZOS)
+        model_versions lists the models whose results are acceptable, most
+        preferred first. Returns the result, relabelled with image_hash,
+        and the hash of the image it was cached for.
+        """
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=self.cache_ttl_hours)).isoformat()
+        placeholders = ", ".join("?" * len(model_versions))
 
-        # Create square canvas and paste
-        canvas = Image.new("RGB", target_size, (255, 255, 255))
-        offset = ((target_size[0] - image.width) // 2, (target_size[1] - image.height) // 2)
-        canvas.paste(image, offset)
+        conn = get_pooled_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT image_hash, result_json, model_version FROM ai_result_cache
+                WHERE image_hash = ? AND crop = ? AND model_version IN ({placeholders}) AND created_at >= ?
+            """, (image_hash, crop, *model_versions, cutoff))
+            rows = cursor.fetchall()
+            row = min(rows, key=lambda r: model_versions.index(r[2])) if rows else None
+            note = "Returned cached result for this image"
+
+            if row is None and perceptual_hash is not None:
+                cursor.execute(f"""
+                    SELECT image_hash, result_json, perceptual_hash FROM ai_result_cache
+                    WHERE crop = ? AND model_version IN ({placeholders}) AND created_at >= ?
+                      AND perceptual_hash IS NOT NULL
+                """, (crop, *model_versions, cutoff))
+                target = int(perceptual_hash, 16)
+                best_distance = self.perceptual_cache_distance + 1
+                for candidate in cursor.fetchall():
+                    distance = bin(target ^ int(candidate[2], 16)).count("1")
+                    if distance < best_distance:
+                        row, best_distance = candidate, distance
+                if row is not None:
+                    note = f"Returned cached result for near-duplicate image {row[0]}"
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+
+        data = json.loads(row[1])
+        data["provider"] = AIProvider(data["provider"])
+        result = ImageAnalysisResult(**data)
+        # Feedback and training saves belong to this upload, not the cached one
+        result.image_hash = image_hash
+        result.notes = result.notes + [note]
+        return result, row[0]
+
+    def _cache_result(self, image_hash: str, crop: str, perceptual_hash: Optional[str],
+                      result: ImageAnalysisResult):
+        """Store a result for reuse and drop entries past the TTL"""
+        now = datetime.now(timezone.utc)
+        data = asdict(result)
+        data["provider"] = result.provider.value
+
+        conn = get_pooled_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO ai_result_cache
+                (image_hash, crop, model_version, perceptual_hash, result_json, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                image_hash,
+                crop,
+                self._result_cache_version(result.provider),
+                perceptual_hash,
+                json.dumps(data),
+                now.isoformat()
+            ))
+            cursor.execute(
+                "DELETE FROM ai_result_cache WHERE created_at < ?",
+                ((now - timedelta(hours=self.cache_ttl_hours)).isoformat(),)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def invalidate_result_cache(self, provider: Optional[AIProvider] = None) -> int:
+        """
+        Drop cached analysis results
+
+        Args:
+            provider: Only drop results from this provider (all if None)
 
-        return canvas
+        Returns:
+            Number of entries removed
+        """
+        conn = get_pooled_connection(self.db_path)
+        try:
+            cursor = conn.cursor()
+            if provider is None:
+                cursor.execute("DELETE FROM ai_result_cache")
+            else:
+                cursor.execute(
+                    "DELETE FROM ai_result_cache WHERE model_version LIKE ?",
+                    (f"{provider.value}:%",)
+                )
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def _preprocess_image(self, image_bytes: bytes, target_size: Tuple[int, int] = (224, 224)) -> Image.Image:
+        """Preprocess image for model input"""
+        return letterbox_image(image_bytes, target_size)
 
     async def analyze_image(
         self,
@@ -331,8 +528,25 @@ class AIImageService:
         image_hash = self._hash_image(image_bytes)
         notes = []
 
+        # Reuse a stored result for an image this model has already analyzed
+        perceptual_hash = None
+        if self.cache_ttl_hours:
+            if self.perceptual_cache_distance is not None:
+                perceptual_hash = self._perceptual_hash(image_bytes)
+            # A local model that fails falls back to the cloud, so its results count too
+            versions = [self._result_cache_version(AIProvider.HUGGINGFACE)]
+            if use_local_model and self.local_model_path is not None:
+                versions.insert(0, self._result_cache_version(AIProvider.LOCAL_MODEL))
+            hit = self._get_cached_result(image_hash, crop, versions, perceptual_hash)
+            if hit is not None:
+                cached, cached_hash = hit
+                cached.processing_time_ms = int((time.time() - start_time) * 1000)
+                if save_for_training and cached_hash != image_hash:
+                    self._save_prediction(image_hash, cached)
+                return cached
+
         # Try local model first if available and requested
-        if use_local_model and self.local_model is not None:
+        if use_local_model and self.local_model_path is not None:
             try:
                 result = await self._analyze_with_local_model(image_bytes, crop)
                 result.image_hash = image_hash
@@ -340,6 +554,8 @@ class AIImageService:
 
                 if save_for_training:
                     self._save_prediction(image_hash, result)
+                if self.cache_ttl_hours and result.raw_labels:
+                    self._cache_result(image_hash, crop, perceptual_hash, result)
 
                 return result
             except Exception as e:
@@ -360,6 +576,10 @@ class AIImageService:
             result.processing_time_ms = processing_time
             result.notes = notes
 
+            # Empty label lists mean the API call failed quietly; don't keep those
+            if self.cache_ttl_hours and result.raw_labels:
+                self._cache_result(image_hash, crop, perceptual_hash, result)
+
             return result
 
         except Exception as e:
@@ -438,24 +658,23 @@ class AIImageService:
         )
 
     async def _analyze_with_local_model(self, image_bytes: bytes, crop: str) -> ImageAnalysisResult:
-        """Analyze image using local TensorFlow model"""
-
-        # Preprocess image
-        image = self._preprocess_image(image_bytes)
-        image_array = np.array(image) / 255.0
-        image_array = np.expand_dims(image_array, axis=0)
+        """
+        Analyze image using local TensorFlow model
 
-        # Run inference
-        predictions = self.local_model.predict(image_array)
+        Preprocessing and inference run on the batch worker, which groups
+        this image with other requests arriving at the same time.
+        """
+        model_name = self.local_model_path.name
+        predictions = await self._get_inference_worker().submit(image_bytes)
 
         # Get class labels (stored with model or in separate file)
         class_labels = self._get_model_classes()
 
         # Get top predictions
-        top_indices = np.argsort(predictions[0])[-5:][::-1]
+        top_indices = np.argsort(predictions)[-5:][::-1]
         raw_labels = [
             {"label": class_labels[i] if i < len(class_labels) else f"class_{i}",
-             "score": float(predictions[0][i])}
+             "score": float(predictions[i])}
             for i in top_indices
         ]
 
@@ -469,7 +688,7 @@ class AIImageService:
             confidence=max([m["confidence"] for m in mapped]) if mapped else 0.0,
             processing_time_ms=0,
             image_hash="",
-            notes=[f"Used local model: {self.local_model_path.name}"]
+            notes=[f"Used local model: {model_name}"]
         )
 
     def _get_model_classes(self) -> List[str]:
@@ -587,7 +806,7 @@ class AIImageService:
         image.save(image_path, "JPEG", quality=90)
 
         # Save metadata to database
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         try:
             cursor = conn.cursor()
 
@@ -619,7 +838,7 @@ class AIImageService:
 
     def _save_prediction(self, image_hash: str, result: ImageAnalysisResult):
         """Save prediction for model improvement tracking"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         try:
             cursor = conn.cursor()
 
@@ -655,7 +874,7 @@ class AIImageService:
         Returns:
             Success status
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -687,7 +906,7 @@ class AIImageService:
 
     def get_training_stats(self) -> Dict:
         """Get statistics about collected training data"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         try:
             cursor = conn.cursor()
 
@@ -768,7 +987,7 @@ class AIImageService:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         try:
             cursor = conn.cursor()
 
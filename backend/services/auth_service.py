@@ -9,8 +9,11 @@ import os
 import hashlib
 import secrets
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set, Tuple
 from enum import Enum
 
 import logging
@@ -31,6 +34,12 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
+# Authenticated-user cache used by the auth middleware. Invalidation is
+# in-process, so with several workers the TTL bounds how long another
+# worker can serve a stale role or active flag.
+AUTH_CACHE_TTL_SECONDS = int(os.getenv("AGTOOLS_AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AGTOOLS_AUTH_CACHE_SIZE", "1024"))
+
 
 # ============================================================================
 # ENUMS
@@ -109,6 +118,144 @@ class LoginRequest(BaseModel):
     password: str
 
 
+# ============================================================================
+# AUTHENTICATED USER CACHE
+# ============================================================================
+
+class AuthenticatedUserCache:
+    """
+    Bounded LRU cache of access token -> authenticated user.
+
+    Lets the auth middleware skip JWT decoding and the users table lookup
+    for tokens it has already resolved. Entries expire after the TTL or
+    when the token itself expires, whichever comes first, and are dropped
+    by UserService/AuthService when a user's role, active flag or password
+    changes, or the token is logged out.
+
+    Each user has a generation counter that invalidation bumps. A lookup
+    reads the generation before loading the user and passes it to put(), so
+    a load that raced with an invalidation is not cached.
+    """
+
+    def __init__(self, max_entries: int = AUTH_CACHE_MAX_ENTRIES, ttl_seconds: float = AUTH_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # token hash -> (expires_at epoch seconds, user_id, user)
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._by_user: Dict[int, Set[str]] = {}
+        self._generations: Dict[int, int] = {}
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "invalidated": 0}
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._by_user.get(entry[1])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_user[entry[1]]
+
+    def get(self, token: str) -> Optional[Any]:
+        """Cached user for a token, or None on a miss."""
+        if self.max_entries <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry[0] <= time.time():
+                self._discard(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[2]
+
+    def generation(self, user_id: int) -> int:
+        """Current invalidation generation for a user (pass to put())."""
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def put(
+        self,
+        token: str,
+        user_id: int,
+        user: Any,
+        token_expires: Optional[datetime] = None,
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Cache a resolved user for a token.
+
+        Args:
+            token: Access token the user was resolved from
+            user_id: User's database ID
+            user: Value returned by later get() calls
+            token_expires: Token expiry; the entry never outlives it
+            generation: Value of generation(user_id) read before the user was
+                loaded; the entry is skipped if the user was invalidated since
+        """
+        if self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires is not None:
+            expires_at = min(expires_at, token_expires.timestamp())
+        key = self._key(token)
+        with self._lock:
+            if generation is not None and generation != self._generations.get(user_id, 0):
+                return
+            self._discard(key)
+            self._entries[key] = (expires_at, user_id, user)
+            self._by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+                self._stats["evicted"] += 1
+
+    def invalidate_token(self, token: str) -> None:
+        """Drop the cached user for one token (logout)."""
+        key = self._key(token)
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+                self._stats["invalidated"] += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached token for a user (role/active/password change)."""
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            for key in list(self._by_user.get(user_id, ())):
+                self._discard(key)
+                self._stats["invalidated"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for user_id in self._by_user:
+                self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self._entries.clear()
+            self._by_user.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            size = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
 # ============================================================================
 # AUTH SERVICE CLASS
 # ============================================================================
@@ -129,7 +276,7 @@ class AuthService:
             db_connection: Database connection (sqlite3 or similar)
         """
         self.db = db_connection
-        self._users_cache: Dict[int, dict] = {}  # Simple cache
+        self.user_cache = AuthenticatedUserCache()
 
     # ========================================================================
     # PASSWORD METHODS
@@ -381,6 +528,8 @@ class AuthService:
         Returns:
             True if invalidated, False otherwise
         """
+        self.user_cache.invalidate_token(token)
+
         db_conn = conn if conn is not None else self.db
         if not db_conn:
             return False
@@ -419,6 +568,8 @@ class AuthService:
         Returns:
             Number of sessions invalidated
         """
+        self.user_cache.invalidate_user(user_id)
+
         db_conn = conn if conn is not None else self.db
         if not db_conn:
             return 0
@@ -657,6 +808,11 @@ def get_auth_service(db_connection=None) -> AuthService:
     return _auth_service
 
 
+def get_auth_cache_stats() -> Dict[str, Any]:
+    """Hit rate and size of the authenticated-user cache."""
+    return get_auth_service().user_cache.get_stats()
+
+
 def set_auth_db(db_connection) -> None:
     """Set the database connection for the auth service."""
     service = get_auth_service()
@@ -11,7 +11,7 @@ from datetime import datetime, timezone
 from typing import Optional, List, Tuple, Any, Type, TypeVar, Dict, Generic
 from pydantic import BaseModel
 
-from database.db_utils import get_db_connection, DatabaseManager, DEFAULT_DB_PATH
+from database.db_utils import get_db_connection, DatabaseManager, DEFAULT_DB_PATH, get_pooled_connection
 
 
 # Type variables for generic typing
@@ -77,13 +77,13 @@ class BaseService(ABC, Generic[ResponseT]):
 
     def _get_connection(self) -> sqlite3.Connection:
         """
-        Get a database connection.
+        Get a pooled database connection (close() returns it to the pool).
 
         DEPRECATED: Use context managers instead:
             with get_db_connection(self.db_path) as conn:
                 ...
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -20,6 +20,7 @@ from enum import Enum
 from pydantic import BaseModel, Field
 import sqlite3
 import os
+from database.db_utils import get_pooled_connection
 
 try:
     import httpx
@@ -351,7 +352,7 @@ class ClimateService:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -12,9 +12,25 @@ import re
 import sqlite3
 from datetime import datetime, date, timezone
 from enum import Enum
-from typing import Optional, List, Tuple, Dict, Any
+from itertools import islice
+from typing import Optional, List, Tuple, Dict, Any, Callable, Iterable, Set
 
 from pydantic import BaseModel, Field
+from database.db_utils import get_pooled_connection
+
+
+# Rows parsed, categorized and written per step of a streaming import
+IMPORT_BATCH_SIZE = 2000
+
+# (reference, date, amount) triples per duplicate-check query
+DUPLICATE_CHECK_CHUNK = 300
+
+# Column order of the records passed to write_imported_expenses
+IMPORT_EXPENSE_COLUMNS = (
+    "category", "vendor", "description", "amount", "expense_date", "tax_year",
+    "source_type", "source_reference", "import_batch_id", "quickbooks_id",
+    "notes", "created_by_user_id"
+)
 
 
 # ============================================================================
@@ -189,6 +205,16 @@ class ImportResult(BaseModel):
     duplicates_skipped: int
 
 
+class ImportProgress(BaseModel):
+    """Running counts reported after each step of an import"""
+    batch_id: int
+    rows_processed: int
+    total_rows: Optional[int] = None
+    successful: int
+    failed: int
+    duplicates_skipped: int
+
+
 class ImportBatchResponse(BaseModel):
     """Import batch response"""
     id: int
@@ -296,6 +322,18 @@ class CostTrackingService:
         ExpenseCategory.STORAGE: ["storage", "drying", "elevator", "grain bin"],
     }
 
+    # Smart categorizer categories that map onto a different cost category
+    SMART_CATEGORY_MAP = {
+        "drying_storage": ExpenseCategory.STORAGE,
+        "trucking": ExpenseCategory.CUSTOM_HIRE,
+    }
+
+    # Below this confidence the categorizer's guess is ignored
+    SMART_CATEGORY_MIN_CONFIDENCE = 0.3
+
+    # Applied in order on startup; each is idempotent
+    MIGRATIONS = ("006_cost_tracking.sql", "009_expense_import_dedup.sql")
+
     def __init__(self, db_path: str = "agtools.db"):
         """Initialize cost tracking service."""
         self.db_path = db_path
@@ -303,19 +341,21 @@ class CostTrackingService:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
     def _init_database(self) -> None:
         """Initialize database tables if they don't exist."""
-        # Read and execute migration file
+        # Read and execute migration files
         import os
-        migration_path = os.path.join(
-            os.path.dirname(__file__),
-            "..", "..", "database", "migrations", "006_cost_tracking.sql"
-        )
-        if os.path.exists(migration_path):
+        for migration in self.MIGRATIONS:
+            migration_path = os.path.join(
+                os.path.dirname(__file__),
+                "..", "..", "database", "migrations", migration
+            )
+            if not os.path.exists(migration_path):
+                continue
             with open(migration_path, "r") as f:
                 migration_sql = f.read()
             conn = self._get_connection()
@@ -439,7 +479,8 @@ class CostTrackingService:
         mapping: ColumnMapping,
         user_id: int,
         source_file: str = "upload.csv",
-        default_tax_year: Optional[int] = None
+        default_tax_year: Optional[int] = None,
+        progress: Optional[Callable[[ImportProgress], None]] = None
     ) -> ImportResult:
         """
         Import expenses from CSV using provided column mapping.
@@ -449,112 +490,115 @@ class CostTrackingService:
             mapping: Column mapping configuration
             user_id: User performing import
             source_file: Original filename
-            default_tax_year: Tax year if not derivable from date
+            default_tax_year: Year for dates given without one (e.g. "12/31")
+            progress: Optional callback given an ImportProgress per batch
 
         Returns:
             ImportResult with counts and errors
         """
-        if default_tax_year is None:
-            default_tax_year = datetime.now(timezone.utc).year
-
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # Create import batch
-        cursor.execute("""
-            INSERT INTO import_batches (source_file, source_type, user_id, status)
-            VALUES (?, ?, ?, ?)
-        """, (source_file, SourceType.CSV.value, user_id, ImportStatus.PROCESSING.value))
-        batch_id = cursor.lastrowid
-
-        reader = csv.DictReader(io.StringIO(csv_content))
+        return self.import_csv_stream(
+            io.StringIO(csv_content), mapping, user_id, source_file,
+            default_tax_year, progress=progress
+        )
 
-        total = 0
-        successful = 0
-        failed = 0
-        duplicates = 0
-        errors = []
+    def import_csv_stream(
+        self,
+        stream: Iterable[str],
+        mapping: ColumnMapping,
+        user_id: int,
+        source_file: str = "upload.csv",
+        default_tax_year: Optional[int] = None,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        progress: Optional[Callable[[ImportProgress], None]] = None
+    ) -> ImportResult:
+        """
+        Import expenses from a CSV stream, batch_size rows at a time.
 
-        for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
-            total += 1
-            try:
-                # Extract and validate amount
-                amount_str = row.get(mapping.amount, "").strip()
-                amount = self._parse_amount(amount_str)
-                if amount is None or amount <= 0:
-                    errors.append(f"Row {row_num}: Invalid amount '{amount_str}'")
-                    failed += 1
-                    continue
+        Each batch is parsed and validated, categorized in one call,
+        checked for duplicates with one set-based query and inserted with
+        executemany. The whole import is a single transaction.
 
-                # Extract and validate date
-                date_str = row.get(mapping.date, "").strip()
-                expense_date = self._parse_date(date_str)
-                if expense_date is None:
-                    errors.append(f"Row {row_num}: Invalid date '{date_str}'")
-                    failed += 1
-                    continue
+        Args:
+            stream: Text file object (or any iterable of CSV lines)
+            mapping: Column mapping configuration
+            user_id: User performing import
+            source_file: Original filename
+            default_tax_year: Year for dates given without one (e.g. "12/31")
+            batch_size: Rows per batch
+            progress: Optional callback given an ImportProgress per batch
 
-                # Optional fields
-                vendor = row.get(mapping.vendor, "").strip() if mapping.vendor else None
-                description = row.get(mapping.description, "").strip() if mapping.description else None
-                category_hint = row.get(mapping.category, "").strip() if mapping.category else None
-                reference = row.get(mapping.reference, "").strip() if mapping.reference else None
-
-                # Auto-detect category
-                category = self._detect_category(vendor, description, category_hint)
-
-                # Derive tax year from date
-                tax_year = expense_date.year if expense_date else default_tax_year
-
-                # Check for duplicates by reference + date + amount
-                if reference:
-                    cursor.execute("""
-                        SELECT id FROM expenses
-                        WHERE quickbooks_id = ? AND expense_date = ? AND amount = ?
-                        AND is_active = 1
-                    """, (reference, expense_date.isoformat(), amount))
-                    if cursor.fetchone():
-                        duplicates += 1
-                        continue
-
-                # Insert expense
-                cursor.execute("""
-                    INSERT INTO expenses (
-                        category, vendor, description, amount, expense_date, tax_year,
-                        source_type, source_reference, import_batch_id, quickbooks_id,
-                        created_by_user_id
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    category.value,
-                    vendor or None,
-                    description or None,
-                    amount,
-                    expense_date.isoformat(),
-                    tax_year,
-                    SourceType.CSV.value,
-                    source_file,
-                    batch_id,
-                    reference or None,
-                    user_id
-                ))
-                successful += 1
-
-            except Exception as e:
-                errors.append(f"Row {row_num}: {str(e)}")
-                failed += 1
-
-        # Update batch record
-        status = ImportStatus.COMPLETED.value if failed == 0 else ImportStatus.COMPLETED.value
-        error_msg = "; ".join(errors[:10]) if errors else None  # First 10 errors
+        Returns:
+            ImportResult with counts and errors
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
 
-        cursor.execute("""
-            UPDATE import_batches
-            SET total_records = ?, successful = ?, failed = ?, status = ?, error_message = ?
-            WHERE id = ?
-        """, (total, successful, failed, status, error_msg, batch_id))
+            # Create import batch
+            cursor.execute("""
+                INSERT INTO import_batches (source_file, source_type, user_id, status)
+                VALUES (?, ?, ?, ?)
+            """, (source_file, SourceType.CSV.value, user_id, ImportStatus.PROCESSING.value))
+            batch_id = cursor.lastrowid
+
+            rows = enumerate(csv.DictReader(stream), start=2)  # Start at 2 (header is row 1)
+            total = 0
+            successful = 0
+            failed = 0
+            duplicates = 0
+            errors = []
+            seen_keys: Set[Tuple[str, str, float]] = set()
+
+            for chunk in iter(lambda: list(islice(rows, batch_size)), []):
+                total += len(chunk)
+                pending = []
+                for row_num, row in chunk:
+                    parsed = self._parse_import_row(row, mapping, default_tax_year)
+                    if isinstance(parsed, str):
+                        errors.append(f"Row {row_num}: {parsed}")
+                        failed += 1
+                    else:
+                        pending.append(parsed)
+
+                # Auto-detect categories for the whole batch
+                categories = self.suggest_categories([
+                    (vendor, description, category_hint)
+                    for _, _, vendor, description, category_hint, _ in pending
+                ])
+
+                records = [
+                    (
+                        category.value, vendor or None, description or None, amount,
+                        expense_date.isoformat(), expense_date.year, SourceType.CSV.value,
+                        source_file, batch_id, reference or None, None, user_id
+                    )
+                    for (amount, expense_date, vendor, description, _, reference), category
+                    in zip(pending, categories)
+                ]
+                inserted = self.write_imported_expenses(cursor, records, seen_keys)
+                successful += len(inserted)
+                duplicates += len(records) - len(inserted)
+
+                if progress:
+                    progress(ImportProgress(
+                        batch_id=batch_id,
+                        rows_processed=total,
+                        successful=successful,
+                        failed=failed,
+                        duplicates_skipped=duplicates
+                    ))
+
+            # Update batch record
+            error_msg = "; ".join(errors[:10]) if errors else None  # First 10 errors
+            cursor.execute("""
+                UPDATE import_batches
+                SET total_records = ?, successful = ?, failed = ?, status = ?, error_message = ?
+                WHERE id = ?
+            """, (total, successful, failed, ImportStatus.COMPLETED.value, error_msg, batch_id))
 
-        conn.commit()
-        conn.close()
+            conn.commit()
+        finally:
+            conn.close()
 
         return ImportResult(
             batch_id=batch_id,
@@ -565,6 +609,94 @@ class CostTrackingService:
             duplicates_skipped=duplicates
         )
 
+    def _parse_import_row(
+        self,
+        row: Dict[str, str],
+        mapping: ColumnMapping,
+        default_tax_year: Optional[int] = None
+    ):
+        """
+        Validate one CSV row.
+
+        Dates without a year are read as falling in default_tax_year.
+
+        Returns (amount, date, vendor, description, category_hint, reference),
+        or an error message string.
+        """
+        # Extract and validate amount
+        amount_str = (row.get(mapping.amount) or "").strip()
+        amount = self._parse_amount(amount_str)
+        if amount is None or amount <= 0:
+            return f"Invalid amount '{amount_str}'"
+
+        # Extract and validate date
+        date_str = (row.get(mapping.date) or "").strip()
+        expense_date = self._parse_date(date_str)
+        if expense_date is None and date_str and default_tax_year:
+            expense_date = self._parse_date(f"{date_str}/{default_tax_year}")
+        if expense_date is None:
+            return f"Invalid date '{date_str}'"
+
+        # Optional fields
+        vendor = (row.get(mapping.vendor) or "").strip() if mapping.vendor else None
+        description = (row.get(mapping.description) or "").strip() if mapping.description else None
+        category_hint = (row.get(mapping.category) or "").strip() if mapping.category else None
+        reference = (row.get(mapping.reference) or "").strip() if mapping.reference else None
+
+        return amount, expense_date, vendor, description, category_hint, reference
+
+    def write_imported_expenses(
+        self,
+        cursor: sqlite3.Cursor,
+        records: List[Tuple],
+        seen_keys: Set[Tuple[str, str, float]]
+    ) -> List[int]:
+        """
+        Insert a batch of imported expenses, skipping duplicates.
+
+        Records are tuples in IMPORT_EXPENSE_COLUMNS order. A record with a
+        reference is a duplicate when an active expense, or an earlier
+        record of the same import (tracked in seen_keys), has the same
+        reference, date and amount. Existing expenses are looked up with one
+        query per DUPLICATE_CHECK_CHUNK keys against idx_expenses_import_dedup.
+        Runs on the caller's cursor and does not commit.
+
+        Returns:
+            Indexes of the records that were inserted
+        """
+        keys = list(dict.fromkeys(
+            (record[9], record[4], record[3]) for record in records if record[9]
+        ))
+        existing = set()
+        for start in range(0, len(keys), DUPLICATE_CHECK_CHUNK):
+            chunk = keys[start:start + DUPLICATE_CHECK_CHUNK]
+            cursor.execute(f"""
+                WITH import_keys (quickbooks_id, expense_date, amount) AS (
+                    VALUES {', '.join(['(?, ?, ?)'] * len(chunk))}
+                )
+                SELECT e.quickbooks_id, e.expense_date, e.amount
+                FROM import_keys k
+                JOIN expenses e ON e.quickbooks_id = k.quickbooks_id
+                    AND e.expense_date = k.expense_date AND e.amount = k.amount
+                WHERE e.is_active = 1
+            """, [value for key in chunk for value in key])
+            existing.update((row[0], row[1], row[2]) for row in cursor.fetchall())
+
+        inserted = []
+        for i, record in enumerate(records):
+            if record[9]:
+                key = (record[9], record[4], record[3])
+                if key in existing or key in seen_keys:
+                    continue
+                seen_keys.add(key)
+            inserted.append(i)
+
+        cursor.executemany(f"""
+            INSERT INTO expenses ({', '.join(IMPORT_EXPENSE_COLUMNS)})
+            VALUES ({', '.join('?' * len(IMPORT_EXPENSE_COLUMNS))})
+        """, [records[i] for i in inserted])
+        return inserted
+
     def _parse_amount(self, value: str) -> Optional[float]:
         """Parse amount from various formats."""
         if not value:
@@ -602,6 +734,51 @@ class CostTrackingService:
                 continue
         return None
 
+    def suggest_categories(
+        self,
+        rows: List[Tuple[Optional[str], Optional[str], Optional[str]]],
+        fallback: bool = True
+    ) -> List[Optional[ExpenseCategory]]:
+        """
+        Categorize many (vendor, description, category_hint) rows at once.
+
+        A hint that already names a category wins. Other rows go through one
+        ExpenseCategorizationService.categorize_batch call; confident
+        predictions that map onto a cost category are used, the rest fall
+        back to keyword detection (or None when fallback is False).
+        """
+        from services.expense_categorization_service import get_expense_categorization_service
+
+        known = {c.value for c in ExpenseCategory}
+        suggestions: List[Optional[ExpenseCategory]] = [None] * len(rows)
+        to_categorize = []
+        for i, (vendor, description, hint) in enumerate(rows):
+            hint_value = (hint or "").strip().lower().replace(" ", "_")
+            if hint_value in known:
+                suggestions[i] = ExpenseCategory(hint_value)
+            else:
+                to_categorize.append(i)
+
+        if to_categorize:
+            results = get_expense_categorization_service().categorize_batch([
+                {
+                    "description": " ".join(filter(None, [rows[i][1], rows[i][2]])),
+                    "vendor": rows[i][0]
+                }
+                for i in to_categorize
+            ])
+            for i, result in zip(to_categorize, results):
+                predicted = result.predicted_category.value
+                if result.confidence >= self.SMART_CATEGORY_MIN_CONFIDENCE and predicted != "other":
+                    if predicted in known:
+                        suggestions[i] = ExpenseCategory(predicted)
+                    else:
+                        suggestions[i] = self.SMART_CATEGORY_MAP.get(predicted)
+                if suggestions[i] is None and fallback:
+                    suggestions[i] = self._detect_category(*rows[i])
+
+        return suggestions
+
     def _detect_category(
         self,
         vendor: Optional[str],
@@ -16,6 +16,7 @@ from typing import Optional, List, Dict, Any
 import sqlite3
 
 from pydantic import BaseModel
+from database.db_utils import get_pooled_connection
 
 
 # ============================================================================
@@ -173,7 +174,7 @@ class CropCostAnalysisService:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
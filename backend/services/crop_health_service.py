@@ -23,6 +23,7 @@ from pathlib import Path
 
 import numpy as np
 from PIL import Image
+from database.db_utils import get_pooled_connection
 
 logger = logging.getLogger(__name__)
 
@@ -188,7 +189,7 @@ class CropHealthService:
 
     def _init_db(self):
         """Initialize database tables for crop health data"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         # Field health assessments
@@ -674,7 +675,7 @@ class CropHealthService:
 
     def _save_assessment(self, report: FieldHealthReport, image_bytes: bytes):
         """Save assessment to database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         # Save image
@@ -748,7 +749,7 @@ class CropHealthService:
 
     def get_field_health_score(self, field_id: int) -> Optional[Dict]:
         """Get current health score for a specific field."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -790,7 +791,7 @@ class CropHealthService:
 
     def get_health_summary(self) -> Dict:
         """Get health summary across all fields."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         # Get latest health data per field
@@ -857,7 +858,7 @@ class CropHealthService:
 
     def get_field_history(self, field_id: int, limit: int = 10) -> List[Dict]:
         """Get health assessment history for a field"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -887,7 +888,7 @@ class CropHealthService:
 
     def get_health_trends(self, field_id: int, crop_year: Optional[int] = None) -> Dict:
         """Get health trends for a field over time"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         if crop_year:
@@ -33,6 +33,37 @@ except ImportError:
         SOYBEAN_DISEASES = []
 
 
+from services.symptom_index import SymptomIndex
+
+
+# Symptom keyword mapping for diseases
+DISEASE_SYMPTOM_KEYWORDS = {
+    "leaf_spots": ["spot", "lesion", "blotch"],
+    "yellowing": ["yellow", "chlorosis"],
+    "tan_lesions": ["tan", "brown", "necrotic"],
+    "gray_lesions": ["gray", "grey"],
+    "rectangular_lesions": ["rectangular", "parallel"],
+    "circular_spots": ["circular", "round", "oval"],
+    "pustules": ["pustule", "rust", "orange", "reddish"],
+    "black_specks": ["black", "tar spot", "stromata"],
+    "white_mold": ["white", "cottony", "fluffy"],
+    "root_rot": ["root rot", "brown roots", "rotted"],
+    "wilting": ["wilt", "wilted", "drooping"],
+    "stem_discoloration": ["stem", "stalk", "vascular", "brown pith"],
+    "ear_rot": ["ear rot", "mold on ear", "kernel mold"],
+    "defoliation": ["defoliation", "leaf death", "premature death"],
+}
+
+_DISEASE_TEXT_FIELDS = ("symptoms", "description")
+
+# Built once at import; keyed like the crop argument of identify_by_symptoms
+DISEASE_INDEXES = {
+    "corn": SymptomIndex(CORN_DISEASES, _DISEASE_TEXT_FIELDS, DISEASE_SYMPTOM_KEYWORDS),
+    "soybean": SymptomIndex(SOYBEAN_DISEASES, _DISEASE_TEXT_FIELDS, DISEASE_SYMPTOM_KEYWORDS),
+    "all": SymptomIndex(CORN_DISEASES + SOYBEAN_DISEASES, _DISEASE_TEXT_FIELDS, DISEASE_SYMPTOM_KEYWORDS),
+}
+
+
 class DiseaseIdentifier:
     """Professional disease identification system"""
 
@@ -60,117 +91,35 @@ class DiseaseIdentifier:
             List of disease matches with confidence scores
         """
 
-        # Get disease database for crop
-        if crop.lower() == "corn":
-            disease_database = self.corn_diseases
-        elif crop.lower() == "soybean":
-            disease_database = self.soybean_diseases
-        else:
-            disease_database = self.corn_diseases + self.soybean_diseases
-
-        # Score each disease
-        matches = []
-
-        for idx, disease in enumerate(disease_database):
-            confidence = self._calculate_confidence(
-                disease=disease,
-                symptoms=symptoms,
-                growth_stage=growth_stage,
-                weather_conditions=weather_conditions
-            )
-
-            if confidence > 0.2:
-                matches.append({
-                    "id": idx,
-                    "common_name": disease["common_name"],
-                    "scientific_name": disease["scientific_name"],
-                    "confidence": round(confidence, 3),
-                    "description": disease["description"],
-                    "symptoms": disease["symptoms"],
-                    "favorable_conditions": disease["favorable_conditions"],
-                    "management": disease["management"]
-                })
-
-        # Sort by confidence
-        matches.sort(key=lambda x: x["confidence"], reverse=True)
-
-        return matches[:5]
-
-    def _calculate_confidence(
-        self,
-        disease: Dict,
-        symptoms: List[str],
-        growth_stage: str,
-        weather_conditions: Optional[str]
-    ) -> float:
-        """Calculate confidence score for disease match"""
-
-        confidence = 0.0
-
-        # Symptom matching (60% weight)
-        symptom_score = self._match_symptoms(disease, symptoms)
-        confidence += symptom_score * 0.6
-
-        # Weather/environmental conditions (30% weight)
-        if weather_conditions:
-            conditions_score = self._match_conditions(disease, weather_conditions)
-            confidence += conditions_score * 0.3
-        else:
-            # If no weather info, give base score
-            confidence += 0.15
-
-        # Timing (10% weight)
-        timing_score = self._match_timing(disease, growth_stage)
-        confidence += timing_score * 0.1
-
-        return min(confidence, 1.0)
-
-    def _match_symptoms(self, disease: Dict, symptoms: List[str]) -> float:
-        """Match symptoms against disease presentation"""
-
-        if not symptoms:
-            return 0.0
-
-        disease_symptoms = disease.get("symptoms", "").lower()
-        disease_description = disease.get("description", "").lower()
-        combined_text = disease_symptoms + " " + disease_description
-
-        matches = 0
-        total_symptoms = len(symptoms)
-
-        # Symptom keyword mapping for diseases
-        symptom_keywords = {
-            "leaf_spots": ["spot", "lesion", "blotch"],
-            "yellowing": ["yellow", "chlorosis"],
-            "tan_lesions": ["tan", "brown", "necrotic"],
-            "gray_lesions": ["gray", "grey"],
-            "rectangular_lesions": ["rectangular", "parallel"],
-            "circular_spots": ["circular", "round", "oval"],
-            "pustules": ["pustule", "rust", "orange", "reddish"],
-            "black_specks": ["black", "tar spot", "stromata"],
-            "white_mold": ["white", "cottony", "fluffy"],
-            "root_rot": ["root rot", "brown roots", "rotted"],
-            "wilting": ["wilt", "wilted", "drooping"],
-            "stem_discoloration": ["stem", "stalk", "vascular", "brown pith"],
-            "ear_rot": ["ear rot", "mold on ear", "kernel mold"],
-            "defoliation": ["defoliation", "leaf death", "premature death"],
-        }
-
-        for symptom in symptoms:
-            symptom_lower = symptom.lower()
+        # Get disease index for crop
+        index = DISEASE_INDEXES.get(crop.lower(), DISEASE_INDEXES["all"])
 
-            # Direct match
-            if symptom_lower in combined_text:
-                matches += 1
-                continue
+        # Symptom matching (60% weight), weather (30%) and timing (10%)
+        def context_terms(disease: Dict):
+            if weather_conditions:
+                conditions_term = self._match_conditions(disease, weather_conditions) * 0.3
+            else:
+                # If no weather info, give base score
+                conditions_term = 0.15
+            return (conditions_term, self._match_timing(disease, growth_stage) * 0.1)
 
-            # Keyword match
-            if symptom_lower in symptom_keywords:
-                keywords = symptom_keywords[symptom_lower]
-                if any(keyword in combined_text for keyword in keywords):
-                    matches += 0.8
+        context_key = (growth_stage.lower(), weather_conditions.lower() if weather_conditions else None)
 
-        return matches / total_symptoms if total_symptoms > 0 else 0.0
+        matches = []
+        for idx, confidence in index.top_matches(symptoms, 0.6, context_key, context_terms):
+            disease = index.entries[idx]
+            matches.append({
+                "id": idx,
+                "common_name": disease["common_name"],
+                "scientific_name": disease["scientific_name"],
+                "confidence": confidence,
+                "description": disease["description"],
+                "symptoms": disease["symptoms"],
+                "favorable_conditions": disease["favorable_conditions"],
+                "management": disease["management"]
+            })
+
+        return matches
 
     def _match_conditions(self, disease: Dict, weather_conditions: str) -> float:
         """Match weather conditions to disease-favorable conditions"""
@@ -0,0 +1,625 @@
+"""
+Domain Store for AgTools
+SQLite persistence for the dataclass-based domain services.
+
+GrainStorageService, FarmIntelligenceService and the other planning
+services keep their records as dataclasses in dicts and lists. A
+DomainStore gives each of those collections its own table (with indexed
+columns for the attributes services filter on), while EntityMap and
+EntityList keep the dict and list interface the services already use.
+
+- Write-through cache: each row's JSON is cached per process. Every row
+  carries a version that is bumped on each write, and reads check it,
+  so a worker only fetches rows another worker changed. Every read
+  decodes its own copy, so in-place edits never reach other readers
+  before they are written.
+- Units of work: a service method decorated with @unit_of_work runs in
+  one BEGIN IMMEDIATE transaction. Entities it reads are re-encoded on
+  exit and written back if they changed, so dataclasses can still be
+  edited in place; concurrent writers in other processes are serialized.
+- Sequences: next_id() replaces the services' per-process _counters,
+  and migrate_counters() starts each sequence past the ids already stored.
+
+AgTools v6.16.0
+"""
+
+import dataclasses
+import functools
+import json
+import re
+import sqlite3
+import threading
+import typing
+import uuid
+from collections import abc
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from database.db_utils import get_db_connection, DEFAULT_DB_PATH
+
+T = TypeVar("T")
+
+# Keys per lookup query (below SQLite's bound parameter limit)
+LOOKUP_BATCH = 500
+
+# Table of id sequences shared by every store in a database
+SEQUENCE_TABLE = "domain_sequences"
+
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+# Placeholder for rows whose cached entity is out of date
+_STALE = object()
+
+
+class StaleEntityError(RuntimeError):
+    """An entity changed in the database after this unit of work read it"""
+
+
+# ============================================================================
+# ENCODING
+# ============================================================================
+
+def encode(value: Any) -> Any:
+    """JSON-ready form of a dataclass, enum, date or container (recursively)."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: encode(getattr(value, f.name)) for f in dataclasses.fields(value)}
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(k.value if isinstance(k, Enum) else k): encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [encode(v) for v in value]
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _field_types(cls: type) -> Tuple[Tuple[str, Any, Any], ...]:
+    """(name, annotation, default factory) for each dataclass field"""
+    hints = typing.get_type_hints(cls)
+    result = []
+    for f in dataclasses.fields(cls):
+        if f.default is not dataclasses.MISSING:
+            default = functools.partial(lambda d: d, f.default)
+        elif f.default_factory is not dataclasses.MISSING:
+            default = f.default_factory
+        else:
+            default = None
+        result.append((f.name, hints.get(f.name, Any), default))
+    return tuple(result)
+
+
+def decode(annotation: Any, value: Any) -> Any:
+    """Rebuild a value encoded by encode() from its type annotation."""
+    if value is None or annotation is Any:
+        return value
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is typing.Union:
+        options = [a for a in args if a is not type(None)]
+        return decode(options[0], value) if len(options) == 1 else value
+    if origin in (list, set, tuple, abc.Sequence) or annotation in (list, List):
+        item = args[0] if args else Any
+        items = [decode(item, v) for v in value]
+        return tuple(items) if origin is tuple else set(items) if origin is set else items
+    if origin is dict or annotation in (dict, Dict):
+        key_type, item = args if args else (Any, Any)
+        return {decode(key_type, k): decode(item, v) for k, v in value.items()}
+
+    if isinstance(annotation, type):
+        if dataclasses.is_dataclass(annotation):
+            obj = annotation.__new__(annotation)
+            for name, field_type, default in _field_types(annotation):
+                if name in value:
+                    setattr(obj, name, decode(field_type, value[name]))
+                else:
+                    setattr(obj, name, default() if default else None)  # Added since stored
+            return obj
+        if issubclass(annotation, Enum):
+            return annotation(value)
+        if issubclass(annotation, datetime):
+            return datetime.fromisoformat(value)
+        if issubclass(annotation, date):
+            # A datetime assigned to a date field keeps its time
+            return datetime.fromisoformat(value) if "T" in value else date.fromisoformat(value)
+    return value
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(encode(value), separators=(",", ":"))
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class _UnitOfWork:
+    """Connection and entities read by one thread's unit of work"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.depth = 1
+        # (collection, key) -> (entity, version, encoded JSON when read)
+        self.tracked: Dict[Tuple["_Collection", str], Tuple[Any, int, str]] = {}
+
+
+class DomainStore:
+    """
+    SQLite storage for one domain service's collections.
+
+    Tables are named "<namespace>_<collection>"; each holds an entity's
+    key, version and JSON, plus any indexed attribute columns.
+    """
+
+    def __init__(self, namespace: str, db_path: Optional[str] = None):
+        if not _IDENTIFIER.match(namespace):
+            raise ValueError(f"Invalid store namespace: {namespace}")
+        self.namespace = namespace
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self._collections: List[_Collection] = []
+        self._local = threading.local()
+
+        with get_db_connection(self.db_path) as conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {SEQUENCE_TABLE} (
+                    namespace TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    value INTEGER NOT NULL,
+                    PRIMARY KEY (namespace, name)
+                ) WITHOUT ROWID
+            """)
+            conn.commit()
+
+    def map(self, name: str, entity_type: Any = None, indexes: Sequence[str] = ()) -> "EntityMap":
+        """A dict-like collection keyed by string id."""
+        return self._register(EntityMap(self, name, entity_type, indexes))
+
+    def list(self, name: str, entity_type: Any = None, indexes: Sequence[str] = ()) -> "EntityList":
+        """A list-like collection kept in insertion order."""
+        return self._register(EntityList(self, name, entity_type, indexes))
+
+    def _register(self, collection: "_Collection") -> Any:
+        with get_db_connection(self.db_path) as conn:
+            collection.create(conn)
+            conn.commit()
+        self._collections.append(collection)
+        return collection
+
+    # ------------------------------------------------------------------------
+    # Units of work
+    # ------------------------------------------------------------------------
+
+    @property
+    def _uow(self) -> Optional[_UnitOfWork]:
+        return getattr(self._local, "uow", None)
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Run a block in one write transaction.
+
+        Entities read inside the block are written back on exit if they
+        were modified in place. Nested blocks join the outer one. On an
+        exception the transaction is rolled back and entities it touched
+        are dropped from the cache.
+        """
+        uow = self._uow
+        if uow is not None:
+            uow.depth += 1
+            try:
+                yield
+            finally:
+                uow.depth -= 1
+            return
+
+        with get_db_connection(self.db_path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            uow = self._local.uow = _UnitOfWork(conn)
+            try:
+                yield
+                self._flush(uow)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                for collection, key in uow.tracked:
+                    collection._cache.pop(key, None)
+                raise
+            finally:
+                self._local.uow = None
+
+    def _flush(self, uow: _UnitOfWork) -> None:
+        """Write back tracked entities whose encoding changed."""
+        for (collection, key), (entity, version, original) in uow.tracked.items():
+            encoded = _dumps(entity)
+            if encoded != original:
+                collection._write(uow.conn, key, entity, encoded, expected_version=version)
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """The unit of work's connection, or a pooled one committed on exit."""
+        uow = self._uow
+        if uow is not None:
+            yield uow.conn
+            return
+        with get_db_connection(self.db_path) as conn:
+            yield conn
+            conn.commit()
+
+    # ------------------------------------------------------------------------
+    # Sequences
+    # ------------------------------------------------------------------------
+
+    def next_id(self, sequence: str) -> int:
+        """Next value of a named sequence, shared by every worker."""
+        with self._connection() as conn:
+            row = conn.execute(f"""
+                INSERT INTO {SEQUENCE_TABLE} (namespace, name, value) VALUES (?, ?, 1)
+                ON CONFLICT (namespace, name) DO UPDATE SET value = value + 1
+                RETURNING value
+            """, (self.namespace, sequence)).fetchone()
+        return row[0]
+
+    def migrate_counters(self, counters: Dict[str, Tuple["_Collection", str]]) -> None:
+        """
+        Move per-process ID counters onto database sequences.
+
+        Each sequence is raised to at least the highest number used by
+        ids like "<PREFIX>-0042" already in its collection, so ids carry
+        on from stored data (including data written before sequences).
+
+        Args:
+            counters: sequence name -> (collection, id prefix) mapping
+        """
+        with self.unit_of_work():
+            conn = self._uow.conn
+            for sequence, (collection, prefix) in counters.items():
+                stem = f"{prefix}-"
+                highest = conn.execute(f"""
+                    SELECT MAX(CAST(substr(key, ?) AS INTEGER)) FROM {collection.table}
+                    WHERE substr(key, 1, ?) = ?
+                """, (len(stem) + 1, len(stem), stem)).fetchone()[0] or 0
+                conn.execute(f"""
+                    INSERT INTO {SEQUENCE_TABLE} (namespace, name, value) VALUES (?, ?, ?)
+                    ON CONFLICT (namespace, name) DO UPDATE SET value = MAX(value, excluded.value)
+                """, (self.namespace, sequence, highest))
+
+
+# ============================================================================
+# COLLECTIONS
+# ============================================================================
+
+class _Collection:
+    """Table, cache and row access shared by EntityMap and EntityList"""
+
+    def __init__(self, store: DomainStore, name: str, entity_type: Any, indexes: Sequence[str]):
+        for identifier in (name, *indexes):
+            if not _IDENTIFIER.match(identifier):
+                raise ValueError(f"Invalid collection or index name: {identifier}")
+        self.store = store
+        self.name = name
+        self.table = f"{store.namespace}_{name}"
+        self.entity_type = entity_type
+        self.indexes = tuple(indexes)
+        # key -> (version, JSON); shared by threads, validated on every read
+        self._cache: Dict[str, Tuple[int, str]] = {}
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __eq__(self, other: Any) -> bool:
+        return self is other
+
+    def create(self, conn: sqlite3.Connection) -> None:
+        columns = "".join(f", {column}" for column in self.indexes)
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                updated_at TEXT{columns}
+            )
+        """)
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")}
+        for column in self.indexes:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {self.table} ADD COLUMN {column}")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_{column} ON {self.table}({column})")
+
+    # ------------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------------
+
+    def _track(self, key: str, version: int, entity: Any, encoded: Optional[str] = None) -> Any:
+        uow = self.store._uow
+        if uow is not None and (self, key) not in uow.tracked:
+            uow.tracked[(self, key)] = (entity, version, encoded if encoded is not None else _dumps(entity))
+        return entity
+
+    def _decode(self, data: str) -> Any:
+        """A fresh entity from stored JSON; never shared between reads"""
+        return decode(self.entity_type or Any, json.loads(data))
+
+    def _tracked(self, key: str) -> Tuple[bool, Any]:
+        uow = self.store._uow
+        if uow is not None and (self, key) in uow.tracked:
+            return True, uow.tracked[(self, key)][0]
+        return False, None
+
+    def _load(self, conn: sqlite3.Connection, keys: Optional[List[str]] = None,
+              where: str = "", params: Sequence[Any] = ()) -> List[Tuple[str, Any]]:
+        """
+        (key, entity) pairs in insertion order, fetching data only for rows
+        whose version differs from the cached one.
+        """
+        if keys is not None:
+            versions = []
+            for i in range(0, len(keys), LOOKUP_BATCH):
+                batch = keys[i:i + LOOKUP_BATCH]
+                versions.extend(conn.execute(
+                    f"SELECT key, version, rowid FROM {self.table} WHERE key IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall())
+            versions.sort(key=lambda row: row[2])
+        else:
+            versions = conn.execute(
+                f"SELECT key, version FROM {self.table} {where} ORDER BY rowid", params
+            ).fetchall()
+
+        result: List[Tuple[str, Any]] = []
+        stale = []
+        for row in versions:
+            key, version = row[0], row[1]
+            found, entity = self._tracked(key)
+            if found:
+                result.append((key, entity))
+                continue
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == version:
+                result.append((key, self._track(key, version, self._decode(cached[1]), cached[1])))
+            else:
+                stale.append(key)
+                result.append((key, _STALE))
+
+        if not stale:
+            return result
+        loaded = {}
+        for i in range(0, len(stale), LOOKUP_BATCH):
+            batch = stale[i:i + LOOKUP_BATCH]
+            for key, version, data in conn.execute(
+                f"SELECT key, version, data FROM {self.table} WHERE key IN ({','.join('?' * len(batch))})",
+                batch
+            ):
+                self._cache[key] = (version, data)
+                loaded[key] = self._track(key, version, self._decode(data), data)
+        # Rows deleted by another writer between the two queries are left out
+        return [
+            (key, loaded[key] if entity is _STALE else entity)
+            for key, entity in result
+            if entity is not _STALE or key in loaded
+        ]
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        found, entity = self._tracked(key)
+        if found:
+            return True, entity
+        with self.store._connection() as conn:
+            cached = self._cache.get(key)
+            row = conn.execute(
+                f"SELECT version, CASE WHEN version = ? THEN NULL ELSE data END FROM {self.table} WHERE key = ?",
+                (cached[0] if cached else -1, key)
+            ).fetchone()
+        if row is None:
+            self._cache.pop(key, None)
+            return False, None
+        version, data = row
+        if data is None:
+            data = cached[1]
+        else:
+            self._cache[key] = (version, data)
+        return True, self._track(key, version, self._decode(data), data)
+
+    # ------------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------------
+
+    def _index_values(self, entity: Any) -> List[Any]:
+        values = []
+        for column in self.indexes:
+            value = getattr(entity, column, None) if not isinstance(entity, dict) else entity.get(column)
+            value = encode(value)
+            values.append(value if value is None or isinstance(value, (str, int, float)) else json.dumps(value))
+        return values
+
+    def _write(self, conn: sqlite3.Connection, key: str, entity: Any, encoded: Optional[str] = None,
+               expected_version: Optional[int] = None) -> int:
+        """Insert or update one row, returning its new version."""
+        encoded = encoded if encoded is not None else _dumps(entity)
+        updated_at = datetime.now(timezone.utc).isoformat()
+        index_values = self._index_values(entity)
+        assignments = "".join(f", {column} = excluded.{column}" for column in self.indexes)
+        columns = "".join(f", {column}" for column in self.indexes)
+
+        if expected_version is None:
+            row = conn.execute(f"""
+                INSERT INTO {self.table} (key, version, data, updated_at{columns})
+                VALUES (?, 1, ?, ?{', ?' * len(self.indexes)})
+                ON CONFLICT (key) DO UPDATE SET
+                    version = version + 1, data = excluded.data, updated_at = excluded.updated_at{assignments}
+                RETURNING version
+            """, (key, encoded, updated_at, *index_values)).fetchone()
+            version = row[0]
+        else:
+            index_assignments = "".join(f", {column} = ?" for column in self.indexes)
+            cursor = conn.execute(f"""
+                UPDATE {self.table} SET version = version + 1, data = ?, updated_at = ?{index_assignments}
+                WHERE key = ? AND version = ?
+            """, (encoded, updated_at, *index_values, key, expected_version))
+            if cursor.rowcount == 0:
+                raise StaleEntityError(f"{self.table} {key} was changed by another writer")
+            version = expected_version + 1
+
+        self._cache[key] = (version, encoded)
+        uow = self.store._uow
+        if uow is not None:
+            uow.tracked[(self, key)] = (entity, version, encoded)
+        return version
+
+    def _put(self, key: str, entity: Any) -> None:
+        with self.store._connection() as conn:
+            self._write(conn, key, entity)
+
+    def _delete(self, key: str) -> bool:
+        with self.store._connection() as conn:
+            deleted = conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,)).rowcount
+        self._cache.pop(key, None)
+        uow = self.store._uow
+        if uow is not None:
+            uow.tracked.pop((self, key), None)
+        return bool(deleted)
+
+    def _where(self, criteria: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for column, value in criteria.items():
+            if column not in self.indexes:
+                raise KeyError(f"{self.table} has no index on {column}")
+            if value is None:
+                clauses.append(f"{column} IS NULL")
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(encode(value))
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _count(self) -> int:
+        with self.store._connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def find(self, **criteria: Any) -> List[Any]:
+        """Entities whose indexed attributes equal the given values (enums and dates as stored)."""
+        where, params = self._where(criteria)
+        with self.store._connection() as conn:
+            return [entity for _, entity in self._load(conn, where=where, params=params)]
+
+    def clear(self) -> None:
+        """Delete every entity in the collection."""
+        with self.store._connection() as conn:
+            conn.execute(f"DELETE FROM {self.table}")
+        self._cache.clear()
+        uow = self.store._uow
+        if uow is not None:
+            for tracked in [t for t in uow.tracked if t[0] is self]:
+                del uow.tracked[tracked]
+
+
+class EntityMap(_Collection, MutableMapping):
+    """
+    Dict-like view of a collection, keyed by string id.
+
+    Values may be dataclasses (decoded back to entity_type), plain JSON
+    values, or None.
+    """
+
+    def __getitem__(self, key: str) -> Any:
+        found, entity = self._get(key)
+        if not found:
+            raise KeyError(key)
+        return entity
+
+    def __setitem__(self, key: str, entity: Any) -> None:
+        self._put(key, entity)
+
+    def __delitem__(self, key: str) -> None:
+        if not self._delete(key):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        if self._tracked(key)[0]:
+            return True
+        with self.store._connection() as conn:
+            return conn.execute(f"SELECT 1 FROM {self.table} WHERE key = ?", (key,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self.store._connection() as conn:
+            keys = [row[0] for row in conn.execute(f"SELECT key FROM {self.table} ORDER BY rowid")]
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return self._count()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        found, entity = self._get(key)
+        return entity if found else default
+
+    def items(self) -> List[Tuple[str, Any]]:
+        with self.store._connection() as conn:
+            return self._load(conn)
+
+    def values(self) -> List[Any]:
+        return [entity for _, entity in self.items()]
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """Entities for the keys that exist, in one query per LOOKUP_BATCH."""
+        with self.store._connection() as conn:
+            return dict(self._load(conn, keys=list(keys)))
+
+
+class EntityList(_Collection):
+    """
+    List-like view of a collection in insertion order.
+
+    Supports what the services use lists for: append, iteration, len,
+    indexing and truthiness. Rows get generated keys.
+    """
+
+    def append(self, entity: Any) -> None:
+        self._put(uuid.uuid4().hex, entity)
+
+    def extend(self, entities: Sequence[Any]) -> None:
+        with self.store._connection() as conn:
+            for entity in entities:
+                self._write(conn, uuid.uuid4().hex, entity)
+
+    def _all(self) -> List[Any]:
+        with self.store._connection() as conn:
+            return [entity for _, entity in self._load(conn)]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._all())
+
+    def __len__(self) -> int:
+        return self._count()
+
+    def __bool__(self) -> bool:
+        return self._count() > 0
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._all()[index]
+
+    def remove(self, entity: Any) -> None:
+        """Remove the first stored entity equal to entity."""
+        with self.store._connection() as conn:
+            for key, stored in self._load(conn):
+                if stored is entity or stored == entity:
+                    self._delete(key)
+                    return
+        raise ValueError("entity not in list")
+
+
+def unit_of_work(method: Callable[..., T]) -> Callable[..., T]:
+    """
+    Run a service method in its store's unit of work (self._store).
+
+    Use on every method that adds entities or changes them in place.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._store.unit_of_work():
+            return method(self, *args, **kwargs)
+    return wrapper
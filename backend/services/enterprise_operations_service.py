@@ -15,6 +15,8 @@ from dataclasses import dataclass
 from enum import Enum
 import statistics
 
+from .domain_store import DomainStore, unit_of_work
+
 
 # =============================================================================
 # ENUMS AND DATA CLASSES
@@ -437,42 +439,55 @@ CERT_VALIDITY = {
 class EnterpriseOperationsService:
     """Enterprise operations management service"""
 
-    def __init__(self):
+    def __init__(self, db_path: str = None):
+        self._store = DomainStore("enterprise_ops", db_path)
+
         # Entities
-        self.entities: Dict[str, FarmEntity] = {}
-        self.allocations: Dict[str, EntityAllocation] = {}
+        self.entities = self._store.map("entities", FarmEntity)
+        self.allocations = self._store.map("allocations", EntityAllocation)
 
         # Labor
-        self.employees: Dict[str, Employee] = {}
-        self.certifications: Dict[str, Certification] = {}
-        self.time_entries: Dict[str, TimeEntry] = {}
-        self.schedules: Dict[str, ScheduleEntry] = {}
+        self.employees = self._store.map("employees", Employee)
+        self.certifications = self._store.map("certifications", Certification)
+        self.time_entries = self._store.map("time_entries", TimeEntry)
+        self.schedules = self._store.map("schedules", ScheduleEntry)
 
         # Land
-        self.landowners: Dict[str, Landowner] = {}
-        self.parcels: Dict[str, LandParcel] = {}
-        self.leases: Dict[str, Lease] = {}
-        self.lease_payments: Dict[str, LeasePayment] = {}
+        self.landowners = self._store.map("landowners", Landowner)
+        self.parcels = self._store.map("parcels", LandParcel)
+        self.leases = self._store.map("leases", Lease)
+        self.lease_payments = self._store.map("lease_payments", LeasePayment)
 
         # Cash Flow
-        self.cash_flow_entries: Dict[str, CashFlowEntry] = {}
-        self.loans: Dict[str, Loan] = {}
+        self.cash_flow_entries = self._store.map("cash_flow_entries", CashFlowEntry)
+        self.loans = self._store.map("loans", Loan)
 
-        self._counters = {
-            "entity": 0, "employee": 0, "cert": 0, "time": 0, "schedule": 0,
-            "landowner": 0, "parcel": 0, "lease": 0, "payment": 0,
-            "cashflow": 0, "loan": 0, "allocation": 0
-        }
-
-        # Create default entity
+        # Create default entity (first start only)
         self._create_default_entity()
 
+        self._store.migrate_counters({
+            "entity": (self.entities, "ENTITY"),
+            "employee": (self.employees, "EMPLOYEE"),
+            "cert": (self.certifications, "CERT"),
+            "time": (self.time_entries, "TIME"),
+            "schedule": (self.schedules, "SCHEDULE"),
+            "landowner": (self.landowners, "LANDOWNER"),
+            "parcel": (self.parcels, "PARCEL"),
+            "lease": (self.leases, "LEASE"),
+            "payment": (self.lease_payments, "PAYMENT"),
+            "cashflow": (self.cash_flow_entries, "CASHFLOW"),
+            "loan": (self.loans, "LOAN"),
+            "allocation": (self.allocations, "ALLOCATION"),
+        })
+
     def _next_id(self, prefix: str) -> str:
-        self._counters[prefix] += 1
-        return f"{prefix.upper()}-{self._counters[prefix]:04d}"
+        return f"{prefix.upper()}-{self._store.next_id(prefix):04d}"
 
+    @unit_of_work
     def _create_default_entity(self):
         """Create a default farming entity"""
+        if "ENTITY-0001" in self.entities:
+            return
         entity = FarmEntity(
             id="ENTITY-0001",
             name="Main Farm Operation",
@@ -491,12 +506,12 @@ class EnterpriseOperationsService:
             notes="Default entity"
         )
         self.entities["ENTITY-0001"] = entity
-        self._counters["entity"] = 1
 
     # =========================================================================
     # ENTITY MANAGEMENT
     # =========================================================================
 
+    @unit_of_work
     def create_entity(
         self,
         name: str,
@@ -564,6 +579,7 @@ class EnterpriseOperationsService:
             "entities": entities
         }
 
+    @unit_of_work
     def create_allocation(
         self,
         source_entity_id: str,
@@ -608,6 +624,7 @@ class EnterpriseOperationsService:
     # LABOR/CREW MANAGEMENT
     # =========================================================================
 
+    @unit_of_work
     def add_employee(
         self,
         first_name: str,
@@ -659,6 +676,7 @@ class EnterpriseOperationsService:
             "message": f"Employee {first_name} {last_name} added"
         }
 
+    @unit_of_work
     def add_certification(
         self,
         employee_id: str,
@@ -707,6 +725,7 @@ class EnterpriseOperationsService:
             "message": f"Certification added for {emp.first_name} {emp.last_name}"
         }
 
+    @unit_of_work
     def record_time(
         self,
         employee_id: str,
@@ -791,6 +810,7 @@ class EnterpriseOperationsService:
             end_date = start_date + timedelta(days=6)
 
         entries = []
+        employees = dict(self.employees.items())
         for entry in self.time_entries.values():
             if start_date <= entry.work_date <= end_date:
                 if employee_id and entry.employee_id != employee_id:
@@ -798,7 +818,7 @@ class EnterpriseOperationsService:
                 if entity_id and entry.entity_id != entity_id:
                     continue
 
-                emp = self.employees.get(entry.employee_id)
+                emp = employees.get(entry.employee_id)
                 entries.append({
                     "id": entry.id,
                     "employee": f"{emp.first_name} {emp.last_name}" if emp else entry.employee_id,
@@ -830,6 +850,7 @@ class EnterpriseOperationsService:
             "entries": entries
         }
 
+    @unit_of_work
     def create_schedule(
         self,
         employee_id: str,
@@ -881,11 +902,12 @@ class EnterpriseOperationsService:
             end_date = start_date + timedelta(days=6)
 
         schedules = []
+        employees = dict(self.employees.items())
         for sched in self.schedules.values():
             if start_date <= sched.scheduled_date <= end_date:
                 if entity_id and sched.entity_id != entity_id:
                     continue
-                emp = self.employees.get(sched.employee_id)
+                emp = employees.get(sched.employee_id)
                 schedules.append({
                     "id": sched.id,
                     "employee": f"{emp.first_name} {emp.last_name}" if emp else sched.employee_id,
@@ -914,9 +936,10 @@ class EnterpriseOperationsService:
         today = date.today()
         cutoff = today + timedelta(days=days_ahead)
 
+        employees = dict(self.employees.items())
         for cert in self.certifications.values():
             if cert.expiration_date <= cutoff:
-                emp = self.employees.get(cert.employee_id)
+                emp = employees.get(cert.employee_id)
                 days_until = (cert.expiration_date - today).days
 
                 if days_until < 0:
@@ -954,6 +977,7 @@ class EnterpriseOperationsService:
     ) -> Dict[str, Any]:
         """Generate payroll summary for pay period"""
         summaries = []
+        time_entries = self.time_entries.values()
 
         for emp_id, emp in self.employees.items():
             if emp.status != EmployeeStatus.ACTIVE:
@@ -966,7 +990,7 @@ class EnterpriseOperationsService:
             overtime_hours = 0
             pto_hours = 0
 
-            for entry in self.time_entries.values():
+            for entry in time_entries:
                 if entry.employee_id != emp_id:
                     continue
                 if not (pay_period_start <= entry.work_date <= pay_period_end):
@@ -1020,6 +1044,7 @@ class EnterpriseOperationsService:
     # LAND/LEASE MANAGEMENT
     # =========================================================================
 
+    @unit_of_work
     def add_landowner(
         self,
         name: str,
@@ -1057,6 +1082,7 @@ class EnterpriseOperationsService:
             "message": f"Landowner {name} added"
         }
 
+    @unit_of_work
     def add_land_parcel(
         self,
         name: str,
@@ -1105,6 +1131,7 @@ class EnterpriseOperationsService:
             "message": f"Parcel {name} ({tillable_acres} tillable acres) added"
         }
 
+    @unit_of_work
     def create_lease(
         self,
         parcel_id: str,
@@ -1174,6 +1201,7 @@ class EnterpriseOperationsService:
             "message": f"Lease created: {acres} acres from {landowner.name} at ${cash_rent_per_acre}/acre"
         }
 
+    @unit_of_work
     def record_lease_payment(
         self,
         lease_id: str,
@@ -1223,6 +1251,8 @@ class EnterpriseOperationsService:
         total_acres = 0
         total_rent = 0
         owned_acres = 0
+        parcels = dict(self.parcels.items())
+        landowners = dict(self.landowners.items())
 
         for lease in self.leases.values():
             if entity_id and lease.entity_id != entity_id:
@@ -1230,8 +1260,8 @@ class EnterpriseOperationsService:
             if lease.status != LeaseStatus.ACTIVE:
                 continue
 
-            parcel = self.parcels.get(lease.parcel_id)
-            landowner = self.landowners.get(lease.landowner_id)
+            parcel = parcels.get(lease.parcel_id)
+            landowner = landowners.get(lease.landowner_id)
 
             leases.append({
                 "id": lease.id,
@@ -1273,13 +1303,15 @@ class EnterpriseOperationsService:
             year = date.today().year
 
         schedule = []
+        parcels = dict(self.parcels.items())
+        landowners = dict(self.landowners.items())
 
         for lease in self.leases.values():
             if lease.status != LeaseStatus.ACTIVE:
                 continue
 
-            landowner = self.landowners.get(lease.landowner_id)
-            parcel = self.parcels.get(lease.parcel_id)
+            landowner = landowners.get(lease.landowner_id)
+            parcel = parcels.get(lease.parcel_id)
 
             # Determine payment dates based on frequency
             if lease.payment_frequency == PaymentFrequency.ANNUAL:
@@ -1327,13 +1359,14 @@ class EnterpriseOperationsService:
         regional_avg = CASH_RENT_AVERAGES.get(region, CASH_RENT_AVERAGES["delta_region"])
 
         comparisons = []
+        parcels = dict(self.parcels.items())
         for lease in self.leases.values():
             if lease.status != LeaseStatus.ACTIVE:
                 continue
             if lease.lease_type != LeaseType.CASH_RENT:
                 continue
 
-            parcel = self.parcels.get(lease.parcel_id)
+            parcel = parcels.get(lease.parcel_id)
 
             # Assume irrigated row crop for comparison
             regional_rate = regional_avg.get("irrigated_row_crop", 200)
@@ -1362,6 +1395,7 @@ class EnterpriseOperationsService:
     # CASH FLOW FORECASTING
     # =========================================================================
 
+    @unit_of_work
     def add_cash_flow_entry(
         self,
         category: str,
@@ -1423,6 +1457,7 @@ class EnterpriseOperationsService:
             "message": f"Cash flow entry added: {description} ${abs(amount):,.2f}"
         }
 
+    @unit_of_work
     def add_loan(
         self,
         lender: str,
@@ -1485,6 +1520,10 @@ class EnterpriseOperationsService:
         forecast = []
 
         running_balance = starting_balance
+        cash_flow_entries = self.cash_flow_entries.values()
+        loans = self.loans.values()
+        leases = self.leases.values()
+        landowners = dict(self.landowners.items())
 
         for i in range(months):
             month_date = date(today.year + (today.month + i - 1) // 12,
@@ -1496,7 +1535,7 @@ class EnterpriseOperationsService:
             items = []
 
             # Get entries for this month
-            for entry in self.cash_flow_entries.values():
+            for entry in cash_flow_entries:
                 if entity_id and entry.entity_id != entity_id:
                     continue
 
@@ -1513,7 +1552,7 @@ class EnterpriseOperationsService:
                         expenses += abs(entry.amount)
 
             # Add loan payments
-            for loan in self.loans.values():
+            for loan in loans:
                 if entity_id and loan.entity_id != entity_id:
                     continue
 
@@ -1527,7 +1566,7 @@ class EnterpriseOperationsService:
                     expenses += loan.payment_amount
 
             # Add lease payments
-            for lease in self.leases.values():
+            for lease in leases:
                 if entity_id and lease.entity_id != entity_id:
                     continue
                 if lease.status != LeaseStatus.ACTIVE:
@@ -1536,7 +1575,7 @@ class EnterpriseOperationsService:
                 # Simplified - assume annual payment in start month
                 if lease.payment_frequency == PaymentFrequency.ANNUAL:
                     if month_date.month == lease.start_date.month:
-                        landowner = self.landowners.get(lease.landowner_id)
+                        landowner = landowners.get(lease.landowner_id)
                         items.append({
                             "category": "land_rent",
                             "description": f"Land rent - {landowner.name if landowner else 'Unknown'}",
@@ -13,7 +13,7 @@ from typing import Optional, List, Tuple
 from pydantic import BaseModel, Field
 
 from .auth_service import get_auth_service
-from database.db_utils import get_db_connection, DatabaseManager
+from database.db_utils import get_db_connection, DatabaseManager, get_pooled_connection
 
 
 # ============================================================================
@@ -381,7 +381,7 @@ class EquipmentService:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection. DEPRECATED - use context managers instead."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
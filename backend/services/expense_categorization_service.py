@@ -10,8 +10,10 @@ Features:
 - Confidence scoring for categorizations
 """
 
+import importlib.util
 import logging
 import os
+import pickle
 import re
 import sqlite3
 from typing import List, Dict, Optional, Tuple, Any
@@ -19,20 +21,15 @@ from dataclasses import dataclass
 from enum import Enum
 from collections import Counter
 
+import numpy as np
+
+from database.db_utils import get_pooled_connection
+
 logger = logging.getLogger(__name__)
 
-# Try to import sklearn for ML-based categorization
-try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.naive_bayes import MultinomialNB
-    from sklearn.linear_model import LogisticRegression
-    from sklearn.pipeline import Pipeline
-    from sklearn.model_selection import train_test_split
-    from sklearn.metrics import accuracy_score, classification_report
-    import pickle
-    HAS_SKLEARN = True
-except ImportError:
-    HAS_SKLEARN = False
+# sklearn is imported in train_model (and by pickle when a saved model loads)
+HAS_SKLEARN = importlib.util.find_spec("sklearn") is not None
+if not HAS_SKLEARN:
     logger.info("scikit-learn not available - using rule-based categorization")
 
 
@@ -200,6 +197,72 @@ DEFAULT_VENDOR_MAPPINGS = {
 }
 
 
+class KeywordMatcher:
+    """
+    Keyword rules compiled once and applied to many descriptions
+
+    Each keyword found in a description counts 1, plus 0.5 when it also
+    matches on word boundaries; a category scores min(0.9, 0.3 + 0.15 x
+    matches). A single trie-regex scan finds the longest keyword starting
+    at every position; any other keyword present is a prefix of one of those.
+    """
+
+    def __init__(self, keywords: Dict[ExpenseCategory, List[str]]):
+        self.categories = list(ExpenseCategory)
+        column = {category: i for i, category in enumerate(self.categories)}
+
+        self._rules: Dict[str, List[Tuple[int, re.Pattern]]] = {}
+        for category, category_keywords in keywords.items():
+            for keyword in category_keywords:
+                self._rules.setdefault(keyword, []).append(
+                    (column[category], re.compile(r'\b' + re.escape(keyword) + r'\b'))
+                )
+
+        # Keywords merged into a prefix trie; greedy optional groups make each
+        # position report its longest keyword
+        trie: Dict[str, Any] = {}
+        for keyword in self._rules:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = True
+        self._scan = re.compile("(?=(" + self._trie_pattern(trie) + "))")
+        self._prefixes = {
+            keyword: [k for k in self._rules if keyword.startswith(k)]
+            for keyword in self._rules
+        }
+
+    @classmethod
+    def _trie_pattern(cls, node: Dict[str, Any]) -> str:
+        """Regex for a keyword trie node"""
+        branches = [re.escape(char) + cls._trie_pattern(child) for char, child in node.items() if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    def keywords_in(self, description: str) -> set:
+        """All keywords occurring in a lowercase description"""
+        found = set()
+        for match in self._scan.finditer(description):
+            found.update(self._prefixes[match.group(1)])
+        return found
+
+    def score_many(self, descriptions: List[str]) -> np.ndarray:
+        """Rule scores as a (descriptions x categories) matrix; input must be lowercase"""
+        matches = np.zeros((len(descriptions), len(self.categories)))
+        for i, description in enumerate(descriptions):
+            found = self.keywords_in(description)
+            if not found:
+                continue
+            row = [0.0] * len(self.categories)
+            for keyword in found:
+                for col, word_pattern in self._rules[keyword]:
+                    row[col] += 1.5 if word_pattern.search(description) else 1
+            matches[i] = row
+        return np.where(matches > 0, np.minimum(0.9, 0.3 + matches * 0.15), 0.0)
+
+
 class ExpenseCategorizationService:
     """
     Smart Expense Categorization Service
@@ -221,6 +284,8 @@ class ExpenseCategorizationService:
         self.model = None
         self.vectorizer = None
         self.vendor_mappings = DEFAULT_VENDOR_MAPPINGS.copy()
+        self.keyword_matcher = KeywordMatcher(CATEGORY_KEYWORDS)
+        self._vendor_cache: Dict[str, Tuple[Optional[ExpenseCategory], float]] = {}
 
         self._init_db()
         self._load_model()
@@ -228,7 +293,7 @@ class ExpenseCategorizationService:
 
     def _init_db(self):
         """Initialize database tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         # Categorization training data
@@ -290,7 +355,7 @@ class ExpenseCategorizationService:
 
     def _load_vendor_mappings(self):
         """Load vendor mappings from database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -326,176 +391,156 @@ class ExpenseCategorizationService:
         Returns:
             CategorizationResult with category and confidence
         """
-        description_lower = description.lower()
-        vendor_lower = vendor.lower() if vendor else ""
-
-        # Track which methods contributed
-        matching_rules = []
-        vendor_recognized = False
-        vendor_category_history = None
-
-        # 1. Check vendor mapping first
-        vendor_category, vendor_conf = self._check_vendor(vendor_lower)
-        if vendor_category:
-            vendor_recognized = True
-            vendor_category_history = vendor_category.value
-            matching_rules.append(f"vendor_match:{vendor_lower}")
-
-        # 2. Apply keyword rules
-        rule_scores = self._apply_keyword_rules(description_lower)
-
-        # 3. Use ML model if available
-        ml_scores = {}
-        if use_ml and self.model and HAS_SKLEARN:
-            ml_scores = self._predict_with_ml(description)
-            if ml_scores:
-                matching_rules.append("ml_model")
+        return self.categorize_batch(
+            [{"description": description, "vendor": vendor, "amount": amount}],
+            use_ml=use_ml
+        )[0]
 
-        # 4. Combine scores
-        final_scores = self._combine_scores(
-            vendor_category, vendor_conf,
-            rule_scores,
-            ml_scores
-        )
+    def categorize_batch(
+        self,
+        expenses: List[Dict[str, Any]],
+        use_ml: bool = True
+    ) -> List[CategorizationResult]:
+        """
+        Categorize multiple expenses
 
-        # Get top category and alternatives
-        sorted_categories = sorted(final_scores.items(), key=lambda x: x[1], reverse=True)
+        Distinct vendors are resolved once, keyword rules run once per
+        distinct description, and the ML model (if loaded) scores all
+        distinct descriptions in a single predict_proba call. Scores are
+        combined as matrices with the vendor/rule/ML weights.
 
-        if sorted_categories:
-            top_category = sorted_categories[0][0]
-            top_confidence = sorted_categories[0][1]
-            alternatives = [(cat, score) for cat, score in sorted_categories[1:4] if score > 0.1]
-        else:
-            top_category = ExpenseCategory.OTHER
-            top_confidence = 0.5
-            alternatives = []
-
-        return CategorizationResult(
-            description=description,
-            predicted_category=top_category,
-            confidence=round(top_confidence, 3),
-            alternative_categories=alternatives,
-            matching_rules=matching_rules,
-            vendor_recognized=vendor_recognized,
-            vendor_category_history=vendor_category_history
-        )
+        Args:
+            expenses: List of dicts with 'description', 'vendor', 'amount'
+            use_ml: Whether to use ML model if available
 
-    def _check_vendor(self, vendor: str) -> Tuple[Optional[ExpenseCategory], float]:
-        """Check if vendor maps to a known category"""
-        if not vendor:
-            return None, 0
+        Returns:
+            List of CategorizationResults
+        """
+        if not expenses:
+            return []
 
-        # Exact match
-        if vendor in self.vendor_mappings:
-            return self.vendor_mappings[vendor], 0.95
+        categories = self.keyword_matcher.categories
+        column = {category: i for i, category in enumerate(categories)}
+        descriptions = [expense.get('description') or '' for expense in expenses]
+        vendors = [(expense.get('vendor') or '').lower() for expense in expenses]
 
-        # Partial match
-        for pattern, category in self.vendor_mappings.items():
-            if pattern in vendor or vendor in pattern:
-                return category, 0.85
+        # Distinct descriptions and vendors, with each expense's row in those tables
+        unique_descriptions = list(dict.fromkeys(descriptions))
+        description_row = {d: i for i, d in enumerate(unique_descriptions)}
+        rows = np.array([description_row[d] for d in descriptions])
 
-        return None, 0
+        # 1. Vendor mapping
+        vendor_matches = {v: self._check_vendor(v) for v in dict.fromkeys(vendors)}
+        vendor_hits = [vendor_matches[v] for v in vendors]
+        has_vendor = np.array([category is not None for category, _ in vendor_hits])
 
-    def _apply_keyword_rules(self, description: str) -> Dict[ExpenseCategory, float]:
-        """Apply keyword rules to description"""
-        scores = {cat: 0.0 for cat in ExpenseCategory}
+        # 2. Keyword rules
+        rule_scores = self.keyword_matcher.score_many([d.lower() for d in unique_descriptions])[rows]
 
-        for category, keywords in CATEGORY_KEYWORDS.items():
-            matches = 0
-            for keyword in keywords:
-                if keyword in description:
-                    matches += 1
-                    # Exact word match scores higher
-                    if re.search(r'\b' + re.escape(keyword) + r'\b', description):
-                        matches += 0.5
+        # 3. ML model over the whole description matrix
+        ml_scores = None
+        if use_ml and self.model and HAS_SKLEARN:
+            ml_scores = self._predict_with_ml(unique_descriptions)
+            if ml_scores is not None:
+                ml_scores = ml_scores[rows]
 
-            if matches > 0:
-                # Normalize score based on number of matches
-                scores[category] = min(0.9, 0.3 + matches * 0.15)
+        # 4. Combine scores
+        vendor_weight = np.where(has_vendor, 0.4, 0.0)
+        rule_weight = np.full(len(expenses), 0.35)
+        ml_weight = np.full(len(expenses), 0.25 if ml_scores is not None else 0.0)
+        total_weight = vendor_weight + rule_weight + ml_weight
+        vendor_weight /= total_weight
+        rule_weight /= total_weight
+        ml_weight /= total_weight
+
+        final_scores = np.zeros((len(expenses), len(categories)))
+        for i, (category, confidence) in enumerate(vendor_hits):
+            if category is not None:
+                final_scores[i, column[category]] += confidence * vendor_weight[i]
+        final_scores += rule_scores * rule_weight[:, None]
+        if ml_scores is not None:
+            final_scores += ml_scores * ml_weight[:, None]
+
+        # Highest first; ties keep category order
+        ranking = np.argsort(-final_scores, axis=1, kind='stable')[:, :4]
+        ranked_scores = np.take_along_axis(final_scores, ranking, axis=1)
 
-        return scores
+        results = []
+        for i, description in enumerate(descriptions):
+            category, _ = vendor_hits[i]
+            matching_rules = [f"vendor_match:{vendors[i]}"] if category is not None else []
+            if ml_scores is not None:
+                matching_rules.append("ml_model")
+
+            top = ranking[i].tolist()
+            top_scores = ranked_scores[i].tolist()
+            if top_scores[0] > 0:
+                predicted, confidence = categories[top[0]], top_scores[0]
+                alternatives = [
+                    (categories[c], score) for c, score in zip(top[1:], top_scores[1:]) if score > 0.1
+                ]
+            else:
+                # Nothing matched at all
+                predicted, confidence, alternatives = ExpenseCategory.OTHER, 0.5, []
+
+            results.append(CategorizationResult(
+                description=description,
+                predicted_category=predicted,
+                confidence=round(confidence, 3),
+                alternative_categories=alternatives,
+                matching_rules=matching_rules,
+                vendor_recognized=category is not None,
+                vendor_category_history=category.value if category is not None else None
+            ))
+        return results
+
+    def _check_vendor(self, vendor: str) -> Tuple[Optional[ExpenseCategory], float]:
+        """Check if vendor maps to a known category (resolved once per vendor)"""
+        if not vendor:
+            return None, 0
+
+        cached = self._vendor_cache.get(vendor)
+        if cached is not None:
+            return cached
 
-    def _predict_with_ml(self, description: str) -> Dict[ExpenseCategory, float]:
-        """Predict category using ML model"""
+        # Exact match
+        if vendor in self.vendor_mappings:
+            match = (self.vendor_mappings[vendor], 0.95)
+        else:
+            # Partial match
+            match = (None, 0)
+            for pattern, category in self.vendor_mappings.items():
+                if pattern in vendor or vendor in pattern:
+                    match = (category, 0.85)
+                    break
+
+        self._vendor_cache[vendor] = match
+        return match
+
+    def _predict_with_ml(self, descriptions: List[str]) -> Optional[np.ndarray]:
+        """Category probabilities for all descriptions as one (rows x categories) matrix"""
         if not self.model or not self.vectorizer:
-            return {}
+            return None
 
         try:
-            # Get probability predictions
-            proba = self.model.predict_proba([description])[0]
-            classes = self.model.classes_
-
-            scores = {}
-            for i, class_name in enumerate(classes):
-                try:
-                    category = ExpenseCategory(class_name)
-                    scores[category] = proba[i]
-                except ValueError:
-                    pass
-
-            return scores
+            proba = self.model.predict_proba(descriptions)
         except Exception as e:
             logger.warning(f"ML prediction failed: {e}")
-            return {}
-
-    def _combine_scores(
-        self,
-        vendor_category: Optional[ExpenseCategory],
-        vendor_conf: float,
-        rule_scores: Dict[ExpenseCategory, float],
-        ml_scores: Dict[ExpenseCategory, float]
-    ) -> Dict[ExpenseCategory, float]:
-        """Combine scores from different methods"""
-        final_scores = {cat: 0.0 for cat in ExpenseCategory}
-
-        # Weight factors
-        vendor_weight = 0.4 if vendor_category else 0
-        rule_weight = 0.35
-        ml_weight = 0.25 if ml_scores else 0
-
-        # Normalize weights
-        total_weight = vendor_weight + rule_weight + ml_weight
-        if total_weight > 0:
-            vendor_weight /= total_weight
-            rule_weight /= total_weight
-            ml_weight /= total_weight
-
-        # Add vendor score
-        if vendor_category:
-            final_scores[vendor_category] += vendor_conf * vendor_weight
-
-        # Add rule scores
-        for cat, score in rule_scores.items():
-            final_scores[cat] += score * rule_weight
-
-        # Add ML scores
-        for cat, score in ml_scores.items():
-            final_scores[cat] += score * ml_weight
+            return None
 
-        return final_scores
-
-    def categorize_batch(
-        self,
-        expenses: List[Dict[str, Any]]
-    ) -> List[CategorizationResult]:
-        """
-        Categorize multiple expenses
-
-        Args:
-            expenses: List of dicts with 'description', 'vendor', 'amount'
+        categories = self.keyword_matcher.categories
+        column = {category.value: i for i, category in enumerate(categories)}
+        class_columns = [
+            (i, column[class_name]) for i, class_name in enumerate(self.model.classes_)
+            if class_name in column
+        ]
+        if not class_columns:
+            return None
 
-        Returns:
-            List of CategorizationResults
-        """
-        results = []
-        for expense in expenses:
-            result = self.categorize(
-                description=expense.get('description', ''),
-                vendor=expense.get('vendor'),
-                amount=expense.get('amount')
-            )
-            results.append(result)
-        return results
+        scores = np.zeros((len(descriptions), len(categories)))
+        source, target = zip(*class_columns)
+        scores[:, list(target)] = proba[:, list(source)]
+        return scores
 
     def submit_correction(
         self,
@@ -518,7 +563,7 @@ class ExpenseCategorizationService:
         Returns:
             Success status
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -546,6 +591,7 @@ class ExpenseCategorizationService:
 
                 # Update in-memory mapping
                 self.vendor_mappings[vendor_lower] = correct_category
+                self._vendor_cache.clear()
 
             conn.commit()
             return True
@@ -572,7 +618,13 @@ class ExpenseCategorizationService:
                 "message": "scikit-learn not installed"
             }
 
-        conn = sqlite3.connect(self.db_path)
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import accuracy_score
+
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         # Get training data
@@ -642,7 +694,7 @@ class ExpenseCategorizationService:
 
     def get_training_stats(self) -> Dict[str, Any]:
         """Get statistics about training data"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         # Total samples
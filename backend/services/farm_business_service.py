@@ -15,6 +15,8 @@ from dataclasses import dataclass
 from enum import Enum
 import statistics
 
+from .domain_store import DomainStore, unit_of_work
+
 
 # =============================================================================
 # ENUMS AND DATA CLASSES
@@ -309,36 +311,43 @@ REGIONAL_BENCHMARKS = {
 class FarmBusinessService:
     """Complete farm business management service"""
 
-    def __init__(self):
+    def __init__(self, db_path: str = None):
+        self._store = DomainStore("farm_business", db_path)
+
         # Tax Planning
-        self.assets: Dict[str, DepreciableAsset] = {}
-        self.tax_projections: Dict[str, TaxProjection] = {}
+        self.assets = self._store.map("assets", DepreciableAsset)
+        self.tax_projections = self._store.map("tax_projections", TaxProjection)
 
         # Succession Planning
-        self.family_members: Dict[str, FamilyMember] = {}
-        self.milestones: Dict[str, SuccessionMilestone] = {}
-        self.transfer_plans: Dict[str, AssetTransferPlan] = {}
+        self.family_members = self._store.map("family_members", FamilyMember)
+        self.milestones = self._store.map("milestones", SuccessionMilestone)
+        self.transfer_plans = self._store.map("transfer_plans", AssetTransferPlan)
 
         # Benchmarking
-        self.benchmarks: Dict[str, BenchmarkRecord] = {}
-        self.historical_data: Dict[str, List[Dict[str, Any]]] = {}
+        self.benchmarks = self._store.map("benchmarks", BenchmarkRecord, indexes=("year", "crop", "metric"))
+        self.historical_data = self._store.map("historical_data", List[Dict[str, Any]])
 
         # Document Vault
-        self.documents: Dict[str, Document] = {}
-
-        self._counters = {
-            "asset": 0, "projection": 0, "family": 0, "milestone": 0,
-            "transfer": 0, "benchmark": 0, "document": 0
-        }
+        self.documents = self._store.map("documents", Document)
+
+        self._store.migrate_counters({
+            "asset": (self.assets, "ASSET"),
+            "projection": (self.tax_projections, "PROJECTION"),
+            "family": (self.family_members, "FAMILY"),
+            "milestone": (self.milestones, "MILESTONE"),
+            "transfer": (self.transfer_plans, "TRANSFER"),
+            "benchmark": (self.benchmarks, "BENCHMARK"),
+            "document": (self.documents, "DOCUMENT"),
+        })
 
     def _next_id(self, prefix: str) -> str:
-        self._counters[prefix] += 1
-        return f"{prefix.upper()}-{self._counters[prefix]:04d}"
+        return f"{prefix.upper()}-{self._store.next_id(prefix):04d}"
 
     # =========================================================================
     # TAX PLANNING TOOLS
     # =========================================================================
 
+    @unit_of_work
     def add_depreciable_asset(
         self,
         name: str,
@@ -568,6 +577,7 @@ class FarmBusinessService:
             "tax_savings_estimate": round(total_179 * 0.32, 2)  # Assuming 32% bracket
         }
 
+    @unit_of_work
     def project_tax_liability(
         self,
         tax_year: int,
@@ -697,6 +707,7 @@ class FarmBusinessService:
     # SUCCESSION PLANNING
     # =========================================================================
 
+    @unit_of_work
     def add_family_member(
         self,
         name: str,
@@ -742,6 +753,7 @@ class FarmBusinessService:
             "message": f"Family member {name} added to succession plan"
         }
 
+    @unit_of_work
     def create_asset_transfer_plan(
         self,
         asset_description: str,
@@ -844,6 +856,7 @@ class FarmBusinessService:
         else:
             return base_reqs
 
+    @unit_of_work
     def add_succession_milestone(
         self,
         title: str,
@@ -964,6 +977,7 @@ class FarmBusinessService:
     # BENCHMARKING DASHBOARD
     # =========================================================================
 
+    @unit_of_work
     def record_benchmark_data(
         self,
         year: int,
@@ -1047,12 +1061,10 @@ class FarmBusinessService:
 
         comparisons = []
         previous_value = None
+        records = self.benchmarks.find(crop=crop, metric=bmetric)
 
         for year in sorted(years):
-            year_records = [
-                b for b in self.benchmarks.values()
-                if b.year == year and b.crop == crop and b.metric == bmetric
-            ]
+            year_records = [b for b in records if b.year == year]
 
             if year_records:
                 avg_value = statistics.mean([r.actual_value for r in year_records])
@@ -1101,11 +1113,10 @@ class FarmBusinessService:
         if year is None:
             year = date.today().year
 
-        records = list(self.benchmarks.values())
-        if crop:
-            records = [r for r in records if r.crop == crop]
+        criteria = {"crop": crop} if crop else {}
         if year:
-            records = [r for r in records if r.year == year]
+            criteria["year"] = year
+        records = self.benchmarks.find(**criteria)
 
         if not records:
             return {
@@ -1184,6 +1195,7 @@ class FarmBusinessService:
     # DOCUMENT VAULT
     # =========================================================================
 
+    @unit_of_work
     def add_document(
         self,
         name: str,
@@ -17,6 +17,8 @@ from dataclasses import dataclass
 from enum import Enum
 import statistics
 
+from .domain_store import DomainStore, unit_of_work
+
 
 # =============================================================================
 # ENUMS AND DATA CLASSES
@@ -355,35 +357,42 @@ SOIL_OPTIMAL_RANGES = {
 class FarmIntelligenceService:
     """Elite farm intelligence service"""
 
-    def __init__(self):
+    def __init__(self, db_path: str = None):
+        self._store = DomainStore("farm_intel", db_path)
+
         # Market Intelligence
-        self.price_history: List[CommodityPrice] = []
-        self.forward_contracts: Dict[str, ForwardContract] = {}
-        self.basis_history: List[BasisHistory] = []
+        self.price_history = self._store.list("price_history", CommodityPrice)
+        self.forward_contracts = self._store.map("forward_contracts", ForwardContract)
+        self.basis_history = self._store.list("basis_history", BasisHistory)
 
         # Crop Insurance
-        self.policies: Dict[str, InsurancePolicy] = {}
-        self.loss_records: Dict[str, LossRecord] = {}
+        self.policies = self._store.map("policies", InsurancePolicy)
+        self.loss_records = self._store.map("loss_records", LossRecord)
 
         # Soil Health
-        self.soil_tests: Dict[str, SoilTest] = {}
+        self.soil_tests = self._store.map("soil_tests", SoilTest, indexes=("field_id",))
 
         # Harvest Analytics
-        self.harvest_records: Dict[str, HarvestRecord] = {}
+        self.harvest_records = self._store.map("harvest_records", HarvestRecord, indexes=("field_id",))
 
         # Input Procurement
-        self.suppliers: Dict[str, Supplier] = {}
-        self.purchase_orders: Dict[str, PurchaseOrder] = {}
-        self.price_quotes: Dict[str, PriceQuote] = {}
-
-        self._counters = {
-            "contract": 0, "policy": 0, "loss": 0, "soil": 0,
-            "harvest": 0, "supplier": 0, "po": 0, "quote": 0
-        }
+        self.suppliers = self._store.map("suppliers", Supplier)
+        self.purchase_orders = self._store.map("purchase_orders", PurchaseOrder)
+        self.price_quotes = self._store.map("price_quotes", PriceQuote)
+
+        self._store.migrate_counters({
+            "contract": (self.forward_contracts, "CONTRACT"),
+            "policy": (self.policies, "POLICY"),
+            "loss": (self.loss_records, "LOSS"),
+            "soil": (self.soil_tests, "SOIL"),
+            "harvest": (self.harvest_records, "HARVEST"),
+            "supplier": (self.suppliers, "SUPPLIER"),
+            "po": (self.purchase_orders, "PO"),
+            "quote": (self.price_quotes, "QUOTE"),
+        })
 
     def _next_id(self, prefix: str) -> str:
-        self._counters[prefix] += 1
-        return f"{prefix.upper()}-{self._counters[prefix]:04d}"
+        return f"{prefix.upper()}-{self._store.next_id(prefix):04d}"
 
     # =========================================================================
     # MARKET INTELLIGENCE SUITE
@@ -458,6 +467,7 @@ class FarmIntelligenceService:
             } if hist_basis else None
         }
 
+    @unit_of_work
     def create_forward_contract(
         self,
         commodity: str,
@@ -676,6 +686,7 @@ class FarmIntelligenceService:
             }
         }
 
+    @unit_of_work
     def create_insurance_policy(
         self,
         crop: str,
@@ -746,6 +757,7 @@ class FarmIntelligenceService:
             "message": f"Policy created: {coverage_level}% RP on {acres} acres"
         }
 
+    @unit_of_work
     def record_loss(
         self,
         policy_id: str,
@@ -859,6 +871,7 @@ class FarmIntelligenceService:
     # SOIL HEALTH DASHBOARD
     # =========================================================================
 
+    @unit_of_work
     def record_soil_test(
         self,
         field_id: str,
@@ -1001,7 +1014,7 @@ class FarmIntelligenceService:
     def get_soil_health_trend(self, field_id: str) -> Dict[str, Any]:
         """Get soil health trends over time for a field"""
         field_tests = sorted(
-            [t for t in self.soil_tests.values() if t.field_id == field_id],
+            self.soil_tests.find(field_id=field_id),
             key=lambda x: x.sample_date
         )
 
@@ -1251,6 +1264,7 @@ class FarmIntelligenceService:
     # HARVEST ANALYTICS
     # =========================================================================
 
+    @unit_of_work
     def record_harvest(
         self,
         field_id: str,
@@ -1398,8 +1412,7 @@ class FarmIntelligenceService:
             return {"error": f"Unknown crop: {crop}"}
 
         records = sorted(
-            [r for r in self.harvest_records.values()
-             if r.field_id == field_id and r.crop == comm],
+            [r for r in self.harvest_records.find(field_id=field_id) if r.crop == comm],
             key=lambda x: x.crop_year
         )
 
@@ -1445,6 +1458,7 @@ class FarmIntelligenceService:
     # INPUT PROCUREMENT OPTIMIZER
     # =========================================================================
 
+    @unit_of_work
     def add_supplier(
         self,
         name: str,
@@ -1489,6 +1503,7 @@ class FarmIntelligenceService:
             "message": f"Supplier {name} added"
         }
 
+    @unit_of_work
     def add_price_quote(
         self,
         supplier_id: str,
@@ -1604,6 +1619,7 @@ class FarmIntelligenceService:
             "recommendation": f"Best overall savings with {comparisons[0]['best_supplier']}" if comparisons else None
         }
 
+    @unit_of_work
     def create_purchase_order(
         self,
         supplier_id: str,
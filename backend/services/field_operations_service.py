@@ -13,6 +13,7 @@ from typing import Optional, List, Tuple
 from pydantic import BaseModel, Field
 
 from .auth_service import get_auth_service
+from database.db_utils import get_pooled_connection
 
 
 # ============================================================================
@@ -194,7 +195,7 @@ class FieldOperationsService:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -22,6 +22,8 @@ from enum import Enum
 import hashlib
 import uuid
 
+from .domain_store import DomainStore, unit_of_work
+
 
 class HarvestLotStatus(str, Enum):
     ACTIVE = "active"
@@ -320,19 +322,21 @@ class FoodSafetyService:
     Supports FSMA compliance, GAP/GHP certification, and grant requirements.
     """
 
-    def __init__(self):
-        self.harvest_lots: List[HarvestLot] = []
-        self.worker_trainings: List[WorkerTraining] = []
-        self.water_tests: List[WaterTest] = []
-        self.sanitation_logs: List[SanitationLog] = []
-        self.incidents: List[FoodSafetyIncident] = []
-        self.audits: List[Audit] = []
-        self.food_safety_plan: Dict = {}
+    def __init__(self, db_path: str = None):
+        self._store = DomainStore("food_safety", db_path)
+        self.harvest_lots = self._store.list("harvest_lots", HarvestLot)
+        self.worker_trainings = self._store.list("worker_trainings", WorkerTraining)
+        self.water_tests = self._store.list("water_tests", WaterTest)
+        self.sanitation_logs = self._store.list("sanitation_logs", SanitationLog)
+        self.incidents = self._store.list("incidents", FoodSafetyIncident)
+        self.audits = self._store.list("audits", Audit)
+        self.food_safety_plan = self._store.map("food_safety_plan")
 
     # =========================================================================
     # LOT TRACKING & TRACEABILITY
     # =========================================================================
 
+    @unit_of_work
     def create_harvest_lot(self, lot_data: Dict) -> Dict:
         """Create a new harvest lot with full traceability"""
 
@@ -389,6 +393,7 @@ class FoodSafetyService:
         data = f"{lot.lot_number}|{lot.field_id}|{lot.harvest_date.isoformat()}"
         return hashlib.sha256(data.encode()).hexdigest()[:16].upper()
 
+    @unit_of_work
     def update_lot_status(
         self,
         lot_id: str,
@@ -650,6 +655,7 @@ class FoodSafetyService:
     # WORKER TRAINING
     # =========================================================================
 
+    @unit_of_work
     def record_worker_training(self, training: WorkerTraining) -> Dict:
         """Record worker training completion"""
         self.worker_trainings.append(training)
@@ -702,6 +708,7 @@ class FoodSafetyService:
     # WATER TESTING
     # =========================================================================
 
+    @unit_of_work
     def record_water_test(self, test: WaterTest) -> Dict:
         """Record water quality test result"""
         self.water_tests.append(test)
@@ -759,6 +766,7 @@ class FoodSafetyService:
     # SANITATION LOGGING
     # =========================================================================
 
+    @unit_of_work
     def record_sanitation(self, log: SanitationLog) -> Dict:
         """Record sanitation/cleaning activity"""
         self.sanitation_logs.append(log)
@@ -813,6 +821,7 @@ class FoodSafetyService:
     # INCIDENT MANAGEMENT
     # =========================================================================
 
+    @unit_of_work
     def record_incident(self, incident: FoodSafetyIncident) -> Dict:
         """Record a food safety incident"""
         self.incidents.append(incident)
@@ -870,6 +879,7 @@ class FoodSafetyService:
     # RECALL MANAGEMENT
     # =========================================================================
 
+    @unit_of_work
     def initiate_recall(
         self,
         lot_numbers: List[str],
@@ -1069,6 +1079,7 @@ class FoodSafetyService:
     # AUDIT MANAGEMENT
     # =========================================================================
 
+    @unit_of_work
     def record_audit(self, audit: Audit) -> Dict:
         """Record an audit and its results"""
         self.audits.append(audit)
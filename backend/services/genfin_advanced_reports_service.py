@@ -11,6 +11,12 @@ from dataclasses import dataclass, field
 import uuid
 import sqlite3
 import json
+from database.db_utils import get_pooled_connection
+from database.schema import ensure_schema
+from services.registry import lazy_service
+
+
+SCHEMA_VERSION = 1
 
 
 class ReportCategory(Enum):
@@ -143,13 +149,16 @@ class GenFinAdvancedReportsService:
         self.inventory_service = None
         self.classes_service = None
 
-        self._init_tables()
-        self._initialize_default_dashboard()
+        ensure_schema(
+            self.db_path, "genfin_advanced_reports", SCHEMA_VERSION,
+            self._init_tables,
+            self._initialize_default_dashboard
+        )
         self._initialized = True
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -1217,4 +1226,4 @@ class GenFinAdvancedReportsService:
 
 
 # Singleton instance
-genfin_advanced_reports_service = GenFinAdvancedReportsService()
+genfin_advanced_reports_service = lazy_service("genfin_advanced_reports", GenFinAdvancedReportsService)
@@ -3,13 +3,33 @@ GenFin Bank Feeds Import Service
 Handles importing transactions from OFX, QFX, and QBO bank files.
 SQLite persistence for data durability
 """
-from datetime import datetime, date
-from typing import Dict, List, Optional, Tuple
+from bisect import bisect_left
+from datetime import datetime, date, timedelta
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from enum import Enum
 from dataclasses import dataclass, field
 import uuid
 import sqlite3
 import re
+from database.db_utils import get_pooled_connection
+from database.schema import ensure_schema
+from services.registry import lazy_service
+
+
+SCHEMA_VERSION = 2
+
+
+# Auto-matching tuning
+MATCH_DATE_WINDOW_DAYS = 7
+AUTO_MATCH_THRESHOLD = 0.8
+MAX_MATCH_CANDIDATES = 5
+MATCH_WEIGHTS = {
+    "amount": 0.4,
+    "date": 0.2,
+    "payee": 0.2,
+    "check_number": 0.2
+}
 
 
 class ImportFileType(Enum):
@@ -96,6 +116,138 @@ class ImportFile:
     processed: bool = False
 
 
+@dataclass
+class MatchCandidate:
+    """An existing GenFin transaction that an imported line could match"""
+    transaction_id: str
+    source: str  # bank_transaction, check, bill, bill_payment, payment_received
+    date: date
+    amount: float  # Signed like the bank feed: money out is negative
+    payee: str = ""
+    check_number: str = ""
+    payee_key: str = field(init=False, default="")
+
+    def __post_init__(self):
+        self.payee_key = _normalize_payee(self.payee)
+        self.check_number = _normalize_check_number(self.check_number)
+
+
+def _normalize_payee(name: str) -> str:
+    """Lowercase alphanumeric tokens, so 'CASEY'S #123' compares like 'caseys 123'"""
+    return " ".join(re.findall(r"[a-z0-9]+", (name or "").lower().replace("'", "")))
+
+
+def _normalize_check_number(check_number: str) -> str:
+    return (check_number or "").strip().lstrip("0")
+
+
+def _to_cents(amount: float) -> int:
+    return int(round(amount * 100))
+
+
+def _amount_bound(value) -> Optional[float]:
+    """Rule amount limit as a float; unparseable stored values mean no limit"""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _payee_similarity(a: str, b: str) -> float:
+    """Similarity of two normalized payee names (0-1)"""
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+
+    tokens_a = set(a.split())
+    tokens_b = set(b.split())
+    overlap = len(tokens_a & tokens_b) / min(len(tokens_a), len(tokens_b))
+    return max(overlap, SequenceMatcher(None, a, b).ratio())
+
+
+class MatchCandidateIndex:
+    """
+    In-memory index of match candidates bucketed by amount in cents.
+
+    Built once per import from one range query per source table, so scoring
+    tens of thousands of imported lines never goes back to SQLite. Candidates
+    claimed by an auto-match are skipped for the rest of the run.
+    """
+
+    # Preferred source when scores tie
+    SOURCE_PRIORITY = {
+        "bank_transaction": 0,
+        "check": 1,
+        "bill_payment": 2,
+        "payment_received": 3,
+        "bill": 4
+    }
+
+    def __init__(
+        self,
+        candidates: Iterable[MatchCandidate],
+        claimed: Optional[Set[str]] = None,
+        date_window_days: int = MATCH_DATE_WINDOW_DAYS
+    ):
+        self.date_window_days = date_window_days
+        self.claimed: Set[str] = set(claimed or ())
+        self._by_cents: Dict[int, List[MatchCandidate]] = {}
+        self.size = 0
+        for candidate in candidates:
+            self._by_cents.setdefault(_to_cents(candidate.amount), []).append(candidate)
+            self.size += 1
+
+    def score(self, imported: "ImportedTransaction", candidate: MatchCandidate) -> float:
+        """Weighted 0-1 score on amount, date distance, payee and check number"""
+        cents_off = abs(_to_cents(imported.amount) - _to_cents(candidate.amount))
+        days_apart = abs((candidate.date - imported.date).days)
+
+        amount_score = max(0.0, 1.0 - cents_off * 0.1)
+        date_score = max(0.0, 1.0 - days_apart / (self.date_window_days + 1))
+        payee_score = _payee_similarity(_normalize_payee(imported.name), candidate.payee_key)
+
+        check_number = _normalize_check_number(imported.check_number)
+        if check_number and candidate.check_number:
+            check_score = 1.0 if check_number == candidate.check_number else 0.0
+        else:
+            check_score = 0.5  # Neither confirms nor contradicts
+
+        return round(
+            MATCH_WEIGHTS["amount"] * amount_score +
+            MATCH_WEIGHTS["date"] * date_score +
+            MATCH_WEIGHTS["payee"] * payee_score +
+            MATCH_WEIGHTS["check_number"] * check_score,
+            4
+        )
+
+    def rank(
+        self,
+        imported: "ImportedTransaction",
+        limit: int = MAX_MATCH_CANDIDATES
+    ) -> List[Tuple[float, MatchCandidate]]:
+        """Best-scoring unclaimed candidates within a cent and the date window"""
+        cents = _to_cents(imported.amount)
+        scored = []
+
+        for key in (cents - 1, cents, cents + 1):
+            for candidate in self._by_cents.get(key, ()):
+                if candidate.transaction_id in self.claimed:
+                    continue
+                if abs((candidate.date - imported.date).days) > self.date_window_days:
+                    continue
+                scored.append((self.score(imported, candidate), candidate))
+
+        scored.sort(key=lambda sc: (
+            -sc[0],
+            self.SOURCE_PRIORITY.get(sc[1].source, 99),
+            abs((sc[1].date - imported.date).days)
+        ))
+        return scored[:limit]
+
+
 @dataclass
 class CategoryRule:
     """Rule for auto-categorizing imported transactions"""
@@ -121,6 +273,187 @@ class CategoryRule:
     created_at: datetime = field(default_factory=datetime.now)
 
 
+class _SubstringAutomaton:
+    """
+    Aho-Corasick automaton over lowercase patterns.
+
+    Each pattern carries a bitmask of the rules that require it; scan()
+    returns the OR of the masks of every pattern found in the text in a
+    single pass, however many patterns there are.
+    """
+
+    def __init__(self, patterns: Dict[str, int]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [0]
+
+        for pattern, mask in patterns.items():
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(0)
+                state = nxt
+            self._out[state] |= mask
+
+        # Breadth-first failure links; outputs inherit along the fail chain
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def scan(self, text: str) -> int:
+        goto, fail, out = self._goto, self._fail, self._out
+        found = 0
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            found |= out[state]
+        return found
+
+
+class CategoryRuleMatcher:
+    """
+    Category rules compiled for bulk categorization.
+
+    Rules are numbered in priority order and every criterion becomes a
+    bitmask of the rules it lets through: substring criteria via one
+    Aho-Corasick pass over the name and memo, exact names via a dict,
+    amount ranges via interval buckets and transaction types via a lookup.
+    ANDing the masks leaves the rules that match; the lowest set bit is the
+    highest-priority one, same as checking _rule_matches rule by rule.
+    """
+
+    def __init__(self, rules: List[CategoryRule]):
+        self.rules = list(rules)
+        everyone = (1 << len(self.rules)) - 1
+
+        name_patterns: Dict[str, int] = {}
+        memo_patterns: Dict[str, int] = {}
+        self._exact_names: Dict[str, int] = {}
+        self._no_name_contains = everyone
+        self._no_name_exact = everyone
+        self._no_memo_contains = everyone
+        self._type_masks: Dict[Optional[TransactionType], int] = {}
+        no_type = everyone
+
+        for position, rule in enumerate(self.rules):
+            bit = 1 << position
+            if rule.match_name_contains:
+                key = rule.match_name_contains.lower()
+                name_patterns[key] = name_patterns.get(key, 0) | bit
+                self._no_name_contains &= ~bit
+            if rule.match_name_exact:
+                key = rule.match_name_exact.lower()
+                self._exact_names[key] = self._exact_names.get(key, 0) | bit
+                self._no_name_exact &= ~bit
+            if rule.match_memo_contains:
+                key = rule.match_memo_contains.lower()
+                memo_patterns[key] = memo_patterns.get(key, 0) | bit
+                self._no_memo_contains &= ~bit
+            if rule.match_type:
+                self._type_masks[rule.match_type] = self._type_masks.get(rule.match_type, 0) | bit
+                no_type &= ~bit
+
+        self._no_type = no_type
+        self._name_automaton = _SubstringAutomaton(name_patterns) if name_patterns else None
+        self._memo_automaton = _SubstringAutomaton(memo_patterns) if memo_patterns else None
+        self._build_amount_buckets()
+
+    def _build_amount_buckets(self):
+        """
+        Split the amount axis at every rule boundary. Odd buckets are the
+        boundary values themselves, even buckets the open intervals between
+        them, so min/max stay inclusive exactly as in _rule_matches.
+        """
+        bounds = sorted({
+            value for rule in self.rules
+            for value in (rule.match_amount_min, rule.match_amount_max)
+            if value is not None
+        })
+        samples = []
+        for i, bound in enumerate(bounds):
+            below = bounds[i - 1] if i else bound - 1
+            samples.append((below + bound) / 2)
+            samples.append(bound)
+        samples.append(bounds[-1] + 1 if bounds else 0.0)
+
+        self._bounds = bounds
+        self._amount_masks = []
+        for value in samples:
+            mask = 0
+            for position, rule in enumerate(self.rules):
+                if rule.match_amount_min is not None and value < rule.match_amount_min:
+                    continue
+                if rule.match_amount_max is not None and value > rule.match_amount_max:
+                    continue
+                mask |= 1 << position
+            self._amount_masks.append(mask)
+
+    def _amount_mask(self, amount: float) -> int:
+        i = bisect_left(self._bounds, amount)
+        if i < len(self._bounds) and self._bounds[i] == amount:
+            return self._amount_masks[2 * i + 1]
+        return self._amount_masks[2 * i]
+
+    def match(self, imported: ImportedTransaction) -> Optional[CategoryRule]:
+        """Highest-priority rule matching the transaction, if any"""
+        if not self.rules:
+            return None
+
+        mask = self._amount_mask(abs(imported.amount))
+        mask &= self._no_type | self._type_masks.get(imported.transaction_type, 0)
+        if not mask:
+            return None
+
+        name_lower = imported.name.lower()
+        mask &= self._no_name_exact | self._exact_names.get(name_lower, 0)
+        if mask and self._name_automaton:
+            mask &= self._no_name_contains | self._name_automaton.scan(name_lower)
+        if mask and self._memo_automaton:
+            mask &= self._no_memo_contains | self._memo_automaton.scan(imported.memo.lower())
+        if not mask:
+            return None
+
+        return self.rules[(mask & -mask).bit_length() - 1]
+
+
+class _DuplicateIndex:
+    """FIT IDs and date/amount keys already imported, for batch duplicate checks"""
+
+    def __init__(self):
+        self.fit_ids: Set[str] = set()
+        self._by_cents: Dict[int, List[Tuple[date, float]]] = {}
+
+    def add(self, fit_id: Optional[str], trans_date: date, amount: float):
+        if fit_id:
+            self.fit_ids.add(fit_id)
+        self._by_cents.setdefault(_to_cents(amount), []).append((trans_date, amount))
+
+    def contains(self, fit_id: str, trans_date: date, amount: float) -> bool:
+        """Same FIT ID, or same amount within one day (mirrors _is_duplicate)"""
+        if fit_id in self.fit_ids:
+            return True
+
+        cents = _to_cents(amount)
+        for key in (cents - 1, cents, cents + 1):
+            for other_date, other_amount in self._by_cents.get(key, ()):
+                if abs((other_date - trans_date).days) <= 1 and abs(other_amount - amount) < 0.01:
+                    return True
+        return False
+
+
 class GenFinBankFeedsService:
     """
     Manages bank feed imports for GenFin.
@@ -146,13 +479,18 @@ class GenFinBankFeedsService:
             return
 
         self.db_path = db_path
-        self._init_tables()
-        self._initialize_default_rules()
+        self._rule_matcher: Optional[CategoryRuleMatcher] = None
+        self._rule_matcher_version: Optional[Tuple] = None
+        ensure_schema(
+            self.db_path, "genfin_bank_feeds", SCHEMA_VERSION,
+            self._init_tables,
+            self._initialize_default_rules
+        )
         self._initialized = True
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -161,11 +499,6 @@ class GenFinBankFeedsService:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            # Drop old tables if schema changed (migration from in-memory)
-            cursor.execute("DROP TABLE IF EXISTS genfin_imported_transactions")
-            cursor.execute("DROP TABLE IF EXISTS genfin_import_files")
-            cursor.execute("DROP TABLE IF EXISTS genfin_category_rules")
-
             # Import files table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS genfin_import_files (
@@ -229,14 +562,21 @@ class GenFinBankFeedsService:
                     assign_customer_id TEXT,
                     assign_class_id TEXT,
                     is_active INTEGER DEFAULT 1,
-                    created_at TEXT NOT NULL
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT
                 )
             """)
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(genfin_category_rules)")}
+            if "updated_at" not in columns:
+                cursor.execute("ALTER TABLE genfin_category_rules ADD COLUMN updated_at TEXT")
 
             # Create indexes
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_imported_file ON genfin_imported_transactions(file_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_imported_status ON genfin_imported_transactions(match_status)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_imported_fit ON genfin_imported_transactions(fit_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_imported_date ON genfin_imported_transactions(trans_date)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_rules_priority ON genfin_category_rules(priority)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_rules_updated ON genfin_category_rules(updated_at)")
 
             conn.commit()
 
@@ -320,8 +660,8 @@ class GenFinBankFeedsService:
             match_name_contains=row["match_name_contains"] or "",
             match_name_exact=row["match_name_exact"] or "",
             match_memo_contains=row["match_memo_contains"] or "",
-            match_amount_min=row["match_amount_min"],
-            match_amount_max=row["match_amount_max"],
+            match_amount_min=_amount_bound(row["match_amount_min"]),
+            match_amount_max=_amount_bound(row["match_amount_max"]),
             match_type=TransactionType(row["match_type"]) if row["match_type"] else None,
             assign_account_id=row["assign_account_id"],
             assign_vendor_id=row["assign_vendor_id"],
@@ -354,9 +694,13 @@ class GenFinBankFeedsService:
 
     def _save_transaction(self, trans: ImportedTransaction):
         """Save imported transaction to database"""
+        self._save_transactions([trans])
+
+    def _save_transactions(self, transactions: List[ImportedTransaction]):
+        """Save many imported transactions in one transaction"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            cursor.executemany("""
                 INSERT OR REPLACE INTO genfin_imported_transactions (
                     import_id, file_id, fit_id, trans_date, amount,
                     transaction_type, name, memo, check_number, ref_number,
@@ -364,14 +708,14 @@ class GenFinBankFeedsService:
                     suggested_account_id, suggested_vendor_id, suggested_customer_id,
                     category_rule_id, imported_at, is_active
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
-            """, (
+            """, [(
                 trans.import_id, trans.file_id, trans.fit_id,
                 trans.date.isoformat(), trans.amount, trans.transaction_type.value,
                 trans.name, trans.memo, trans.check_number, trans.ref_number,
                 trans.match_status.value, trans.matched_transaction_id, trans.match_score,
                 trans.suggested_account_id, trans.suggested_vendor_id, trans.suggested_customer_id,
                 trans.category_rule_id, trans.imported_at.isoformat()
-            ))
+            ) for trans in transactions])
             conn.commit()
 
     def _save_rule(self, rule: CategoryRule):
@@ -383,17 +727,18 @@ class GenFinBankFeedsService:
                     rule_id, name, priority, match_name_contains, match_name_exact,
                     match_memo_contains, match_amount_min, match_amount_max, match_type,
                     assign_account_id, assign_vendor_id, assign_customer_id, assign_class_id,
-                    is_active, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    is_active, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 rule.rule_id, rule.name, rule.priority,
                 rule.match_name_contains, rule.match_name_exact,
                 rule.match_memo_contains, rule.match_amount_min, rule.match_amount_max,
                 rule.match_type.value if rule.match_type else None,
                 rule.assign_account_id, rule.assign_vendor_id, rule.assign_customer_id, rule.assign_class_id,
-                1 if rule.is_active else 0, rule.created_at.isoformat()
+                1 if rule.is_active else 0, rule.created_at.isoformat(), datetime.now().isoformat()
             ))
             conn.commit()
+        self._rule_matcher = None
 
     def _get_transaction_by_id(self, import_id: str) -> Optional[ImportedTransaction]:
         """Get imported transaction by ID"""
@@ -419,6 +764,20 @@ class GenFinBankFeedsService:
             """)
             return [self._row_to_rule(row) for row in cursor.fetchall()]
 
+    def _get_rules_version(self) -> Tuple:
+        """Rule count and latest change, so edits by other workers are seen"""
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT COUNT(*), MAX(updated_at) FROM genfin_category_rules").fetchone()
+            return tuple(row)
+
+    def _get_rule_matcher(self) -> CategoryRuleMatcher:
+        """Compiled matcher for the active rules, rebuilt when the rules table changes"""
+        version = self._get_rules_version()
+        if self._rule_matcher is None or version != self._rule_matcher_version:
+            self._rule_matcher = CategoryRuleMatcher(self._get_all_rules())
+            self._rule_matcher_version = version
+        return self._rule_matcher
+
     # ==================== FILE IMPORT ====================
 
     def import_ofx_content(self, content: str, filename: str = "import.ofx") -> Dict:
@@ -448,9 +807,18 @@ class GenFinBankFeedsService:
             imported_count = 0
             duplicate_count = 0
 
+            # Load everything the loop needs once, not per line
+            matcher = self._get_rule_matcher()
+            duplicates = self._load_duplicate_index(transactions)
+            match_index = self._build_match_index(
+                min(t["date"] for t in transactions),
+                max(t["date"] for t in transactions)
+            ) if transactions else None
+            new_transactions = []
+
             for trans in transactions:
                 # Check for duplicates
-                if self._is_duplicate(trans["fit_id"], trans["date"], trans["amount"]):
+                if duplicates.contains(trans["fit_id"], trans["date"], trans["amount"]):
                     duplicate_count += 1
                     continue
 
@@ -474,12 +842,13 @@ class GenFinBankFeedsService:
                 )
 
                 # Apply category rules
-                self._apply_category_rules(imported)
+                self._apply_category_rules(imported, matcher)
 
                 # Try to auto-match
-                self._try_auto_match(imported)
+                self._try_auto_match(imported, match_index)
 
-                self._save_transaction(imported)
+                duplicates.add(trans["fit_id"], trans["date"], trans["amount"])
+                new_transactions.append(imported)
                 imported_count += 1
 
                 if trans["amount"] < 0:
@@ -487,6 +856,8 @@ class GenFinBankFeedsService:
                 else:
                     total_credits += trans["amount"]
 
+            self._save_transactions(new_transactions)
+
             import_file.total_debits = total_debits
             import_file.total_credits = total_credits
             import_file.transaction_count = imported_count
@@ -501,6 +872,7 @@ class GenFinBankFeedsService:
                 "account_masked": import_file.account_number_masked,
                 "transactions_imported": imported_count,
                 "duplicates_skipped": duplicate_count,
+                "auto_matched": sum(1 for t in new_transactions if t.match_status == MatchStatus.MATCHED),
                 "total_debits": round(total_debits, 2),
                 "total_credits": round(total_credits, 2),
                 "date_range": {
@@ -651,6 +1023,13 @@ class GenFinBankFeedsService:
             min_date = None
             max_date = None
 
+            matcher = self._get_rule_matcher()
+            match_index = self._build_match_index(
+                min(t["date"] for t in transactions),
+                max(t["date"] for t in transactions)
+            ) if transactions else None
+            new_transactions = []
+
             for trans in transactions:
                 import_id = str(uuid.uuid4())
 
@@ -666,8 +1045,9 @@ class GenFinBankFeedsService:
                     name=trans.get("name", "")
                 )
 
-                self._apply_category_rules(imported)
-                self._save_transaction(imported)
+                self._apply_category_rules(imported, matcher)
+                self._try_auto_match(imported, match_index)
+                new_transactions.append(imported)
                 imported_count += 1
 
                 if trans["amount"] < 0:
@@ -680,6 +1060,8 @@ class GenFinBankFeedsService:
                 if max_date is None or trans["date"] > max_date:
                     max_date = trans["date"]
 
+            self._save_transactions(new_transactions)
+
             import_file.start_date = min_date
             import_file.end_date = max_date
             import_file.total_debits = total_debits
@@ -693,6 +1075,7 @@ class GenFinBankFeedsService:
                 "file_id": file_id,
                 "filename": filename,
                 "transactions_imported": imported_count,
+                "auto_matched": sum(1 for t in new_transactions if t.match_status == MatchStatus.MATCHED),
                 "total_debits": round(total_debits, 2),
                 "total_credits": round(total_credits, 2)
             }
@@ -723,6 +1106,35 @@ class GenFinBankFeedsService:
 
         return False
 
+    def _load_duplicate_index(self, transactions: List[Dict]) -> "_DuplicateIndex":
+        """Load the FIT IDs and date/amount keys an import could collide with"""
+        index = _DuplicateIndex()
+        if not transactions:
+            return index
+
+        fit_ids = list({t["fit_id"] for t in transactions})
+        start = min(t["date"] for t in transactions) - timedelta(days=1)
+        end = max(t["date"] for t in transactions) + timedelta(days=1)
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for i in range(0, len(fit_ids), 500):
+                chunk = fit_ids[i:i + 500]
+                cursor.execute(f"""
+                    SELECT fit_id FROM genfin_imported_transactions
+                    WHERE is_active = 1 AND fit_id IN ({','.join('?' * len(chunk))})
+                """, chunk)
+                index.fit_ids.update(row["fit_id"] for row in cursor.fetchall())
+
+            cursor.execute("""
+                SELECT trans_date, amount FROM genfin_imported_transactions
+                WHERE is_active = 1 AND trans_date BETWEEN ? AND ?
+            """, (start.isoformat(), end.isoformat()))
+            for row in cursor.fetchall():
+                index.add(None, datetime.strptime(row["trans_date"], "%Y-%m-%d").date(), row["amount"])
+
+        return index
+
     def _determine_transaction_type(self, trans: Dict) -> TransactionType:
         """Determine transaction type from OFX data"""
         trntype = trans.get("trntype", "").upper()
@@ -744,14 +1156,184 @@ class GenFinBankFeedsService:
 
     # ==================== MATCHING ====================
 
-    def _try_auto_match(self, imported: ImportedTransaction):
+    def _build_match_index(self, start_date: date, end_date: date) -> MatchCandidateIndex:
+        """
+        Index GenFin bank transactions, checks, bills and payments that fall
+        within the match window around [start_date, end_date].
+
+        One range query per source table regardless of how many lines are
+        being matched.
+        """
+        low = (start_date - timedelta(days=MATCH_DATE_WINDOW_DAYS)).isoformat()
+        high = (end_date + timedelta(days=MATCH_DATE_WINDOW_DAYS)).isoformat()
+
+        sources = [
+            ("bank_transaction", """
+                SELECT transaction_id AS id, transaction_date AS day, amount,
+                       payee, reference_number AS check_number
+                FROM genfin_bank_transactions
+                WHERE is_active = 1 AND check_id IS NULL AND COALESCE(imported, 0) = 0
+                AND transaction_date BETWEEN ? AND ?
+            """),
+            ("check", """
+                SELECT check_id AS id, check_date AS day, -amount AS amount,
+                       payee_name AS payee, CAST(check_number AS TEXT) AS check_number
+                FROM genfin_checks
+                WHERE is_active = 1 AND status != 'voided'
+                AND check_date BETWEEN ? AND ?
+            """),
+            ("bill_payment", """
+                SELECT p.payment_id AS id, p.payment_date AS day, -p.total_amount AS amount,
+                       COALESCE(v.display_name, '') AS payee,
+                       CASE WHEN p.payment_method = 'check' THEN p.reference_number ELSE '' END AS check_number
+                FROM genfin_bill_payments p
+                LEFT JOIN genfin_vendors v ON p.vendor_id = v.vendor_id
+                WHERE p.is_active = 1 AND p.is_voided = 0
+                AND p.payment_date BETWEEN ? AND ?
+            """),
+            ("payment_received", """
+                SELECT p.payment_id AS id, p.payment_date AS day, p.total_amount AS amount,
+                       COALESCE(c.display_name, '') AS payee,
+                       CASE WHEN p.payment_method = 'check' THEN p.reference_number ELSE '' END AS check_number
+                FROM genfin_payments_received p
+                LEFT JOIN genfin_customers c ON p.customer_id = c.customer_id
+                WHERE p.is_voided = 0
+                AND p.payment_date BETWEEN ? AND ?
+            """),
+            ("bill", """
+                SELECT b.bill_id AS id, b.due_date AS day, -b.balance_due AS amount,
+                       COALESCE(v.display_name, '') AS payee, '' AS check_number
+                FROM genfin_bills b
+                LEFT JOIN genfin_vendors v ON b.vendor_id = v.vendor_id
+                WHERE b.is_active = 1 AND b.balance_due > 0
+                AND b.status IN ('open', 'partial', 'overdue')
+                AND b.due_date BETWEEN ? AND ?
+            """),
+        ]
+
+        candidates = []
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            for source, query in sources:
+                try:
+                    cursor.execute(query, (low, high))
+                except sqlite3.OperationalError:
+                    # Source service has not created its tables in this database
+                    continue
+
+                for row in cursor.fetchall():
+                    try:
+                        day = datetime.strptime(row["day"][:10], "%Y-%m-%d").date()
+                    except (TypeError, ValueError):
+                        continue
+                    candidates.append(MatchCandidate(
+                        transaction_id=row["id"],
+                        source=source,
+                        date=day,
+                        amount=row["amount"] or 0.0,
+                        payee=row["payee"] or "",
+                        check_number=row["check_number"] or ""
+                    ))
+
+            # Don't offer records another imported line is already matched to
+            cursor.execute("""
+                SELECT matched_transaction_id FROM genfin_imported_transactions
+                WHERE is_active = 1 AND match_status = 'matched'
+                AND matched_transaction_id IS NOT NULL
+            """)
+            claimed = {row["matched_transaction_id"] for row in cursor.fetchall()}
+
+        return MatchCandidateIndex(candidates, claimed)
+
+    def _try_auto_match(self, imported: ImportedTransaction, index: Optional[MatchCandidateIndex] = None):
         """Try to auto-match imported transaction with existing transactions"""
-        # In a real implementation, this would check against existing transactions
-        # For now, just set a match score based on categorization
-        if imported.suggested_account_id:
-            imported.match_score = 0.8
-        else:
+        if index is None:
+            index = self._build_match_index(imported.date, imported.date)
+
+        ranked = index.rank(imported, limit=1)
+        if not ranked:
             imported.match_score = 0.0
+            return
+
+        score, candidate = ranked[0]
+        imported.match_score = score
+        if score >= AUTO_MATCH_THRESHOLD:
+            imported.match_status = MatchStatus.MATCHED
+            imported.matched_transaction_id = candidate.transaction_id
+            index.claimed.add(candidate.transaction_id)
+
+    def get_match_candidates(self, import_id: str, limit: int = MAX_MATCH_CANDIDATES) -> Dict:
+        """Ranked match candidates for an imported transaction (review UI)"""
+        imported = self._get_transaction_by_id(import_id)
+        if not imported:
+            return {"success": False, "error": "Imported transaction not found"}
+
+        index = self._build_match_index(imported.date, imported.date)
+        # Keep the transaction's own current match in the list
+        index.claimed.discard(imported.matched_transaction_id)
+
+        return {
+            "success": True,
+            "import_id": import_id,
+            "auto_match_threshold": AUTO_MATCH_THRESHOLD,
+            "candidates": [
+                {
+                    "transaction_id": candidate.transaction_id,
+                    "source": candidate.source,
+                    "date": candidate.date.isoformat(),
+                    "amount": round(candidate.amount, 2),
+                    "payee": candidate.payee,
+                    "check_number": candidate.check_number,
+                    "score": score,
+                    "is_current_match": candidate.transaction_id == imported.matched_transaction_id
+                }
+                for score, candidate in index.rank(imported, limit)
+            ]
+        }
+
+    def auto_match_all(self, file_id: str = None) -> Dict:
+        """Run the matching engine over all unmatched imported transactions"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            query = """
+                SELECT * FROM genfin_imported_transactions
+                WHERE is_active = 1 AND match_status = 'unmatched'
+            """
+            params = []
+
+            if file_id:
+                query += " AND file_id = ?"
+                params.append(file_id)
+
+            cursor.execute(query + " ORDER BY trans_date", params)
+            pending = [self._row_to_transaction(row) for row in cursor.fetchall()]
+
+        if not pending:
+            return {"success": True, "transactions_processed": 0, "transactions_matched": 0}
+
+        index = self._build_match_index(pending[0].date, pending[-1].date)
+        for trans in pending:
+            self._try_auto_match(trans, index)
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                UPDATE genfin_imported_transactions
+                SET match_status = ?, matched_transaction_id = ?, match_score = ?
+                WHERE import_id = ?
+            """, [
+                (t.match_status.value, t.matched_transaction_id, t.match_score, t.import_id)
+                for t in pending
+            ])
+            conn.commit()
+
+        return {
+            "success": True,
+            "transactions_processed": len(pending),
+            "transactions_matched": sum(1 for t in pending if t.match_status == MatchStatus.MATCHED)
+        }
 
     def match_transaction(
         self,
@@ -816,17 +1398,14 @@ class GenFinBankFeedsService:
 
     # ==================== CATEGORY RULES ====================
 
-    def _apply_category_rules(self, imported: ImportedTransaction):
+    def _apply_category_rules(self, imported: ImportedTransaction, matcher: Optional[CategoryRuleMatcher] = None):
         """Apply category rules to imported transaction"""
-        sorted_rules = self._get_all_rules()
-
-        for rule in sorted_rules:
-            if self._rule_matches(rule, imported):
-                imported.suggested_account_id = rule.assign_account_id
-                imported.suggested_vendor_id = rule.assign_vendor_id
-                imported.suggested_customer_id = rule.assign_customer_id
-                imported.category_rule_id = rule.rule_id
-                break
+        rule = (matcher or self._get_rule_matcher()).match(imported)
+        if rule:
+            imported.suggested_account_id = rule.assign_account_id
+            imported.suggested_vendor_id = rule.assign_vendor_id
+            imported.suggested_customer_id = rule.assign_customer_id
+            imported.category_rule_id = rule.rule_id
 
     def _rule_matches(self, rule: CategoryRule, imported: ImportedTransaction) -> bool:
         """Check if a rule matches the transaction"""
@@ -873,7 +1452,8 @@ class GenFinBankFeedsService:
         match_amount_max: float = None,
         assign_account_id: str = None,
         assign_vendor_id: str = None,
-        priority: int = 0
+        priority: int = 0,
+        match_name_exact: str = ""
     ) -> Dict:
         """Create a new category rule"""
         rule_id = str(uuid.uuid4())
@@ -883,6 +1463,7 @@ class GenFinBankFeedsService:
             name=name,
             priority=priority,
             match_name_contains=match_name_contains,
+            match_name_exact=match_name_exact,
             match_memo_contains=match_memo_contains,
             match_amount_min=match_amount_min,
             match_amount_max=match_amount_max,
@@ -923,12 +1504,13 @@ class GenFinBankFeedsService:
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE genfin_category_rules
-                SET is_active = 0
+                SET is_active = 0, updated_at = ?
                 WHERE rule_id = ?
-            """, (rule_id,))
+            """, (datetime.now().isoformat(), rule_id))
             if cursor.rowcount == 0:
                 return {"success": False, "error": "Rule not found"}
             conn.commit()
+        self._rule_matcher = None
 
         return {"success": True, "message": "Rule deleted"}
 
@@ -1090,18 +1672,19 @@ class GenFinBankFeedsService:
             cursor.execute(query, params)
             rows = cursor.fetchall()
 
-            categorized = 0
-            for row in rows:
-                trans = self._row_to_transaction(row)
-                self._apply_category_rules(trans)
-                if trans.suggested_account_id:
-                    self._save_transaction(trans)
-                    categorized += 1
+        matcher = self._get_rule_matcher()
+        categorized = []
+        for row in rows:
+            trans = self._row_to_transaction(row)
+            self._apply_category_rules(trans, matcher)
+            if trans.suggested_account_id:
+                categorized.append(trans)
+        self._save_transactions(categorized)
 
         return {
             "success": True,
             "transactions_processed": len(rows),
-            "transactions_categorized": categorized
+            "transactions_categorized": len(categorized)
         }
 
     def get_service_summary(self) -> Dict:
@@ -1149,4 +1732,4 @@ class GenFinBankFeedsService:
 
 
 # Singleton instance
-genfin_bank_feeds_service = GenFinBankFeedsService()
+genfin_bank_feeds_service = lazy_service("genfin_bank_feeds", GenFinBankFeedsService)
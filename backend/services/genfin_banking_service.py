@@ -11,8 +11,13 @@ import uuid
 import sqlite3
 import json
 import math
+from database.db_utils import get_pooled_connection
+from database.schema import ensure_schema
+from services.registry import lazy_service
 
 
+SCHEMA_VERSION = 1
+
 
 class BankAccountType(Enum):
     """Bank account types"""
@@ -145,12 +150,12 @@ class GenFinBankingService:
         if self._initialized:
             return
         self.db_path = db_path
-        self._init_tables()
+        ensure_schema(self.db_path, "genfin_banking", SCHEMA_VERSION, self._init_tables)
         self._initialized = True
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -1968,4 +1973,4 @@ class GenFinBankingService:
 
 
 # Singleton instance
-genfin_banking_service = GenFinBankingService()
+genfin_banking_service = lazy_service("genfin_banking", GenFinBankingService)
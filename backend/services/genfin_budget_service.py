@@ -14,6 +14,12 @@ import json
 
 from .genfin_core_service import genfin_core_service
 from .genfin_reports_service import genfin_reports_service
+from database.db_utils import get_pooled_connection
+from database.schema import ensure_schema
+from services.registry import lazy_service
+
+
+SCHEMA_VERSION = 1
 
 
 class BudgetType(Enum):
@@ -131,12 +137,12 @@ class GenFinBudgetService:
             return
 
         self.db_path = db_path
-        self._init_tables()
+        ensure_schema(self.db_path, "genfin_budget", SCHEMA_VERSION, self._init_tables)
         self._initialized = True
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -1494,4 +1500,4 @@ class GenFinBudgetService:
 
 
 # Singleton instance
-genfin_budget_service = GenFinBudgetService()
+genfin_budget_service = lazy_service("genfin_budget", GenFinBudgetService)
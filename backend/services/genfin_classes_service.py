@@ -10,6 +10,12 @@ from typing import Dict, List, Optional
 from enum import Enum
 from dataclasses import dataclass, field
 import uuid
+from database.db_utils import get_pooled_connection
+from database.schema import ensure_schema
+from services.registry import lazy_service
+
+
+SCHEMA_VERSION = 1
 
 
 class ClassType(Enum):
@@ -239,13 +245,16 @@ class GenFinClassesService:
             return
 
         self.db_path = db_path
-        self._init_tables()
-        self._initialize_farm_classes()
+        ensure_schema(
+            self.db_path, "genfin_classes", SCHEMA_VERSION,
+            self._init_tables,
+            self._initialize_farm_classes
+        )
         self._initialized = True
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -1489,4 +1498,4 @@ class GenFinClassesService:
 
 
 # Singleton instance
-genfin_classes_service = GenFinClassesService()
+genfin_classes_service = lazy_service("genfin_classes", GenFinClassesService)
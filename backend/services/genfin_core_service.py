@@ -10,6 +10,12 @@ from enum import Enum
 from dataclasses import dataclass, field
 import uuid
 import sqlite3
+from database.db_utils import get_pooled_connection
+from database.schema import ensure_schema
+from services.registry import lazy_service
+
+
+SCHEMA_VERSION = 1
 
 
 class AccountType(Enum):
@@ -290,16 +296,14 @@ class GenFinCoreService:
         self.company_name = "GenFin"
         self.fiscal_year_start_month = 1  # January
 
-        # Initialize database tables
-        self._init_tables()
-
-        # Initialize with farm chart of accounts if empty
-        self._initialize_chart_of_accounts()
+        # Create tables and seed the farm chart of accounts (once per database)
+        ensure_schema(self.db_path, "genfin_core", SCHEMA_VERSION,
+                      self._init_tables, self._initialize_chart_of_accounts)
         self._initialized = True
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -412,6 +416,21 @@ class GenFinCoreService:
                 )
             """)
 
+            # Materialized account balances: one row per account per entry date
+            # with that day's activity and running totals through the day
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS genfin_account_balances (
+                    account_id TEXT NOT NULL,
+                    balance_date TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    debit_total REAL DEFAULT 0.0,
+                    credit_total REAL DEFAULT 0.0,
+                    running_debit REAL DEFAULT 0.0,
+                    running_credit REAL DEFAULT 0.0,
+                    PRIMARY KEY (account_id, balance_date)
+                )
+            """)
+
             # Initialize next_entry_number if not exists
             cursor.execute("""
                 INSERT OR IGNORE INTO genfin_core_settings (key, value) VALUES ('next_entry_number', '1')
@@ -424,9 +443,21 @@ class GenFinCoreService:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_status ON genfin_journal_entries(status)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_entry_lines_entry ON genfin_journal_entry_lines(entry_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_entry_lines_account ON genfin_journal_entry_lines(account_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_account_balances_period ON genfin_account_balances(account_id, period)")
 
             conn.commit()
 
+            # Backfill balances once for ledgers created before the table existed
+            cursor.execute(
+                "SELECT value FROM genfin_core_settings WHERE key = 'account_balances_version'"
+            )
+            if not cursor.fetchone():
+                self._rebuild_account_balances(cursor)
+                cursor.execute(
+                    "INSERT OR REPLACE INTO genfin_core_settings (key, value) VALUES ('account_balances_version', '1')"
+                )
+                conn.commit()
+
     def _get_next_entry_number(self) -> int:
         """Get and increment the next entry number"""
         with self._get_connection() as conn:
@@ -597,6 +628,8 @@ class GenFinCoreService:
                     VALUES (?, ?, ?, ?, ?, 0)
                 """, (str(uuid.uuid4()), entry_id, obe_id, f"Opening balance - {account_name}", abs(balance)))
 
+            self._apply_entry_to_balances(cursor, entry_id, entry_date)
+
             conn.commit()
 
     def update_account(
@@ -720,14 +753,16 @@ class GenFinCoreService:
             cursor.execute(query, params)
             rows = cursor.fetchall()
 
-            result = []
-            for row in rows:
-                acct_dict = self._row_to_account_dict(row)
-                if include_balances:
-                    acct_dict["balance"] = self.get_account_balance(row['account_id'])
-                result.append(acct_dict)
+        balances = self.get_account_balances() if include_balances else {}
 
-            return result
+        result = []
+        for row in rows:
+            acct_dict = self._row_to_account_dict(row)
+            if include_balances:
+                acct_dict["balance"] = balances.get(row['account_id'], 0.0)
+            result.append(acct_dict)
+
+        return result
 
     def get_chart_of_accounts(self) -> Dict:
         """Get complete chart of accounts organized by type"""
@@ -746,20 +781,22 @@ class GenFinCoreService:
             """)
             rows = cursor.fetchall()
 
-            for row in rows:
-                acct_dict = self._row_to_account_dict(row)
-                acct_dict["balance"] = self.get_account_balance(row['account_id'])
-
-                if row['account_type'] == 'asset':
-                    coa["assets"].append(acct_dict)
-                elif row['account_type'] == 'liability':
-                    coa["liabilities"].append(acct_dict)
-                elif row['account_type'] == 'equity':
-                    coa["equity"].append(acct_dict)
-                elif row['account_type'] == 'revenue':
-                    coa["revenue"].append(acct_dict)
-                elif row['account_type'] == 'expense':
-                    coa["expenses"].append(acct_dict)
+        balances = self.get_account_balances()
+
+        for row in rows:
+            acct_dict = self._row_to_account_dict(row)
+            acct_dict["balance"] = balances.get(row['account_id'], 0.0)
+
+            if row['account_type'] == 'asset':
+                coa["assets"].append(acct_dict)
+            elif row['account_type'] == 'liability':
+                coa["liabilities"].append(acct_dict)
+            elif row['account_type'] == 'equity':
+                coa["equity"].append(acct_dict)
+            elif row['account_type'] == 'revenue':
+                coa["revenue"].append(acct_dict)
+            elif row['account_type'] == 'expense':
+                coa["expenses"].append(acct_dict)
 
         return coa
 
@@ -833,6 +870,12 @@ class GenFinCoreService:
                     line.get("location_id")
                 ))
 
+            if auto_post:
+                self._apply_balance_deltas(cursor, entry_date, [
+                    (line["account_id"], line.get("debit", 0) or 0, line.get("credit", 0) or 0)
+                    for line in lines
+                ])
+
             conn.commit()
 
         return {
@@ -847,7 +890,7 @@ class GenFinCoreService:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            cursor.execute("SELECT status FROM genfin_journal_entries WHERE entry_id = ?", (entry_id,))
+            cursor.execute("SELECT status, entry_date FROM genfin_journal_entries WHERE entry_id = ?", (entry_id,))
             row = cursor.fetchone()
 
             if not row:
@@ -862,6 +905,8 @@ class GenFinCoreService:
                 WHERE entry_id = ?
             """, (datetime.now(timezone.utc).isoformat(), entry_id))
 
+            self._apply_entry_to_balances(cursor, entry_id, row['entry_date'])
+
             conn.commit()
 
         return {
@@ -874,7 +919,7 @@ class GenFinCoreService:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            cursor.execute("SELECT status, memo FROM genfin_journal_entries WHERE entry_id = ?", (entry_id,))
+            cursor.execute("SELECT status, memo, entry_date FROM genfin_journal_entries WHERE entry_id = ?", (entry_id,))
             row = cursor.fetchone()
 
             if not row:
@@ -893,6 +938,9 @@ class GenFinCoreService:
                 WHERE entry_id = ?
             """, (new_memo, entry_id))
 
+            if row['status'] == 'posted':
+                self._apply_entry_to_balances(cursor, entry_id, row['entry_date'], sign=-1)
+
             conn.commit()
 
         return {
@@ -1016,47 +1064,283 @@ class GenFinCoreService:
 
     # ==================== GENERAL LEDGER ====================
 
+    @staticmethod
+    def _signed_balance(account_type: str, debits: float, credits: float) -> float:
+        """Net activity in the account's normal-balance direction"""
+        # Assets and Expenses increase with debits
+        if account_type in ['asset', 'expense']:
+            return debits - credits
+        # Liabilities, Equity, Revenue increase with credits
+        return credits - debits
+
+    def _apply_balance_deltas(self, cursor: sqlite3.Cursor, entry_date: str, deltas: List[tuple], sign: int = 1):
+        """
+        Fold (account_id, debit, credit) deltas for one entry date into the
+        materialized balance table. Runs on the caller's cursor so it commits
+        or rolls back together with the journal entry change.
+        """
+        totals: Dict[str, List[float]] = {}
+        for account_id, debit, credit in deltas:
+            acc = totals.setdefault(account_id, [0.0, 0.0])
+            acc[0] += sign * (debit or 0.0)
+            acc[1] += sign * (credit or 0.0)
+
+        period = entry_date[:7]
+        for account_id, (debit, credit) in totals.items():
+            if not debit and not credit:
+                continue
+
+            # Seed a row for this date carrying forward the prior running totals
+            cursor.execute("""
+                INSERT OR IGNORE INTO genfin_account_balances
+                (account_id, balance_date, period, debit_total, credit_total, running_debit, running_credit)
+                SELECT ?, ?, ?, 0, 0,
+                       COALESCE((SELECT running_debit FROM genfin_account_balances
+                                 WHERE account_id = ? AND balance_date < ?
+                                 ORDER BY balance_date DESC LIMIT 1), 0),
+                       COALESCE((SELECT running_credit FROM genfin_account_balances
+                                 WHERE account_id = ? AND balance_date < ?
+                                 ORDER BY balance_date DESC LIMIT 1), 0)
+            """, (account_id, entry_date, period, account_id, entry_date, account_id, entry_date))
+
+            cursor.execute("""
+                UPDATE genfin_account_balances
+                SET debit_total = debit_total + ?, credit_total = credit_total + ?
+                WHERE account_id = ? AND balance_date = ?
+            """, (debit, credit, account_id, entry_date))
+
+            # Roll the change forward through every later day for the account
+            cursor.execute("""
+                UPDATE genfin_account_balances
+                SET running_debit = running_debit + ?, running_credit = running_credit + ?
+                WHERE account_id = ? AND balance_date >= ?
+            """, (debit, credit, account_id, entry_date))
+
+            # A day whose activity was fully voided carries no information
+            cursor.execute("""
+                DELETE FROM genfin_account_balances
+                WHERE account_id = ? AND balance_date = ?
+                AND ABS(debit_total) < 1e-9 AND ABS(credit_total) < 1e-9
+            """, (account_id, entry_date))
+
+    def _apply_entry_to_balances(self, cursor: sqlite3.Cursor, entry_id: str, entry_date: str, sign: int = 1):
+        """Add (sign=1) or remove (sign=-1) a stored entry's lines from the balance table"""
+        cursor.execute(
+            "SELECT account_id, debit, credit FROM genfin_journal_entry_lines WHERE entry_id = ?",
+            (entry_id,)
+        )
+        deltas = [(row['account_id'], row['debit'], row['credit']) for row in cursor.fetchall()]
+        self._apply_balance_deltas(cursor, entry_date, deltas, sign)
+
+    @staticmethod
+    def _expected_balance_rows(cursor: sqlite3.Cursor) -> List[tuple]:
+        """Recompute balance table rows from the raw posted journal lines"""
+        cursor.execute("""
+            SELECT account_id, entry_date, debit_total, credit_total,
+                   SUM(debit_total) OVER w AS running_debit,
+                   SUM(credit_total) OVER w AS running_credit
+            FROM (
+                SELECT l.account_id, e.entry_date,
+                       SUM(l.debit) AS debit_total, SUM(l.credit) AS credit_total
+                FROM genfin_journal_entry_lines l
+                JOIN genfin_journal_entries e ON l.entry_id = e.entry_id
+                WHERE e.status IN ('posted', 'reconciled')
+                GROUP BY l.account_id, e.entry_date
+                HAVING ABS(SUM(l.debit)) >= 1e-9 OR ABS(SUM(l.credit)) >= 1e-9
+            )
+            WINDOW w AS (PARTITION BY account_id ORDER BY entry_date)
+        """)
+        return [tuple(row) for row in cursor.fetchall()]
+
+    def _rebuild_account_balances(self, cursor: sqlite3.Cursor) -> int:
+        """Replace the balance table with totals recomputed from journal lines"""
+        rows = self._expected_balance_rows(cursor)
+        cursor.execute("DELETE FROM genfin_account_balances")
+        cursor.executemany("""
+            INSERT INTO genfin_account_balances
+            (account_id, balance_date, period, debit_total, credit_total, running_debit, running_credit)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (account_id, entry_date, (entry_date or "")[:7], debit, credit, run_debit, run_credit)
+            for account_id, entry_date, debit, credit, run_debit, run_credit in rows
+        ])
+        return len(rows)
+
+    def rebuild_account_balances(self) -> Dict:
+        """Rebuild materialized account balances from posted journal lines"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            count = self._rebuild_account_balances(cursor)
+            conn.commit()
+
+        return {"success": True, "rows_rebuilt": count}
+
+    def verify_account_balances(self, tolerance: float = 0.005) -> Dict:
+        """
+        Compare the materialized balance table against the raw journal lines.
+
+        Returns a report listing every (account, date) row that is missing,
+        unexpected, or differs by more than the tolerance.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            expected = {
+                (row[0], row[1]): row[2:] for row in self._expected_balance_rows(cursor)
+            }
+            cursor.execute("""
+                SELECT account_id, balance_date, debit_total, credit_total, running_debit, running_credit
+                FROM genfin_account_balances
+            """)
+            actual = {(row[0], row[1]): tuple(row[2:]) for row in cursor.fetchall()}
+
+        mismatches = []
+        for key in expected.keys() | actual.keys():
+            exp = expected.get(key)
+            act = actual.get(key)
+            if exp is None:
+                problem = "unexpected"
+            elif act is None:
+                problem = "missing"
+            elif any(abs(e - a) > tolerance for e, a in zip(exp, act)):
+                problem = "mismatch"
+            else:
+                continue
+            mismatches.append({
+                "account_id": key[0],
+                "balance_date": key[1],
+                "problem": problem,
+                "expected": list(exp) if exp else None,
+                "actual": list(act) if act else None
+            })
+
+        mismatches.sort(key=lambda m: (m["account_id"], m["balance_date"] or ""))
+        return {
+            "consistent": not mismatches,
+            "rows_checked": len(expected),
+            "accounts_checked": len({key[0] for key in expected}),
+            "mismatches": mismatches
+        }
+
+    def get_account_balances(
+        self,
+        as_of_date: Optional[str] = None,
+        account_ids: Optional[List[str]] = None
+    ) -> Dict[str, float]:
+        """
+        Balances for many accounts in a single query.
+
+        Each account's balance is its opening balance plus the running totals
+        on the latest materialized row on or before as_of_date.
+        """
+        return self.get_account_balances_at([as_of_date], account_ids)[as_of_date]
+
+    def get_account_balances_at(
+        self,
+        as_of_dates: List[Optional[str]],
+        account_ids: Optional[List[str]] = None
+    ) -> Dict[Optional[str], Dict[str, float]]:
+        """
+        Balances for many accounts at several dates in a single query.
+
+        Returns {as_of_date: {account_id: balance}}; a None date means the
+        latest balance. Used by comparative reports so the current and prior
+        columns come from one pass over the balance table.
+        """
+        dates = list(dict.fromkeys(as_of_dates))
+        if account_ids is not None and not account_ids:
+            return {as_of: {} for as_of in dates}
+
+        columns = []
+        params: List = []
+        for i, as_of in enumerate(dates):
+            date_clause = " AND b.balance_date <= ?" if as_of else ""
+            for column in ("running_debit", "running_credit"):
+                columns.append(f"""
+                       (SELECT b.{column} FROM genfin_account_balances b
+                        WHERE b.account_id = a.account_id{date_clause}
+                        ORDER BY b.balance_date DESC LIMIT 1) AS {column}_{i}""")
+                if as_of:
+                    params.append(as_of)
+
+        query = f"""
+            SELECT a.account_id, a.account_type, a.opening_balance,{','.join(columns)}
+            FROM genfin_accounts a
+        """
+        if account_ids is not None:
+            query += f" WHERE a.account_id IN ({','.join('?' * len(account_ids))})"
+            params.extend(account_ids)
+
+        balances: Dict[Optional[str], Dict[str, float]] = {as_of: {} for as_of in dates}
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+
+            for row in cursor.fetchall():
+                opening = row['opening_balance'] or 0.0
+                for i, as_of in enumerate(dates):
+                    balance = opening + self._signed_balance(
+                        row['account_type'],
+                        row[f'running_debit_{i}'] or 0.0,
+                        row[f'running_credit_{i}'] or 0.0
+                    )
+                    balances[as_of][row['account_id']] = round(balance, 2)
+
+        return balances
+
     def get_account_balance(
         self,
         account_id: str,
         as_of_date: Optional[str] = None
     ) -> float:
-        """Calculate account balance as of a date"""
+        """Account balance as of a date, read from the materialized balance table"""
+        return self.get_account_balances(as_of_date, [account_id]).get(account_id, 0.0)
+
+    def get_account_activity(
+        self,
+        account_id: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Dict:
+        """Debit/credit activity for an account between two dates (inclusive)"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-
-            cursor.execute("SELECT * FROM genfin_accounts WHERE account_id = ?", (account_id,))
+            cursor.execute("SELECT account_type FROM genfin_accounts WHERE account_id = ?", (account_id,))
             account_row = cursor.fetchone()
-
             if not account_row:
-                return 0.0
-
-            balance = account_row['opening_balance'] or 0.0
-            account_type = account_row['account_type']
-
-            query = """
-                SELECT l.debit, l.credit FROM genfin_journal_entry_lines l
-                JOIN genfin_journal_entries e ON l.entry_id = e.entry_id
-                WHERE l.account_id = ? AND e.status IN ('posted', 'reconciled')
-            """
-            params = [account_id]
-
-            if as_of_date:
-                query += " AND e.entry_date <= ?"
-                params.append(as_of_date)
-
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
+                return {"error": "Account not found"}
 
-            for row in rows:
-                # Assets and Expenses increase with debits
-                if account_type in ['asset', 'expense']:
-                    balance += row['debit'] - row['credit']
-                # Liabilities, Equity, Revenue increase with credits
-                else:
-                    balance += row['credit'] - row['debit']
+            def running_at(clause: str, param: Optional[str]) -> tuple:
+                if param is None:
+                    return (0.0, 0.0)
+                cursor.execute(f"""
+                    SELECT running_debit, running_credit FROM genfin_account_balances
+                    WHERE account_id = ? AND balance_date {clause} ?
+                    ORDER BY balance_date DESC LIMIT 1
+                """, (account_id, param))
+                row = cursor.fetchone()
+                return (row['running_debit'], row['running_credit']) if row else (0.0, 0.0)
+
+            if end_date is None:
+                cursor.execute("""
+                    SELECT running_debit, running_credit FROM genfin_account_balances
+                    WHERE account_id = ? ORDER BY balance_date DESC LIMIT 1
+                """, (account_id,))
+                row = cursor.fetchone()
+                end_totals = (row['running_debit'], row['running_credit']) if row else (0.0, 0.0)
+            else:
+                end_totals = running_at("<=", end_date)
+            start_totals = running_at("<", start_date)
 
-        return round(balance, 2)
+        debits = end_totals[0] - start_totals[0]
+        credits = end_totals[1] - start_totals[1]
+        return {
+            "account_id": account_id,
+            "start_date": start_date,
+            "end_date": end_date,
+            "total_debits": round(debits, 2),
+            "total_credits": round(credits, 2),
+            "net_change": round(self._signed_balance(account_row['account_type'], debits, credits), 2)
+        }
 
     def get_account_ledger(
         self,
@@ -1079,18 +1363,16 @@ class GenFinCoreService:
             # Calculate opening balance
             opening_balance = account_row['opening_balance'] or 0.0
             if start_date:
-                query = """
-                    SELECT l.debit, l.credit FROM genfin_journal_entry_lines l
-                    JOIN genfin_journal_entries e ON l.entry_id = e.entry_id
-                    WHERE l.account_id = ? AND e.status IN ('posted', 'reconciled')
-                    AND e.entry_date < ?
-                """
-                cursor.execute(query, (account_id, start_date))
-                for row in cursor.fetchall():
-                    if account_type in ['asset', 'expense']:
-                        opening_balance += row['debit'] - row['credit']
-                    else:
-                        opening_balance += row['credit'] - row['debit']
+                cursor.execute("""
+                    SELECT running_debit, running_credit FROM genfin_account_balances
+                    WHERE account_id = ? AND balance_date < ?
+                    ORDER BY balance_date DESC LIMIT 1
+                """, (account_id, start_date))
+                prior = cursor.fetchone()
+                if prior:
+                    opening_balance += self._signed_balance(
+                        account_type, prior['running_debit'], prior['running_credit']
+                    )
 
             # Get transactions
             query = """
@@ -1156,40 +1438,42 @@ class GenFinCoreService:
             """)
             rows = cursor.fetchall()
 
-            for account_row in rows:
-                balance = self.get_account_balance(account_row['account_id'], as_of_date)
+        balances = self.get_account_balances(as_of_date)
 
-                if balance == 0:
-                    continue
+        for account_row in rows:
+            balance = balances.get(account_row['account_id'], 0.0)
 
-                account_type = account_row['account_type']
+            if balance == 0:
+                continue
 
-                # Normalize debit/credit columns
-                if account_type in ['asset', 'expense']:
-                    if balance >= 0:
-                        debit = balance
-                        credit = 0
-                    else:
-                        debit = 0
-                        credit = abs(balance)
+            account_type = account_row['account_type']
+
+            # Normalize debit/credit columns
+            if account_type in ['asset', 'expense']:
+                if balance >= 0:
+                    debit = balance
+                    credit = 0
                 else:
-                    if balance >= 0:
-                        debit = 0
-                        credit = balance
-                    else:
-                        debit = abs(balance)
-                        credit = 0
-
-                total_debits += debit
-                total_credits += credit
-
-                accounts.append({
-                    "account_number": account_row['account_number'],
-                    "account_name": account_row['name'],
-                    "account_type": account_type,
-                    "debit": round(debit, 2),
-                    "credit": round(credit, 2)
-                })
+                    debit = 0
+                    credit = abs(balance)
+            else:
+                if balance >= 0:
+                    debit = 0
+                    credit = balance
+                else:
+                    debit = abs(balance)
+                    credit = 0
+
+            total_debits += debit
+            total_credits += credit
+
+            accounts.append({
+                "account_number": account_row['account_number'],
+                "account_name": account_row['name'],
+                "account_type": account_type,
+                "debit": round(debit, 2),
+                "credit": round(credit, 2)
+            })
 
         return {
             "as_of_date": as_of_date or date.today().isoformat(),
@@ -1289,6 +1573,8 @@ class GenFinCoreService:
         else:
             year_end = date(year + 1, self.fiscal_year_start_month - 1, 28)
 
+        year_end_balances = self.get_account_balances(year_end.isoformat())
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT account_id, account_type FROM genfin_accounts WHERE is_active = 1")
@@ -1296,9 +1582,9 @@ class GenFinCoreService:
 
             for account in accounts:
                 if account['account_type'] == 'revenue':
-                    total_revenue += self.get_account_balance(account['account_id'], year_end.isoformat())
+                    total_revenue += year_end_balances.get(account['account_id'], 0.0)
                 elif account['account_type'] == 'expense':
-                    total_expenses += self.get_account_balance(account['account_id'], year_end.isoformat())
+                    total_expenses += year_end_balances.get(account['account_id'], 0.0)
 
         net_income = total_revenue - total_expenses
 
@@ -1311,7 +1597,7 @@ class GenFinCoreService:
             # Close revenue accounts
             cursor.execute("SELECT account_id, name FROM genfin_accounts WHERE account_type = 'revenue' AND is_active = 1")
             for account in cursor.fetchall():
-                balance = self.get_account_balance(account['account_id'], year_end.isoformat())
+                balance = year_end_balances.get(account['account_id'], 0.0)
                 if balance != 0:
                     closing_lines.append({
                         "account_id": account['account_id'],
@@ -1323,7 +1609,7 @@ class GenFinCoreService:
             # Close expense accounts
             cursor.execute("SELECT account_id, name FROM genfin_accounts WHERE account_type = 'expense' AND is_active = 1")
             for account in cursor.fetchall():
-                balance = self.get_account_balance(account['account_id'], year_end.isoformat())
+                balance = year_end_balances.get(account['account_id'], 0.0)
                 if balance != 0:
                     closing_lines.append({
                         "account_id": account['account_id'],
@@ -1535,4 +1821,4 @@ class GenFinCoreService:
 
 
 # Singleton instance
-genfin_core_service = GenFinCoreService()
+genfin_core_service = lazy_service("genfin_core", GenFinCoreService)
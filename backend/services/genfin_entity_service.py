@@ -17,6 +17,11 @@ from datetime import datetime, date, timezone
 from typing import Optional, List, Dict, Tuple
 from enum import Enum
 from pydantic import BaseModel, Field
+from database.db_utils import get_pooled_connection
+from database.schema import ensure_schema
+
+
+SCHEMA_VERSION = 1
 
 
 # ============================================================================
@@ -109,11 +114,11 @@ class GenFinEntityService:
 
     def __init__(self, db_path: str = "agtools.db"):
         self.db_path = db_path
-        self._init_tables()
-        self._ensure_default_entity()
+        ensure_schema(self.db_path, "genfin_entity", SCHEMA_VERSION,
+                      self._init_tables, self._ensure_default_entity)
 
     def _get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -8,6 +8,12 @@ from typing import Dict, Optional
 from enum import Enum
 from dataclasses import dataclass, field
 import uuid
+from database.db_utils import get_pooled_connection
+from database.schema import ensure_schema
+from services.registry import lazy_service
+
+
+SCHEMA_VERSION = 1
 
 
 class DepreciationMethod(Enum):
@@ -150,12 +156,12 @@ class GenFinFixedAssetsService:
             return
 
         self.db_path = db_path
-        self._init_tables()
+        ensure_schema(self.db_path, "genfin_fixed_assets", SCHEMA_VERSION, self._init_tables)
         self._initialized = True
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -886,4 +892,4 @@ class GenFinFixedAssetsService:
 
 
 # Singleton instance
-genfin_fixed_assets_service = GenFinFixedAssetsService()
+genfin_fixed_assets_service = lazy_service("genfin_fixed_assets", GenFinFixedAssetsService)
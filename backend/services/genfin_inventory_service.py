@@ -4,11 +4,24 @@ Full inventory tracking, item types, COGS, assemblies, reorder points
 SQLite-backed persistence
 """
 
+from collections import deque
 from datetime import datetime, date, timezone
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from enum import Enum
 import uuid
 import sqlite3
+from database.db_utils import get_pooled_connection
+from database.schema import ensure_schema
+from services.registry import lazy_service
+
+
+SCHEMA_VERSION = 2
+
+# Quantities below this are treated as zero when draining lots
+QUANTITY_EPSILON = 1e-9
+
+# Max ids per "IN (...)" query, under SQLite's bound-parameter limit
+SQL_CHUNK_SIZE = 500
 
 
 class ItemType(Enum):
@@ -42,6 +55,64 @@ class AdjustmentType(Enum):
     RECOUNT = "recount"  # Physical count correction
 
 
+class CostLayers:
+    """
+    Open receipt lots for one inventory item, oldest first
+
+    Running quantity and cost totals are kept alongside the lots so a
+    batch of sales can drain them from either end in memory.
+    Each lot is [lot_id, received_date, remaining_quantity, cost_per_unit].
+    """
+
+    def __init__(self, lots: Iterable[Tuple[str, str, float, float]] = ()):
+        self.lots: deque = deque()
+        self.quantity = 0.0
+        self.cost = 0.0
+        for lot in lots:
+            self.add(*lot)
+
+    def add(self, lot_id: str, received_date: str, quantity: float, cost_per_unit: float):
+        """Add a lot, keeping received-date order (ties stay in arrival order)"""
+        position = len(self.lots)
+        while position > 0 and self.lots[position - 1][1] > received_date:
+            position -= 1
+        self.lots.insert(position, [lot_id, received_date, quantity, cost_per_unit])
+        self.quantity += quantity
+        self.cost += quantity * cost_per_unit
+
+    def consume(self, quantity: float, newest_first: bool = False) -> Tuple[float, float, List[Tuple[str, float]]]:
+        """
+        Drain quantity from the oldest (or newest) lots
+
+        Returns (cost, quantity_taken, [(lot_id, new_remaining_quantity), ...]).
+        quantity_taken is less than quantity when the lots run out.
+        """
+        cost = 0.0
+        remaining = quantity
+        changed = []
+        while remaining > QUANTITY_EPSILON and self.lots:
+            lot = self.lots[-1] if newest_first else self.lots[0]
+            use = min(lot[2], remaining)
+            cost += use * lot[3]
+            lot[2] -= use
+            remaining -= use
+            if lot[2] <= QUANTITY_EPSILON:
+                lot[2] = 0.0
+                if newest_first:
+                    self.lots.pop()
+                else:
+                    self.lots.popleft()
+            changed.append((lot[0], lot[2]))
+
+        taken = quantity - max(remaining, 0.0)
+        if self.lots:
+            self.quantity -= taken
+            self.cost -= cost
+        else:
+            self.quantity = self.cost = 0.0
+        return cost, taken, changed
+
+
 class GenFinInventoryService:
     """
     GenFin Inventory & Items Service - SQLite backed
@@ -69,16 +140,47 @@ class GenFinInventoryService:
         if self._initialized:
             return
         self.db_path = db_path
-        self._init_tables()
-        self._initialize_default_tax_codes()
+        ensure_schema(
+            self.db_path, "genfin_inventory", SCHEMA_VERSION,
+            self._init_tables,
+            self._initialize_default_tax_codes
+        )
         self._initialized = True
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
+    def _load_layers(self, cursor: sqlite3.Cursor, item_ids: List[str]) -> Dict[str, CostLayers]:
+        """
+        Cost layers for the items, read in bulk from genfin_inventory_lots
+
+        Layers are not kept between calls: other workers post sales and
+        receipts too, so callers that write lots load them inside their
+        own write transaction.
+        """
+        layers: Dict[str, CostLayers] = {}
+        item_ids = list(dict.fromkeys(item_ids))
+        for start in range(0, len(item_ids), SQL_CHUNK_SIZE):
+            chunk = item_ids[start:start + SQL_CHUNK_SIZE]
+            loaded = {item_id: CostLayers() for item_id in chunk}
+            cursor.execute(f"""
+                SELECT lot_id, item_id, received_date, remaining_quantity, cost_per_unit
+                FROM genfin_inventory_lots
+                WHERE item_id IN ({', '.join('?' * len(chunk))})
+                  AND remaining_quantity > 0 AND is_active = 1
+                ORDER BY received_date ASC, rowid ASC
+            """, chunk)
+            for row in cursor.fetchall():
+                loaded[row['item_id']].add(
+                    row['lot_id'], row['received_date'],
+                    row['remaining_quantity'], row['cost_per_unit']
+                )
+            layers.update(loaded)
+        return layers
+
     def _init_tables(self):
         """Initialize database tables"""
         with self._get_connection() as conn:
@@ -161,6 +263,10 @@ class GenFinInventoryService:
                     FOREIGN KEY (item_id) REFERENCES genfin_items (item_id)
                 )
             """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_inventory_lots_item
+                ON genfin_inventory_lots (item_id, received_date)
+            """)
 
             # Inventory adjustments
             cursor.execute("""
@@ -827,111 +933,105 @@ class GenFinInventoryService:
         sale_date: str
     ) -> Dict:
         """Sell inventory (reduce quantity, calculate COGS)"""
-        item = self.get_item(item_id)
-        if not item:
-            return {"success": False, "error": "Item not found"}
-
-        if item["item_type"] != "inventory":
-            return {"success": False, "error": "Item is not an inventory item"}
-
-        if item["quantity_on_hand"] < quantity:
-            return {"success": False, "error": "Insufficient quantity on hand"}
-
-        # Calculate COGS based on valuation method
-        valuation = item.get("valuation_method", "average")
-        if valuation == "average":
-            cogs = quantity * item.get("average_cost", 0)
-        elif valuation == "fifo":
-            cogs = self._calculate_fifo_cogs(item_id, quantity)
-        else:  # lifo
-            cogs = self._calculate_lifo_cogs(item_id, quantity)
+        return self.sell_inventory_batch([
+            {"item_id": item_id, "quantity": quantity, "sale_date": sale_date}
+        ])["results"][0]
+
+    def sell_inventory_batch(self, sales: List[Dict]) -> Dict:
+        """
+        Post many inventory sales in one pass
+
+        Sales apply in the order given against the items' cost layers:
+        FIFO drains the oldest lots, LIFO the newest, and average cost
+        drains the oldest lots but charges COGS at the item's average
+        cost. Quantity not covered by lots is charged at average cost.
+        Items and their open lots are read and written back in one
+        IMMEDIATE transaction, so concurrent sales from other workers are
+        serialized rather than overwriting each other's balances. A sale
+        that cannot post gets an error entry; the others still post.
+        """
+        results = []
+        lot_updates: Dict[str, float] = {}
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
 
-            new_qty = item["quantity_on_hand"] - quantity
-            new_value = item.get("asset_value", 0) - cogs
+            item_ids = list(dict.fromkeys(sale["item_id"] for sale in sales))
+            items: Dict[str, Dict] = {}
+            for start in range(0, len(item_ids), SQL_CHUNK_SIZE):
+                chunk = item_ids[start:start + SQL_CHUNK_SIZE]
+                cursor.execute(f"""
+                    SELECT item_id, item_type, quantity_on_hand, asset_value,
+                           average_cost, valuation_method
+                    FROM genfin_items WHERE item_id IN ({', '.join('?' * len(chunk))})
+                """, chunk)
+                items.update({row['item_id']: dict(row) for row in cursor.fetchall()})
+            layers = self._load_layers(cursor, [
+                item_id for item_id, item in items.items() if item['item_type'] == 'inventory'
+            ])
+
+            for sale in sales:
+                item_id, quantity = sale["item_id"], sale["quantity"]
+                item = items.get(item_id)
+                if not item:
+                    results.append({"success": False, "error": "Item not found"})
+                    continue
+                if item["item_type"] != "inventory":
+                    results.append({"success": False, "error": "Item is not an inventory item"})
+                    continue
+                if (item["quantity_on_hand"] or 0) < quantity:
+                    results.append({"success": False, "error": "Insufficient quantity on hand"})
+                    continue
+
+                # Calculate COGS based on valuation method
+                valuation = item["valuation_method"] or "average"
+                average_cost = item["average_cost"] or 0
+                lot_cost, lot_quantity, changed = layers[item_id].consume(
+                    quantity, newest_first=valuation not in ("average", "fifo")
+                )
+                lot_updates.update(changed)
+                if valuation == "average":
+                    cogs = quantity * average_cost
+                else:
+                    cogs = lot_cost + (quantity - lot_quantity) * average_cost
+
+                item["quantity_on_hand"] = (item["quantity_on_hand"] or 0) - quantity
+                item["asset_value"] = (item["asset_value"] or 0) - cogs
+                item["sold"] = True
+                results.append({
+                    "success": True,
+                    "quantity_sold": quantity,
+                    "cogs": round(cogs, 2),
+                    "remaining_quantity": item["quantity_on_hand"],
+                    "remaining_value": round(item["asset_value"], 2)
+                })
 
-            cursor.execute("""
+            now = datetime.now(timezone.utc).isoformat()
+            sold = [item for item in items.values() if item.get("sold")]
+            cursor.executemany("""
+                UPDATE genfin_inventory_lots SET remaining_quantity = ?
+                WHERE lot_id = ?
+            """, [(remaining, lot_id) for lot_id, remaining in lot_updates.items()])
+            cursor.executemany("""
                 UPDATE genfin_items
                 SET quantity_on_hand = ?, asset_value = ?, updated_at = ?
                 WHERE item_id = ?
-            """, (new_qty, new_value, datetime.now(timezone.utc).isoformat(), item_id))
-
+            """, [
+                (item["quantity_on_hand"], item["asset_value"], now, item["item_id"])
+                for item in sold
+            ])
             conn.commit()
 
+        posted = [r for r in results if r["success"]]
         return {
-            "success": True,
-            "quantity_sold": quantity,
-            "cogs": round(cogs, 2),
-            "remaining_quantity": new_qty,
-            "remaining_value": round(new_value, 2)
+            "success": len(posted) == len(results),
+            "sales_posted": len(posted),
+            "sales_failed": len(results) - len(posted),
+            "total_cogs": round(sum(r["cogs"] for r in posted), 2),
+            "results": results
         }
 
-    def _calculate_fifo_cogs(self, item_id: str, quantity: float) -> float:
-        """Calculate COGS using FIFO method"""
-        cogs = 0.0
-        remaining = quantity
-
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT lot_id, remaining_quantity, cost_per_unit
-                FROM genfin_inventory_lots
-                WHERE item_id = ? AND remaining_quantity > 0 AND is_active = 1
-                ORDER BY received_date ASC
-            """, (item_id,))
-
-            for lot in cursor.fetchall():
-                if remaining <= 0:
-                    break
-
-                use_qty = min(lot['remaining_quantity'], remaining)
-                cogs += use_qty * lot['cost_per_unit']
-
-                cursor.execute("""
-                    UPDATE genfin_inventory_lots SET remaining_quantity = ?
-                    WHERE lot_id = ?
-                """, (lot['remaining_quantity'] - use_qty, lot['lot_id']))
-
-                remaining -= use_qty
-
-            conn.commit()
-
-        return cogs
-
-    def _calculate_lifo_cogs(self, item_id: str, quantity: float) -> float:
-        """Calculate COGS using LIFO method"""
-        cogs = 0.0
-        remaining = quantity
-
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT lot_id, remaining_quantity, cost_per_unit
-                FROM genfin_inventory_lots
-                WHERE item_id = ? AND remaining_quantity > 0 AND is_active = 1
-                ORDER BY received_date DESC
-            """, (item_id,))
-
-            for lot in cursor.fetchall():
-                if remaining <= 0:
-                    break
-
-                use_qty = min(lot['remaining_quantity'], remaining)
-                cogs += use_qty * lot['cost_per_unit']
-
-                cursor.execute("""
-                    UPDATE genfin_inventory_lots SET remaining_quantity = ?
-                    WHERE lot_id = ?
-                """, (lot['remaining_quantity'] - use_qty, lot['lot_id']))
-
-                remaining -= use_qty
-
-            conn.commit()
-
-        return cogs
-
     def adjust_inventory(
         self,
         item_id: str,
@@ -1391,29 +1491,44 @@ class GenFinInventoryService:
     # ==================== REPORTS ====================
 
     def get_inventory_valuation_report(self) -> Dict:
-        """Get inventory valuation summary"""
+        """
+        Get inventory valuation summary
+
+        Book value comes from the item records; open lot quantity and value
+        come from the items' cost layers.
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT item_id, name, sku, quantity_on_hand, average_cost, asset_value
+                SELECT item_id, name, sku, quantity_on_hand, average_cost, asset_value,
+                       valuation_method
                 FROM genfin_items
                 WHERE is_active = 1 AND item_type = 'inventory'
                 ORDER BY asset_value DESC
             """)
+            rows = cursor.fetchall()
+            layers = self._load_layers(cursor, [row['item_id'] for row in rows])
 
             items = []
             total_value = 0.0
+            total_lot_value = 0.0
 
-            for row in cursor.fetchall():
+            for row in rows:
                 value = row['asset_value'] or 0
+                item_layers = layers[row['item_id']]
                 total_value += value
+                total_lot_value += item_layers.cost
                 items.append({
                     "item_id": row['item_id'],
                     "name": row['name'],
                     "sku": row['sku'] or '',
+                    "valuation_method": row['valuation_method'] or 'average',
                     "quantity_on_hand": row['quantity_on_hand'] or 0,
                     "average_cost": round(row['average_cost'] or 0, 4),
                     "asset_value": round(value, 2),
+                    "open_lots": len(item_layers.lots),
+                    "lot_quantity": round(item_layers.quantity, 4),
+                    "lot_value": round(item_layers.cost, 2),
                     "percent_of_total": 0
                 })
 
@@ -1427,6 +1542,7 @@ class GenFinInventoryService:
             "as_of_date": date.today().isoformat(),
             "total_items": len(items),
             "total_value": round(total_value, 2),
+            "total_lot_value": round(total_lot_value, 2),
             "items": items
         }
 
@@ -1583,4 +1699,4 @@ class GenFinInventoryService:
 
 
 # Singleton instance
-genfin_inventory_service = GenFinInventoryService()
+genfin_inventory_service = lazy_service("genfin_inventory", GenFinInventoryService)
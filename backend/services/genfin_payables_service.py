@@ -12,6 +12,12 @@ import sqlite3
 import json
 
 from .genfin_core_service import genfin_core_service
+from database.db_utils import get_pooled_connection
+from database.schema import ensure_schema
+from services.registry import lazy_service
+
+
+SCHEMA_VERSION = 1
 
 
 class VendorStatus(Enum):
@@ -91,12 +97,12 @@ class GenFinPayablesService:
         if self._initialized:
             return
         self.db_path = db_path
-        self._init_tables()
+        ensure_schema(self.db_path, "genfin_payables", SCHEMA_VERSION, self._init_tables)
         self._initialized = True
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -1756,4 +1762,4 @@ class GenFinPayablesService:
 
 
 # Singleton instance
-genfin_payables_service = GenFinPayablesService()
+genfin_payables_service = lazy_service("genfin_payables", GenFinPayablesService)
@@ -12,6 +12,12 @@ from dataclasses import dataclass, field
 import uuid
 
 from .genfin_banking_service import genfin_banking_service, ACHTransactionCode
+from database.db_utils import get_pooled_connection
+from database.schema import ensure_schema
+from services.registry import lazy_service
+
+
+SCHEMA_VERSION = 1
 
 
 class EmployeeStatus(Enum):
@@ -398,6 +404,20 @@ ADDITIONAL_MEDICARE_THRESHOLD = 200000
 FUTA_RATE = 0.006  # 0.6% after credit
 FUTA_WAGE_BASE = 7000
 
+# Pay periods per year by frequency
+PAY_PERIODS_PER_YEAR = {
+    PayFrequency.WEEKLY: 52,
+    PayFrequency.BIWEEKLY: 26,
+    PayFrequency.SEMIMONTHLY: 24,
+    PayFrequency.MONTHLY: 12
+}
+
+# Flat state income tax withholding rates
+STATE_INCOME_TAX_RATES = {
+    "CA": 0.093, "NY": 0.0685, "TX": 0.0, "FL": 0.0,
+    "WA": 0.0, "NV": 0.0, "default": 0.05
+}
+
 # Standard deduction for tax calculation
 STANDARD_DEDUCTION_2024 = {
     FilingStatus.SINGLE: 14600,
@@ -433,13 +453,16 @@ class GenFinPayrollService:
             return
 
         self.db_path = db_path
-        self._init_tables()
-        self._initialize_defaults()
+        ensure_schema(
+            self.db_path, "genfin_payroll", SCHEMA_VERSION,
+            self._init_tables,
+            self._initialize_defaults
+        )
         self._initialized = True
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -1692,6 +1715,24 @@ class GenFinPayrollService:
 
         return ytd_gross
 
+    def _get_ytd_earnings_for_run(self, cursor: sqlite3.Cursor, pay_run_id: str, as_of_date: date) -> Dict[str, float]:
+        """Year-to-date earnings for every employee on a pay run, in one grouped query"""
+        year_start = date(as_of_date.year, 1, 1)
+        cursor.execute("""
+            SELECT prl.employee_id, SUM(prl.gross_pay) AS ytd_gross
+            FROM genfin_pay_run_lines prl
+            JOIN genfin_pay_runs pr ON prl.pay_run_id = pr.pay_run_id
+            WHERE prl.employee_id IN (
+                SELECT employee_id FROM genfin_pay_run_lines WHERE pay_run_id = ?
+            )
+              AND pr.status IN ('approved', 'paid')
+              AND pr.pay_date >= ?
+              AND pr.pay_date < ?
+            GROUP BY prl.employee_id
+        """, (pay_run_id, year_start.isoformat(), as_of_date.isoformat()))
+
+        return {row['employee_id']: row['ytd_gross'] or 0.0 for row in cursor.fetchall()}
+
     # ==================== PAY RUNS ====================
 
     def start_scheduled_payroll(self, schedule_id: str, bank_account_id: str) -> Dict:
@@ -1986,7 +2027,14 @@ class GenFinPayrollService:
         }
 
     def calculate_pay_run(self, pay_run_id: str) -> Dict:
-        """Calculate all pay for a pay run"""
+        """
+        Calculate all pay for a pay run.
+
+        Employees, YTD earnings and deductions for every line are preloaded
+        up front and the lines are written back with a single executemany,
+        so a large seasonal crew costs a handful of queries rather than
+        several per employee.
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
@@ -2001,176 +2049,82 @@ class GenFinPayrollService:
 
             pay_date = datetime.strptime(pay_run_row['pay_date'], "%Y-%m-%d").date()
 
+            cursor.execute("SELECT * FROM genfin_pay_run_lines WHERE pay_run_id = ?", (pay_run_id,))
+            lines = cursor.fetchall()
+
+            # Preload everything the calculation needs for the whole run
+            cursor.execute("""
+                SELECT * FROM genfin_employees
+                WHERE employee_id IN (
+                    SELECT employee_id FROM genfin_pay_run_lines WHERE pay_run_id = ?
+                )
+            """, (pay_run_id,))
+            employees = {row['employee_id']: row for row in cursor.fetchall()}
+
+            ytd_earnings = self._get_ytd_earnings_for_run(cursor, pay_run_id, pay_date)
+
+            cursor.execute("""
+                SELECT ed.*, dt.code, dt.name, dt.is_pretax
+                FROM genfin_employee_deductions ed
+                JOIN genfin_deduction_types dt ON ed.deduction_type_id = dt.deduction_type_id
+                WHERE ed.is_active = 1
+                  AND ed.employee_id IN (
+                      SELECT employee_id FROM genfin_pay_run_lines WHERE pay_run_id = ?
+                  )
+            """, (pay_run_id,))
+            deductions: Dict[str, List[sqlite3.Row]] = {}
+            for ded_row in cursor.fetchall():
+                deductions.setdefault(ded_row['employee_id'], []).append(ded_row)
+
             total_gross = 0.0
             total_taxes = 0.0
             total_deductions = 0.0
             total_net = 0.0
             total_employer_taxes = 0.0
-
-            cursor.execute("SELECT * FROM genfin_pay_run_lines WHERE pay_run_id = ?", (pay_run_id,))
-            lines = cursor.fetchall()
+            updates = []
 
             for line in lines:
-                cursor.execute("SELECT * FROM genfin_employees WHERE employee_id = ?",
-                             (line['employee_id'],))
-                emp_row = cursor.fetchone()
+                emp_row = employees.get(line['employee_id'])
                 if not emp_row:
                     continue
 
-                # Calculate gross pay
-                pay_type = emp_row['pay_type']
-                pay_rate = emp_row['pay_rate']
-                pay_frequency = PayFrequency(emp_row['pay_frequency'])
-
-                if pay_type == 'hourly':
-                    regular_pay = line['regular_hours'] * pay_rate
-                    overtime_pay = line['overtime_hours'] * pay_rate * 1.5
-                    double_time_pay = line['double_time_hours'] * pay_rate * 2.0
-                    sick_pay = line['sick_hours'] * pay_rate
-                    vacation_pay = line['vacation_hours'] * pay_rate
-                    holiday_pay = line['holiday_hours'] * pay_rate
-                else:
-                    periods_per_year = {
-                        PayFrequency.WEEKLY: 52,
-                        PayFrequency.BIWEEKLY: 26,
-                        PayFrequency.SEMIMONTHLY: 24,
-                        PayFrequency.MONTHLY: 12
-                    }
-                    period_pay = pay_rate / periods_per_year.get(pay_frequency, 26)
-                    regular_pay = period_pay
-                    overtime_pay = 0.0
-                    double_time_pay = 0.0
-                    sick_pay = 0.0
-                    vacation_pay = 0.0
-                    holiday_pay = 0.0
-
-                # Add existing bonus/vacation from line
-                bonus = line['bonus'] or 0.0
-                vacation_pay = max(vacation_pay, line['vacation_pay'] or 0.0)
-
-                gross_pay = round(
-                    regular_pay + overtime_pay + double_time_pay +
-                    sick_pay + vacation_pay + holiday_pay +
-                    bonus + (line['commission'] or 0.0) + (line['other_earnings'] or 0.0), 2
+                pay = self._calculate_line_pay(
+                    line,
+                    emp_row,
+                    ytd_earnings.get(emp_row['employee_id'], 0.0),
+                    deductions.get(emp_row['employee_id'], []),
+                    pay_date
                 )
 
-                # Get YTD for tax calculations
-                ytd_gross = self._get_ytd_earnings(emp_row['employee_id'], pay_date)
-
-                # Calculate pre-tax deductions
-                pretax_deductions = 0.0
-                deductions_list = []
-
-                cursor.execute("""
-                    SELECT ed.*, dt.code, dt.name, dt.is_pretax
-                    FROM genfin_employee_deductions ed
-                    JOIN genfin_deduction_types dt ON ed.deduction_type_id = dt.deduction_type_id
-                    WHERE ed.employee_id = ? AND ed.is_active = 1
-                """, (emp_row['employee_id'],))
-
-                for ded_row in cursor.fetchall():
-                    # Check date range
-                    if ded_row['start_date'] and pay_date < datetime.strptime(ded_row['start_date'], "%Y-%m-%d").date():
-                        continue
-                    if ded_row['end_date'] and pay_date > datetime.strptime(ded_row['end_date'], "%Y-%m-%d").date():
-                        continue
-
-                    if ded_row['percentage'] > 0:
-                        ded_amount = gross_pay * (ded_row['percentage'] / 100)
-                    else:
-                        ded_amount = ded_row['amount']
-
-                    if ded_row['is_pretax']:
-                        pretax_deductions += ded_amount
-
-                    deductions_list.append({
-                        "code": ded_row['code'],
-                        "name": ded_row['name'],
-                        "amount": round(ded_amount, 2),
-                        "is_pretax": bool(ded_row['is_pretax'])
-                    })
-
-                # Taxable gross after pre-tax deductions
-                taxable_gross = gross_pay - pretax_deductions
-
-                # Calculate annualized income for tax brackets
-                periods_per_year = {
-                    PayFrequency.WEEKLY: 52,
-                    PayFrequency.BIWEEKLY: 26,
-                    PayFrequency.SEMIMONTHLY: 24,
-                    PayFrequency.MONTHLY: 12
-                }
-                periods = periods_per_year.get(pay_frequency, 26)
-                annual_taxable = taxable_gross * periods
-
-                # Federal income tax
-                filing_status = FilingStatus(emp_row['filing_status'])
-                annual_fed_tax = self._calculate_federal_tax(
-                    annual_taxable,
-                    filing_status,
-                    emp_row['federal_allowances']
-                )
-                federal_income_tax = round(annual_fed_tax / periods, 2)
-                federal_income_tax += emp_row['federal_additional_withholding']
-
-                # State income tax
-                state_rates = {
-                    "CA": 0.093, "NY": 0.0685, "TX": 0.0, "FL": 0.0,
-                    "WA": 0.0, "NV": 0.0, "default": 0.05
-                }
-                state = emp_row['state'] or ""
-                state_rate = state_rates.get(state.upper(), state_rates["default"])
-                state_income_tax = round(taxable_gross * state_rate, 2)
-                state_income_tax += emp_row['state_additional_withholding']
-
-                # FICA
-                ss_emp, med_emp, ss_er, med_er = self._calculate_fica(taxable_gross, ytd_gross)
-
-                # FUTA / SUTA
-                futa, suta = self._calculate_futa_suta(taxable_gross, ytd_gross, state)
-
-                # Total taxes
-                employee_taxes = (
-                    federal_income_tax + state_income_tax + ss_emp + med_emp
-                )
-
-                # Post-tax deductions
-                posttax_deductions = sum(d["amount"] for d in deductions_list if not d["is_pretax"])
-                total_line_deductions = round(pretax_deductions + posttax_deductions, 2)
-
-                # Net pay
-                net_pay = round(gross_pay - employee_taxes - total_line_deductions, 2)
-
-                # Direct deposit amount
-                dd_amount = net_pay if emp_row['payment_method'] == 'direct_deposit' else 0.0
-
-                # Employer taxes
-                employer_taxes = ss_er + med_er + futa + suta
-
-                # Update line
-                cursor.execute("""
-                    UPDATE genfin_pay_run_lines
-                    SET regular_pay = ?, overtime_pay = ?, double_time_pay = ?,
-                        sick_pay = ?, vacation_pay = ?, holiday_pay = ?,
-                        gross_pay = ?, federal_income_tax = ?, state_income_tax = ?,
-                        social_security_employee = ?, medicare_employee = ?,
-                        social_security_employer = ?, medicare_employer = ?,
-                        futa = ?, suta = ?, deductions_json = ?,
-                        total_deductions = ?, net_pay = ?, direct_deposit_amount = ?
-                    WHERE line_id = ?
-                """, (regular_pay, overtime_pay, double_time_pay,
-                      sick_pay, vacation_pay, holiday_pay,
-                      gross_pay, federal_income_tax, state_income_tax,
-                      ss_emp, med_emp, ss_er, med_er, futa, suta,
-                      json.dumps(deductions_list), total_line_deductions,
-                      net_pay, dd_amount, line['line_id']))
+                updates.append((
+                    pay["regular_pay"], pay["overtime_pay"], pay["double_time_pay"],
+                    pay["sick_pay"], pay["vacation_pay"], pay["holiday_pay"],
+                    pay["gross_pay"], pay["federal_income_tax"], pay["state_income_tax"],
+                    pay["social_security_employee"], pay["medicare_employee"],
+                    pay["social_security_employer"], pay["medicare_employer"],
+                    pay["futa"], pay["suta"], json.dumps(pay["deductions"]),
+                    pay["total_deductions"], pay["net_pay"], pay["direct_deposit_amount"],
+                    line['line_id']
+                ))
 
                 # Add to totals
-                total_gross += gross_pay
-                total_taxes += employee_taxes
-                total_deductions += total_line_deductions
-                total_net += net_pay
-                total_employer_taxes += employer_taxes
+                total_gross += pay["gross_pay"]
+                total_taxes += pay["employee_taxes"]
+                total_deductions += pay["total_deductions"]
+                total_net += pay["net_pay"]
+                total_employer_taxes += pay["employer_taxes"]
+
+            cursor.executemany("""
+                UPDATE genfin_pay_run_lines
+                SET regular_pay = ?, overtime_pay = ?, double_time_pay = ?,
+                    sick_pay = ?, vacation_pay = ?, holiday_pay = ?,
+                    gross_pay = ?, federal_income_tax = ?, state_income_tax = ?,
+                    social_security_employee = ?, medicare_employee = ?,
+                    social_security_employer = ?, medicare_employer = ?,
+                    futa = ?, suta = ?, deductions_json = ?,
+                    total_deductions = ?, net_pay = ?, direct_deposit_amount = ?
+                WHERE line_id = ?
+            """, updates)
 
             # Update pay run totals
             cursor.execute("""
@@ -2191,6 +2145,138 @@ class GenFinPayrollService:
             "pay_run": self.get_pay_run(pay_run_id)
         }
 
+    def _calculate_line_pay(
+        self,
+        line: sqlite3.Row,
+        emp_row: sqlite3.Row,
+        ytd_gross: float,
+        deduction_rows: List[sqlite3.Row],
+        pay_date: date
+    ) -> Dict:
+        """Calculate gross pay, taxes, deductions and net pay for one pay run line"""
+        # Calculate gross pay
+        pay_type = emp_row['pay_type']
+        pay_rate = emp_row['pay_rate']
+        pay_frequency = PayFrequency(emp_row['pay_frequency'])
+        periods = PAY_PERIODS_PER_YEAR.get(pay_frequency, 26)
+
+        if pay_type == 'hourly':
+            regular_pay = line['regular_hours'] * pay_rate
+            overtime_pay = line['overtime_hours'] * pay_rate * 1.5
+            double_time_pay = line['double_time_hours'] * pay_rate * 2.0
+            sick_pay = line['sick_hours'] * pay_rate
+            vacation_pay = line['vacation_hours'] * pay_rate
+            holiday_pay = line['holiday_hours'] * pay_rate
+        else:
+            regular_pay = pay_rate / periods
+            overtime_pay = 0.0
+            double_time_pay = 0.0
+            sick_pay = 0.0
+            vacation_pay = 0.0
+            holiday_pay = 0.0
+
+        # Add existing bonus/vacation from line
+        bonus = line['bonus'] or 0.0
+        vacation_pay = max(vacation_pay, line['vacation_pay'] or 0.0)
+
+        gross_pay = round(
+            regular_pay + overtime_pay + double_time_pay +
+            sick_pay + vacation_pay + holiday_pay +
+            bonus + (line['commission'] or 0.0) + (line['other_earnings'] or 0.0), 2
+        )
+
+        # Calculate pre-tax deductions
+        pretax_deductions = 0.0
+        deductions_list = []
+
+        for ded_row in deduction_rows:
+            # Check date range
+            if ded_row['start_date'] and pay_date < datetime.strptime(ded_row['start_date'], "%Y-%m-%d").date():
+                continue
+            if ded_row['end_date'] and pay_date > datetime.strptime(ded_row['end_date'], "%Y-%m-%d").date():
+                continue
+
+            if ded_row['percentage'] > 0:
+                ded_amount = gross_pay * (ded_row['percentage'] / 100)
+            else:
+                ded_amount = ded_row['amount']
+
+            if ded_row['is_pretax']:
+                pretax_deductions += ded_amount
+
+            deductions_list.append({
+                "code": ded_row['code'],
+                "name": ded_row['name'],
+                "amount": round(ded_amount, 2),
+                "is_pretax": bool(ded_row['is_pretax'])
+            })
+
+        # Taxable gross after pre-tax deductions
+        taxable_gross = gross_pay - pretax_deductions
+
+        # Calculate annualized income for tax brackets
+        annual_taxable = taxable_gross * periods
+
+        # Federal income tax
+        filing_status = FilingStatus(emp_row['filing_status'])
+        annual_fed_tax = self._calculate_federal_tax(
+            annual_taxable,
+            filing_status,
+            emp_row['federal_allowances']
+        )
+        federal_income_tax = round(annual_fed_tax / periods, 2)
+        federal_income_tax += emp_row['federal_additional_withholding']
+
+        # State income tax
+        state = emp_row['state'] or ""
+        state_rate = STATE_INCOME_TAX_RATES.get(state.upper(), STATE_INCOME_TAX_RATES["default"])
+        state_income_tax = round(taxable_gross * state_rate, 2)
+        state_income_tax += emp_row['state_additional_withholding']
+
+        # FICA
+        ss_emp, med_emp, ss_er, med_er = self._calculate_fica(taxable_gross, ytd_gross)
+
+        # FUTA / SUTA
+        futa, suta = self._calculate_futa_suta(taxable_gross, ytd_gross, state)
+
+        # Total taxes
+        employee_taxes = (
+            federal_income_tax + state_income_tax + ss_emp + med_emp
+        )
+
+        # Post-tax deductions
+        posttax_deductions = sum(d["amount"] for d in deductions_list if not d["is_pretax"])
+        total_line_deductions = round(pretax_deductions + posttax_deductions, 2)
+
+        # Net pay
+        net_pay = round(gross_pay - employee_taxes - total_line_deductions, 2)
+
+        return {
+            "regular_pay": regular_pay,
+            "overtime_pay": overtime_pay,
+            "double_time_pay": double_time_pay,
+            "sick_pay": sick_pay,
+            "vacation_pay": vacation_pay,
+            "holiday_pay": holiday_pay,
+            "gross_pay": gross_pay,
+            "federal_income_tax": federal_income_tax,
+            "state_income_tax": state_income_tax,
+            "social_security_employee": ss_emp,
+            "medicare_employee": med_emp,
+            "social_security_employer": ss_er,
+            "medicare_employer": med_er,
+            "futa": futa,
+            "suta": suta,
+            "deductions": deductions_list,
+            "total_deductions": total_line_deductions,
+            "net_pay": net_pay,
+            # Direct deposit amount
+            "direct_deposit_amount": net_pay if emp_row['payment_method'] == 'direct_deposit' else 0.0,
+            "employee_taxes": employee_taxes,
+            # Employer taxes
+            "employer_taxes": ss_er + med_er + futa + suta
+        }
+
     def approve_pay_run(self, pay_run_id: str, approved_by: str) -> Dict:
         """Approve a calculated pay run"""
         with self._get_connection() as conn:
@@ -2686,4 +2772,4 @@ NET PAY: ${line['net_pay']:,.2f}"""
 
 
 # Singleton instance
-genfin_payroll_service = GenFinPayrollService()
+genfin_payroll_service = lazy_service("genfin_payroll", GenFinPayrollService)
@@ -12,6 +12,12 @@ import sqlite3
 import json
 
 from .genfin_core_service import genfin_core_service
+from database.db_utils import get_pooled_connection
+from database.schema import ensure_schema
+from services.registry import lazy_service
+
+
+SCHEMA_VERSION = 1
 
 
 class CustomerStatus(Enum):
@@ -93,7 +99,7 @@ class GenFinReceivablesService:
             return
 
         self.db_path = db_path
-        self._init_tables()
+        ensure_schema(self.db_path, "genfin_receivables", SCHEMA_VERSION, self._init_tables)
 
         # Default AR account
         self.default_ar_account_id = self._get_default_ar_account()
@@ -101,7 +107,7 @@ class GenFinReceivablesService:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -1945,4 +1951,4 @@ class GenFinReceivablesService:
 
 
 # Singleton instance
-genfin_receivables_service = GenFinReceivablesService()
+genfin_receivables_service = lazy_service("genfin_receivables", GenFinReceivablesService)
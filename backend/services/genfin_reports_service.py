@@ -5,7 +5,7 @@ SQLite persistent storage implementation
 """
 
 from datetime import datetime, date, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass, field
 import uuid
@@ -13,6 +13,12 @@ import sqlite3
 import json
 
 from .genfin_core_service import genfin_core_service
+from database.db_utils import get_pooled_connection
+from database.schema import ensure_schema
+from services.registry import lazy_service
+
+
+SCHEMA_VERSION = 1
 
 
 class ReportType(Enum):
@@ -80,12 +86,12 @@ class GenFinReportsService:
             return
 
         self.db_path = db_path
-        self._init_tables()
+        ensure_schema(self.db_path, "genfin_reports", SCHEMA_VERSION, self._init_tables)
         self._initialized = True
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -111,6 +117,134 @@ class GenFinReportsService:
 
             conn.commit()
 
+    # ==================== REPORT ENGINE ====================
+
+    def _get_period_totals(
+        self,
+        periods: Dict[str, Tuple[date, date]],
+        class_id: Optional[str] = None,
+        location_id: Optional[str] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Net activity for every account across several date ranges in one query.
+
+        Each named (start, end) range becomes a pair of conditional SUM columns,
+        so current, prior-period, prior-year and monthly columns all come from a
+        single grouped scan of the journal lines. Amounts are signed in each
+        account's normal-balance direction and rounded per account.
+
+        Returns {period_name: {account_id: amount}}.
+        """
+        totals: Dict[str, Dict[str, float]] = {name: {} for name in periods}
+        if not periods:
+            return totals
+
+        names = list(periods)
+        columns = []
+        params: List = []
+        for i, name in enumerate(names):
+            start, end = periods[name]
+            columns.append(
+                f"SUM(CASE WHEN e.entry_date BETWEEN ? AND ? THEN COALESCE(l.debit, 0) ELSE 0 END) AS debit_{i}"
+            )
+            columns.append(
+                f"SUM(CASE WHEN e.entry_date BETWEEN ? AND ? THEN COALESCE(l.credit, 0) ELSE 0 END) AS credit_{i}"
+            )
+            params.extend([start.isoformat(), end.isoformat()] * 2)
+
+        query = f"""
+            SELECT l.account_id, a.account_type, {', '.join(columns)}
+            FROM genfin_journal_entry_lines l
+            JOIN genfin_journal_entries e ON l.entry_id = e.entry_id
+            JOIN genfin_accounts a ON l.account_id = a.account_id
+            WHERE e.status IN ('posted', 'reconciled')
+            AND e.entry_date >= ?
+            AND e.entry_date <= ?
+        """
+        params.append(min(start for start, _ in periods.values()).isoformat())
+        params.append(max(end for _, end in periods.values()).isoformat())
+
+        if class_id:
+            query += " AND l.class_id = ?"
+            params.append(class_id)
+        if location_id:
+            query += " AND l.location_id = ?"
+            params.append(location_id)
+
+        query += " GROUP BY l.account_id"
+
+        with genfin_core_service._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+
+            for row in cursor.fetchall():
+                for i, name in enumerate(names):
+                    amount = genfin_core_service._signed_balance(
+                        row['account_type'], row[f'debit_{i}'] or 0.0, row[f'credit_{i}'] or 0.0
+                    )
+                    if amount:
+                        totals[name][row['account_id']] = round(amount, 2)
+
+        return totals
+
+    @staticmethod
+    def _prior_year(day: date) -> date:
+        """Same calendar day one year earlier (Feb 29 falls back to Feb 28)"""
+        try:
+            return day.replace(year=day.year - 1)
+        except ValueError:
+            return day.replace(year=day.year - 1, day=28)
+
+    @staticmethod
+    def _month_ranges(start_date: date, end_date: date) -> List[Tuple[date, date]]:
+        """Calendar months from the month of start_date through end_date"""
+        months = []
+        current = date(start_date.year, start_date.month, 1)
+
+        while current <= end_date:
+            # End of month
+            if current.month == 12:
+                month_end = date(current.year, 12, 31)
+            else:
+                month_end = date(current.year, current.month + 1, 1) - timedelta(days=1)
+
+            months.append((current, min(month_end, end_date)))
+
+            # Next month
+            if current.month == 12:
+                current = date(current.year + 1, 1, 1)
+            else:
+                current = date(current.year, current.month + 1, 1)
+
+        return months
+
+    @staticmethod
+    def _pl_sections(accounts: List[Dict]) -> Dict[str, List[Dict]]:
+        """Split active accounts into revenue, COGS and operating expense sections"""
+        sections = {"revenue": [], "cogs": [], "expenses": []}
+        for account in accounts:
+            if account["account_type"] == "revenue":
+                sections["revenue"].append(account)
+            elif account["account_type"] == "expense":
+                if account.get("sub_type") == "cost_of_goods":
+                    sections["cogs"].append(account)
+                else:
+                    sections["expenses"].append(account)
+        return sections
+
+    @staticmethod
+    def _section_total(section: List[Dict], amounts: Dict[str, float]) -> float:
+        return sum(amounts.get(a["account_id"], 0.0) for a in section)
+
+    def _net_income(self, accounts: List[Dict], amounts: Dict[str, float]) -> float:
+        """Net income from one period's account totals"""
+        sections = self._pl_sections(accounts)
+        return (
+            self._section_total(sections["revenue"], amounts) -
+            self._section_total(sections["cogs"], amounts) -
+            self._section_total(sections["expenses"], amounts)
+        )
+
     # ==================== PROFIT & LOSS ====================
 
     def get_profit_loss(
@@ -133,44 +267,37 @@ class GenFinReportsService:
         s_date = datetime.strptime(start_date, "%Y-%m-%d").date()
         e_date = datetime.strptime(end_date, "%Y-%m-%d").date()
 
-        # Get all revenue and expense accounts
-        revenue_accounts = []
-        expense_accounts = []
-        cogs_accounts = []
-
-        coa = genfin_core_service.get_chart_of_accounts()
-
-        for acct in coa["revenue"]:
-            balance = self._get_account_balance_for_period(
-                acct["account_id"], s_date, e_date, class_id, location_id
-            )
-            if balance != 0:
-                revenue_accounts.append({
-                    "account_id": acct["account_id"],
-                    "account_number": acct["account_number"],
-                    "account_name": acct["name"],
-                    "balance": balance
-                })
-
-        for acct in coa["expenses"]:
-            balance = self._get_account_balance_for_period(
-                acct["account_id"], s_date, e_date, class_id, location_id
-            )
-            if balance != 0:
-                account_info = genfin_core_service.get_account(acct["account_id"])
-                sub_type = account_info.get("sub_type", "") if account_info else ""
-
-                entry = {
+        # Every column of the report is a named period in one aggregation
+        periods = {"current": (s_date, e_date)}
+        if compare_prior_period:
+            period_days = (e_date - s_date).days
+            prior_end = s_date - timedelta(days=1)
+            periods["prior_period"] = (prior_end - timedelta(days=period_days), prior_end)
+        if compare_prior_year:
+            periods["prior_year"] = (self._prior_year(s_date), self._prior_year(e_date))
+        months = self._month_ranges(s_date, e_date) if group_by_month else []
+        for month_start, month_end in months:
+            periods[month_start.strftime("%Y-%m")] = (month_start, month_end)
+
+        sections = self._pl_sections(genfin_core_service.list_accounts(active_only=True))
+        totals = self._get_period_totals(periods, class_id, location_id)
+        current = totals["current"]
+
+        def section_entries(section: List[Dict]) -> List[Dict]:
+            return [
+                {
                     "account_id": acct["account_id"],
                     "account_number": acct["account_number"],
                     "account_name": acct["name"],
-                    "balance": balance
+                    "balance": current[acct["account_id"]]
                 }
+                for acct in section
+                if current.get(acct["account_id"])
+            ]
 
-                if sub_type == "cost_of_goods":
-                    cogs_accounts.append(entry)
-                else:
-                    expense_accounts.append(entry)
+        revenue_accounts = section_entries(sections["revenue"])
+        cogs_accounts = section_entries(sections["cogs"])
+        expense_accounts = section_entries(sections["expenses"])
 
         # Calculate totals
         total_revenue = sum(a["balance"] for a in revenue_accounts)
@@ -179,70 +306,48 @@ class GenFinReportsService:
         total_expenses = sum(a["balance"] for a in expense_accounts)
         net_income = gross_profit - total_expenses
 
+        def period_summary(name: str) -> Dict:
+            amounts = totals[name]
+            revenue = self._section_total(sections["revenue"], amounts)
+            cogs = self._section_total(sections["cogs"], amounts)
+            expenses = self._section_total(sections["expenses"], amounts)
+            return {
+                "revenue": revenue,
+                "cogs": cogs,
+                "gross_profit": revenue - cogs,
+                "expenses": expenses,
+                "net_income": revenue - cogs - expenses
+            }
+
         # Build comparison data if requested
         comparison = None
         if compare_prior_period or compare_prior_year:
             comparison = {}
 
-            if compare_prior_period:
-                period_days = (e_date - s_date).days
-                prior_end = s_date - timedelta(days=1)
-                prior_start = prior_end - timedelta(days=period_days)
-
-                prior_revenue = sum(
-                    self._get_account_balance_for_period(a["account_id"], prior_start, prior_end)
-                    for a in revenue_accounts
-                )
-                prior_cogs = sum(
-                    self._get_account_balance_for_period(a["account_id"], prior_start, prior_end)
-                    for a in cogs_accounts
-                )
-                prior_expenses = sum(
-                    self._get_account_balance_for_period(a["account_id"], prior_start, prior_end)
-                    for a in expense_accounts
-                )
-
-                comparison["prior_period"] = {
-                    "start_date": prior_start.isoformat(),
-                    "end_date": prior_end.isoformat(),
-                    "total_revenue": round(prior_revenue, 2),
-                    "gross_profit": round(prior_revenue - prior_cogs, 2),
-                    "total_expenses": round(prior_expenses, 2),
-                    "net_income": round(prior_revenue - prior_cogs - prior_expenses, 2)
-                }
-
-            if compare_prior_year:
-                py_start = date(s_date.year - 1, s_date.month, s_date.day)
-                py_end = date(e_date.year - 1, e_date.month, e_date.day)
-
-                py_revenue = sum(
-                    self._get_account_balance_for_period(a["account_id"], py_start, py_end)
-                    for a in revenue_accounts
-                )
-                py_cogs = sum(
-                    self._get_account_balance_for_period(a["account_id"], py_start, py_end)
-                    for a in cogs_accounts
-                )
-                py_expenses = sum(
-                    self._get_account_balance_for_period(a["account_id"], py_start, py_end)
-                    for a in expense_accounts
-                )
-
-                comparison["prior_year"] = {
-                    "start_date": py_start.isoformat(),
-                    "end_date": py_end.isoformat(),
-                    "total_revenue": round(py_revenue, 2),
-                    "gross_profit": round(py_revenue - py_cogs, 2),
-                    "total_expenses": round(py_expenses, 2),
-                    "net_income": round(py_revenue - py_cogs - py_expenses, 2)
+            for name in ("prior_period", "prior_year"):
+                if name not in periods:
+                    continue
+                summary = period_summary(name)
+                comparison[name] = {
+                    "start_date": periods[name][0].isoformat(),
+                    "end_date": periods[name][1].isoformat(),
+                    "total_revenue": round(summary["revenue"], 2),
+                    "gross_profit": round(summary["gross_profit"], 2),
+                    "total_expenses": round(summary["expenses"], 2),
+                    "net_income": round(summary["net_income"], 2)
                 }
 
         # Monthly breakdown if requested
         monthly_data = None
         if group_by_month:
-            monthly_data = self._get_monthly_breakdown(
-                s_date, e_date, revenue_accounts, cogs_accounts, expense_accounts
-            )
+            monthly_data = []
+            for month_start, _ in months:
+                summary = period_summary(month_start.strftime("%Y-%m"))
+                monthly_data.append({
+                    "month": month_start.strftime("%Y-%m"),
+                    "month_name": month_start.strftime("%B %Y"),
+                    **{key: round(value, 2) for key, value in summary.items()}
+                })
 
         return {
             "report_type": "Profit & Loss Statement",
@@ -318,59 +423,6 @@ class GenFinReportsService:
 
         return round(balance, 2)
 
-    def _get_monthly_breakdown(
-        self,
-        start_date: date,
-        end_date: date,
-        revenue_accounts: List,
-        cogs_accounts: List,
-        expense_accounts: List
-    ) -> List[Dict]:
-        """Get monthly P&L breakdown"""
-        months = []
-        current = date(start_date.year, start_date.month, 1)
-
-        while current <= end_date:
-            # End of month
-            if current.month == 12:
-                month_end = date(current.year, 12, 31)
-            else:
-                month_end = date(current.year, current.month + 1, 1) - timedelta(days=1)
-
-            if month_end > end_date:
-                month_end = end_date
-
-            month_revenue = sum(
-                self._get_account_balance_for_period(a["account_id"], current, month_end)
-                for a in revenue_accounts
-            )
-            month_cogs = sum(
-                self._get_account_balance_for_period(a["account_id"], current, month_end)
-                for a in cogs_accounts
-            )
-            month_expenses = sum(
-                self._get_account_balance_for_period(a["account_id"], current, month_end)
-                for a in expense_accounts
-            )
-
-            months.append({
-                "month": current.strftime("%Y-%m"),
-                "month_name": current.strftime("%B %Y"),
-                "revenue": round(month_revenue, 2),
-                "cogs": round(month_cogs, 2),
-                "gross_profit": round(month_revenue - month_cogs, 2),
-                "expenses": round(month_expenses, 2),
-                "net_income": round(month_revenue - month_cogs - month_expenses, 2)
-            })
-
-            # Next month
-            if current.month == 12:
-                current = date(current.year + 1, 1, 1)
-            else:
-                current = date(current.year, current.month + 1, 1)
-
-        return months
-
     # ==================== BALANCE SHEET ====================
 
     def get_balance_sheet(
@@ -385,6 +437,7 @@ class GenFinReportsService:
             as_of_date = date.today().isoformat()
 
         report_date = datetime.strptime(as_of_date, "%Y-%m-%d").date()
+        py_date = self._prior_year(report_date)
 
         # Get all accounts with balances
         assets = {"current": [], "fixed": [], "other": []}
@@ -398,8 +451,13 @@ class GenFinReportsService:
         # Get all active accounts
         all_accounts = genfin_core_service.list_accounts(active_only=True, include_balances=False)
 
+        dates = [as_of_date]
+        if compare_prior_year:
+            dates.append(py_date.isoformat())
+        balances = genfin_core_service.get_account_balances_at(dates)
+
         for account in all_accounts:
-            balance = genfin_core_service.get_account_balance(account["account_id"], as_of_date)
+            balance = balances[as_of_date].get(account["account_id"], 0.0)
 
             if balance == 0:
                 continue
@@ -437,7 +495,7 @@ class GenFinReportsService:
 
         # Calculate retained earnings (Net Income for the year)
         year_start = date(report_date.year, 1, 1)
-        ytd_income = self._calculate_net_income(year_start, report_date)
+        ytd_income = self._calculate_net_income(year_start, report_date, all_accounts)
 
         if ytd_income != 0:
             equity.append({
@@ -454,12 +512,12 @@ class GenFinReportsService:
             comparison = {}
 
             if compare_prior_year:
-                py_date = date(report_date.year - 1, report_date.month, report_date.day)
+                py_balances = balances[py_date.isoformat()]
                 py_assets = 0.0
                 py_liabilities = 0.0
 
                 for account in all_accounts:
-                    balance = genfin_core_service.get_account_balance(account["account_id"], py_date.isoformat())
+                    balance = py_balances.get(account["account_id"], 0.0)
                     if account["account_type"] == "asset":
                         py_assets += balance
                     elif account["account_type"] == "liability":
@@ -511,24 +569,18 @@ class GenFinReportsService:
             "comparison": comparison
         }
 
-    def _calculate_net_income(self, start_date: date, end_date: date) -> float:
+    def _calculate_net_income(
+        self,
+        start_date: date,
+        end_date: date,
+        accounts: Optional[List[Dict]] = None
+    ) -> float:
         """Calculate net income for a period"""
-        total_revenue = 0.0
-        total_expenses = 0.0
+        if accounts is None:
+            accounts = genfin_core_service.list_accounts(active_only=True)
 
-        all_accounts = genfin_core_service.list_accounts(active_only=True)
-
-        for account in all_accounts:
-            if account["account_type"] == "revenue":
-                total_revenue += self._get_account_balance_for_period(
-                    account["account_id"], start_date, end_date
-                )
-            elif account["account_type"] == "expense":
-                total_expenses += self._get_account_balance_for_period(
-                    account["account_id"], start_date, end_date
-                )
-
-        return total_revenue - total_expenses
+        totals = self._get_period_totals({"period": (start_date, end_date)})
+        return self._net_income(accounts, totals["period"])
 
     # ==================== CASH FLOW ====================
 
@@ -542,42 +594,43 @@ class GenFinReportsService:
 
         s_date = datetime.strptime(start_date, "%Y-%m-%d").date()
         e_date = datetime.strptime(end_date, "%Y-%m-%d").date()
-
-        # Get beginning and ending cash balances
-        beginning_cash = 0.0
-        ending_cash = 0.0
+        prev_day = (s_date - timedelta(days=1)).isoformat()
 
         all_accounts = genfin_core_service.list_accounts(active_only=True)
 
-        for account in all_accounts:
-            if account["sub_type"] in ["cash", "bank"]:
-                # Beginning balance (day before start)
-                prev_day = s_date - timedelta(days=1)
-                beginning_cash += genfin_core_service.get_account_balance(
-                    account["account_id"], prev_day.isoformat()
-                )
-                # Ending balance
-                ending_cash += genfin_core_service.get_account_balance(
-                    account["account_id"], end_date
-                )
+        # Opening and closing balances for every account in one pass
+        balances = genfin_core_service.get_account_balances_at([prev_day, end_date])
+        activity = self._get_period_totals({"period": (s_date, e_date)})["period"]
+
+        def balance_change(sub_type: str) -> float:
+            """Change in balance for accounts of a specific subtype"""
+            return round(sum(
+                balances[end_date].get(a["account_id"], 0.0) - balances[prev_day].get(a["account_id"], 0.0)
+                for a in all_accounts
+                if a["sub_type"] == sub_type
+            ), 2)
+
+        # Get beginning and ending cash balances
+        cash_accounts = [a for a in all_accounts if a["sub_type"] in ["cash", "bank"]]
+        beginning_cash = sum(balances[prev_day].get(a["account_id"], 0.0) for a in cash_accounts)
+        ending_cash = sum(balances[end_date].get(a["account_id"], 0.0) for a in cash_accounts)
 
         # Operating activities
-        net_income = self._calculate_net_income(s_date, e_date)
+        net_income = self._net_income(all_accounts, activity)
 
         # Adjustments for non-cash items
-        depreciation = 0.0
-        for account in all_accounts:
-            if account["sub_type"] == "depreciation":
-                depreciation += self._get_account_balance_for_period(
-                    account["account_id"], s_date, e_date
-                )
+        depreciation = sum(
+            activity.get(a["account_id"], 0.0)
+            for a in all_accounts
+            if a["sub_type"] == "depreciation"
+        )
 
         # Changes in working capital
-        ar_change = self._get_balance_change("accounts_receivable", s_date, e_date)
-        inventory_change = self._get_balance_change("inventory", s_date, e_date)
-        prepaid_change = self._get_balance_change("prepaid_expense", s_date, e_date)
-        ap_change = self._get_balance_change("accounts_payable", s_date, e_date)
-        accrued_change = self._get_balance_change("payroll_liability", s_date, e_date)
+        ar_change = balance_change("accounts_receivable")
+        inventory_change = balance_change("inventory")
+        prepaid_change = balance_change("prepaid_expense")
+        ap_change = balance_change("accounts_payable")
+        accrued_change = balance_change("payroll_liability")
 
         operating_cash_flow = (
             net_income +
@@ -590,16 +643,13 @@ class GenFinReportsService:
         )
 
         # Investing activities
-        fixed_asset_change = self._get_balance_change("fixed_asset", s_date, e_date)
+        fixed_asset_change = balance_change("fixed_asset")
         investing_cash_flow = -fixed_asset_change  # Purchases are negative
 
         # Financing activities
-        loan_change = (
-            self._get_balance_change("short_term_loan", s_date, e_date) +
-            self._get_balance_change("long_term_loan", s_date, e_date)
-        )
-        equity_change = self._get_balance_change("owner_equity", s_date, e_date)
-        draws = self._get_balance_change("owner_draw", s_date, e_date)
+        loan_change = balance_change("short_term_loan") + balance_change("long_term_loan")
+        equity_change = balance_change("owner_equity")
+        draws = balance_change("owner_draw")
 
         financing_cash_flow = loan_change + equity_change - draws
 
@@ -641,25 +691,6 @@ class GenFinReportsService:
             "reconciliation_check": round(beginning_cash + net_change, 2)
         }
 
-    def _get_balance_change(self, sub_type: str, start_date: date, end_date: date) -> float:
-        """Get change in balance for accounts of a specific subtype"""
-        change = 0.0
-        prev_day = start_date - timedelta(days=1)
-
-        all_accounts = genfin_core_service.list_accounts(active_only=True)
-
-        for account in all_accounts:
-            if account["sub_type"] == sub_type:
-                beginning = genfin_core_service.get_account_balance(
-                    account["account_id"], prev_day.isoformat()
-                )
-                ending = genfin_core_service.get_account_balance(
-                    account["account_id"], end_date.isoformat()
-                )
-                change += ending - beginning
-
-        return round(change, 2)
-
     # ==================== OTHER REPORTS ====================
 
     def get_trial_balance(self, as_of_date: str) -> Dict:
@@ -807,9 +838,10 @@ class GenFinReportsService:
         total_equity = 0.0
 
         all_accounts = genfin_core_service.list_accounts(active_only=True)
+        balances = genfin_core_service.get_account_balances(as_of_date)
 
         for account in all_accounts:
-            balance = genfin_core_service.get_account_balance(account["account_id"], as_of_date)
+            balance = balances.get(account["account_id"], 0.0)
 
             if account["account_type"] == "asset":
                 total_assets += balance
@@ -829,12 +861,9 @@ class GenFinReportsService:
                 total_equity += balance
 
         # Get P&L data
-        net_income = self._calculate_net_income(year_start, report_date)
-        total_revenue = sum(
-            self._get_account_balance_for_period(a["account_id"], year_start, report_date)
-            for a in all_accounts
-            if a["account_type"] == "revenue"
-        )
+        ytd = self._get_period_totals({"ytd": (year_start, report_date)})["ytd"]
+        net_income = self._net_income(all_accounts, ytd)
+        total_revenue = self._section_total(self._pl_sections(all_accounts)["revenue"], ytd)
 
         # Calculate ratios
         current_ratio = current_assets / current_liabilities if current_liabilities > 0 else 0
@@ -991,4 +1020,4 @@ class GenFinReportsService:
 
 
 # Singleton instance
-genfin_reports_service = GenFinReportsService()
+genfin_reports_service = lazy_service("genfin_reports", GenFinReportsService)
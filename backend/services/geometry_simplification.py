@@ -0,0 +1,287 @@
+"""
+Geometry Simplification for AgTools GIS
+Zoom-level Douglas-Peucker simplification of GeoJSON geometries.
+
+RTK-surveyed field outlines carry a vertex every few centimetres, far
+more than a map can show below street level. Geometries are simplified
+to about a pixel at the requested zoom (in Web Mercator, as drawn) and
+coordinates rounded to match, then cached in SQLite so each feature
+is simplified once per cached zoom level until it is edited.
+
+AgTools v6.16.0
+"""
+
+import json
+import math
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .spatial_index import TILE_SIZE
+
+# Tolerance in screen pixels; vertices closer than this to the
+# simplified line are dropped
+SIMPLIFY_PIXELS = 1.0
+
+# Beyond this zoom geometries are served at full resolution
+MAX_SIMPLIFY_ZOOM = 20
+
+# Zoom levels are cached in steps of this many; a request between two
+# cached levels is served from the next finer one
+CACHE_ZOOM_STEP = 2
+
+# Most cached geometries across all sources; the oldest built are
+# evicted down to CACHE_EVICT_TO once it is exceeded
+MAX_CACHE_ENTRIES = 200_000
+CACHE_EVICT_TO = 150_000
+
+# Ids per cache lookup query (below SQLite's bound parameter limit)
+CACHE_LOOKUP_BATCH = 500
+
+
+def simplification_tolerance(zoom: int) -> float:
+    """Degrees of longitude covered by SIMPLIFY_PIXELS screen pixels at a zoom level"""
+    return 360.0 / (TILE_SIZE * 2 ** zoom) * SIMPLIFY_PIXELS
+
+
+def coordinate_precision(zoom: int) -> int:
+    """Decimal places that keep rounding error under a tenth of a pixel"""
+    return max(0, math.ceil(-math.log10(simplification_tolerance(zoom) / 10)))
+
+
+def cached_zoom(zoom: int) -> int:
+    """Zoom level a request is simplified and cached at"""
+    step_up = -(-zoom // CACHE_ZOOM_STEP) * CACHE_ZOOM_STEP
+    return min(step_up, MAX_SIMPLIFY_ZOOM)
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Douglas-Peucker vertex selection.
+
+    Args:
+        points: (n, 2) array of planar coordinates
+        tolerance: Largest allowed distance from a dropped vertex to the line
+
+    Returns:
+        Boolean mask of the vertices to keep (always the first and last)
+    """
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a = points[start]
+        dx, dy = points[end] - a
+        between = points[start + 1:end] - a
+        length = math.hypot(dx, dy)
+        if length == 0:
+            # Closed ring: measure from the shared start/end point
+            distances = np.hypot(between[:, 0], between[:, 1])
+        else:
+            distances = np.abs(dx * between[:, 1] - dy * between[:, 0]) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = start + 1 + farthest
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return keep
+
+
+def _mercator(coords: np.ndarray) -> np.ndarray:
+    """Project lon/lat degrees to Web Mercator, scaled so x stays in degrees"""
+    lat = np.radians(np.clip(coords[:, 1], -85.0511, 85.0511))
+    y = np.degrees(np.log(np.tan(np.pi / 4 + lat / 2)))
+    return np.column_stack((coords[:, 0], y))
+
+
+def _simplify_line(line: Sequence, tolerance: float, digits: int, ring: bool = False) -> Optional[List]:
+    """Simplify one coordinate list; None if it collapses to under a pixel"""
+    coords = np.asarray(line, dtype=float)[:, :2]
+    projected = _mercator(coords)
+    if ring and np.ptp(projected, axis=0).max() < tolerance:
+        return None
+    min_points = 4 if ring else 2
+    if len(coords) > min_points:
+        coords = coords[douglas_peucker(projected, tolerance)]
+    if len(coords) < min_points:
+        return None
+    return np.round(coords, digits).tolist()
+
+
+def simplify_geometry(geometry: Dict[str, Any], zoom: int) -> Dict[str, Any]:
+    """
+    Simplify a GeoJSON geometry for display at a zoom level.
+
+    Polygon holes smaller than the tolerance are dropped; an outer ring
+    that would collapse is kept at full resolution, since sub-pixel
+    features are already thinned by the spatial index.
+    """
+    if not geometry or zoom > MAX_SIMPLIFY_ZOOM:
+        return geometry
+
+    tolerance = simplification_tolerance(zoom)
+    digits = coordinate_precision(zoom)
+    geometry_type = geometry.get("type")
+    coordinates = geometry.get("coordinates")
+
+    def polygon(rings):
+        if not rings:
+            return rings
+        outer = _simplify_line(rings[0], tolerance, digits, ring=True) or rings[0]
+        holes = [_simplify_line(ring, tolerance, digits, ring=True) for ring in rings[1:]]
+        return [outer] + [hole for hole in holes if hole is not None]
+
+    def line(coords):
+        return _simplify_line(coords, tolerance, digits) or coords
+
+    if geometry_type == "GeometryCollection":
+        return {
+            "type": geometry_type,
+            "geometries": [simplify_geometry(g, zoom) for g in geometry.get("geometries", [])]
+        }
+    if not coordinates:
+        return geometry
+    if geometry_type == "Point":
+        simplified = [round(c, digits) for c in coordinates[:2]]
+    elif geometry_type == "MultiPoint":
+        simplified = np.round(np.asarray(coordinates, dtype=float)[:, :2], digits).tolist()
+    elif geometry_type == "LineString":
+        simplified = line(coordinates)
+    elif geometry_type == "MultiLineString":
+        simplified = [line(part) for part in coordinates]
+    elif geometry_type == "Polygon":
+        simplified = polygon(coordinates)
+    elif geometry_type == "MultiPolygon":
+        simplified = [polygon(part) for part in coordinates]
+    else:
+        return geometry
+
+    return {"type": geometry_type, "coordinates": simplified}
+
+
+class SimplifiedGeometryCache:
+    """
+    Per-zoom simplified geometries for rows of another table.
+
+    Entries record the version (updated_at) of the row they were built
+    from, so rows edited anywhere are re-simplified on next read; services
+    also invalidate on their own edits and prune rows that are no longer
+    active. Only every CACHE_ZOOM_STEP-th zoom is stored, and the table is
+    capped at MAX_CACHE_ENTRIES by evicting the oldest built entries.
+    """
+
+    TABLE = "gis_simplified_geometries"
+
+    def __init__(self, source: str):
+        self.source = source
+
+    def create(self, cursor: sqlite3.Cursor) -> None:
+        """Create the cache table if it does not exist"""
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                source TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                zoom INTEGER NOT NULL,
+                version TEXT,
+                geometry TEXT NOT NULL,
+                PRIMARY KEY (source, id, zoom)
+            )
+        """)
+
+    def get(
+        self,
+        cursor: sqlite3.Cursor,
+        rows: Iterable[Tuple[int, Optional[str], Any]],
+        zoom: int
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Simplified geometries for rows, building and storing any missing.
+
+        Args:
+            rows: (id, version, geometry) tuples; geometry is a GeoJSON dict
+                or its JSON text, only parsed on a cache miss
+            zoom: Map zoom level; geometries are simplified at cached_zoom(zoom)
+
+        Returns:
+            Geometry dicts by id, omitting rows whose geometry is unreadable
+            and every row beyond MAX_SIMPLIFY_ZOOM
+        """
+        rows = list(rows)
+        zoom = max(0, int(zoom))
+        if zoom > MAX_SIMPLIFY_ZOOM:
+            return {}  # Full resolution; callers use the stored geometry
+        zoom = cached_zoom(zoom)
+
+        cached: Dict[int, Tuple[Optional[str], str]] = {}
+        ids = [row[0] for row in rows]
+        for i in range(0, len(ids), CACHE_LOOKUP_BATCH):
+            batch = ids[i:i + CACHE_LOOKUP_BATCH]
+            cursor.execute(f"""
+                SELECT id, version, geometry FROM {self.TABLE}
+                WHERE source = ? AND zoom = ? AND id IN ({", ".join("?" * len(batch))})
+            """, [self.source, zoom, *batch])
+            for entry in cursor.fetchall():
+                cached[entry[0]] = (entry[1], entry[2])
+
+        result: Dict[int, Dict[str, Any]] = {}
+        built = []
+        for row_id, version, geometry in rows:
+            entry = cached.get(row_id)
+            if entry is not None and entry[0] == version:
+                result[row_id] = json.loads(entry[1])
+                continue
+            try:
+                if isinstance(geometry, str):
+                    geometry = json.loads(geometry)
+                simplified = simplify_geometry(geometry, zoom)
+            except (json.JSONDecodeError, TypeError, ValueError, IndexError):
+                continue  # Left out; callers fall back to the stored geometry
+            result[row_id] = simplified
+            built.append((self.source, row_id, zoom, version, json.dumps(simplified, separators=(",", ":"))))
+
+        if built:
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {self.TABLE} (source, id, zoom, version, geometry) VALUES (?, ?, ?, ?, ?)",
+                built
+            )
+            self._evict(cursor)
+        return result
+
+    def _evict(self, cursor: sqlite3.Cursor) -> None:
+        """Drop the oldest built entries once the table is over MAX_CACHE_ENTRIES"""
+        cursor.execute(f"SELECT COUNT(*) FROM {self.TABLE}")
+        count = cursor.fetchone()[0]
+        if count > MAX_CACHE_ENTRIES:
+            # REPLACE re-inserts, so rowid order is build order
+            cursor.execute(f"""
+                DELETE FROM {self.TABLE}
+                WHERE rowid IN (SELECT rowid FROM {self.TABLE} ORDER BY rowid LIMIT ?)
+            """, (count - CACHE_EVICT_TO,))
+
+    def invalidate(self, cursor: sqlite3.Cursor, ids: Iterable[int]) -> None:
+        """Drop cached geometries for rows at every zoom"""
+        cursor.executemany(
+            f"DELETE FROM {self.TABLE} WHERE source = ? AND id = ?",
+            [(self.source, i) for i in ids]
+        )
+
+    def prune(self, cursor: sqlite3.Cursor, active_ids_sql: str) -> None:
+        """
+        Drop cached geometries for rows that are no longer active.
+
+        Args:
+            active_ids_sql: SELECT of the source's active ids, e.g.
+                "SELECT id FROM fields WHERE is_active = 1"
+        """
+        cursor.execute(
+            f"DELETE FROM {self.TABLE} WHERE source = ? AND id NOT IN ({active_ids_sql})",
+            (self.source,)
+        )
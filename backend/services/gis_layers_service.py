@@ -10,12 +10,14 @@ import logging
 import sqlite3
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional, List, Tuple, Dict, Any
+from typing import Optional, Iterable, List, Tuple, Dict, Any
 
 from pydantic import BaseModel, Field
 
 from database.db_utils import get_db_connection, DEFAULT_DB_PATH
 from .base_service import BaseService
+from .spatial_index import BBox, SpatialIndex, VIEWPORT_FEATURE_LIMIT, geometry_bounds
+from .geometry_simplification import SimplifiedGeometryCache
 
 logger = logging.getLogger(__name__)
 
@@ -121,6 +123,7 @@ class GeoJSONFeatureCollection(BaseModel):
     """GeoJSON Feature Collection"""
     type: str = "FeatureCollection"
     features: List[Dict[str, Any]] = []
+    truncated: bool = False  # More features matched than the query limit
 
 
 # ============================================================================
@@ -140,10 +143,18 @@ class GISLayersService(BaseService[LayerResponse]):
 
     TABLE_NAME = "gis_layers"
 
+    # Bounds of active features, with their layer for per-layer queries
+    FEATURE_INDEX = SpatialIndex("gis_features_rtree", ("layer_id",))
+
+    # Per-zoom simplified feature geometries
+    SIMPLIFIED = SimplifiedGeometryCache("gis_features")
+
+    # Features indexed per batch when backfilling existing rows
+    INDEX_BACKFILL_BATCH = 5000
+
     def __init__(self, db_path: str = None):
         """Initialize GIS layers service."""
-        self.db_path = db_path or DEFAULT_DB_PATH
-        self._init_database()
+        super().__init__(db_path)
 
     def _init_database(self) -> None:
         """Initialize database tables."""
@@ -188,8 +199,37 @@ class GISLayersService(BaseService[LayerResponse]):
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_gis_layers_visible ON gis_layers(is_visible)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_gis_features_layer ON gis_features(layer_id)")
 
+            # Spatial index, backfilled for features written before it existed
+            self.FEATURE_INDEX.create(cursor)
+            self._backfill_feature_index(cursor)
+            self.SIMPLIFIED.create(cursor)
+
             conn.commit()
 
+    def _backfill_feature_index(self, cursor: sqlite3.Cursor) -> None:
+        """Index active features that are missing from the spatial index."""
+        cursor.execute("""
+            SELECT f.id, f.layer_id, f.geometry FROM gis_features f
+            LEFT JOIN gis_features_rtree r ON r.id = f.id
+            WHERE f.is_active = 1 AND r.id IS NULL
+        """)
+        indexed = 0
+        while True:
+            rows = cursor.fetchmany(self.INDEX_BACKFILL_BATCH)
+            if not rows:
+                break
+            entries = []
+            for row in rows:
+                try:
+                    entries.append((row["id"], geometry_bounds(json.loads(row["geometry"])), row["layer_id"]))
+                except (json.JSONDecodeError, TypeError, IndexError):
+                    logger.warning("Skipping unindexable geometry for GIS feature %s", row["id"])
+            # Separate cursor so the SELECT above keeps its position
+            self.FEATURE_INDEX.upsert(cursor.connection.cursor(), entries)
+            indexed += len(entries)
+        if indexed:
+            logger.info("Indexed %d existing GIS features", indexed)
+
     def _row_to_response(self, row: sqlite3.Row, **kwargs) -> LayerResponse:
         """Convert a database row to LayerResponse."""
         style = None
@@ -512,6 +552,7 @@ class GISLayersService(BaseService[LayerResponse]):
                 """, (layer_id, geometry_json, properties_json))
 
                 feature_id = cursor.lastrowid
+                self.FEATURE_INDEX.upsert(cursor, [(feature_id, geometry_bounds(feature_data.geometry), layer_id)])
                 conn.commit()
 
             return self.get_feature_by_id(feature_id), None
@@ -519,6 +560,34 @@ class GISLayersService(BaseService[LayerResponse]):
         except Exception as e:
             return None, self._sanitize_error(e, "feature creation")
 
+    @classmethod
+    def insert_features(
+        cls,
+        cursor: sqlite3.Cursor,
+        layer_id: int,
+        features: Iterable[Tuple[str, str, Optional[BBox]]]
+    ) -> int:
+        """
+        Insert many features into a layer and index them, on the caller's transaction.
+
+        Args:
+            cursor: Cursor whose connection the caller commits
+            layer_id: Layer ID
+            features: (geometry_json, properties_json, bounds) tuples
+
+        Returns:
+            Number of features inserted
+        """
+        entries = []
+        for geometry_json, properties_json, bounds in features:
+            cursor.execute(
+                "INSERT INTO gis_features (layer_id, geometry, properties) VALUES (?, ?, ?)",
+                (layer_id, geometry_json, properties_json)
+            )
+            entries.append((cursor.lastrowid, bounds, layer_id))
+        cls.FEATURE_INDEX.upsert(cursor, entries)
+        return len(entries)
+
     def get_feature_by_id(self, feature_id: int) -> Optional[FeatureResponse]:
         """Get feature by ID."""
         with get_db_connection(self.db_path) as conn:
@@ -545,39 +614,70 @@ class GISLayersService(BaseService[LayerResponse]):
     def get_layer_features(
         self,
         layer_id: int,
-        as_geojson: bool = True
+        as_geojson: bool = True,
+        bbox: Optional[BBox] = None,
+        zoom: Optional[int] = None,
+        limit: Optional[int] = None
     ) -> GeoJSONFeatureCollection:
         """
-        Get all features in a layer as GeoJSON FeatureCollection.
+        Get features in a layer as GeoJSON FeatureCollection.
 
         Args:
             layer_id: Layer ID
             as_geojson: Return as GeoJSON (always True currently)
+            bbox: Only features intersecting (west, south, east, north)
+            zoom: Map zoom level; geometries are simplified to about a pixel
+                and, with bbox, features under a few pixels are thinned
+            limit: Most features to return (defaults to VIEWPORT_FEATURE_LIMIT with a bbox)
 
         Returns:
-            GeoJSON FeatureCollection
+            GeoJSON FeatureCollection, with truncated set if the limit was hit
+        """
+        query = """
+            SELECT id, geometry, properties, updated_at FROM gis_features
+            WHERE layer_id = ? AND is_active = 1
         """
+        params: List[Any] = [layer_id]
+
+        if bbox is not None:
+            candidates, candidate_params = self.FEATURE_INDEX.candidates_sql(bbox, zoom, {"layer_id": layer_id})
+            query += f" AND id IN ({candidates})"
+            params.extend(candidate_params)
+            if limit is None:
+                limit = VIEWPORT_FEATURE_LIMIT
+
+        if limit is not None:
+            # One extra row tells us whether the result was cut off
+            query += " ORDER BY id LIMIT ?"
+            params.append(limit + 1)
+
         with get_db_connection(self.db_path) as conn:
             cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
 
-            cursor.execute("""
-                SELECT * FROM gis_features
-                WHERE layer_id = ? AND is_active = 1
-            """, (layer_id,))
+            truncated = limit is not None and len(rows) > limit
+            if truncated:
+                rows = rows[:limit]
 
-            rows = cursor.fetchall()
+            simplified = {}
+            if zoom is not None:
+                simplified = self.SIMPLIFIED.get(
+                    cursor, ((row["id"], row["updated_at"], row["geometry"]) for row in rows), zoom
+                )
+                conn.commit()
 
         features = []
         for row in rows:
             feature = {
                 "type": "Feature",
                 "id": row["id"],
-                "geometry": json.loads(row["geometry"]),
+                "geometry": simplified.get(row["id"]) or json.loads(row["geometry"]),
                 "properties": json.loads(row["properties"]) if row["properties"] else {}
             }
             features.append(feature)
 
-        return GeoJSONFeatureCollection(features=features)
+        return GeoJSONFeatureCollection(features=features, truncated=truncated)
 
     def update_feature(
         self,
@@ -616,6 +716,13 @@ class GISLayersService(BaseService[LayerResponse]):
                 if cursor.rowcount == 0:
                     return None, "Feature not found"
 
+                if feature_data.geometry is not None:
+                    cursor.execute("SELECT layer_id FROM gis_features WHERE id = ?", (feature_id,))
+                    self.FEATURE_INDEX.upsert(cursor, [
+                        (feature_id, geometry_bounds(feature_data.geometry), cursor.fetchone()["layer_id"])
+                    ])
+                    self.SIMPLIFIED.invalidate(cursor, [feature_id])
+
                 conn.commit()
 
             return self.get_feature_by_id(feature_id), None
@@ -637,6 +744,8 @@ class GISLayersService(BaseService[LayerResponse]):
                 if cursor.rowcount == 0:
                     return False, "Feature not found"
 
+                self.FEATURE_INDEX.delete(cursor, [feature_id])
+                self.SIMPLIFIED.invalidate(cursor, [feature_id])
                 conn.commit()
 
             return True, None
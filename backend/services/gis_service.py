@@ -8,31 +8,74 @@ AgTools v6.16.0
 
 import json
 import logging
+import math
 import os
 import sqlite3
 import tempfile
+import threading
+import uuid
 from datetime import datetime, timezone
-from typing import Optional, List, Tuple, Dict, Any
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, Callable, List, Sequence, Tuple, Dict, Any
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 from database.db_utils import get_db_connection, DEFAULT_DB_PATH
 from .base_service import BaseService
+from .spatial_index import BBox, SpatialIndex, VIEWPORT_FEATURE_LIMIT, geometry_bounds
+from .geometry_simplification import SimplifiedGeometryCache
+from .gis_layers_service import GISLayersService
 
 logger = logging.getLogger(__name__)
 
 # Try to import GIS libraries
 try:
     import geopandas as gpd
+    import shapely
     from shapely.geometry import shape, mapping, Polygon, MultiPolygon, Point
     from shapely.ops import transform
     import pyproj
+    import fiona
     from fiona.crs import from_epsg
+    # fiona only lists drivers it tests; GDAL's KML driver reads fine
+    fiona.supported_drivers.setdefault("KML", "r")
     HAS_GIS_LIBS = True
 except ImportError:
     HAS_GIS_LIBS = False
     logger.warning("GIS libraries not installed. Install with: pip install geopandas shapely fiona pyproj")
 
+SQ_METERS_PER_ACRE = 4046.8564224
+
+# Boundaries read and measured per batch when recalculating acreage
+AREA_BATCH_SIZE = 5000
+
+# Features read, matched and written per transaction when importing
+IMPORT_CHUNK_SIZE = 5000
+
+# Imported features returned in ImportResult.features
+IMPORT_PREVIEW_LIMIT = 500
+
+# Share of the larger shape an imported polygon and a field boundary must
+# overlap for a location match, so each covers most of the other
+MATCH_MIN_OVERLAP = 0.5
+
+# Finished import jobs kept for status queries
+MAX_FINISHED_IMPORT_JOBS = 50
+
+# Attribute names checked, in order, for a feature's name
+NAME_FIELDS = ("name", "Name", "NAME", "field_name", "FIELD_NAME", "label")
+
+# shapely type ids of Polygon and MultiPolygon
+POLYGONAL_TYPE_IDS = (3, 6)
+
+
+@lru_cache(maxsize=64)
+def _get_transformer(from_crs: str, to_crs: str) -> "pyproj.Transformer":
+    """Cached transformer; building one costs far more than using it (thread-safe in pyproj >= 3.1)"""
+    return pyproj.Transformer.from_crs(from_crs, to_crs, always_xy=True)
+
 
 # ============================================================================
 # PYDANTIC MODELS
@@ -50,6 +93,7 @@ class GeoJSONFeatureCollection(BaseModel):
     """GeoJSON Feature Collection"""
     type: str = "FeatureCollection"
     features: List[GeoJSONFeature] = []
+    truncated: bool = False  # More features matched than the query limit
 
 
 class BoundaryUpdate(BaseModel):
@@ -70,8 +114,30 @@ class ImportResult(BaseModel):
     message: str
     imported_count: int = 0
     matched_count: int = 0
+    stored_count: int = 0  # Unmatched features saved to the target layer
+    failed_count: int = 0
+    cancelled: bool = False
     errors: List[str] = []
-    features: List[Dict[str, Any]] = []
+    features: List[Dict[str, Any]] = []  # First IMPORT_PREVIEW_LIMIT features
+
+
+class GISImportProgress(BaseModel):
+    """Running totals reported after each imported chunk"""
+    job_id: Optional[str] = None
+    features_read: int = 0
+    total_features: Optional[int] = None  # Unknown when a bbox filter is applied
+    imported_count: int = 0
+    matched_count: int = 0
+    stored_count: int = 0
+    failed_count: int = 0
+
+
+class ImportJobInfo(BaseModel):
+    """Status of a background import"""
+    job_id: str
+    status: str  # running, completed, cancelled, failed
+    progress: Optional[GISImportProgress] = None
+    result: Optional[ImportResult] = None
 
 
 class ExportRequest(BaseModel):
@@ -97,6 +163,26 @@ class AreaResult(BaseModel):
     perimeter_meters: float
 
 
+class AreaBatchRequest(BaseModel):
+    """Batch area calculation request"""
+    geometries: List[Dict[str, Any]] = Field(..., max_length=100000, description="GeoJSON geometries")
+
+
+class AcreageRecalculationRequest(BaseModel):
+    """Recalculate field acreage from boundaries"""
+    field_ids: Optional[List[int]] = None
+    farm_name: Optional[str] = None
+
+
+class AcreageRecalculationResult(BaseModel):
+    """Acreage recalculation result"""
+    success: bool
+    message: str
+    fields_checked: int = 0
+    fields_updated: int = 0
+    errors: List[str] = []
+
+
 class QGISProjectResult(BaseModel):
     """QGIS project generation result"""
     success: bool
@@ -105,6 +191,47 @@ class QGISProjectResult(BaseModel):
     message: str
 
 
+# ============================================================================
+# IMPORT JOBS
+# ============================================================================
+
+class ImportJob:
+    """
+    Handle on a running import.
+
+    The importer updates progress after each chunk and checks for
+    cancellation before reading the next, so a cancelled import stops
+    within one chunk; chunks already committed stay imported.
+    """
+
+    def __init__(self, job_id: str, user_id: Optional[int] = None):
+        self.job_id = job_id
+        self.user_id = user_id
+        self.status = "running"
+        self.progress: Optional[GISImportProgress] = None
+        self.result: Optional[ImportResult] = None
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        """Ask the import to stop after the current chunk"""
+        self._cancel.set()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def finish(self, result: ImportResult) -> None:
+        """Record the final result"""
+        self.result = result
+        if result.cancelled:
+            self.status = "cancelled"
+        else:
+            self.status = "completed" if result.success else "failed"
+
+    def info(self) -> ImportJobInfo:
+        return ImportJobInfo(job_id=self.job_id, status=self.status, progress=self.progress, result=self.result)
+
+
 # ============================================================================
 # GIS SERVICE CLASS
 # ============================================================================
@@ -124,14 +251,84 @@ class GISService(BaseService):
 
     TABLE_NAME = "fields"  # Uses existing fields table
 
+    # Bounds of field boundaries (or locations). updated_at records the
+    # version indexed, so fields edited outside this service are re-indexed
+    FIELD_INDEX = SpatialIndex("field_boundaries_rtree", ("updated_at",))
+
+    # Per-zoom simplified field boundaries
+    SIMPLIFIED = SimplifiedGeometryCache("fields")
+
     def __init__(self, db_path: str = None):
         """Initialize GIS service."""
-        self.db_path = db_path or DEFAULT_DB_PATH
-        self._init_database()
+        super().__init__(db_path)
+        self._import_jobs: Dict[str, ImportJob] = {}
+        self._import_jobs_lock = threading.Lock()
+        # Fields table state as of the last index sync; see _sync_field_index
+        self._field_index_version: Optional[Tuple] = None
 
     def _init_database(self) -> None:
-        """Initialize database - uses existing fields table."""
-        pass  # Fields table already exists
+        """Initialize database - uses existing fields table plus its spatial index and simplification cache."""
+        with get_db_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            self.FIELD_INDEX.create(cursor)
+            self.SIMPLIFIED.create(cursor)
+            conn.commit()
+
+    @staticmethod
+    def _field_bounds(boundary: Optional[str], lat: Optional[float], lng: Optional[float]) -> Optional[BBox]:
+        """Bounds of a field's boundary, falling back to its location point."""
+        if boundary:
+            try:
+                bounds = geometry_bounds(json.loads(boundary))
+                if bounds is not None:
+                    return bounds
+            except (json.JSONDecodeError, TypeError, IndexError, AttributeError):
+                pass
+        if lat and lng:
+            return (lng, lat, lng, lat)
+        return None
+
+    def _sync_field_index(self, cursor: sqlite3.Cursor) -> bool:
+        """
+        Bring the field index up to date.
+
+        Fields are created and edited by FieldService and imports as well as
+        update_field_boundary, so changed rows are found by comparing
+        updated_at with the indexed version, and deactivated fields are
+        dropped from the index and the simplification cache. The comparison
+        (and any write)
+        is skipped while the row count, active count and latest updated_at
+        are unchanged since the last sync, so map reads normally cost one
+        aggregate query.
+
+        Returns:
+            True if the index was written and needs a commit
+        """
+        cursor.execute("SELECT COUNT(*), SUM(is_active), MAX(updated_at) FROM fields")
+        version = tuple(cursor.fetchone())
+        if version == self._field_index_version:
+            return False
+
+        cursor.execute("""
+            SELECT f.id, f.boundary, f.location_lat, f.location_lng, f.updated_at
+            FROM fields f
+            LEFT JOIN field_boundaries_rtree r ON r.id = f.id
+            WHERE f.is_active = 1 AND (r.id IS NULL OR r.updated_at IS NOT f.updated_at)
+        """)
+        stale = [
+            (row["id"], self._field_bounds(row["boundary"], row["location_lat"], row["location_lng"]), row["updated_at"])
+            for row in cursor.fetchall()
+        ]
+        if stale:
+            self.FIELD_INDEX.upsert(cursor, stale)
+
+        cursor.execute("""
+            DELETE FROM field_boundaries_rtree
+            WHERE id NOT IN (SELECT id FROM fields WHERE is_active = 1)
+        """)
+        self.SIMPLIFIED.prune(cursor, "SELECT id FROM fields WHERE is_active = 1")
+        self._field_index_version = version
+        return True
 
     def _row_to_response(self, row: sqlite3.Row, **kwargs) -> Dict[str, Any]:
         """Convert row to dict."""
@@ -144,7 +341,10 @@ class GISService(BaseService):
     def get_field_boundaries(
         self,
         field_ids: Optional[List[int]] = None,
-        farm_name: Optional[str] = None
+        farm_name: Optional[str] = None,
+        bbox: Optional[BBox] = None,
+        zoom: Optional[int] = None,
+        limit: Optional[int] = None
     ) -> GeoJSONFeatureCollection:
         """
         Get field boundaries as GeoJSON FeatureCollection.
@@ -152,16 +352,26 @@ class GISService(BaseService):
         Args:
             field_ids: Optional list of field IDs to include
             farm_name: Optional farm name filter
+            bbox: Only fields intersecting (west, south, east, north)
+            zoom: Map zoom level; boundaries are simplified to about a pixel
+                and, with bbox, fields under a few pixels are thinned
+            limit: Most fields to return (defaults to VIEWPORT_FEATURE_LIMIT with a bbox)
 
         Returns:
-            GeoJSON FeatureCollection
+            GeoJSON FeatureCollection, with truncated set if the limit was hit
         """
         with get_db_connection(self.db_path) as conn:
             cursor = conn.cursor()
 
+            if bbox is not None or zoom is not None:
+                if self._sync_field_index(cursor):
+                    conn.commit()
+            if bbox is not None and limit is None:
+                limit = VIEWPORT_FEATURE_LIMIT
+
             query = """
                 SELECT id, name, farm_name, acreage, current_crop, soil_type,
-                       location_lat, location_lng, boundary
+                       location_lat, location_lng, boundary, updated_at
                 FROM fields
                 WHERE is_active = 1
             """
@@ -176,14 +386,37 @@ class GISService(BaseService):
                 query += " AND farm_name = ?"
                 params.append(farm_name)
 
+            if bbox is not None:
+                candidates, candidate_params = self.FIELD_INDEX.candidates_sql(bbox, zoom)
+                query += f" AND id IN ({candidates})"
+                params.extend(candidate_params)
+
+            if limit is not None:
+                # One extra row tells us whether the result was cut off
+                query += " ORDER BY id LIMIT ?"
+                params.append(limit + 1)
+
             cursor.execute(query, params)
             rows = cursor.fetchall()
 
+            truncated = limit is not None and len(rows) > limit
+            if truncated:
+                rows = rows[:limit]
+
+            simplified = {}
+            if zoom is not None:
+                simplified = self.SIMPLIFIED.get(
+                    cursor,
+                    ((row["id"], row["updated_at"], row["boundary"]) for row in rows if row["boundary"]),
+                    zoom
+                )
+                conn.commit()
+
         features = []
         for row in rows:
             # Parse boundary GeoJSON or create point from coordinates
-            geometry = None
-            if row["boundary"]:
+            geometry = simplified.get(row["id"])
+            if geometry is None and row["boundary"]:
                 try:
                     geometry = json.loads(row["boundary"])
                 except json.JSONDecodeError:
@@ -211,7 +444,7 @@ class GISService(BaseService):
                 )
                 features.append(feature)
 
-        return GeoJSONFeatureCollection(features=features)
+        return GeoJSONFeatureCollection(features=features, truncated=truncated)
 
     def update_field_boundary(
         self,
@@ -264,7 +497,8 @@ class GISService(BaseService):
 
                 # Build update query
                 updates = ["boundary = ?", "updated_at = ?"]
-                params = [boundary, datetime.now(timezone.utc).isoformat()]
+                updated_at = datetime.now(timezone.utc).isoformat()
+                params = [boundary, updated_at]
 
                 if acreage is not None:
                     updates.append("acreage = ?")
@@ -289,6 +523,11 @@ class GISService(BaseService):
                 if cursor.rowcount == 0:
                     return False, "Field not found"
 
+                self.FIELD_INDEX.upsert(cursor, [
+                    (field_id, self._field_bounds(boundary, center_lat, center_lng), updated_at)
+                ])
+                self.SIMPLIFIED.invalidate(cursor, [field_id])
+
                 # Log action
                 self.auth_service.log_action(
                     user_id=user_id,
@@ -311,25 +550,78 @@ class GISService(BaseService):
     # IMPORT OPERATIONS
     # ========================================================================
 
+    def create_import_job(self, user_id: Optional[int] = None) -> ImportJob:
+        """Register a handle for an import run in the background."""
+        job = ImportJob(uuid.uuid4().hex, user_id)
+        with self._import_jobs_lock:
+            finished = [j for j in self._import_jobs.values() if j.status != "running"]
+            for old in finished[:max(0, len(finished) - MAX_FINISHED_IMPORT_JOBS + 1)]:
+                del self._import_jobs[old.job_id]
+            self._import_jobs[job.job_id] = job
+        return job
+
+    def get_import_job(self, job_id: str, user_id: Optional[int] = None) -> Optional[ImportJob]:
+        """Look up an import job started by this process, only for the user who started it."""
+        with self._import_jobs_lock:
+            job = self._import_jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
     def import_file(
         self,
         file_path: str,
         file_type: str = "auto",
         match_by: str = "name",
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        layer_id: Optional[int] = None,
+        bbox: Optional[BBox] = None,
+        progress: Optional[Callable[[GISImportProgress], None]] = None,
+        job: Optional[ImportJob] = None
     ) -> ImportResult:
         """
         Import geographic data from file.
 
+        Features are streamed from the file IMPORT_CHUNK_SIZE at a time, so
+        memory stays flat however large the file is. Each chunk is
+        reprojected to WGS84 in one call, matched against indexes of the
+        existing fields built once per import, and written in one
+        transaction: matched polygons replace field boundaries and
+        unmatched features are saved to layer_id when given.
+
         Args:
-            file_path: Path to file
-            file_type: File type (auto, shapefile, kml, geojson)
-            match_by: How to match imported features to existing fields
+            file_path: Path to file (.shp, zipped shapefile, .gpkg, .kml, .geojson)
+            file_type: File type (auto, shapefile, kml, geojson, geopackage)
+            match_by: How to match imported features to existing fields:
+                name, location (boundary overlap) or none
             user_id: User performing import
+            layer_id: Optional GIS layer to save unmatched features to
+            bbox: Optional (west, south, east, north) in WGS84; only features
+                intersecting it are read
+            progress: Optional callback given running totals after each chunk
+            job: Optional handle updated with progress and checked for
+                cancellation between chunks
 
         Returns:
             ImportResult
         """
+        result = self._import_file(file_path, file_type, match_by, user_id, layer_id, bbox, progress, job)
+        if job is not None:
+            job.finish(result)
+        return result
+
+    def _import_file(
+        self,
+        file_path: str,
+        file_type: str,
+        match_by: str,
+        user_id: Optional[int],
+        layer_id: Optional[int],
+        bbox: Optional[BBox],
+        progress: Optional[Callable[[GISImportProgress], None]],
+        job: Optional[ImportJob]
+    ) -> ImportResult:
+        """Body of import_file."""
         if not HAS_GIS_LIBS:
             return ImportResult(
                 success=False,
@@ -339,129 +631,312 @@ class GISService(BaseService):
         if not os.path.exists(file_path):
             return ImportResult(success=False, message=f"File not found: {file_path}")
 
-        try:
-            # Detect file type
-            if file_type == "auto":
-                ext = os.path.splitext(file_path)[1].lower()
-                if ext in [".shp", ".dbf", ".shx"]:
-                    file_type = "shapefile"
-                elif ext == ".kml":
-                    file_type = "kml"
-                elif ext in [".geojson", ".json"]:
-                    file_type = "geojson"
-                elif ext in [".gpkg"]:
-                    file_type = "geopackage"
-                else:
-                    return ImportResult(success=False, message=f"Unknown file type: {ext}")
-
-            # Read file with geopandas
-            if file_type == "kml":
-                gdf = gpd.read_file(file_path, driver="KML")
+        if match_by not in ("name", "location", "none"):
+            return ImportResult(success=False, message=f"Unknown match_by: {match_by}")
+
+        # Detect file type
+        ext = os.path.splitext(file_path)[1].lower()
+        if file_type == "auto":
+            if ext in [".shp", ".dbf", ".shx", ".zip"]:
+                file_type = "shapefile"
+            elif ext == ".kml":
+                file_type = "kml"
+            elif ext in [".geojson", ".json"]:
+                file_type = "geojson"
+            elif ext in [".gpkg"]:
+                file_type = "geopackage"
             else:
-                gdf = gpd.read_file(file_path)
+                return ImportResult(success=False, message=f"Unknown file type: {ext}")
 
-            # Transform to WGS84 if needed
-            if gdf.crs and gdf.crs != "EPSG:4326":
-                gdf = gdf.to_crs("EPSG:4326")
+        source_path = f"zip://{file_path}" if ext == ".zip" else file_path
+        open_kwargs = {"driver": "KML"} if file_type == "kml" else {}
 
-            imported_count = 0
-            matched_count = 0
-            errors = []
-            features = []
+        if layer_id is not None and GISLayersService(self.db_path).get_layer_by_id(layer_id) is None:
+            return ImportResult(success=False, message=f"Layer not found: {layer_id}")
 
-            for idx, row in gdf.iterrows():
-                try:
-                    geom = row.geometry
-                    if geom is None:
-                        continue
-
-                    # Extract properties
-                    props = {}
-                    for col in gdf.columns:
-                        if col != "geometry":
-                            val = row[col]
-                            if val is not None and str(val) != "nan":
-                                props[col] = str(val)
-
-                    # Get name from common field names
-                    name = None
-                    for name_field in ["name", "Name", "NAME", "field_name", "FIELD_NAME", "label"]:
-                        if name_field in props:
-                            name = props[name_field]
-                            break
-
-                    # Convert geometry to GeoJSON string
-                    geom_json = json.dumps(mapping(geom))
-
-                    # Calculate area
-                    area_acres = None
-                    try:
-                        area_result = self.calculate_area(geom)
-                        area_acres = area_result.area_acres
-                    except Exception:
-                        pass
-
-                    feature_data = {
-                        "name": name or f"Imported Field {idx + 1}",
-                        "geometry": mapping(geom),
-                        "properties": props,
-                        "area_acres": area_acres
-                    }
-                    features.append(feature_data)
-
-                    # Match to existing field if requested
-                    if match_by == "name" and name:
-                        match_result = self._match_and_update_field(
-                            name=name,
-                            boundary=geom_json,
-                            user_id=user_id
-                        )
-                        if match_result:
-                            matched_count += 1
-                        else:
-                            imported_count += 1
-                    else:
-                        imported_count += 1
+        totals = GISImportProgress(job_id=job.job_id if job else None)
+        errors: List[str] = []
+        preview: List[Dict[str, Any]] = []
+        cancelled = False
 
-                except Exception as e:
-                    errors.append(f"Error processing feature {idx}: {str(e)}")
+        try:
+            with get_db_connection(self.db_path) as conn, fiona.open(source_path, **open_kwargs) as source:
+                cursor = conn.cursor()
+                fields = self._load_field_matcher(cursor, match_by)
+                to_wgs84 = self._wgs84_transformer(source.crs_wkt)
 
-            return ImportResult(
-                success=True,
-                message=f"Imported {imported_count} features, matched {matched_count} existing fields",
-                imported_count=imported_count,
-                matched_count=matched_count,
-                errors=errors,
-                features=features
-            )
+                if bbox is not None:
+                    features = iter(source.filter(bbox=self._source_bbox(bbox, source.crs_wkt)))
+                else:
+                    totals.total_features = len(source)
+                    features = iter(source)
+
+                while True:
+                    if job is not None and job.cancel_requested:
+                        cancelled = True
+                        break
+                    chunk = list(islice(features, IMPORT_CHUNK_SIZE))
+                    if not chunk:
+                        break
+
+                    self._import_chunk(cursor, chunk, to_wgs84, match_by, fields, layer_id, totals, errors, preview)
+                    conn.commit()
+
+                    snapshot = totals.model_copy()
+                    if job is not None:
+                        job.progress = snapshot
+                    if progress is not None:
+                        progress(snapshot)
+
+                if user_id is not None and (totals.matched_count or totals.stored_count):
+                    self.auth_service.log_action(
+                        user_id=user_id,
+                        action="import_gis_file",
+                        entity_type="field",
+                        details=json.dumps({
+                            "file": os.path.basename(file_path),
+                            "matched": totals.matched_count,
+                            "stored": totals.stored_count,
+                            "layer_id": layer_id
+                        }),
+                        conn=conn
+                    )
+                    conn.commit()
 
         except Exception as e:
             logger.error("Import error: %s", e)
-            return ImportResult(success=False, message=f"Import failed: {str(e)}")
+            return ImportResult(
+                success=False,
+                message=f"Import failed: {str(e)}",
+                imported_count=totals.imported_count,
+                matched_count=totals.matched_count,
+                stored_count=totals.stored_count,
+                failed_count=totals.failed_count,
+                errors=errors[:20],
+                features=preview
+            )
+
+        message = f"Imported {totals.imported_count} features, matched {totals.matched_count} existing fields"
+        if cancelled:
+            message = f"Import cancelled after {totals.features_read} features. " + message
+        return ImportResult(
+            success=True,
+            message=message,
+            imported_count=totals.imported_count,
+            matched_count=totals.matched_count,
+            stored_count=totals.stored_count,
+            failed_count=totals.failed_count,
+            cancelled=cancelled,
+            errors=errors[:20],  # Return first 20 errors
+            features=preview
+        )
 
-    def _match_and_update_field(
+    def _import_chunk(
         self,
-        name: str,
-        boundary: str,
-        user_id: Optional[int]
-    ) -> bool:
-        """Match imported feature to existing field by name."""
-        with get_db_connection(self.db_path) as conn:
-            cursor = conn.cursor()
+        cursor: sqlite3.Cursor,
+        chunk: List["fiona.Feature"],
+        to_wgs84: Optional["pyproj.Transformer"],
+        match_by: str,
+        fields: Dict[str, Any],
+        layer_id: Optional[int],
+        totals: GISImportProgress,
+        errors: List[str],
+        preview: List[Dict[str, Any]]
+    ) -> None:
+        """Match and write one chunk of features, updating totals in place."""
+        first_index = totals.features_read
+        totals.features_read += len(chunk)
+
+        rows = [(first_index + i, feature) for i, feature in enumerate(chunk) if feature.geometry is not None]
+        if not rows:
+            return
+
+        geoms = self._to_geometries([self._feature_geometry(feature) for _, feature in rows])
+        if to_wgs84 is not None:
+            geoms = shapely.transform(
+                geoms, lambda xy: np.column_stack(to_wgs84.transform(xy[:, 0], xy[:, 1]))
+            )
 
+        readable = ~shapely.is_missing(geoms)
+        for (index, _), ok in zip(rows, readable):
+            if not ok:
+                totals.failed_count += 1
+                errors.append(f"Error processing feature {index}: unreadable geometry")
+
+        properties = [self._feature_properties(feature) for _, feature in rows]
+        names = [next((str(props[key]) for key in NAME_FIELDS if key in props), None) for props in properties]
+        matched, containing = self._match_fields(geoms, names, match_by, fields)
+
+        is_matched = matched >= 0
+        if is_matched.any():
+            self._write_matched_boundaries(cursor, geoms[is_matched], matched[is_matched])
+            totals.matched_count += int(is_matched.sum())
+
+        unmatched = np.flatnonzero(readable & ~is_matched)
+        totals.imported_count += len(unmatched)
+        for i in np.flatnonzero(containing >= 0):
+            properties[i]["field_id"] = int(containing[i])
+
+        if layer_id is not None and len(unmatched):
+            totals.stored_count += GISLayersService.insert_features(cursor, layer_id, zip(
+                shapely.to_geojson(geoms[unmatched]).tolist(),
+                (json.dumps(properties[i]) for i in unmatched),
+                (tuple(b) for b in shapely.bounds(geoms[unmatched]).tolist())
+            ))
+
+        wanted = np.flatnonzero(readable)[:IMPORT_PREVIEW_LIMIT - len(preview)]
+        if len(wanted):
+            areas, _ = self._measure_in_utm(geoms[wanted])
+            for i, geometry_json, area in zip(wanted, shapely.to_geojson(geoms[wanted]), areas):
+                preview.append({
+                    "name": names[i] or f"Imported Field {rows[i][0] + 1}",
+                    "geometry": json.loads(geometry_json),
+                    "properties": properties[i],
+                    "area_acres": None if np.isnan(area) else round(float(area) / SQ_METERS_PER_ACRE, 2)
+                })
+
+    @staticmethod
+    def _feature_geometry(feature: "fiona.Feature") -> Dict[str, Any]:
+        """GeoJSON-like dict of a feature's geometry (__geo_interface__ is several times slower)."""
+        geometry = feature.geometry
+        if geometry.type == "GeometryCollection":
+            return geometry.__geo_interface__
+        return {"type": geometry.type, "coordinates": geometry.coordinates}
+
+    @staticmethod
+    def _feature_properties(feature: "fiona.Feature") -> Dict[str, Any]:
+        """JSON-safe attributes of a feature, without nulls."""
+        props = {}
+        for key, value in feature.properties.items():
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                continue
+            props[key] = value if isinstance(value, (str, int, float, bool)) else str(value)
+        return props
+
+    def _load_field_matcher(self, cursor: sqlite3.Cursor, match_by: str) -> Dict[str, Any]:
+        """
+        Indexes of the existing fields, built once per import.
+
+        Returns:
+            {"names": lowercase name -> id} for name matching, or
+            {"ids", "geoms", "tree"} (an STRtree of boundaries) for location matching
+        """
+        if match_by == "name":
+            cursor.execute("SELECT id, name FROM fields WHERE is_active = 1 AND name IS NOT NULL ORDER BY id DESC")
+            # Lowest id wins for duplicate names, as with the old per-feature lookup
+            return {"names": {row["name"].lower(): row["id"] for row in cursor.fetchall()}}
+
+        if match_by == "location":
             cursor.execute("""
-                SELECT id FROM fields
-                WHERE LOWER(name) = LOWER(?) AND is_active = 1
-            """, (name,))
-
-            row = cursor.fetchone()
-            if row:
-                success, _ = self.update_field_boundary(
-                    row["id"], boundary, user_id or 1
-                )
-                return success
+                SELECT id, boundary FROM fields
+                WHERE is_active = 1 AND boundary IS NOT NULL AND boundary != ''
+            """)
+            rows = cursor.fetchall()
+            geoms = self._to_geometries([row["boundary"] for row in rows])
+            polygonal = np.isin(shapely.get_type_id(geoms), POLYGONAL_TYPE_IDS)
+            geoms = shapely.make_valid(geoms[polygonal])
+            ids = np.array([row["id"] for row in rows], dtype=np.int64)[polygonal]
+            return {"ids": ids, "geoms": geoms, "tree": shapely.STRtree(geoms)}
+
+        return {}
+
+    @staticmethod
+    def _match_fields(
+        geoms: np.ndarray,
+        names: List[Optional[str]],
+        match_by: str,
+        fields: Dict[str, Any]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Existing fields for a chunk of imported geometries.
 
-        return False
+        Polygons match by name, or by the field boundary they overlap most
+        (at least MATCH_MIN_OVERLAP of the larger shape). For location
+        matching, other geometries record the field they fall in.
+
+        Returns:
+            (matched field ids, containing field ids), -1 where none
+        """
+        matched = np.full(len(geoms), -1, dtype=np.int64)
+        containing = np.full(len(geoms), -1, dtype=np.int64)
+        polygonal = np.isin(shapely.get_type_id(geoms), POLYGONAL_TYPE_IDS)
+
+        if match_by == "name":
+            lookup = fields["names"]
+            for i in np.flatnonzero(polygonal):
+                if names[i]:
+                    matched[i] = lookup.get(names[i].lower(), -1)
+
+        elif match_by == "location" and len(fields["ids"]):
+            present = np.flatnonzero(~shapely.is_missing(geoms))
+            query_index, tree_index = fields["tree"].query(geoms[present], predicate="intersects")
+            inputs = present[query_index]
+            is_polygon = polygonal[inputs]
+
+            candidates, targets = inputs[is_polygon], tree_index[is_polygon]
+            if len(candidates):
+                imported = shapely.make_valid(geoms[candidates])
+                existing = fields["geoms"][targets]
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    overlap = shapely.area(shapely.intersection(imported, existing)) / np.maximum(
+                        shapely.area(imported), shapely.area(existing)
+                    )
+                order = np.argsort(-np.nan_to_num(overlap), kind="stable")
+                candidates, targets, overlap = candidates[order], targets[order], overlap[order]
+                _, best = np.unique(candidates, return_index=True)
+                best = best[overlap[best] >= MATCH_MIN_OVERLAP]
+                matched[candidates[best]] = fields["ids"][targets[best]]
+
+            others, targets = inputs[~is_polygon], tree_index[~is_polygon]
+            _, first = np.unique(others, return_index=True)
+            containing[others[first]] = fields["ids"][targets[first]]
+
+        return matched, containing
+
+    def _write_matched_boundaries(self, cursor: sqlite3.Cursor, geoms: np.ndarray, field_ids: np.ndarray) -> None:
+        """Replace field boundaries, acreage and centroids from imported polygons."""
+        areas, _ = self._measure_in_utm(geoms)
+        centroids = shapely.centroid(geoms)
+        updated_at = datetime.now(timezone.utc).isoformat()
+
+        # A later feature for the same field wins
+        updates: Dict[int, Tuple] = {}
+        for field_id, boundary, area, lng, lat, bounds in zip(
+            field_ids.tolist(),
+            shapely.to_geojson(geoms).tolist(),
+            areas,
+            shapely.get_x(centroids).tolist(),
+            shapely.get_y(centroids).tolist(),
+            shapely.bounds(geoms).tolist()
+        ):
+            acreage = None if np.isnan(area) else round(float(area) / SQ_METERS_PER_ACRE, 2)
+            updates[field_id] = (boundary, acreage, lat, lng, updated_at, field_id, tuple(bounds))
+
+        cursor.executemany("""
+            UPDATE fields
+            SET boundary = ?, acreage = COALESCE(?, acreage), location_lat = ?, location_lng = ?, updated_at = ?
+            WHERE id = ? AND is_active = 1
+        """, [update[:6] for update in updates.values()])
+
+        self.FIELD_INDEX.upsert(cursor, [(field_id, update[6], updated_at) for field_id, update in updates.items()])
+        self.SIMPLIFIED.invalidate(cursor, updates.keys())
+
+    @staticmethod
+    def _wgs84_transformer(crs_wkt: Optional[str]) -> Optional["pyproj.Transformer"]:
+        """Transformer from a source CRS to WGS84; None if it is already WGS84 or unknown."""
+        if not crs_wkt:
+            return None
+        crs = pyproj.CRS.from_wkt(crs_wkt)
+        if crs.equals(pyproj.CRS("EPSG:4326"), ignore_axis_order=True):
+            return None
+        return _get_transformer(crs_wkt, "EPSG:4326")
+
+    @staticmethod
+    def _source_bbox(bbox: BBox, crs_wkt: Optional[str]) -> BBox:
+        """A WGS84 bbox in a source file's CRS."""
+        if not crs_wkt or pyproj.CRS.from_wkt(crs_wkt).equals(pyproj.CRS("EPSG:4326"), ignore_axis_order=True):
+            return tuple(bbox)
+        return _get_transformer("EPSG:4326", crs_wkt).transform_bounds(*bbox)
 
     # ========================================================================
     # EXPORT OPERATIONS
@@ -572,7 +1047,7 @@ class GISService(BaseService):
             raise RuntimeError("GIS libraries not installed")
 
         geom = shape(geometry)
-        transformer = pyproj.Transformer.from_crs(from_crs, to_crs, always_xy=True)
+        transformer = _get_transformer(from_crs, to_crs)
         transformed = transform(transformer.transform, geom)
 
         return mapping(transformed)
@@ -604,6 +1079,9 @@ class GISService(BaseService):
 
         Returns:
             AreaResult with area in various units
+
+        Raises:
+            ValueError: If the geometry is empty
         """
         if not HAS_GIS_LIBS:
             raise RuntimeError("GIS libraries not installed")
@@ -611,26 +1089,233 @@ class GISService(BaseService):
         if isinstance(geometry, dict):
             geometry = shape(geometry)
 
-        # Get centroid longitude to determine UTM zone
-        centroid = geometry.centroid
-        utm_crs = self.get_utm_zone(centroid.x)
+        result = self.calculate_areas([geometry])[0]
+        if result is None:
+            raise ValueError("Geometry is empty")
+        return result
+
+    def calculate_areas(self, geometries: Sequence) -> List[Optional[AreaResult]]:
+        """
+        Calculate areas of many geometries at once.
+
+        Args:
+            geometries: Shapely geometries, GeoJSON dicts or GeoJSON strings
+
+        Returns:
+            AreaResult per geometry, None where a geometry is empty or invalid
+        """
+        if not HAS_GIS_LIBS:
+            raise RuntimeError("GIS libraries not installed")
+
+        areas, perimeters = self._measure_in_utm(self._to_geometries(geometries))
+        return [
+            None if np.isnan(area) else self._area_result(area, perimeter)
+            for area, perimeter in zip(areas, perimeters)
+        ]
 
-        # Transform to UTM for accurate area calculation
-        transformer = pyproj.Transformer.from_crs("EPSG:4326", utm_crs, always_xy=True)
-        utm_geom = transform(transformer.transform, geometry)
+    def _measure_in_utm(self, geoms: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Area (sq m) and perimeter (m) of geometries, each in its UTM zone.
 
-        area_sq_meters = utm_geom.area
-        perimeter_meters = utm_geom.length
+        Geometries are grouped by the zone of their centroid and every
+        zone's coordinates go through one cached transformer in a single
+        array call.
+
+        Returns:
+            (areas, perimeters), NaN for missing or empty geometries
+        """
+        areas = np.full(len(geoms), np.nan)
+        perimeters = np.full(len(geoms), np.nan)
+
+        valid = np.flatnonzero(~shapely.is_missing(geoms) & ~shapely.is_empty(geoms))
+        if not len(valid):
+            return areas, perimeters
+
+        # Same zone rule as get_utm_zone
+        longitudes = shapely.get_x(shapely.centroid(geoms[valid]))
+        zones = ((longitudes + 180) // 6).astype(int) + 1
+
+        for zone in np.unique(zones):
+            selected = valid[zones == zone]
+            transformer = _get_transformer("EPSG:4326", f"EPSG:326{zone:02d}")
+            projected = shapely.transform(
+                geoms[selected],
+                lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1]))
+            )
+            areas[selected] = shapely.area(projected)
+            perimeters[selected] = shapely.length(projected)
 
-        # Convert to other units
-        area_acres = area_sq_meters / 4046.8564224  # sq meters to acres
-        area_hectares = area_sq_meters / 10000  # sq meters to hectares
+        return areas, perimeters
 
+    @staticmethod
+    def _area_result(area_sq_meters: float, perimeter_meters: float) -> AreaResult:
+        """AreaResult in the units and rounding shown to users."""
         return AreaResult(
-            area_sq_meters=round(area_sq_meters, 2),
-            area_acres=round(area_acres, 2),
-            area_hectares=round(area_hectares, 4),
-            perimeter_meters=round(perimeter_meters, 2)
+            area_sq_meters=round(float(area_sq_meters), 2),
+            area_acres=round(float(area_sq_meters) / SQ_METERS_PER_ACRE, 2),
+            area_hectares=round(float(area_sq_meters) / 10000, 4),
+            perimeter_meters=round(float(perimeter_meters), 2)
+        )
+
+    @staticmethod
+    def _to_geometries(items: Sequence) -> np.ndarray:
+        """
+        Shapely geometries from GeoJSON strings, dicts or shapely geometries.
+
+        Points, polygons and multipolygons are gathered into coordinate
+        arrays and built with one shapely call per type, instead of one
+        shape() call each. Unreadable items become None.
+        """
+        geoms = np.empty(len(items), dtype=object)
+        points: List[int] = []
+        point_coords: List[Sequence[float]] = []
+        polygonal: List[int] = []
+        single_polygons: List[int] = []
+        rings: List[np.ndarray] = []
+        ring_counts: List[int] = []
+        part_counts: List[int] = []
+
+        for i, item in enumerate(items):
+            if item is None or not isinstance(item, (str, dict)):
+                geoms[i] = item
+                continue
+            try:
+                geometry = json.loads(item) if isinstance(item, str) else item
+                geometry_type = geometry.get("type")
+                if geometry_type == "Point" and len(geometry["coordinates"]) >= 2:
+                    points.append(i)
+                    point_coords.append(geometry["coordinates"][:2])
+                    continue
+                if geometry_type not in ("Polygon", "MultiPolygon"):
+                    geoms[i] = shape(geometry)
+                    continue
+                parts = geometry["coordinates"]
+                if geometry_type == "Polygon":
+                    parts = [parts] if parts else []
+                part_rings = [
+                    [np.asarray(ring, dtype=float)[:, :2] for ring in part] for part in parts
+                ]
+            except Exception:
+                geoms[i] = None
+                continue
+            if not part_rings or any(len(ring) < 4 for part in part_rings for ring in part):
+                geoms[i] = None
+                continue
+
+            if geometry_type == "Polygon":
+                single_polygons.append(len(polygonal))
+            polygonal.append(i)
+            part_counts.append(len(part_rings))
+            for part in part_rings:
+                ring_counts.append(len(part))
+                rings.extend(part)
+
+        if points:
+            geoms[points] = shapely.points(np.asarray(point_coords, dtype=float))
+
+        if polygonal:
+            ring_offsets = np.zeros(len(rings) + 1, dtype=np.int64)
+            ring_offsets[1:] = np.cumsum([len(ring) for ring in rings])
+            part_offsets = np.zeros(len(ring_counts) + 1, dtype=np.int64)
+            part_offsets[1:] = np.cumsum(ring_counts)
+            geometry_offsets = np.zeros(len(part_counts) + 1, dtype=np.int64)
+            geometry_offsets[1:] = np.cumsum(part_counts)
+            built = shapely.from_ragged_array(
+                shapely.GeometryType.MULTIPOLYGON, np.concatenate(rings),
+                (ring_offsets, part_offsets, geometry_offsets)
+            )
+            # Polygons were built as one-part multipolygons
+            built[single_polygons] = shapely.get_geometry(built[single_polygons], 0)
+            geoms[polygonal] = built
+        return geoms
+
+    def recalculate_field_acreage(
+        self,
+        field_ids: Optional[List[int]] = None,
+        farm_name: Optional[str] = None,
+        user_id: Optional[int] = None
+    ) -> AcreageRecalculationResult:
+        """
+        Recompute acreage from boundaries for many fields in one transaction.
+
+        Only fields whose rounded acreage changes are written.
+
+        Args:
+            field_ids: Optional list of field IDs (default: all with boundaries)
+            farm_name: Optional farm name filter
+            user_id: User requesting the recalculation, for the audit log
+
+        Returns:
+            AcreageRecalculationResult
+        """
+        if not HAS_GIS_LIBS:
+            return AcreageRecalculationResult(
+                success=False,
+                message="GIS libraries not installed. Run: pip install geopandas shapely fiona pyproj"
+            )
+
+        query = """
+            SELECT id, boundary, acreage FROM fields
+            WHERE is_active = 1 AND boundary IS NOT NULL AND boundary != ''
+        """
+        params: List[Any] = []
+        if field_ids:
+            query += f" AND id IN ({','.join('?' * len(field_ids))})"
+            params.extend(field_ids)
+        if farm_name:
+            query += " AND farm_name = ?"
+            params.append(farm_name)
+
+        checked = 0
+        updates = []
+        errors = []
+        updated_at = datetime.now(timezone.utc).isoformat()
+
+        try:
+            with get_db_connection(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+
+                while True:
+                    rows = cursor.fetchmany(AREA_BATCH_SIZE)
+                    if not rows:
+                        break
+                    checked += len(rows)
+                    areas, _ = self._measure_in_utm(self._to_geometries([row["boundary"] for row in rows]))
+                    for row, area in zip(rows, areas):
+                        if np.isnan(area):
+                            errors.append(f"Field {row['id']}: boundary could not be measured")
+                            continue
+                        acreage = round(float(area) / SQ_METERS_PER_ACRE, 2)
+                        if acreage != row["acreage"]:
+                            updates.append((acreage, updated_at, row["id"]))
+
+                cursor.executemany(
+                    "UPDATE fields SET acreage = ?, updated_at = ? WHERE id = ?", updates
+                )
+
+                if updates and user_id is not None:
+                    self.auth_service.log_action(
+                        user_id=user_id,
+                        action="recalculate_field_acreage",
+                        entity_type="field",
+                        details=json.dumps({"fields_updated": len(updates)}),
+                        conn=conn
+                    )
+
+                conn.commit()
+
+        except Exception as e:
+            return AcreageRecalculationResult(
+                success=False, message=self._sanitize_error(e, "acreage recalculation")
+            )
+
+        return AcreageRecalculationResult(
+            success=True,
+            message=f"Updated acreage for {len(updates)} of {checked} fields",
+            fields_checked=checked,
+            fields_updated=len(updates),
+            errors=errors[:20]  # Return first 20 errors
         )
 
     def calculate_distance(
@@ -14,6 +14,8 @@ from typing import Dict, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
+from .domain_store import DomainStore, unit_of_work
+
 
 # =============================================================================
 # ENUMS AND DATA CLASSES
@@ -249,26 +251,33 @@ CURRENT_PRICES = {
 class GrainStorageService:
     """Grain and storage management service"""
 
-    def __init__(self):
-        self.bins: Dict[str, StorageBin] = {}
-        self.inventories: Dict[str, BinInventory] = {}
-        self.transactions: Dict[str, GrainTransaction] = {}
-        self.drying_records: Dict[str, DryingRecord] = {}
-        self.basis_alerts: Dict[str, BasisAlert] = {}
-        self.price_alerts: Dict[str, PriceAlert] = {}
-
-        self._counters = {
-            "bin": 0, "txn": 0, "dry": 0, "basis_alert": 0, "price_alert": 0
-        }
+    def __init__(self, db_path: str = None):
+        self._store = DomainStore("grain", db_path)
+        self.bins = self._store.map("bins", StorageBin)
+        self.inventories = self._store.map("inventories", Optional[BinInventory])
+        self.transactions = self._store.map(
+            "transactions", GrainTransaction, indexes=("grain_type", "transaction_type")
+        )
+        self.drying_records = self._store.map("drying_records", DryingRecord)
+        self.basis_alerts = self._store.map("basis_alerts", BasisAlert)
+        self.price_alerts = self._store.map("price_alerts", PriceAlert)
+
+        self._store.migrate_counters({
+            "bin": (self.bins, "BIN"),
+            "txn": (self.transactions, "TXN"),
+            "dry": (self.drying_records, "DRY"),
+            "basis_alert": (self.basis_alerts, "BASIS_ALERT"),
+            "price_alert": (self.price_alerts, "PRICE_ALERT"),
+        })
 
     def _next_id(self, prefix: str) -> str:
-        self._counters[prefix] += 1
-        return f"{prefix.upper()}-{self._counters[prefix]:04d}"
+        return f"{prefix.upper()}-{self._store.next_id(prefix):04d}"
 
     # =========================================================================
     # BIN MANAGEMENT
     # =========================================================================
 
+    @unit_of_work
     def add_bin(
         self,
         name: str,
@@ -331,6 +340,7 @@ class GrainStorageService:
             "message": f"Bin '{name}' added with {capacity_bushels:,.0f} bu capacity"
         }
 
+    @unit_of_work
     def load_bin(
         self,
         bin_id: str,
@@ -428,6 +438,7 @@ class GrainStorageService:
             "message": f"Loaded {bushels:,.0f} bu into {bin_obj.name} ({pct_full:.1f}% full)"
         }
 
+    @unit_of_work
     def unload_bin(
         self,
         bin_id: str,
@@ -499,14 +510,15 @@ class GrainStorageService:
                 return {"error": f"Bin {bin_id} not found"}
             bins_to_check = {bin_id: self.bins[bin_id]}
         else:
-            bins_to_check = self.bins
+            bins_to_check = dict(self.bins.items())
+        inventories = self.inventories.get_many(list(bins_to_check))
 
         statuses = []
         total_capacity = 0
         total_stored = 0
 
         for bid, bin_obj in bins_to_check.items():
-            inv = self.inventories.get(bid)
+            inv = inventories.get(bid)
             bushels = inv.bushels if inv else 0
             pct_full = bushels / bin_obj.capacity_bushels * 100 if bin_obj.capacity_bushels > 0 else 0
 
@@ -543,6 +555,7 @@ class GrainStorageService:
             "bins": statuses
         }
 
+    @unit_of_work
     def update_bin_conditions(
         self,
         bin_id: str,
@@ -677,6 +690,7 @@ class GrainStorageService:
             }
         }
 
+    @unit_of_work
     def record_drying_operation(
         self,
         bin_id: str,
@@ -771,6 +785,7 @@ class GrainStorageService:
     def get_grain_inventory(self, grain_type: str = None) -> Dict[str, Any]:
         """Get total grain inventory across all bins"""
         inventory_by_grain = {}
+        bins = dict(self.bins.items())
 
         for bin_id, inv in self.inventories.items():
             if not inv or inv.bushels == 0:
@@ -792,7 +807,7 @@ class GrainStorageService:
             inventory_by_grain[grain]["total_moisture_bushels"] += inv.bushels * inv.moisture_pct
             inventory_by_grain[grain]["bins"].append({
                 "bin_id": bin_id,
-                "bin_name": self.bins[bin_id].name,
+                "bin_name": bins[bin_id].name,
                 "bushels": inv.bushels,
                 "moisture": f"{inv.moisture_pct:.1f}%"
             })
@@ -823,7 +838,13 @@ class GrainStorageService:
         """Get grain transaction history"""
         transactions = []
 
-        for txn in self.transactions.values():
+        criteria = {}
+        if grain_type:
+            criteria["grain_type"] = grain_type
+        if transaction_type:
+            criteria["transaction_type"] = transaction_type
+
+        for txn in self.transactions.find(**criteria):
             if grain_type and txn.grain_type.value != grain_type:
                 continue
             if start_date and txn.transaction_date < start_date:
@@ -922,6 +943,7 @@ class GrainStorageService:
     # BASIS ALERTS
     # =========================================================================
 
+    @unit_of_work
     def create_basis_alert(
         self,
         grain_type: str,
@@ -980,6 +1002,7 @@ class GrainStorageService:
             "message": f"Basis alert created - notify when basis goes {direction} ${target_basis:.2f}"
         }
 
+    @unit_of_work
     def create_price_alert(
         self,
         grain_type: str,
@@ -1031,6 +1054,7 @@ class GrainStorageService:
             "message": f"Price alert created - notify when price goes {direction} ${target_price:.2f}"
         }
 
+    @unit_of_work
     def check_alerts(self) -> Dict[str, Any]:
         """Check all active alerts against current prices"""
         triggered_alerts = []
@@ -0,0 +1,228 @@
+"""
+Batched Inference Worker
+Micro-batching background worker for local image model inference
+
+Concurrent requests are preprocessed in a process pool, queued, and run
+through the model together so a burst of uploads shares forward passes
+instead of serializing behind each other.
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+# Defaults, overridable with AI_INFERENCE_MAX_BATCH / AI_INFERENCE_MAX_WAIT_MS
+DEFAULT_MAX_BATCH_SIZE = 16
+DEFAULT_MAX_WAIT_MS = 10.0
+
+_STOP = object()
+
+
+def letterbox_image(image_bytes: bytes, target_size: Tuple[int, int] = (224, 224)) -> Image.Image:
+    """Decode, convert to RGB and fit the image onto a white square canvas"""
+    image = Image.open(io.BytesIO(image_bytes))
+
+    # Convert to RGB if needed
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    # Resize maintaining aspect ratio
+    image.thumbnail(target_size, Image.Resampling.LANCZOS)
+
+    # Create square canvas and paste
+    canvas = Image.new("RGB", target_size, (255, 255, 255))
+    offset = ((target_size[0] - image.width) // 2, (target_size[1] - image.height) // 2)
+    canvas.paste(image, offset)
+
+    return canvas
+
+
+def preprocess_image_array(image_bytes: bytes, target_size: Tuple[int, int] = (224, 224)) -> np.ndarray:
+    """Model input for one image: (height, width, 3) float32 scaled to [0, 1]"""
+    return np.asarray(letterbox_image(image_bytes, target_size), dtype=np.float32) / 255.0
+
+
+def _resolve(future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+    """Complete a request future on its event loop, unless it was cancelled"""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class BatchInferenceWorker:
+    """
+    Background thread that runs a model on micro-batches of images.
+
+    submit() preprocesses an image in the pool, queues the array and
+    resolves with the model's output row once its batch has run. A batch
+    closes when max_batch_size requests are waiting or max_wait_ms has
+    passed since its first request arrived. predict is only ever called
+    from the worker thread, so it may load the model lazily. A stopped
+    worker cannot be restarted: requests still in flight fail with
+    RuntimeError, and later submit() calls raise it.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[np.ndarray], np.ndarray],
+        target_size: Tuple[int, int] = (224, 224),
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        preprocess_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            predict: Maps a (batch, height, width, 3) array to one output row per image
+            target_size: Model input size
+            max_batch_size: Most images per forward pass
+            max_wait_ms: Longest a request waits for its batch to fill
+            preprocess_workers: Preprocessing processes (0 = use threads in this process)
+        """
+        if max_batch_size is None:
+            max_batch_size = int(os.environ.get("AI_INFERENCE_MAX_BATCH", DEFAULT_MAX_BATCH_SIZE))
+        if max_wait_ms is None:
+            max_wait_ms = float(os.environ.get("AI_INFERENCE_MAX_WAIT_MS", DEFAULT_MAX_WAIT_MS))
+        if preprocess_workers is None:
+            preprocess_workers = max(1, (os.cpu_count() or 2) - 1)
+
+        self._predict = predict
+        self.target_size = target_size
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self.preprocess_workers = preprocess_workers
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[Executor] = None
+        self._stopped = False
+        self._batches = 0
+        self._images = 0
+
+    def start(self) -> None:
+        """Start the worker thread and preprocessing pool if not running"""
+        with self._lock:
+            self._start_locked()
+
+    def _start_locked(self) -> None:
+        if self._stopped:
+            raise RuntimeError("Inference worker has been stopped")
+        if self._thread is None:
+            if self.preprocess_workers > 0:
+                # spawn, not fork: forking a process that is running threads can deadlock
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.preprocess_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ai-preprocess")
+            self._thread = threading.Thread(target=self._run, name="ai-inference", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """Finish queued requests, then stop the thread and pool"""
+        with self._lock:
+            self._stopped = True
+            thread, pool = self._thread, self._pool
+            self._thread = None
+            self._pool = None
+        if thread is not None:
+            self._queue.put(_STOP)
+            if wait:
+                thread.join()
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    async def submit(self, image_bytes: bytes) -> np.ndarray:
+        """Preprocess one image and return its model output once its batch runs"""
+        with self._lock:
+            self._start_locked()
+            pool = self._pool
+        loop = asyncio.get_running_loop()
+        array = await loop.run_in_executor(pool, preprocess_image_array, image_bytes, self.target_size)
+
+        future = loop.create_future()
+        with self._lock:
+            # stop() may have run while the image was being preprocessed
+            if self._stopped:
+                raise RuntimeError("Inference worker was stopped before the image was queued")
+            self._queue.put((array, loop, future))
+        return await future
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait_ms / 1000.0
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+
+        # Nothing is queued after _STOP, but never leave a caller waiting
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                _, loop, future = item
+                loop.call_soon_threadsafe(
+                    _resolve, future, None, RuntimeError("Inference worker stopped before the image ran")
+                )
+
+    def _run_batch(self, batch: List[Tuple[np.ndarray, asyncio.AbstractEventLoop, asyncio.Future]]) -> None:
+        try:
+            outputs = self._predict(np.stack([array for array, _, _ in batch]))
+        except Exception as e:
+            logger.warning(f"Batch inference failed for {len(batch)} images: {e}")
+            for _, loop, future in batch:
+                loop.call_soon_threadsafe(_resolve, future, None, e)
+            return
+
+        self._batches += 1
+        self._images += len(batch)
+        for (_, loop, future), row in zip(batch, outputs):
+            loop.call_soon_threadsafe(_resolve, future, row)
+
+    def get_stats(self) -> Dict:
+        """Batch counts since start"""
+        return {
+            "running": self._thread is not None,
+            "queued": self._queue.qsize(),
+            "batches": self._batches,
+            "images": self._images,
+            "mean_batch_size": round(self._images / self._batches, 2) if self._batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+        }
@@ -3,11 +3,12 @@ Irrigation Optimization Module
 Helps farmers optimize water usage, timing, and costs for irrigated crops
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence, Tuple, Union
 from dataclasses import dataclass
 from datetime import date, timedelta
 from enum import Enum
-import math
+
+import numpy as np
 
 
 class IrrigationType(str, Enum):
@@ -129,6 +130,12 @@ WATER_COSTS = {
 }
 
 
+# Daily water balance defaults
+EFFECTIVE_RAIN_FRACTION = 0.70  # Share of seasonal rainfall that reaches the root zone
+DEFAULT_ALLOWABLE_DEPLETION = 0.50  # Irrigate once half the available water is used
+DEFAULT_MIN_DAYS_BETWEEN_EVENTS = 3  # Typical pivot revolution for ~1 inch
+
+
 @dataclass
 class IrrigationSchedule:
     """Represents a single irrigation event"""
@@ -329,11 +336,17 @@ class IrrigationOptimizer:
         season_end: date,
         expected_rainfall_inches: float,
         soil_water_holding_capacity: float = 2.0,
-        pumping_depth_ft: float = 150
+        pumping_depth_ft: float = 150,
+        daily_reference_et: Optional[Sequence[float]] = None,
+        daily_rainfall: Optional[Sequence[float]] = None
     ) -> Dict[str, Any]:
         """
         Create optimized irrigation schedule for the season
 
+        The schedule comes from a daily root-zone water balance: crop ET
+        depletes the soil, effective rain refills it, and an irrigation is
+        scheduled whenever depletion reaches the allowable limit.
+
         Args:
             crop: Crop type
             acres: Field size
@@ -344,92 +357,372 @@ class IrrigationOptimizer:
             expected_rainfall_inches: Expected total rainfall
             soil_water_holding_capacity: Inches of water soil can hold
             pumping_depth_ft: Well depth
+            daily_reference_et: Known reference ET (in/day) from season_start;
+                remaining days use the crop's seasonal water need
+            daily_rainfall: Known rainfall (in/day) from season_start;
+                remaining days spread expected_rainfall_inches evenly
 
         Returns:
             Optimized season schedule with costs
         """
-        crop_data = CROP_WATER_USE.get(crop.lower(), CROP_WATER_USE['corn'])
         system = SYSTEM_EFFICIENCY.get(irrigation_type, SYSTEM_EFFICIENCY['center_pivot'])
 
-        # Calculate season water need
-        seasonal_et = crop_data['seasonal_water_need']
-        effective_rainfall = expected_rainfall_inches * 0.70  # 70% effective
-        net_irrigation_need = seasonal_et - effective_rainfall
-
-        # Account for efficiency
-        gross_irrigation_need = net_irrigation_need / system['application_efficiency']
-
-        # Calculate number of irrigations
-        # Typical application is 0.75-1.25 inches per event
-        optimal_application = min(soil_water_holding_capacity * 0.5, 1.0)
-        num_irrigations = math.ceil(gross_irrigation_need / optimal_application)
-
-        # Calculate season costs
-        season_days = (season_end - season_start).days
-
-        # Water costs
-        total_acre_inches = gross_irrigation_need * acres
-        cost_per_event = self.calculate_irrigation_costs(
-            acres, optimal_application, irrigation_type, water_source, pumping_depth_ft
-        )
-
-        total_variable_cost = cost_per_event['cost_breakdown']['total_cost'] * num_irrigations
-
-        # Fixed annual costs
-        fixed_costs = self._calculate_annual_fixed_costs(
-            acres, irrigation_type, water_source
-        )
-
-        total_season_cost = total_variable_cost + fixed_costs['total_fixed_cost']
-        cost_per_acre = total_season_cost / acres if acres > 0 else 0
-
-        # Generate schedule recommendations
-        schedule = self._generate_irrigation_schedule(
-            crop, season_start, season_end, num_irrigations, optimal_application
-        )
+        plan = self.schedule_irrigation_batch([{
+            "crop": crop,
+            "acres": acres,
+            "irrigation_type": irrigation_type,
+            "water_source": water_source,
+            "season_start": season_start,
+            "season_end": season_end,
+            "expected_rainfall_inches": expected_rainfall_inches,
+            "soil_water_holding_capacity": soil_water_holding_capacity,
+            "pumping_depth_ft": pumping_depth_ft,
+            "daily_reference_et": daily_reference_et,
+            "daily_rainfall": daily_rainfall
+        }])["fields"][0]
+        if "error" in plan:
+            raise ValueError(plan["error"])
+
+        balance = plan["water_balance"]
+        costs = plan["cost_analysis"]
+        net_irrigation_need = balance["net_irrigation_inches"]
+        gross_irrigation_need = balance["gross_irrigation_inches"]
+        cost_per_acre = costs["cost_per_acre"]
 
         # ROI analysis
         roi = self._calculate_irrigation_roi(
-            crop, acres, total_season_cost, net_irrigation_need
+            crop, acres, costs["total_season_cost"], net_irrigation_need
         )
 
         return {
             "season_summary": {
                 "crop": crop,
                 "acres": acres,
-                "season_length_days": season_days,
-                "seasonal_crop_et_inches": seasonal_et,
-                "expected_effective_rainfall_inches": round(effective_rainfall, 1),
-                "net_irrigation_need_inches": round(net_irrigation_need, 1),
-                "gross_irrigation_need_inches": round(gross_irrigation_need, 1),
-                "number_of_irrigations": num_irrigations,
-                "application_per_event_inches": round(optimal_application, 2)
+                "season_length_days": (season_end - season_start).days,
+                "seasonal_crop_et_inches": balance["crop_et_inches"],
+                "expected_effective_rainfall_inches": balance["effective_rainfall_inches"],
+                "net_irrigation_need_inches": net_irrigation_need,
+                "gross_irrigation_need_inches": gross_irrigation_need,
+                "number_of_irrigations": plan["number_of_irrigations"],
+                "application_per_event_inches": plan["application_per_event_inches"],
+                "crop_stress_days": balance["stress_days"]
             },
             "system_details": {
                 "irrigation_type": irrigation_type,
                 "water_source": water_source,
                 "system_efficiency": f"{system['application_efficiency'] * 100}%",
-                "total_water_applied_acre_inches": round(total_acre_inches, 0)
+                "total_water_applied_acre_inches": round(gross_irrigation_need * acres, 0)
             },
             "cost_analysis": {
-                "variable_costs": {
-                    "cost_per_irrigation_event": round(cost_per_event['cost_breakdown']['total_cost'], 2),
-                    "total_variable_cost": round(total_variable_cost, 2)
-                },
-                "fixed_costs": fixed_costs,
-                "total_season_cost": round(total_season_cost, 2),
-                "cost_per_acre": round(cost_per_acre, 2),
+                "variable_costs": costs["variable_costs"],
+                "fixed_costs": costs["fixed_costs"],
+                "total_season_cost": costs["total_season_cost"],
+                "cost_per_acre": cost_per_acre,
                 "cost_per_bushel_potential": round(
                     cost_per_acre / (200 if crop.lower() == 'corn' else 55), 2
                 )
             },
-            "recommended_schedule": schedule,
+            "recommended_schedule": plan["schedule"],
             "roi_analysis": roi,
             "optimization_opportunities": self._identify_irrigation_savings(
                 irrigation_type, water_source, gross_irrigation_need, acres
             )
         }
 
+    def schedule_irrigation_batch(
+        self,
+        fields: List[Dict[str, Any]],
+        allowable_depletion: float = DEFAULT_ALLOWABLE_DEPLETION,
+        min_days_between_events: int = DEFAULT_MIN_DAYS_BETWEEN_EVENTS
+    ) -> Dict[str, Any]:
+        """
+        Plan irrigation events for many fields and seasons in one simulation
+
+        Each entry is one field-season with the same inputs as
+        optimize_irrigation_schedule plus an optional field_id,
+        initial_depletion_inches and application_inches. All entries are
+        stacked into (field, day) arrays and stepped through the water
+        balance together; event costs are computed once per distinct
+        field/system/application combination.
+
+        Args:
+            fields: Field-season definitions
+            allowable_depletion: Fraction of available water used before irrigating
+            min_days_between_events: System capacity limit between events
+
+        Returns:
+            Per-field schedules, water balance and costs plus farm totals
+        """
+        prepared = []
+        slots = []
+        results: List[Optional[Dict[str, Any]]] = [None] * len(fields)
+        for i, field in enumerate(fields):
+            try:
+                prepared.append(self._prepare_water_balance_inputs(field))
+                slots.append(i)
+            except (KeyError, TypeError, ValueError) as e:
+                results[i] = {"field_id": field.get("field_id"), "error": str(e)}
+
+        if prepared:
+            days = max(p["days"] for p in prepared)
+            crop_et = np.zeros((len(prepared), days))
+            effective_rain = np.zeros((len(prepared), days))
+            for row, p in enumerate(prepared):
+                crop_et[row, :p["days"]] = p["crop_et"]
+                effective_rain[row, :p["days"]] = p["rainfall"] * EFFECTIVE_RAIN_FRACTION
+
+            simulation = self.simulate_water_balance(
+                crop_et,
+                effective_rain,
+                available_water=np.array([p["available_water"] for p in prepared]),
+                application_inches=np.array([p["application"] for p in prepared]),
+                season_days=np.array([p["days"] for p in prepared]),
+                allowable_depletion=allowable_depletion,
+                min_days_between_events=min_days_between_events,
+                initial_depletion=np.array([p["initial_depletion"] for p in prepared])
+            )
+
+            cost_cache: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+            for row, (slot, p) in enumerate(zip(slots, prepared)):
+                results[slot] = self._format_water_balance(
+                    p, row, simulation, crop_et, effective_rain, allowable_depletion, cost_cache
+                )
+
+        planned = [r for r in results if "error" not in r]
+        return {
+            "field_count": len(fields),
+            "allowable_depletion": allowable_depletion,
+            "min_days_between_events": min_days_between_events,
+            "totals": {
+                "irrigation_events": sum(r["number_of_irrigations"] for r in planned),
+                "acres": round(sum(r["acres"] for r in planned), 1),
+                "gross_acre_inches": round(sum(
+                    r["water_balance"]["gross_irrigation_inches"] * r["acres"] for r in planned
+                ), 1),
+                "total_season_cost": round(sum(r["cost_analysis"]["total_season_cost"] for r in planned), 2)
+            },
+            "fields": results
+        }
+
+    def simulate_water_balance(
+        self,
+        crop_et: np.ndarray,
+        effective_rain: np.ndarray,
+        available_water: np.ndarray,
+        application_inches: np.ndarray,
+        season_days: Optional[np.ndarray] = None,
+        allowable_depletion: Union[float, np.ndarray] = DEFAULT_ALLOWABLE_DEPLETION,
+        min_days_between_events: Union[int, np.ndarray] = DEFAULT_MIN_DAYS_BETWEEN_EVENTS,
+        initial_depletion: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Step a root-zone depletion balance for many field-seasons at once
+
+        Rows are field-seasons and columns are days. Each day depletion grows
+        by crop ET less effective rain (surplus drains below the root zone);
+        when it reaches allowable_depletion x available water and the system
+        is free, the row's application is made that day. Depletion left above
+        the allowable limit counts as a crop stress day.
+
+        Returns (field, day) arrays: irrigation (net inches), depletion (end
+        of day), depletion_before_irrigation and stress, plus drainage.
+        """
+        crop_et = np.asarray(crop_et, dtype=float)
+        effective_rain = np.asarray(effective_rain, dtype=float)
+        rows, days = crop_et.shape
+        available_water = np.asarray(available_water, dtype=float)
+        application_inches = np.asarray(application_inches, dtype=float)
+        trigger = available_water * np.asarray(allowable_depletion, dtype=float)
+        min_gap = np.broadcast_to(np.asarray(min_days_between_events), (rows,))
+        season_days = np.full(rows, days) if season_days is None else np.asarray(season_days)
+
+        depletion = np.zeros(rows) if initial_depletion is None else np.asarray(initial_depletion, dtype=float).copy()
+        last_event = np.full(rows, -np.iinfo(np.int32).max, dtype=np.int64)
+
+        irrigation = np.zeros((rows, days))
+        depletion_out = np.zeros((rows, days))
+        depletion_before = np.zeros((rows, days))
+        drainage = np.zeros((rows, days))
+        stress = np.zeros((rows, days), dtype=bool)
+
+        for day in range(days):
+            in_season = day < season_days
+            depletion += crop_et[:, day] - effective_rain[:, day]
+            drainage[:, day] = np.maximum(-depletion, 0.0)
+            np.maximum(depletion, 0.0, out=depletion)
+            np.minimum(depletion, available_water, out=depletion)
+            depletion_before[:, day] = depletion
+
+            due = in_season & (depletion >= trigger) & (day - last_event >= min_gap)
+            applied = np.where(due, application_inches, 0.0)
+            depletion -= applied
+            drainage[:, day] += np.maximum(-depletion, 0.0)
+            np.maximum(depletion, 0.0, out=depletion)
+            last_event[due] = day
+
+            irrigation[:, day] = applied
+            depletion_out[:, day] = depletion
+            stress[:, day] = in_season & (depletion > trigger)
+
+        return {
+            "irrigation": irrigation,
+            "depletion": depletion_out,
+            "depletion_before_irrigation": depletion_before,
+            "drainage": drainage,
+            "stress": stress
+        }
+
+    def _crop_coefficient_profile(self, crop: str, days: int) -> Tuple[np.ndarray, List[str]]:
+        """Daily Kc interpolated across the crop's growth stages, plus the stage for each day"""
+        crop_data = CROP_WATER_USE.get(crop.lower(), CROP_WATER_USE['corn'])
+        stages = list(crop_data['kc_coefficients'])
+        kc_values = np.array([crop_data['kc_coefficients'][s] for s in stages])
+
+        # Stages share the season evenly; Kc is anchored at the middle of each stage
+        day_index = np.arange(days)
+        stage_index = np.minimum(day_index * len(stages) // max(days, 1), len(stages) - 1)
+        anchors = (np.arange(len(stages)) + 0.5) * days / len(stages)
+        kc = np.interp(day_index + 0.5, anchors, kc_values)
+        return kc, [stages[i] for i in stage_index.tolist()]
+
+    def _prepare_water_balance_inputs(self, field: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate one field-season and build its daily ET and rainfall series"""
+        season_start = field["season_start"]
+        season_end = field["season_end"]
+        if isinstance(season_start, str):
+            season_start = date.fromisoformat(season_start)
+        if isinstance(season_end, str):
+            season_end = date.fromisoformat(season_end)
+        if season_end < season_start:
+            raise ValueError("season_end must not be before season_start")
+
+        crop = field.get("crop", "corn")
+        acres = float(field["acres"])
+        available_water = float(field.get("soil_water_holding_capacity", 2.0))
+        if acres <= 0 or available_water <= 0:
+            raise ValueError("acres and soil_water_holding_capacity must be positive")
+
+        days = (season_end - season_start).days + 1
+        kc, stages = self._crop_coefficient_profile(crop, days)
+        crop_data = CROP_WATER_USE.get(crop.lower(), CROP_WATER_USE['corn'])
+
+        # Without observed ET, reference ET is sized so the season's crop ET
+        # matches the crop's seasonal water need
+        reference_et = np.full(days, crop_data['seasonal_water_need'] / kc.sum())
+        observed_et = field.get("daily_reference_et")
+        if observed_et:
+            observed_et = np.asarray(observed_et, dtype=float)[:days]
+            reference_et[:len(observed_et)] = observed_et
+
+        rainfall = np.full(days, float(field.get("expected_rainfall_inches", 0.0)) / days)
+        observed_rain = field.get("daily_rainfall")
+        if observed_rain:
+            observed_rain = np.asarray(observed_rain, dtype=float)[:days]
+            rainfall[:len(observed_rain)] = observed_rain
+
+        application = field.get("application_inches") or min(available_water * 0.5, 1.0)
+
+        return {
+            "field_id": field.get("field_id"),
+            "crop": crop,
+            "acres": acres,
+            "irrigation_type": field.get("irrigation_type", "center_pivot"),
+            "water_source": field.get("water_source", "groundwater_well"),
+            "pumping_depth_ft": float(field.get("pumping_depth_ft", 150)),
+            "season_start": season_start,
+            "season_end": season_end,
+            "days": days,
+            "stages": stages,
+            "crop_et": reference_et * kc,
+            "rainfall": rainfall,
+            "available_water": available_water,
+            "application": float(application),
+            "initial_depletion": float(field.get("initial_depletion_inches", 0.0))
+        }
+
+    def _format_water_balance(
+        self,
+        p: Dict[str, Any],
+        row: int,
+        simulation: Dict[str, np.ndarray],
+        crop_et: np.ndarray,
+        effective_rain: np.ndarray,
+        allowable_depletion: float,
+        cost_cache: Dict[Tuple, Tuple[float, Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Turn one simulated row into event dates, balance totals and costs"""
+        crop_data = CROP_WATER_USE.get(p["crop"].lower(), CROP_WATER_USE['corn'])
+        system = SYSTEM_EFFICIENCY.get(p["irrigation_type"], SYSTEM_EFFICIENCY['center_pivot'])
+        days = p["days"]
+        irrigation = simulation["irrigation"][row, :days]
+        depletion_before = simulation["depletion_before_irrigation"][row, :days]
+        event_days = np.flatnonzero(irrigation > 0).tolist()
+
+        schedule = []
+        for number, day in enumerate(event_days, start=1):
+            stage = p["stages"][day]
+            is_critical = stage in crop_data['critical_stages']
+            schedule.append({
+                "irrigation_number": number,
+                "target_date": (p["season_start"] + timedelta(days=day)).isoformat(),
+                "amount_inches": round(p["application"], 2),
+                "growth_stage": stage,
+                "priority": "High" if is_critical else "Medium",
+                "depletion_before_inches": round(float(depletion_before[day]), 2),
+                "notes": (
+                    "Prioritize this irrigation - reproductive stage is most sensitive to water stress"
+                    if is_critical else
+                    "Adjust timing based on rainfall and soil moisture conditions"
+                )
+            })
+
+        key = (p["acres"], p["application"], p["irrigation_type"], p["water_source"], p["pumping_depth_ft"])
+        if key not in cost_cache:
+            event_cost = self.calculate_irrigation_costs(
+                p["acres"], p["application"], p["irrigation_type"], p["water_source"], p["pumping_depth_ft"]
+            )['cost_breakdown']['total_cost']
+            cost_cache[key] = (
+                event_cost,
+                self._calculate_annual_fixed_costs(p["acres"], p["irrigation_type"], p["water_source"])
+            )
+        event_cost, fixed_costs = cost_cache[key]
+
+        net_irrigation = float(irrigation.sum())
+        total_variable_cost = event_cost * len(event_days)
+        total_season_cost = total_variable_cost + fixed_costs['total_fixed_cost']
+
+        return {
+            "field_id": p["field_id"],
+            "crop": p["crop"],
+            "acres": p["acres"],
+            "season_start": p["season_start"].isoformat(),
+            "season_end": p["season_end"].isoformat(),
+            "season_length_days": days,
+            "number_of_irrigations": len(event_days),
+            "application_per_event_inches": round(p["application"], 2),
+            "water_balance": {
+                "crop_et_inches": round(float(crop_et[row, :days].sum()), 1),
+                "effective_rainfall_inches": round(float(effective_rain[row, :days].sum()), 1),
+                "net_irrigation_inches": round(net_irrigation, 1),
+                "gross_irrigation_inches": round(net_irrigation / system['application_efficiency'], 1),
+                "drainage_inches": round(float(simulation["drainage"][row, :days].sum()), 1),
+                "readily_available_water_inches": round(p["available_water"] * allowable_depletion, 2),
+                "peak_depletion_inches": round(float(depletion_before.max()), 2),
+                "ending_depletion_inches": round(float(simulation["depletion"][row, days - 1]), 2),
+                "stress_days": int(simulation["stress"][row, :days].sum())
+            },
+            "schedule": schedule,
+            "cost_analysis": {
+                "variable_costs": {
+                    "cost_per_irrigation_event": round(event_cost, 2),
+                    "total_variable_cost": round(total_variable_cost, 2)
+                },
+                "fixed_costs": fixed_costs,
+                "total_season_cost": round(total_season_cost, 2),
+                "cost_per_acre": round(total_season_cost / p["acres"], 2)
+            }
+        }
+
     def compare_irrigation_systems(
         self,
         acres: float,
@@ -689,50 +982,6 @@ class IrrigationOptimizer:
             "fixed_cost_per_acre": round(fixed_total / acres if acres > 0 else 0, 2)
         }
 
-    def _generate_irrigation_schedule(
-        self,
-        crop: str,
-        season_start: date,
-        season_end: date,
-        num_irrigations: int,
-        amount_per_irrigation: float
-    ) -> List[Dict[str, Any]]:
-        """Generate recommended irrigation schedule"""
-        _crop_data = CROP_WATER_USE.get(crop.lower(), CROP_WATER_USE['corn'])
-        season_days = (season_end - season_start).days
-
-        schedule = []
-        interval = season_days // (num_irrigations + 1)
-
-        for i in range(num_irrigations):
-            irrigation_date = season_start + timedelta(days=interval * (i + 1))
-
-            # Determine growth stage (simplified)
-            days_in = interval * (i + 1)
-            if days_in < 30:
-                stage = "Early vegetative"
-            elif days_in < 60:
-                stage = "Late vegetative"
-            elif days_in < 90:
-                stage = "Reproductive (CRITICAL)"
-            else:
-                stage = "Grain fill"
-
-            schedule.append({
-                "irrigation_number": i + 1,
-                "target_date": irrigation_date.isoformat(),
-                "amount_inches": round(amount_per_irrigation, 2),
-                "growth_stage": stage,
-                "priority": "High" if "CRITICAL" in stage else "Medium",
-                "notes": (
-                    "Prioritize this irrigation - reproductive stage is most sensitive to water stress"
-                    if "CRITICAL" in stage else
-                    "Adjust timing based on rainfall and soil moisture conditions"
-                )
-            })
-
-        return schedule
-
     def _calculate_irrigation_roi(
         self,
         crop: str,
@@ -4,6 +4,7 @@ Hybrid approach: Symptom-based guided identification + AI image recognition
 """
 
 from typing import List, Dict, Optional
+import json
 import sys
 import os
 
@@ -33,6 +34,37 @@ except ImportError:
         SOYBEAN_PESTS = []
 
 
+from services.symptom_index import SymptomIndex
+
+
+# Symptom keyword mapping
+PEST_SYMPTOM_KEYWORDS = {
+    "leaf_holes": ["holes", "defoliation", "feeding", "skeletonizing"],
+    "whorl_damage": ["whorl", "shothole"],
+    "silk_clipping": ["silk", "pollination"],
+    "root_damage": ["root", "pruning", "lodging", "goose-neck"],
+    "stalk_tunneling": ["stalk", "tunnel", "borer"],
+    "yellowing": ["yellow", "chlorosis", "stunted"],
+    "wilting": ["wilt", "drooping"],
+    "stippling": ["stippling", "speckling", "mite"],
+    "webbing": ["web", "silk"],
+    "curled_leaves": ["curl", "distorted"],
+    "pod_damage": ["pod", "seed"],
+    "stem_damage": ["stem", "girdling"],
+    "dead_heart": ["dead heart", "dead whorl"],
+    "ear_damage": ["ear", "kernel"],
+}
+
+_PEST_TEXT_FIELDS = ("damage_symptoms", "identification_features")
+
+# Built once at import; keyed like the crop argument of identify_by_symptoms
+PEST_INDEXES = {
+    "corn": SymptomIndex(CORN_PESTS, _PEST_TEXT_FIELDS, PEST_SYMPTOM_KEYWORDS),
+    "soybean": SymptomIndex(SOYBEAN_PESTS, _PEST_TEXT_FIELDS, PEST_SYMPTOM_KEYWORDS),
+    "all": SymptomIndex(CORN_PESTS + SOYBEAN_PESTS, _PEST_TEXT_FIELDS, PEST_SYMPTOM_KEYWORDS),
+}
+
+
 class PestIdentifier:
     """Professional pest identification system"""
 
@@ -60,116 +92,38 @@ class PestIdentifier:
             List of pest matches with confidence scores
         """
 
-        # Get pest database for crop
-        if crop.lower() == "corn":
-            pest_database = self.corn_pests
-        elif crop.lower() == "soybean":
-            pest_database = self.soybean_pests
-        else:
-            pest_database = self.corn_pests + self.soybean_pests
+        # Get pest index for crop
+        index = PEST_INDEXES.get(crop.lower(), PEST_INDEXES["all"])
 
-        # Score each pest based on symptom matching
-        matches = []
+        # Symptom matching (60% weight), timing (25%) and field conditions (15%)
+        def context_terms(pest: Dict):
+            terms = (self._match_timing(pest, growth_stage) * 0.25,)
+            if field_conditions:
+                terms += (self._match_conditions(pest, field_conditions) * 0.15,)
+            return terms
 
-        for idx, pest in enumerate(pest_database):
-            confidence = self._calculate_confidence(
-                pest=pest,
-                symptoms=symptoms,
-                growth_stage=growth_stage,
-                field_conditions=field_conditions
-            )
-
-            if confidence > 0.2:  # Only return reasonable matches
-                matches.append({
-                    "id": idx,
-                    "common_name": pest["common_name"],
-                    "scientific_name": pest["scientific_name"],
-                    "confidence": round(confidence, 3),
-                    "description": pest["description"],
-                    "damage_symptoms": pest["damage_symptoms"],
-                    "identification_features": pest["identification_features"],
-                    "economic_threshold": pest.get("economic_threshold", "Consult extension resources"),
-                    "management_notes": pest.get("management_notes", "")
-                })
-
-        # Sort by confidence (highest first)
-        matches.sort(key=lambda x: x["confidence"], reverse=True)
-
-        # Return top 5 matches
-        return matches[:5]
-
-    def _calculate_confidence(
-        self,
-        pest: Dict,
-        symptoms: List[str],
-        growth_stage: str,
-        field_conditions: Optional[Dict]
-    ) -> float:
-        """Calculate confidence score for pest match"""
-
-        confidence = 0.0
-
-        # Symptom matching (most important factor)
-        symptom_score = self._match_symptoms(pest, symptoms)
-        confidence += symptom_score * 0.6  # 60% weight
-
-        # Timing/growth stage matching
-        timing_score = self._match_timing(pest, growth_stage)
-        confidence += timing_score * 0.25  # 25% weight
-
-        # Field conditions matching
-        if field_conditions:
-            conditions_score = self._match_conditions(pest, field_conditions)
-            confidence += conditions_score * 0.15  # 15% weight
-
-        return min(confidence, 1.0)  # Cap at 1.0
-
-    def _match_symptoms(self, pest: Dict, symptoms: List[str]) -> float:
-        """Match symptoms against pest damage patterns"""
-
-        if not symptoms:
-            return 0.0
-
-        damage_description = pest.get("damage_symptoms", "").lower()
-        identification_features = pest.get("identification_features", "").lower()
-        combined_text = damage_description + " " + identification_features
-
-        matches = 0
-        total_symptoms = len(symptoms)
-
-        # Symptom keyword mapping
-        symptom_keywords = {
-            "leaf_holes": ["holes", "defoliation", "feeding", "skeletonizing"],
-            "whorl_damage": ["whorl", "shothole"],
-            "silk_clipping": ["silk", "pollination"],
-            "root_damage": ["root", "pruning", "lodging", "goose-neck"],
-            "stalk_tunneling": ["stalk", "tunnel", "borer"],
-            "yellowing": ["yellow", "chlorosis", "stunted"],
-            "wilting": ["wilt", "drooping"],
-            "stippling": ["stippling", "speckling", "mite"],
-            "webbing": ["web", "silk"],
-            "curled_leaves": ["curl", "distorted"],
-            "pod_damage": ["pod", "seed"],
-            "stem_damage": ["stem", "girdling"],
-            "dead_heart": ["dead heart", "dead whorl"],
-            "ear_damage": ["ear", "kernel"],
-        }
-
-        for symptom in symptoms:
-            symptom_lower = symptom.lower()
-
-            # Direct match
-            if symptom_lower in combined_text:
-                matches += 1
-                continue
-
-            # Keyword match
-            if symptom_lower in symptom_keywords:
-                keywords = symptom_keywords[symptom_lower]
-                if any(keyword in combined_text for keyword in keywords):
-                    matches += 0.8  # Slightly lower weight for keyword match
-
-        return matches / total_symptoms if total_symptoms > 0 else 0.0
+        context_key = (
+            growth_stage.lower(),
+            json.dumps(field_conditions, sort_keys=True, default=str) if field_conditions else None
+        )
+
+        # Top 5 reasonable matches, highest confidence first
+        matches = []
+        for idx, confidence in index.top_matches(symptoms, 0.6, context_key, context_terms):
+            pest = index.entries[idx]
+            matches.append({
+                "id": idx,
+                "common_name": pest["common_name"],
+                "scientific_name": pest["scientific_name"],
+                "confidence": confidence,
+                "description": pest["description"],
+                "damage_symptoms": pest["damage_symptoms"],
+                "identification_features": pest["identification_features"],
+                "economic_threshold": pest.get("economic_threshold", "Consult extension resources"),
+                "management_notes": pest.get("management_notes", "")
+            })
+
+        return matches
 
     def _match_timing(self, pest: Dict, growth_stage: str) -> float:
         """Match growth stage to typical pest timing"""
@@ -13,6 +13,7 @@ from typing import Optional, List, Tuple
 from pathlib import Path
 
 from pydantic import BaseModel
+from database.db_utils import get_pooled_connection
 
 logger = logging.getLogger(__name__)
 
@@ -110,7 +111,7 @@ class PhotoService:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -16,6 +16,8 @@ from enum import Enum
 import statistics
 import math
 
+from .domain_store import DomainStore, unit_of_work
+
 
 # =============================================================================
 # ENUMS AND DATA CLASSES
@@ -218,28 +220,32 @@ SPRAY_TIMING = {
 class PrecisionIntelligenceService:
     """Advanced precision agriculture intelligence service"""
 
-    def __init__(self):
-        self.predictions: Dict[str, YieldPrediction] = {}
-        self.zones: Dict[str, ManagementZone] = {}
-        self.prescriptions: Dict[str, Prescription] = {}
-        self.recommendations: Dict[str, DecisionRecommendation] = {}
+    def __init__(self, db_path: str = None):
+        self._store = DomainStore("precision", db_path)
+        self.predictions = self._store.map("predictions", YieldPrediction)
+        self.zones = self._store.map("zones", ManagementZone, indexes=("field_id",))
+        self.prescriptions = self._store.map("prescriptions", Prescription)
+        self.recommendations = self._store.map("recommendations", DecisionRecommendation)
 
         # Historical data storage
-        self.field_history: Dict[str, List[Dict[str, Any]]] = {}
-        self.weather_data: Dict[str, Dict[str, Any]] = {}
+        self.field_history = self._store.map("field_history", List[Dict[str, Any]])
+        self.weather_data = self._store.map("weather_data", Dict[str, Any])
 
-        self._counters = {
-            "prediction": 0, "zone": 0, "prescription": 0, "recommendation": 0
-        }
+        self._store.migrate_counters({
+            "prediction": (self.predictions, "PREDICTION"),
+            "zone": (self.zones, "ZONE"),
+            "prescription": (self.prescriptions, "PRESCRIPTION"),
+            "recommendation": (self.recommendations, "RECOMMENDATION"),
+        })
 
     def _next_id(self, prefix: str) -> str:
-        self._counters[prefix] += 1
-        return f"{prefix.upper()}-{self._counters[prefix]:04d}"
+        return f"{prefix.upper()}-{self._store.next_id(prefix):04d}"
 
     # =========================================================================
     # YIELD PREDICTION ENGINE
     # =========================================================================
 
+    @unit_of_work
     def predict_yield(
         self,
         field_id: str,
@@ -462,6 +468,7 @@ class PrecisionIntelligenceService:
     # PRESCRIPTION GENERATOR
     # =========================================================================
 
+    @unit_of_work
     def create_zone(
         self,
         field_id: str,
@@ -519,6 +526,7 @@ class PrecisionIntelligenceService:
             "message": f"Zone '{zone_name}' created with {acres} acres"
         }
 
+    @unit_of_work
     def generate_seeding_prescription(
         self,
         field_id: str,
@@ -528,7 +536,7 @@ class PrecisionIntelligenceService:
         units_per_bag: int = 80000  # seeds per bag for corn
     ) -> Dict[str, Any]:
         """Generate variable rate seeding prescription"""
-        field_zones = [z for z in self.zones.values() if z.field_id == field_id]
+        field_zones = self.zones.find(field_id=field_id)
 
         if not field_zones:
             return {"error": f"No zones defined for field {field_id}"}
@@ -606,6 +614,7 @@ class PrecisionIntelligenceService:
             "message": f"Seeding prescription created - potential savings of ${savings:,.2f}"
         }
 
+    @unit_of_work
     def generate_nitrogen_prescription(
         self,
         field_id: str,
@@ -616,7 +625,7 @@ class PrecisionIntelligenceService:
         previous_crop: str = "corn"
     ) -> Dict[str, Any]:
         """Generate variable rate nitrogen prescription"""
-        field_zones = [z for z in self.zones.values() if z.field_id == field_id]
+        field_zones = self.zones.find(field_id=field_id)
 
         if not field_zones:
             return {"error": f"No zones defined for field {field_id}"}
@@ -847,6 +856,7 @@ class PrecisionIntelligenceService:
     # DECISION SUPPORT AI
     # =========================================================================
 
+    @unit_of_work
     def get_planting_recommendation(
         self,
         field_id: str,
@@ -982,6 +992,7 @@ class PrecisionIntelligenceService:
             "economic_impact": economic_impact
         }
 
+    @unit_of_work
     def get_spray_recommendation(
         self,
         field_id: str,
@@ -6,17 +6,25 @@ Includes:
 - Break-even calculator (yield and price)
 - Input ROI ranker (identify what to cut first)
 - Scenario planner (what-if analysis)
+- Monte Carlo downside-risk simulation (VaR/CVaR, probability of loss)
 - Budget tracker with targets and alerts
 
 AgTools v2.8.0
 """
 
+from collections import OrderedDict
 from datetime import date
 from enum import Enum
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+import hashlib
+import json
+import math
 import sqlite3
+import threading
 
+import numpy as np
 from pydantic import BaseModel, Field
+from database.db_utils import get_pooled_connection
 
 
 # ============================================================================
@@ -66,6 +74,14 @@ class ScenarioType(str, Enum):
     COMBINED = "combined"
 
 
+class DistributionType(str, Enum):
+    """Sampling distributions for risk simulation"""
+    NORMAL = "normal"
+    LOGNORMAL = "lognormal"
+    TRIANGULAR = "triangular"
+    EMPIRICAL = "empirical"  # resample from historical observations
+
+
 # ============================================================================
 # CROP PARAMETERS - Including Rice for Louisiana
 # ============================================================================
@@ -433,6 +449,252 @@ class BudgetTrackerResponse(BaseModel):
     recommendations: List[str]
 
 
+class RiskDistribution(BaseModel):
+    """
+    Price or yield distribution for risk simulation.
+
+    Unset parameters fall back to the crop's default and typical range.
+    """
+    distribution: DistributionType = DistributionType.TRIANGULAR
+    mean: Optional[float] = Field(None, gt=0)  # normal, lognormal
+    std_dev: Optional[float] = Field(None, ge=0)  # normal, lognormal
+    low: Optional[float] = Field(None, ge=0)  # triangular
+    mode: Optional[float] = Field(None, ge=0)  # triangular
+    high: Optional[float] = Field(None, ge=0)  # triangular
+    values: Optional[List[float]] = None  # empirical, e.g. past 10 years of yields
+
+
+class RiskFieldInput(BaseModel):
+    """One field in a risk simulation"""
+    field_id: Optional[str] = None
+    field_name: Optional[str] = None
+    crop: CropType
+    acres: float = Field(..., gt=0)
+    cost_per_acre: Optional[float] = Field(None, ge=0)
+    yield_distribution: Optional[RiskDistribution] = None  # overrides the crop's
+
+
+class RiskSimulationRequest(BaseModel):
+    """Request for Monte Carlo profit risk simulation"""
+    fields: List[RiskFieldInput] = Field(..., min_length=1)
+
+    # Price is shared by every field of a crop; yields are per field
+    price_distributions: Optional[Dict[CropType, RiskDistribution]] = None
+    yield_distributions: Optional[Dict[CropType, RiskDistribution]] = None
+
+    # Correlations between the standard normal draws behind each sample
+    price_yield_correlation: float = Field(0.0, ge=-1, le=1)
+    field_yield_correlation: float = Field(0.5, ge=0, le=1)  # shared weather
+    crop_price_correlation: float = Field(0.0, ge=0, le=1)  # shared market
+
+    n_draws: int = Field(100_000, ge=1_000, le=1_000_000)
+    confidence_levels: List[float] = Field(default_factory=lambda: [0.95, 0.99])
+    seed: Optional[int] = None  # defaults to one derived from the inputs
+
+
+class RiskMetrics(BaseModel):
+    """Profit distribution summary for a field, crop or the whole farm"""
+    acres: float
+    total_cost: float
+    expected_profit: float
+    expected_profit_per_acre: float
+    profit_std_dev: float
+    probability_of_loss: float
+    profit_percentiles: Dict[str, float]  # "p5" -> total profit
+
+    # Keyed by confidence level ("95%"); positive values are losses
+    value_at_risk: Dict[str, float]
+    conditional_value_at_risk: Dict[str, float]
+
+    # Single-crop only: price needed at each sampled yield, and vice versa
+    break_even_price_percentiles: Optional[Dict[str, Optional[float]]] = None
+    break_even_yield_percentiles: Optional[Dict[str, Optional[float]]] = None
+
+
+class FieldRiskResult(BaseModel):
+    """Risk simulation result for one field"""
+    field_id: Optional[str]
+    field_name: Optional[str]
+    crop: str
+    cost_per_acre: float
+    metrics: RiskMetrics
+
+
+class RiskSimulationResponse(BaseModel):
+    """Monte Carlo profit risk results"""
+    n_draws: int
+    seed: int
+    input_hash: str
+    cached: bool = False
+
+    farm: RiskMetrics
+    crops: Dict[str, RiskMetrics]
+    fields: List[FieldRiskResult]
+
+    # Fields ranked by VaR per acre at the lowest confidence level, riskiest first
+    riskiest_fields: List[str]
+    recommendations: List[str]
+
+
+# ============================================================================
+# RISK SIMULATION SAMPLING
+# ============================================================================
+
+RISK_PERCENTILES = (1, 5, 10, 25, 50, 75, 90, 95, 99)
+RISK_CACHE_MAX_ENTRIES = 32
+
+# Fields are simulated in blocks of at most this many draws x fields values
+# so 100k draws across hundreds of fields stays within ~100 MB of temporaries
+RISK_BLOCK_VALUES = 1_000_000
+
+
+def _normal_cdf(z: np.ndarray) -> np.ndarray:
+    """Standard normal CDF (Abramowitz & Stegun 7.1.26, error < 1.5e-7)"""
+    x = np.abs(z) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-x * x)
+    return 0.5 * (1.0 + np.sign(z) * erf)
+
+
+def resolve_distribution(
+    dist: Optional[RiskDistribution],
+    default: float,
+    typical_range: Tuple[float, float]
+) -> Tuple:
+    """
+    Fill a distribution's unset parameters from crop defaults.
+
+    Returns a hashable (kind, *params) tuple so fields sharing a
+    distribution can be sampled together.
+    """
+    low, high = typical_range
+    if dist is None:
+        return (DistributionType.TRIANGULAR, float(low), float(default), float(high))
+
+    kind = dist.distribution
+    if kind in (DistributionType.NORMAL, DistributionType.LOGNORMAL):
+        mean = dist.mean if dist.mean is not None else default
+        std_dev = dist.std_dev if dist.std_dev is not None else (high - low) / 4
+        return (kind, float(mean), float(std_dev))
+
+    if kind == DistributionType.TRIANGULAR:
+        tri_low = dist.low if dist.low is not None else low
+        tri_high = dist.high if dist.high is not None else high
+        tri_mode = dist.mode if dist.mode is not None else min(max(default, tri_low), tri_high)
+        if not tri_low <= tri_mode <= tri_high or tri_low == tri_high:
+            raise ValueError(f"Triangular distribution needs low <= mode <= high and low < high, "
+                             f"got {tri_low}, {tri_mode}, {tri_high}")
+        return (kind, float(tri_low), float(tri_mode), float(tri_high))
+
+    values = dist.values or []
+    if len(values) < 2:
+        raise ValueError("Empirical distribution needs at least 2 historical values")
+    if min(values) < 0:
+        raise ValueError("Empirical distribution values must not be negative")
+    return (kind,) + tuple(sorted(float(v) for v in values))
+
+
+def sample_distribution(params: Tuple, z: np.ndarray) -> np.ndarray:
+    """
+    Map standard normal draws onto a resolved distribution.
+
+    Normal and lognormal transform z directly; triangular and empirical go
+    through the normal CDF (a Gaussian copula), so correlations set on z
+    carry over as rank correlations. Samples are floored at zero.
+    """
+    kind = params[0]
+    if kind == DistributionType.NORMAL:
+        _, mean, std_dev = params
+        return np.maximum(mean + std_dev * z, 0.0)
+
+    if kind == DistributionType.LOGNORMAL:
+        _, mean, std_dev = params
+        sigma2 = math.log1p((std_dev / mean) ** 2)
+        return np.exp(math.log(mean) - sigma2 / 2 + math.sqrt(sigma2) * z)
+
+    u = _normal_cdf(z)
+    if kind == DistributionType.TRIANGULAR:
+        _, low, mode, high = params
+        split = (mode - low) / (high - low)
+        lower = low + np.sqrt(u * (high - low) * (mode - low))
+        upper = high - np.sqrt((1 - u) * (high - low) * (high - mode))
+        return np.where(u < split, lower, upper)
+
+    values = np.asarray(params[1:])
+    return np.interp(u, np.linspace(0.0, 1.0, len(values)), values)
+
+
+def _column_percentiles(ordered: np.ndarray, digits: int) -> List[Dict[str, Optional[float]]]:
+    """
+    RISK_PERCENTILES of each column of an already sorted (draws, columns)
+    array, interpolated like np.percentile. Non-finite values (e.g. a
+    break-even price at zero yield) are reported as None.
+    """
+    positions = np.asarray(RISK_PERCENTILES, dtype=float) / 100 * (len(ordered) - 1)
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, len(ordered) - 1)
+    frac = (positions - lower)[:, None]
+    with np.errstate(invalid="ignore"):
+        points = ordered[lower] + (ordered[upper] - ordered[lower]) * frac
+
+    return [
+        {
+            f"p{p}": round(float(v), digits) if math.isfinite(v) else None
+            for p, v in zip(RISK_PERCENTILES, points[:, col])
+        }
+        for col in range(ordered.shape[1])
+    ]
+
+
+def summarize_profit(
+    profit: np.ndarray,
+    acres: np.ndarray,
+    total_cost: np.ndarray,
+    levels: List[float],
+    break_even_price: Optional[np.ndarray] = None,
+    break_even_yield: Optional[np.ndarray] = None
+) -> List[RiskMetrics]:
+    """
+    Reduce each column of simulated total profit (draws x columns) to
+    RiskMetrics. VaR is the loss at the (1 - level) quantile and CVaR the
+    mean loss over that tail; both are positive for losses.
+    """
+    n_draws = len(profit)
+    ordered = np.sort(profit, axis=0)
+    percentiles = _column_percentiles(ordered, 2)
+    expected = profit.mean(axis=0)
+    std_dev = profit.std(axis=0)
+    loss_probability = (profit < 0).mean(axis=0)
+
+    var, cvar = {}, {}
+    for level in levels:
+        # Worst (1 - level) share of draws, at least one
+        tail = max(1, int(math.ceil(n_draws * (1 - level))))
+        var[level] = -ordered[tail - 1]
+        cvar[level] = -ordered[:tail].mean(axis=0)
+
+    be_prices = _column_percentiles(np.sort(break_even_price, axis=0), 2) if break_even_price is not None else None
+    be_yields = _column_percentiles(np.sort(break_even_yield, axis=0), 1) if break_even_yield is not None else None
+
+    results = []
+    for col in range(profit.shape[1]):
+        results.append(RiskMetrics(
+            acres=round(float(acres[col]), 2),
+            total_cost=round(float(total_cost[col]), 2),
+            expected_profit=round(float(expected[col]), 2),
+            expected_profit_per_acre=round(float(expected[col] / acres[col]), 2),
+            profit_std_dev=round(float(std_dev[col]), 2),
+            probability_of_loss=round(float(loss_probability[col]), 4),
+            profit_percentiles=percentiles[col],
+            value_at_risk={f"{level * 100:g}%": round(float(var[level][col]), 2) for level in levels},
+            conditional_value_at_risk={f"{level * 100:g}%": round(float(cvar[level][col]), 2) for level in levels},
+            break_even_price_percentiles=be_prices[col] if be_prices else None,
+            break_even_yield_percentiles=be_yields[col] if be_yields else None,
+        ))
+    return results
+
+
 # ============================================================================
 # PROFITABILITY SERVICE
 # ============================================================================
@@ -445,16 +707,20 @@ class ProfitabilityService:
     - Break-even analysis (yield and price)
     - Input ROI ranking with cut recommendations
     - What-if scenario planning
+    - Monte Carlo downside-risk simulation across fields
     - Budget tracking with alerts
     """
 
     def __init__(self, db_path: str = "agtools.db"):
         self.db_path = db_path
         self.crop_params = CROP_PARAMETERS
+        # input hash -> RiskSimulationResponse, least recently used first
+        self._risk_cache: "OrderedDict[str, RiskSimulationResponse]" = OrderedDict()
+        self._risk_lock = threading.Lock()
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -928,6 +1194,217 @@ class ProfitabilityService:
 
         return recs
 
+    # ========================================================================
+    # RISK SIMULATION
+    # ========================================================================
+
+    def simulate_profit_risk(self, request: RiskSimulationRequest) -> RiskSimulationResponse:
+        """
+        Monte Carlo profit risk across fields.
+
+        Draws correlated price and yield samples for every field in one
+        vectorized pass and reports the profit distribution, probability of
+        loss, VaR/CVaR and break-even percentiles per field, per crop and
+        for the whole farm. Identical requests are served from a cache.
+        """
+        input_hash = self._risk_input_hash(request)
+        with self._risk_lock:
+            cached = self._risk_cache.get(input_hash)
+            if cached is not None:
+                self._risk_cache.move_to_end(input_hash)
+                return cached.model_copy(update={"cached": True})
+
+        result = self._run_risk_simulation(request, input_hash)
+
+        with self._risk_lock:
+            self._risk_cache[input_hash] = result
+            self._risk_cache.move_to_end(input_hash)
+            while len(self._risk_cache) > RISK_CACHE_MAX_ENTRIES:
+                self._risk_cache.popitem(last=False)
+        return result
+
+    def clear_risk_cache(self) -> int:
+        """Drop cached risk simulations. Returns the number removed."""
+        with self._risk_lock:
+            count = len(self._risk_cache)
+            self._risk_cache.clear()
+        return count
+
+    @staticmethod
+    def _risk_input_hash(request: RiskSimulationRequest) -> str:
+        """Stable hash of a request's inputs"""
+        canonical = json.dumps(request.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+    def _run_risk_simulation(self, request: RiskSimulationRequest, input_hash: str) -> RiskSimulationResponse:
+        levels = sorted(set(request.confidence_levels))
+        if not levels or not all(0 < level < 1 for level in levels):
+            raise ValueError("Confidence levels must be between 0 and 1")
+
+        n = request.n_draws
+        seed = request.seed if request.seed is not None else int(input_hash[:8], 16)
+        rng = np.random.default_rng(seed)
+        fields = request.fields
+        price_dists = request.price_distributions or {}
+        yield_dists = request.yield_distributions or {}
+
+        # Resolve every distribution up front so bad input fails before sampling
+        crops = list(dict.fromkeys(f.crop for f in fields))
+        crop_column = {crop: i for i, crop in enumerate(crops)}
+        price_params = []
+        for crop in crops:
+            crop_data = self.crop_params[crop]
+            price_params.append(resolve_distribution(
+                price_dists.get(crop), crop_data["default_price"], crop_data["typical_price_range"]
+            ))
+
+        yield_params = []
+        costs = np.empty(len(fields))
+        for i, f in enumerate(fields):
+            crop_data = self.crop_params[f.crop]
+            yield_params.append(resolve_distribution(
+                f.yield_distribution or yield_dists.get(f.crop),
+                crop_data["default_yield"],
+                crop_data["typical_yield_range"]
+            ))
+            costs[i] = (f.cost_per_acre if f.cost_per_acre is not None
+                        else sum(crop_data["variable_costs_per_acre"].values()))
+        acres = np.array([f.acres for f in fields])
+
+        # One market factor per crop (sharing a common component) and one
+        # weather factor for the farm. A field's yield draw is
+        #   rho * price_z + sqrt(1 - rho^2) * (sqrt(w) * weather + sqrt(1 - w) * own)
+        # so corr(yield, price) = rho for every field.
+        rho = request.price_yield_correlation
+        shared_price = math.sqrt(request.crop_price_correlation)
+        shared_weather = math.sqrt(request.field_yield_correlation)
+        z_price = (shared_price * rng.standard_normal(n)[:, None]
+                   + math.sqrt(1 - request.crop_price_correlation) * rng.standard_normal((n, len(crops))))
+        prices = np.empty_like(z_price)
+        for i, params in enumerate(price_params):
+            prices[:, i] = sample_distribution(params, z_price[:, i])
+        z_weather = rng.standard_normal(n)[:, None]
+
+        crop_profit = np.zeros((n, len(crops)))
+        crop_production = np.zeros((n, len(crops)))
+        field_metrics: List[RiskMetrics] = []
+
+        block = max(1, RISK_BLOCK_VALUES // n)
+        for start in range(0, len(fields), block):
+            stop = min(start + block, len(fields))
+            columns = np.array([crop_column[f.crop] for f in fields[start:stop]])
+            z_yield = rho * z_price[:, columns] + math.sqrt(1 - rho * rho) * (
+                shared_weather * z_weather
+                + math.sqrt(1 - request.field_yield_correlation) * rng.standard_normal((n, stop - start))
+            )
+
+            # Fields sharing a distribution are sampled together
+            groups: Dict[Tuple, List[int]] = {}
+            for j, params in enumerate(yield_params[start:stop]):
+                groups.setdefault(params, []).append(j)
+            yields = np.empty_like(z_yield)
+            for params, idx in groups.items():
+                yields[:, idx] = sample_distribution(params, z_yield[:, idx])
+
+            block_prices = prices[:, columns]
+            block_costs = costs[start:stop]
+            block_acres = acres[start:stop]
+            profit = (yields * block_prices - block_costs) * block_acres
+
+            # Roll fields up to their crops with one matrix product each
+            crop_onehot = np.zeros((stop - start, len(crops)))
+            crop_onehot[np.arange(stop - start), columns] = 1.0
+            crop_profit += profit @ crop_onehot
+            crop_production += (yields * block_acres) @ crop_onehot
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                field_metrics.extend(summarize_profit(
+                    profit, block_acres, block_costs * block_acres, levels,
+                    break_even_price=np.divide(block_costs, yields),
+                    break_even_yield=np.divide(block_costs, block_prices),
+                ))
+
+        crop_acres = np.zeros(len(crops))
+        crop_costs = np.zeros(len(crops))
+        np.add.at(crop_acres, [crop_column[f.crop] for f in fields], acres)
+        np.add.at(crop_costs, [crop_column[f.crop] for f in fields], costs * acres)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crop_metrics = summarize_profit(
+                crop_profit, crop_acres, crop_costs, levels,
+                break_even_price=np.divide(crop_costs, crop_production),
+                break_even_yield=np.divide(crop_costs, prices * crop_acres),
+            )
+        farm_metrics = summarize_profit(
+            crop_profit.sum(axis=1, keepdims=True),
+            np.array([acres.sum()]),
+            np.array([crop_costs.sum()]),
+            levels
+        )[0]
+
+        field_results = [
+            FieldRiskResult(
+                field_id=f.field_id,
+                field_name=f.field_name,
+                crop=f.crop.value,
+                cost_per_acre=round(float(costs[i]), 2),
+                metrics=field_metrics[i],
+            )
+            for i, f in enumerate(fields)
+        ]
+
+        var_key = f"{levels[0] * 100:g}%"
+        ranked = sorted(
+            range(len(fields)),
+            key=lambda i: field_metrics[i].value_at_risk[var_key] / field_metrics[i].acres,
+            reverse=True
+        )
+        riskiest = [self._risk_field_label(fields[i], i) for i in ranked[:5]]
+
+        return RiskSimulationResponse(
+            n_draws=n,
+            seed=seed,
+            input_hash=input_hash,
+            farm=farm_metrics,
+            crops={crop.value: metrics for crop, metrics in zip(crops, crop_metrics)},
+            fields=field_results,
+            riskiest_fields=riskiest,
+            recommendations=self._generate_risk_recommendations(farm_metrics, levels[0], riskiest),
+        )
+
+    @staticmethod
+    def _risk_field_label(field: RiskFieldInput, index: int) -> str:
+        return field.field_name or field.field_id or f"Field {index + 1}"
+
+    def _generate_risk_recommendations(
+        self,
+        farm: RiskMetrics,
+        level: float,
+        riskiest: List[str]
+    ) -> List[str]:
+        """Generate recommendations from a risk simulation."""
+        recs = []
+
+        var_key = f"{level * 100:g}%"
+        var = farm.value_at_risk[var_key]
+        cvar = farm.conditional_value_at_risk[var_key]
+        if var > 0:
+            recs.append(f"At {var_key} confidence the farm loses no more than ${var:,.2f}; "
+                        f"in the worst {(1 - level) * 100:g}% of years the average loss is ${cvar:,.2f}")
+        else:
+            recs.append(f"At {var_key} confidence the farm still makes at least ${-var:,.2f}")
+
+        if farm.probability_of_loss >= 0.5:
+            recs.append(f"⚠️ CRITICAL: {farm.probability_of_loss:.0%} chance of a farm-wide loss. "
+                        "Cut costs or reconsider the crop mix.")
+        elif farm.probability_of_loss >= 0.2:
+            recs.append(f"⚠️ {farm.probability_of_loss:.0%} chance of a farm-wide loss - "
+                        "consider revenue protection insurance or forward contracting")
+
+        if riskiest:
+            recs.append(f"Highest downside risk per acre: {', '.join(riskiest[:3])}")
+
+        return recs
+
     # ========================================================================
     # BUDGET TRACKER
     # ========================================================================
@@ -28,6 +28,8 @@ from pathlib import Path
 
 from PIL import Image
 import httpx
+from database.db_utils import get_pooled_connection
+from services.registry import lazy_service
 
 logger = logging.getLogger(__name__)
 
@@ -168,7 +170,7 @@ class ReceiptOCRService:
 
     def _init_database(self):
         """Initialize database tables for receipt storage"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -565,7 +567,7 @@ class ReceiptOCRService:
             image = image.convert('RGB')
         image.save(image_path, 'JPEG', quality=90)
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -616,7 +618,7 @@ class ReceiptOCRService:
 
     def get_receipt_by_hash(self, image_hash: str) -> Optional[Dict]:
         """Get previously scanned receipt by image hash"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -633,7 +635,7 @@ class ReceiptOCRService:
 
     def link_to_bill(self, receipt_id: int, bill_id: int) -> bool:
         """Link a receipt scan to a GenFin bill"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -649,7 +651,7 @@ class ReceiptOCRService:
 
     def get_recent_scans(self, user_id: Optional[int] = None, limit: int = 20) -> List[Dict]:
         """Get recent receipt scans"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -678,7 +680,7 @@ class ReceiptOCRService:
 
     def list_scans(self, limit: int = 20, offset: int = 0) -> List[Dict]:
         """List receipt scans with pagination"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -697,7 +699,7 @@ class ReceiptOCRService:
 
     def get_scan(self, scan_id: int) -> Optional[Dict]:
         """Get a specific receipt scan by ID"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -720,22 +722,10 @@ class ReceiptOCRService:
         return None
 
 
-class _LazyReceiptOCRService:
-    """Lazy-loading wrapper for ReceiptOCRService to avoid initialization at import time"""
-    _instance: Optional[ReceiptOCRService] = None
-
-    def __getattr__(self, name):
-        if self._instance is None:
-            self._instance = ReceiptOCRService()
-        return getattr(self._instance, name)
-
-
 # Module-level singleton (lazy-loaded)
-receipt_ocr_service = _LazyReceiptOCRService()
+receipt_ocr_service = lazy_service("receipt_ocr", ReceiptOCRService)
 
 
 def get_receipt_ocr_service() -> ReceiptOCRService:
     """Get or create Receipt OCR service singleton"""
-    if receipt_ocr_service._instance is None:
-        receipt_ocr_service._instance = ReceiptOCRService()
-    return receipt_ocr_service._instance
+    return receipt_ocr_service.resolve()
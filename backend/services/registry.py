@@ -0,0 +1,115 @@
+"""
+Lazy Service Registry
+AgTools v6.13.5
+
+Module-level service singletons are registered here as lazy proxies so that
+importing main.py (or any router) does not construct services, open the
+database or run schema setup. Each service is built on first attribute
+access and then behaves exactly like the real instance.
+
+Usage:
+    genfin_core_service = lazy_service("genfin_core", GenFinCoreService)
+
+    genfin_core_service.list_accounts()   # constructs GenFinCoreService here
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class LazyService:
+    """
+    Proxy that constructs its service on first use.
+
+    Attribute reads and writes are forwarded to the real instance, so call
+    sites and tests that patch attributes keep working unchanged.
+    """
+
+    __slots__ = ("_name", "_factory", "_instance", "_lock", "_init_seconds")
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "_init_seconds", None)
+
+    def resolve(self) -> Any:
+        """Return the real service, constructing it if needed."""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    started = time.perf_counter()
+                    instance = self._factory()
+                    object.__setattr__(self, "_init_seconds", time.perf_counter() - started)
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.resolve(), name, value)
+
+    def __repr__(self) -> str:
+        state = "initialized" if self.is_initialized else "pending"
+        return f"<LazyService {self._name} ({state})>"
+
+
+_registry: Dict[str, LazyService] = {}
+
+
+def lazy_service(name: str, factory: Callable[[], Any]) -> LazyService:
+    """Register a service factory and return its lazy proxy."""
+    proxy = _registry.get(name)
+    if proxy is None:
+        proxy = _registry[name] = LazyService(name, factory)
+    return proxy
+
+
+def get_service(name: str) -> Any:
+    """Resolve a registered service by name."""
+    return _registry[name].resolve()
+
+
+def registered_services() -> List[str]:
+    return sorted(_registry)
+
+
+def initialize_services(names: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Construct registered services up front (e.g. from a migration step).
+
+    Returns:
+        Seconds spent constructing each service that was not yet built
+    """
+    timings = {}
+    for name in names or registered_services():
+        proxy = _registry[name]
+        if not proxy.is_initialized:
+            proxy.resolve()
+            timings[name] = round(proxy._init_seconds, 4)
+    return timings
+
+
+def get_registry_stats() -> Dict[str, Any]:
+    """Which services have been constructed and how long each took."""
+    services = {}
+    for name in registered_services():
+        proxy = _registry[name]
+        services[name] = {
+            "initialized": proxy.is_initialized,
+            "init_ms": round(proxy._init_seconds * 1000, 2) if proxy._init_seconds is not None else None,
+        }
+    return {
+        "registered": len(services),
+        "initialized": sum(1 for s in services.values() if s["initialized"]),
+        "services": services,
+    }
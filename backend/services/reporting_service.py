@@ -18,6 +18,7 @@ from .field_service import get_field_service
 from .field_operations_service import get_field_operations_service
 from .equipment_service import get_equipment_service
 from .inventory_service import get_inventory_service
+from database.db_utils import get_pooled_connection
 
 
 # ============================================================================
@@ -270,7 +271,7 @@ class ReportingService:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -21,6 +21,7 @@ import sqlite3
 import os
 import math
 from statistics import mean, stdev, variance
+from database.db_utils import get_pooled_connection
 
 
 # =============================================================================
@@ -361,7 +362,7 @@ class ResearchService:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
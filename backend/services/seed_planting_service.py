@@ -13,6 +13,7 @@ from typing import Optional, List, Tuple, Dict
 from pydantic import BaseModel, Field
 
 from .auth_service import get_auth_service
+from database.db_utils import get_pooled_connection
 
 
 # ============================================================================
@@ -381,10 +382,7 @@ class SeedPlantingService:
         self._init_database()
 
     def _get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        return get_pooled_connection(self.db_path, row_factory=sqlite3.Row, foreign_keys=True)
 
     def _init_database(self):
         """Initialize database tables from migration."""
@@ -0,0 +1,172 @@
+"""
+Spatial Index for AgTools GIS
+Bounding-box R*Tree index over GeoJSON geometries stored as text.
+
+Keeps one row per geometry in an SQLite R*Tree virtual table so map
+viewport queries only touch features whose bounds intersect the view,
+and features smaller than a few screen pixels are thinned to one per
+pixel cell at low zoom levels.
+
+AgTools v6.16.0
+"""
+
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# (west, south, east, north) in degrees
+BBox = Tuple[float, float, float, float]
+
+# Web map tile size in pixels and the thinning cell size in pixels
+TILE_SIZE = 256
+THIN_PIXELS = 4
+
+# Default and maximum features returned by one viewport query
+VIEWPORT_FEATURE_LIMIT = 10000
+MAX_VIEWPORT_FEATURE_LIMIT = 100000
+
+
+def geometry_bounds(geometry: Optional[Dict[str, Any]]) -> Optional[BBox]:
+    """
+    Bounds of a GeoJSON geometry.
+
+    Returns:
+        (west, south, east, north), or None if the geometry has no coordinates
+    """
+    if not geometry:
+        return None
+
+    if geometry.get("type") == "GeometryCollection":
+        parts = [geometry_bounds(g) for g in geometry.get("geometries", [])]
+        parts = [p for p in parts if p is not None]
+        if not parts:
+            return None
+        return (
+            min(p[0] for p in parts), min(p[1] for p in parts),
+            max(p[2] for p in parts), max(p[3] for p in parts)
+        )
+
+    xs: List[float] = []
+    ys: List[float] = []
+    stack = [geometry.get("coordinates")]
+    while stack:
+        coords = stack.pop()
+        if not coords:
+            continue
+        if isinstance(coords[0], (int, float)):
+            xs.append(coords[0])
+            ys.append(coords[1])
+        else:
+            stack.extend(coords)
+
+    if not xs:
+        return None
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def parse_bbox(value: str) -> BBox:
+    """
+    Parse a "west,south,east,north" query parameter.
+
+    Raises:
+        ValueError: If the value is not four numbers with west <= east and south <= north
+    """
+    try:
+        west, south, east, north = (float(part) for part in value.split(","))
+    except ValueError:
+        raise ValueError("bbox must be four comma-separated numbers: west,south,east,north")
+    if west > east or south > north:
+        raise ValueError("bbox must be ordered west,south,east,north")
+    return (west, south, east, north)
+
+
+def thinning_cell_size(zoom: int) -> float:
+    """Degrees of longitude covered by THIN_PIXELS screen pixels at a zoom level"""
+    return 360.0 / (TILE_SIZE * 2 ** zoom) * THIN_PIXELS
+
+
+class SpatialIndex:
+    """
+    R*Tree over the bounds of rows in another table.
+
+    The index table shares ids with the indexed table. Auxiliary columns
+    (stored but not indexed) let queries filter, e.g. by layer, without
+    touching the indexed table.
+    """
+
+    def __init__(self, table: str, aux_columns: Sequence[str] = ()):
+        self.table = table
+        self.aux_columns = tuple(aux_columns)
+
+    def create(self, cursor: sqlite3.Cursor) -> None:
+        """Create the index table if it does not exist"""
+        aux = "".join(f", +{column}" for column in self.aux_columns)
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {self.table}
+            USING rtree(id, min_x, max_x, min_y, max_y{aux})
+        """)
+
+    def upsert(self, cursor: sqlite3.Cursor, rows: Iterable[Tuple]) -> None:
+        """
+        Index or re-index rows.
+
+        Args:
+            rows: (id, bounds, *aux_values) tuples; rows whose bounds are None
+                are removed from the index
+        """
+        rows = list(rows)
+        self.delete(cursor, [row[0] for row in rows])
+        placeholders = ", ".join("?" * (5 + len(self.aux_columns)))
+        cursor.executemany(
+            f"INSERT INTO {self.table} VALUES ({placeholders})",
+            [
+                (row[0], bounds[0], bounds[2], bounds[1], bounds[3], *row[2:])
+                for row in rows
+                for bounds in (row[1],)
+                if bounds is not None
+            ]
+        )
+
+    def delete(self, cursor: sqlite3.Cursor, ids: Iterable[int]) -> None:
+        """Remove rows from the index"""
+        cursor.executemany(f"DELETE FROM {self.table} WHERE id = ?", [(i,) for i in ids])
+
+    def candidates_sql(
+        self,
+        bbox: BBox,
+        zoom: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, List[Any]]:
+        """
+        SELECT of the ids whose bounds intersect bbox, for use in "id IN (...)".
+
+        With a zoom level, rows smaller than thinning_cell_size(zoom) in both
+        directions are reduced to the lowest id per cell; larger rows are
+        always included.
+
+        Args:
+            bbox: (west, south, east, north)
+            zoom: Web map zoom level, or None for no thinning
+            filters: Equality filters on auxiliary columns
+        """
+        west, south, east, north = bbox
+        where = "max_x >= ? AND min_x <= ? AND max_y >= ? AND min_y <= ?"
+        params: List[Any] = [west, east, south, north]
+        for column, value in (filters or {}).items():
+            if column not in self.aux_columns:
+                raise ValueError(f"{column} is not a column of {self.table}")
+            where += f" AND {column} = ?"
+            params.append(value)
+
+        if zoom is None:
+            return f"SELECT id FROM {self.table} WHERE {where}", params
+
+        cell = thinning_cell_size(zoom)
+        sql = f"""
+            SELECT id FROM {self.table}
+            WHERE {where} AND (max_x - min_x >= ? OR max_y - min_y >= ?)
+            UNION ALL
+            SELECT MIN(id) FROM {self.table}
+            WHERE {where} AND max_x - min_x < ? AND max_y - min_y < ?
+            GROUP BY CAST((min_x + 180) / ? AS INTEGER), CAST((min_y + 90) / ? AS INTEGER)
+        """
+        return sql, params + [cell, cell] + params + [cell, cell, cell, cell]
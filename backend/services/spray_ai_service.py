@@ -10,6 +10,7 @@ Features:
 - Integrates with existing SprayTimingOptimizer
 """
 
+import importlib.util
 import logging
 import os
 import json
@@ -21,18 +22,12 @@ from dataclasses import dataclass
 from enum import Enum
 
 import numpy as np
+from database.db_utils import get_pooled_connection
 
 logger = logging.getLogger(__name__)
 
-# Try to import sklearn
-try:
-    from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-    from sklearn.preprocessing import StandardScaler
-    from sklearn.model_selection import train_test_split
-    from sklearn.metrics import accuracy_score, classification_report
-    HAS_SKLEARN = True
-except ImportError:
-    HAS_SKLEARN = False
+# sklearn is imported in train_model (and by pickle when saved models load)
+HAS_SKLEARN = importlib.util.find_spec("sklearn") is not None
 
 
 class SprayOutcome(str, Enum):
@@ -153,7 +148,7 @@ class SprayAIService:
 
     def _init_db(self):
         """Initialize database tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         # Historical spray applications
@@ -249,7 +244,7 @@ class SprayAIService:
 
     def _calculate_condition_weights(self):
         """Calculate condition weights from historical data"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         for spray_type in SprayType:
@@ -294,7 +289,7 @@ class SprayAIService:
         Returns:
             Record ID
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -507,7 +502,7 @@ class SprayAIService:
 
     def _apply_microclimate(self, conditions: Dict, field_id: int, time_of_day: str) -> Dict:
         """Apply micro-climate adjustments for specific field"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         hour_map = {'morning': 8, 'midday': 12, 'evening': 18, 'night': 22}
@@ -548,7 +543,7 @@ class SprayAIService:
 
     def _count_similar_conditions(self, spray_type: SprayType, conditions: Dict) -> int:
         """Count historical applications with similar conditions"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -610,7 +605,12 @@ class SprayAIService:
         if not HAS_SKLEARN:
             return {"status": "error", "message": "scikit-learn not available"}
 
-        conn = sqlite3.connect(self.db_path)
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import accuracy_score
+
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -672,7 +672,7 @@ class SprayAIService:
         importance = dict(zip(feature_names, model.feature_importances_))
 
         # Save to database
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
         cursor.execute("""
             INSERT INTO spray_models (spray_type, model_type, training_records, accuracy, feature_importance)
@@ -691,7 +691,7 @@ class SprayAIService:
 
     def get_historical_analysis(self, spray_type: Optional[SprayType] = None) -> Dict[str, Any]:
         """Get analysis of historical spray outcomes"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         if spray_type:
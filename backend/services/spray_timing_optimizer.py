@@ -4,11 +4,13 @@ Predicts optimal spray windows based on weather forecasts
 Calculates cost-of-waiting and helps avoid wasted applications
 """
 
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Sequence
+from dataclasses import dataclass, fields
 from enum import Enum
 from datetime import datetime, timedelta, timezone
 
+import numpy as np
+
 
 class SprayType(str, Enum):
     HERBICIDE = "herbicide"
@@ -99,6 +101,16 @@ OPTIMAL_CONDITIONS = {
     }
 }
 
+# Score cut-offs shared by the scalar evaluator and the columnar scanner
+EXCELLENT_SCORE = 90
+SPRAYABLE_SCORE = 75  # GOOD or better
+
+# Warning bits used by the columnar scanner
+WARN_WIND = 1
+WARN_TEMPERATURE = 2
+WARN_RAIN = 4
+WARN_LEAF_WETNESS = 8
+
 # Product-specific rain-free requirements (hours after application)
 RAINFASTNESS_HOURS = {
     # Herbicides
@@ -226,6 +238,101 @@ class SprayWindow:
         return (self.end - self.start).total_seconds() / 3600
 
 
+@dataclass
+class ForecastColumns:
+    """
+    Hourly forecast stored column-wise for vectorized scoring
+
+    Inversion and leaf-wetness flags use the same rules as the
+    WeatherCondition properties. elapsed_hours is measured from each
+    field's first forecast hour, so only differences within one field
+    are meaningful once several fields are concatenated.
+    """
+    times: List[datetime]
+    elapsed_hours: np.ndarray
+    temp_f: np.ndarray
+    humidity_pct: np.ndarray
+    wind_mph: np.ndarray
+    precip_chance_pct: np.ndarray
+    inversion_risk: np.ndarray
+    leaf_wetness: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        times: Sequence[datetime],
+        temp_f: Sequence[float],
+        humidity_pct: Sequence[float],
+        wind_mph: Sequence[float],
+        precip_chance_pct: Sequence[float],
+        precip_amount_in: Optional[Sequence[float]] = None,
+        cloud_cover_pct: Optional[Sequence[float]] = None,
+        dew_point_f: Optional[Sequence[float]] = None
+    ) -> "ForecastColumns":
+        """Build columns from raw hourly arrays (missing optional columns use API defaults)"""
+        times = list(times)
+        n = len(times)
+        temp = np.asarray(temp_f, dtype=float)
+        humidity = np.asarray(humidity_pct, dtype=float)
+        wind = np.asarray(wind_mph, dtype=float)
+        precip_amount = np.zeros(n) if precip_amount_in is None else np.asarray(precip_amount_in, dtype=float)
+        cloud = np.full(n, 50.0) if cloud_cover_pct is None else np.asarray(cloud_cover_pct, dtype=float)
+        dew = np.full(n, 55.0) if dew_point_f is None else np.asarray(dew_point_f, dtype=float)
+
+        hour = np.fromiter((t.hour for t in times), dtype=np.int64, count=n)
+        start = times[0] if times else None
+        elapsed = np.fromiter(
+            ((t - start).total_seconds() / 3600 for t in times), dtype=float, count=n
+        )
+
+        inversion = ((hour < 8) | (hour > 18)) & (wind < 3) & (cloud < 30)
+        leaf_wetness = (
+            ((hour >= 4) & (hour <= 9) & (humidity > 85))
+            | (precip_amount > 0)
+            | (np.abs(temp - dew) < 5)
+        )
+
+        return cls(
+            times=times,
+            elapsed_hours=elapsed,
+            temp_f=temp,
+            humidity_pct=humidity,
+            wind_mph=wind,
+            precip_chance_pct=np.asarray(precip_chance_pct, dtype=float),
+            inversion_risk=inversion,
+            leaf_wetness=leaf_wetness
+        )
+
+    @classmethod
+    def from_conditions(cls, forecast: Sequence[WeatherCondition]) -> "ForecastColumns":
+        """Build columns from a list of WeatherCondition objects"""
+        return cls.from_arrays(
+            times=[w.datetime for w in forecast],
+            temp_f=[w.temp_f for w in forecast],
+            humidity_pct=[w.humidity_pct for w in forecast],
+            wind_mph=[w.wind_mph for w in forecast],
+            precip_chance_pct=[w.precip_chance_pct for w in forecast],
+            precip_amount_in=[w.precip_amount_in for w in forecast],
+            cloud_cover_pct=[w.cloud_cover_pct for w in forecast],
+            dew_point_f=[w.dew_point_f for w in forecast]
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence["ForecastColumns"]) -> "ForecastColumns":
+        """Stack several fields' forecasts end to end"""
+        values = {}
+        for f in fields(cls):
+            columns = [getattr(part, f.name) for part in parts]
+            if f.name == "times":
+                values[f.name] = [t for column in columns for t in column]
+            else:
+                values[f.name] = np.concatenate(columns) if columns else np.zeros(0)
+        return cls(**values)
+
+
 class SprayTimingOptimizer:
     """
     Optimizes spray timing based on weather conditions
@@ -313,9 +420,9 @@ class SprayTimingOptimizer:
             score -= 5
 
         # Determine overall rating
-        if score >= 90:
+        if score >= EXCELLENT_SCORE:
             risk_level = ApplicationRisk.EXCELLENT
-        elif score >= 75:
+        elif score >= SPRAYABLE_SCORE:
             risk_level = ApplicationRisk.GOOD
         elif score >= 55:
             risk_level = ApplicationRisk.MARGINAL
@@ -382,103 +489,11 @@ class SprayTimingOptimizer:
         if not forecast:
             return {"error": "No forecast data provided"}
 
-        windows: List[SprayWindow] = []
-        current_window_start = None
-        current_window_conditions = []
-        current_window_issues = []
-
-        for weather in forecast:
-            eval_result = self.evaluate_current_conditions(weather, spray_type, product_name)
-            risk_level = ApplicationRisk(eval_result["evaluation"]["risk_level"])
-
-            is_sprayable = risk_level in [ApplicationRisk.EXCELLENT, ApplicationRisk.GOOD]
-
-            if is_sprayable:
-                if current_window_start is None:
-                    current_window_start = weather.datetime
-                    current_window_conditions = []
-                    current_window_issues = []
-
-                current_window_conditions.append({
-                    "temp": weather.temp_f,
-                    "humidity": weather.humidity_pct,
-                    "wind": weather.wind_mph,
-                    "rain_chance": weather.precip_chance_pct,
-                    "quality": risk_level.value
-                })
-                current_window_issues.extend(eval_result["evaluation"]["warnings"])
-            else:
-                # End current window if one exists
-                if current_window_start is not None:
-                    window_duration = (weather.datetime - current_window_start).total_seconds() / 3600
-
-                    if window_duration >= min_window_hours:
-                        # Calculate average conditions
-                        avg_conditions = {
-                            "temp_f": sum(c["temp"] for c in current_window_conditions) / len(current_window_conditions),
-                            "humidity_pct": sum(c["humidity"] for c in current_window_conditions) / len(current_window_conditions),
-                            "wind_mph": sum(c["wind"] for c in current_window_conditions) / len(current_window_conditions),
-                            "rain_chance_pct": sum(c["rain_chance"] for c in current_window_conditions) / len(current_window_conditions)
-                        }
-
-                        # Determine window quality
-                        excellent_hours = sum(1 for c in current_window_conditions if c["quality"] == "excellent")
-                        quality = ApplicationRisk.EXCELLENT if excellent_hours >= len(current_window_conditions) * 0.7 else ApplicationRisk.GOOD
-
-                        windows.append(SprayWindow(
-                            start=current_window_start,
-                            end=weather.datetime,
-                            quality=quality,
-                            avg_conditions=avg_conditions,
-                            limiting_factors=list(set(current_window_issues)),
-                            notes=self._generate_window_notes(avg_conditions, spray_type)
-                        ))
-
-                current_window_start = None
-                current_window_conditions = []
-                current_window_issues = []
-
-        # Close final window if still open
-        if current_window_start is not None and forecast:
-            window_duration = (forecast[-1].datetime - current_window_start).total_seconds() / 3600
-            if window_duration >= min_window_hours:
-                avg_conditions = {
-                    "temp_f": sum(c["temp"] for c in current_window_conditions) / len(current_window_conditions),
-                    "humidity_pct": sum(c["humidity"] for c in current_window_conditions) / len(current_window_conditions),
-                    "wind_mph": sum(c["wind"] for c in current_window_conditions) / len(current_window_conditions),
-                    "rain_chance_pct": sum(c["rain_chance"] for c in current_window_conditions) / len(current_window_conditions)
-                }
-
-                windows.append(SprayWindow(
-                    start=current_window_start,
-                    end=forecast[-1].datetime,
-                    quality=ApplicationRisk.GOOD,
-                    avg_conditions=avg_conditions,
-                    limiting_factors=list(set(current_window_issues)),
-                    notes=self._generate_window_notes(avg_conditions, spray_type)
-                ))
-
-        # Format response
-        formatted_windows = []
-        for w in windows:
-            formatted_windows.append({
-                "start": w.start.isoformat(),
-                "end": w.end.isoformat(),
-                "duration_hours": round(w.duration_hours, 1),
-                "quality": w.quality.value,
-                "avg_conditions": {k: round(v, 1) for k, v in w.avg_conditions.items()},
-                "limiting_factors": w.limiting_factors,
-                "notes": w.notes
-            })
-
-        # Find best window
-        best_window = None
-        if formatted_windows:
-            excellent_windows = [w for w in formatted_windows if w["quality"] == "excellent"]
-            if excellent_windows:
-                best_window = max(excellent_windows, key=lambda x: x["duration_hours"])
-            else:
-                best_window = max(formatted_windows, key=lambda x: x["duration_hours"])
+        columns = ForecastColumns.from_conditions(forecast)
+        formatted_windows = self._scan_columns(
+            columns, np.array([0, len(columns)]), spray_type, min_window_hours
+        )[0]
+        best_window = self._select_best_window(formatted_windows)
 
         return {
             "spray_type": spray_type.value,
@@ -491,6 +506,248 @@ class SprayTimingOptimizer:
             "recommendation": self._generate_overall_recommendation(formatted_windows, best_window)
         }
 
+    def scan_spray_windows(
+        self,
+        forecasts: Dict[str, List[WeatherCondition]],
+        spray_types: List[SprayType],
+        min_window_hours: float = 3.0
+    ) -> Dict[str, Any]:
+        """
+        Find spray windows for many fields and spray types in one pass
+
+        All field forecasts are stacked into one set of columns and scored
+        once per spray type; window strings are only built for windows that
+        meet min_window_hours.
+
+        Args:
+            forecasts: Hourly forecast per field id
+            spray_types: Applications to schedule
+            min_window_hours: Minimum window duration to consider
+        """
+        field_ids = list(forecasts)
+        parts = [ForecastColumns.from_conditions(forecasts[field_id]) for field_id in field_ids]
+        columns = ForecastColumns.concat(parts)
+        offsets = np.concatenate(([0], np.cumsum([len(part) for part in parts], dtype=np.int64)))
+
+        per_type = {
+            spray_type: self._scan_columns(columns, offsets, spray_type, min_window_hours)
+            for spray_type in spray_types
+        }
+
+        results = {}
+        for idx, field_id in enumerate(field_ids):
+            if not len(parts[idx]):
+                results[field_id] = {"error": "No forecast data provided"}
+                continue
+
+            field_result = {"forecast_hours_analyzed": len(parts[idx])}
+            for spray_type in spray_types:
+                windows = per_type[spray_type][idx]
+                best_window = self._select_best_window(windows)
+                field_result[spray_type.value] = {
+                    "windows_found": len(windows),
+                    "windows": windows,
+                    "best_window": best_window,
+                    "recommendation": self._generate_overall_recommendation(windows, best_window)
+                }
+            results[field_id] = field_result
+
+        return {
+            "fields_analyzed": len(field_ids),
+            "spray_types": [spray_type.value for spray_type in spray_types],
+            "forecast_hours_analyzed": len(columns),
+            "min_window_required_hours": min_window_hours,
+            "windows_found": sum(len(w) for windows in per_type.values() for w in windows),
+            "fields": results
+        }
+
+    def score_columns(self, columns: ForecastColumns, spray_type: SprayType) -> np.ndarray:
+        """
+        Vectorized evaluate_current_conditions score for every forecast hour
+
+        Applies the same deductions as the scalar evaluator without building
+        issue/warning strings.
+        """
+        optimal = self.optimal_conditions.get(spray_type, OPTIMAL_CONDITIONS[SprayType.HERBICIDE])
+        wind = columns.wind_mph
+        temp = columns.temp_f
+        humidity = columns.humidity_pct
+        rain = columns.precip_chance_pct
+
+        score = np.full(len(columns), 100, dtype=np.int64)
+        score -= np.where(
+            wind < optimal["wind_min_mph"], 25,
+            np.where(wind > optimal["wind_max_mph"] + 5, 30,
+                     np.where(wind > optimal["wind_max_mph"], 15, 0))
+        )
+        score -= np.where(temp < optimal["temp_min_f"], 20, np.where(temp > optimal["temp_max_f"], 25, 0))
+        score -= np.where(
+            humidity < optimal["humidity_min_pct"], 15,
+            np.where(humidity > optimal["humidity_max_pct"], 10, 0)
+        )
+        score -= np.where(rain > 50, 30, np.where(rain > 30, 10, 0))
+        if optimal["avoid_inversion"]:
+            score -= 35 * columns.inversion_risk
+        if not optimal["leaf_wetness_ok"]:
+            score -= 5 * columns.leaf_wetness
+        return score
+
+    def _scan_columns(
+        self,
+        columns: ForecastColumns,
+        offsets: np.ndarray,
+        spray_type: SprayType,
+        min_window_hours: float
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Locate sprayable runs in stacked forecasts and format qualifying windows
+
+        offsets holds the start index of each field plus the total length.
+        A window closed by a non-sprayable hour ends at that hour; a window
+        still open at the end of a field's forecast ends at its last hour.
+        """
+        windows: List[List[Dict[str, Any]]] = [[] for _ in range(len(offsets) - 1)]
+        n = len(columns)
+        if n == 0:
+            return windows
+
+        score = self.score_columns(columns, spray_type)
+        sprayable = score >= SPRAYABLE_SCORE
+
+        field_first = np.zeros(n, dtype=bool)
+        field_last = np.zeros(n, dtype=bool)
+        non_empty = offsets[:-1] < offsets[1:]
+        field_first[offsets[:-1][non_empty]] = True
+        field_last[offsets[1:][non_empty] - 1] = True
+
+        previous = np.concatenate(([False], sprayable[:-1]))
+        following = np.concatenate((sprayable[1:], [False]))
+        firsts = np.flatnonzero(sprayable & (~previous | field_first))
+        lasts = np.flatnonzero(sprayable & (~following | field_last))
+        ends = np.where(field_last[lasts], lasts, lasts + 1)
+
+        duration = columns.elapsed_hours[ends] - columns.elapsed_hours[firsts]
+        keep = duration >= min_window_hours
+        if not keep.any():
+            return windows
+        firsts, lasts, ends = firsts[keep], lasts[keep], ends[keep]
+
+        excellent = np.concatenate(([0], np.cumsum(score >= EXCELLENT_SCORE)))
+        hours = lasts + 1 - firsts
+        is_excellent = (excellent[lasts + 1] - excellent[firsts]) >= hours * 0.7
+        owners = np.searchsorted(offsets, firsts, side="right") - 1
+
+        # Warning flags are computed for every hour at once; only the flagged
+        # hours inside reported windows are turned into strings.
+        flags = self._warning_flags(columns, spray_type)
+        flagged = np.flatnonzero(flags)
+        flag_from = np.searchsorted(flagged, firsts).tolist()
+        flag_to = np.searchsorted(flagged, lasts, side="right").tolist()
+
+        values = {
+            "temp_f": columns.temp_f.tolist(),
+            "humidity_pct": columns.humidity_pct.tolist(),
+            "wind_mph": columns.wind_mph.tolist(),
+            "rain_chance_pct": columns.precip_chance_pct.tolist()
+        }
+        flagged_hours = flagged.tolist()
+        flag_values = flags.tolist()
+
+        for i, (owner, first, last, end, top) in enumerate(zip(
+            owners.tolist(), firsts.tolist(), lasts.tolist(), ends.tolist(), is_excellent.tolist()
+        )):
+            limiting_factors = self._window_warnings(
+                values, flag_values, flagged_hours[flag_from[i]:flag_to[i]]
+            )
+            windows[owner].append(self._format_window(
+                columns.times[first], columns.times[end], values, first, last + 1,
+                ApplicationRisk.EXCELLENT if top else ApplicationRisk.GOOD,
+                limiting_factors, spray_type
+            ))
+        return windows
+
+    def _warning_flags(self, columns: ForecastColumns, spray_type: SprayType) -> np.ndarray:
+        """Bit flags for the evaluate_current_conditions warnings raised at each hour"""
+        optimal = self.optimal_conditions.get(spray_type, OPTIMAL_CONDITIONS[SprayType.HERBICIDE])
+        wind = columns.wind_mph
+        temp = columns.temp_f
+        rain = columns.precip_chance_pct
+
+        flags = np.zeros(len(columns), dtype=np.int64)
+        flags |= WARN_WIND * (
+            (wind >= optimal["wind_min_mph"]) & (wind <= optimal["wind_max_mph"])
+            & (wind > optimal["wind_max_mph"] - 2)
+        )
+        flags |= WARN_TEMPERATURE * (
+            (temp >= optimal["temp_min_f"]) & (temp <= optimal["temp_max_f"])
+            & (temp > optimal["temp_max_f"] - 5)
+        )
+        flags |= WARN_RAIN * ((rain > 30) & (rain <= 50))
+        if not optimal["leaf_wetness_ok"]:
+            flags |= WARN_LEAF_WETNESS * columns.leaf_wetness
+        return flags
+
+    def _window_warnings(
+        self,
+        values: Dict[str, List[float]],
+        flags: List[int],
+        hours: List[int]
+    ) -> List[str]:
+        """Distinct warnings, in forecast order, for the flagged hours of one window"""
+        warnings: Dict[str, None] = {}
+        for i in hours:
+            flag = flags[i]
+            if flag & WARN_WIND:
+                warnings[f"Wind approaching limit ({values['wind_mph'][i]:.1f} mph)"] = None
+            if flag & WARN_TEMPERATURE:
+                warnings[f"Temperature high ({values['temp_f'][i]:.0f}°F)"] = None
+            if flag & WARN_RAIN:
+                warnings[f"Rain possible ({values['rain_chance_pct'][i]:.0f}% chance)"] = None
+            if flag & WARN_LEAF_WETNESS:
+                warnings["Leaf wetness detected - may reduce contact herbicide efficacy"] = None
+        return list(warnings)
+
+    def _format_window(
+        self,
+        start: datetime,
+        end: datetime,
+        values: Dict[str, List[float]],
+        first: int,
+        stop: int,
+        quality: ApplicationRisk,
+        limiting_factors: List[str],
+        spray_type: SprayType
+    ) -> Dict[str, Any]:
+        """Build the reported window for forecast hours [first, stop)"""
+        hours = stop - first
+        avg_conditions = {key: sum(column[first:stop]) / hours for key, column in values.items()}
+
+        window = SprayWindow(
+            start=start,
+            end=end,
+            quality=quality,
+            avg_conditions=avg_conditions,
+            limiting_factors=limiting_factors,
+            notes=self._generate_window_notes(avg_conditions, spray_type)
+        )
+
+        return {
+            "start": window.start.isoformat(),
+            "end": window.end.isoformat(),
+            "duration_hours": round(window.duration_hours, 1),
+            "quality": window.quality.value,
+            "avg_conditions": {k: round(v, 1) for k, v in window.avg_conditions.items()},
+            "limiting_factors": window.limiting_factors,
+            "notes": window.notes
+        }
+
+    def _select_best_window(self, windows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Longest excellent window, else the longest window"""
+        if not windows:
+            return None
+        excellent_windows = [w for w in windows if w["quality"] == "excellent"]
+        return max(excellent_windows or windows, key=lambda x: x["duration_hours"])
+
     def _generate_window_notes(
         self,
         avg_conditions: Dict[str, float],
@@ -19,6 +19,7 @@ from pydantic import BaseModel, Field
 import sqlite3
 import os
 import math
+from database.db_utils import get_pooled_connection
 
 
 def _safe_float(value: float, default: float = 0.0) -> float:
@@ -412,7 +413,7 @@ class SustainabilityService:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
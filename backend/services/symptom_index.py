@@ -0,0 +1,197 @@
+"""
+Symptom Index
+Inverted index from symptoms to pest/disease catalog entries
+
+Built once per catalog at import so identification requests look up
+candidate entries instead of rescanning every description.
+"""
+
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+
+# Distinct free-text symptoms and scoring contexts remembered per index
+TERM_CACHE_SIZE = 1024
+CONTEXT_CACHE_SIZE = 256
+
+# Score credited for a symptom matched through its keyword list
+KEYWORD_MATCH_SCORE = 0.8
+
+
+class SymptomIndex:
+    """
+    Inverted index over one pest or disease catalog.
+
+    Each entry's text fields are lowercased and joined once into a single
+    corpus. Known symptoms map straight to the entries whose text contains
+    one of their keywords. Free-text symptoms are located with one
+    str.find pass over the corpus and remembered.
+
+    Scoring context (growth stage, weather, field conditions) does not
+    depend on symptoms, so its per-entry terms and ranking are cached by
+    context key. top_matches() then scores only the entries a symptom hit,
+    plus the best entries by context alone.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[Dict],
+        text_fields: Sequence[str],
+        symptom_keywords: Dict[str, List[str]]
+    ):
+        self.entries = list(entries)
+
+        texts = [
+            " ".join(entry.get(field, "").lower() for field in text_fields)
+            for entry in self.entries
+        ]
+        # \0 never appears in a symptom, so a match cannot span two entries
+        self._corpus = "\0".join(texts)
+        self._starts = []
+        offset = 0
+        for text in texts:
+            self._starts.append(offset)
+            offset += len(text) + 1
+
+        self._lock = threading.Lock()
+        self._terms: "OrderedDict[str, FrozenSet[int]]" = OrderedDict()
+        self._contexts: "OrderedDict[Any, Tuple[List[Tuple[float, ...]], List[Tuple[int, float]]]]" = OrderedDict()
+
+        self._keyword_postings = {
+            symptom: frozenset().union(*(self._find(keyword) for keyword in keywords))
+            for symptom, keywords in symptom_keywords.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _find(self, term: str) -> FrozenSet[int]:
+        """Scan the corpus for every entry whose text contains term."""
+        hits = set()
+        corpus, starts = self._corpus, self._starts
+        pos = corpus.find(term)
+        while pos != -1:
+            idx = bisect_right(starts, pos) - 1
+            hits.add(idx)
+            # Skip the rest of this entry
+            next_start = starts[idx + 1] if idx + 1 < len(starts) else len(corpus)
+            pos = corpus.find(term, next_start)
+        return frozenset(hits)
+
+    def entries_containing(self, term: str) -> FrozenSet[int]:
+        """Indexes of entries whose text contains term (lowercase)."""
+        with self._lock:
+            hits = self._terms.get(term)
+            if hits is not None:
+                self._terms.move_to_end(term)
+                return hits
+
+        hits = self._find(term) if term else frozenset(range(len(self.entries)))
+        with self._lock:
+            self._terms[term] = hits
+            if len(self._terms) > TERM_CACHE_SIZE:
+                self._terms.popitem(last=False)
+        return hits
+
+    def score_symptoms(self, symptoms: Sequence[str]) -> Dict[int, float]:
+        """
+        Fraction of symptoms each entry matches.
+
+        A symptom found in an entry's text counts 1; otherwise a hit on one
+        of its keywords counts KEYWORD_MATCH_SCORE. Entries matching
+        nothing are left out.
+        """
+        if not symptoms:
+            return {}
+
+        totals: Dict[int, float] = {}
+        for symptom in symptoms:
+            symptom_lower = symptom.lower()
+            direct = self.entries_containing(symptom_lower)
+            for idx in direct:
+                totals[idx] = totals.get(idx, 0) + 1
+
+            keyword_hits = self._keyword_postings.get(symptom_lower)
+            if keyword_hits:
+                for idx in keyword_hits - direct:
+                    totals[idx] = totals.get(idx, 0) + KEYWORD_MATCH_SCORE
+
+        total_symptoms = len(symptoms)
+        return {idx: matches / total_symptoms for idx, matches in totals.items()}
+
+    def _context(
+        self,
+        key: Any,
+        context_terms: Callable[[Dict], Tuple[float, ...]],
+        min_confidence: float
+    ) -> Tuple[List[Tuple[float, ...]], List[Tuple[int, float]]]:
+        """Per-entry context terms and the ranking of entries by them alone."""
+        with self._lock:
+            cached = self._contexts.get(key)
+            if cached is not None:
+                self._contexts.move_to_end(key)
+                return cached
+
+        terms = [context_terms(entry) for entry in self.entries]
+        ranking = []
+        for idx, entry_terms in enumerate(terms):
+            confidence = self._combine(0.0, entry_terms)
+            if confidence > min_confidence:
+                ranking.append((idx, confidence))
+        ranking.sort(key=lambda item: (-round(item[1], 3), item[0]))
+
+        with self._lock:
+            self._contexts[key] = (terms, ranking)
+            if len(self._contexts) > CONTEXT_CACHE_SIZE:
+                self._contexts.popitem(last=False)
+        return terms, ranking
+
+    @staticmethod
+    def _combine(confidence: float, terms: Iterable[float]) -> float:
+        for term in terms:
+            confidence += term
+        return min(confidence, 1.0)  # Cap at 1.0
+
+    def top_matches(
+        self,
+        symptoms: Sequence[str],
+        symptom_weight: float,
+        context_key: Any,
+        context_terms: Callable[[Dict], Tuple[float, ...]],
+        limit: int = 5,
+        min_confidence: float = 0.2
+    ) -> List[Tuple[int, float]]:
+        """
+        Best-matching entries for a set of symptoms.
+
+        Confidence is symptom score * symptom_weight plus the weighted
+        context terms, capped at 1.0. context_terms(entry) must depend only
+        on what context_key identifies, since its results are cached under
+        that key.
+
+        Returns:
+            Up to limit (index, confidence rounded to 3 places) pairs,
+            highest first, ties in catalog order
+        """
+        terms, ranking = self._context(context_key, context_terms, min_confidence)
+        symptom_scores = self.score_symptoms(symptoms)
+
+        matches = []
+        for idx, score in symptom_scores.items():
+            confidence = self._combine(0.0 + score * symptom_weight, terms[idx])
+            if confidence > min_confidence:
+                matches.append((round(confidence, 3), idx))
+
+        # Entries no symptom hit score on context alone; only the best can place
+        remaining = limit
+        for idx, confidence in ranking:
+            if remaining == 0:
+                break
+            if idx not in symptom_scores:
+                matches.append((round(confidence, 3), idx))
+                remaining -= 1
+
+        matches.sort(key=lambda match: (-match[0], match[1]))
+        return [(idx, confidence) for confidence, idx in matches[:limit]]
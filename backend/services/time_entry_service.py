@@ -11,6 +11,7 @@ from typing import Optional, List, Tuple
 from enum import Enum
 
 from pydantic import BaseModel, Field
+from database.db_utils import get_pooled_connection
 
 
 # ============================================================================
@@ -104,7 +105,7 @@ class TimeEntryService:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
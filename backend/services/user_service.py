@@ -21,7 +21,7 @@ from .auth_service import (
     get_auth_service
 )
 from .base_service import sanitize_error
-from database.db_utils import DEFAULT_DB_PATH
+from database.db_utils import DEFAULT_DB_PATH, get_pooled_connection
 
 
 # ============================================================================
@@ -95,7 +95,7 @@ class UserService:
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -676,6 +676,10 @@ class UserService:
             conn.commit()
             conn.close()
 
+            # Drop cached logins after commit so a concurrent lookup cannot
+            # re-cache the old role or active flag
+            self.auth_service.user_cache.invalidate_user(user_id)
+
             return self.get_user_by_id(user_id), None
 
         except Exception as e:
@@ -732,6 +736,7 @@ class UserService:
 
         conn.commit()
         conn.close()
+        self.auth_service.user_cache.invalidate_user(user_id)
 
         return True, None
 
@@ -771,6 +776,7 @@ class UserService:
 
         conn.commit()
         conn.close()
+        self.auth_service.user_cache.invalidate_user(user_id)
 
         return True, None
 
@@ -10,9 +10,9 @@ Features:
 - Marketing/pricing decision support
 """
 
+import importlib.util
 import logging
 import json
-import sqlite3
 import pickle
 from datetime import date
 from typing import List, Dict, Optional, Any
@@ -21,19 +21,14 @@ from enum import Enum
 from pathlib import Path
 
 import numpy as np
+from database.db_utils import get_pooled_connection
 
 logger = logging.getLogger(__name__)
 
-# Try to import sklearn for ML
-try:
-    from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-    from sklearn.linear_model import LinearRegression, Ridge
-    from sklearn.preprocessing import StandardScaler
-    from sklearn.model_selection import train_test_split, cross_val_score
-    from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-    HAS_SKLEARN = True
-except ImportError:
-    HAS_SKLEARN = False
+# sklearn is imported in train_model (and by pickle when saved models load);
+# importing it here would add seconds to every backend start
+HAS_SKLEARN = importlib.util.find_spec("sklearn") is not None
+if not HAS_SKLEARN:
     logger.info("scikit-learn not available - using simplified prediction model")
 
 
@@ -208,7 +203,7 @@ class YieldPredictionService:
 
     def _init_db(self):
         """Initialize database tables for yield prediction"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         # Historical yield data for training
@@ -311,7 +306,7 @@ class YieldPredictionService:
         Returns:
             ID of inserted record
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -360,8 +355,14 @@ class YieldPredictionService:
                 "message": "scikit-learn not installed. Run: pip install scikit-learn"
             }
 
+        from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+        from sklearn.linear_model import LinearRegression, Ridge
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.model_selection import train_test_split, cross_val_score
+        from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+
         # Get training data
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -469,7 +470,7 @@ class YieldPredictionService:
         self.feature_names[crop] = feature_names
 
         # Save to database
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -817,7 +818,7 @@ class YieldPredictionService:
 
     def _save_prediction(self, prediction: YieldPrediction, input_data: Dict):
         """Save prediction to database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -841,7 +842,7 @@ class YieldPredictionService:
 
     def get_model_info(self, crop: Optional[CropType] = None) -> Dict[str, Any]:
         """Get information about available models"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         if crop:
@@ -890,7 +891,7 @@ class YieldPredictionService:
 
     def get_training_data_stats(self) -> Dict[str, Any]:
         """Get statistics about available training data"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_pooled_connection(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -11,6 +11,8 @@ from dataclasses import dataclass
 from enum import Enum
 import math
 
+import numpy as np
+
 
 class ResponseModel(str, Enum):
     """Mathematical models for yield response curves"""
@@ -180,6 +182,18 @@ DEFAULT_INPUT_COSTS = {
     "application": 8.00,    # $/acre per application
 }
 
+# Upper bound (lb/acre applied) for optimum and breakeven searches
+MAX_SEARCH_RATE = 300
+
+# Approximate ppm for soil test categories (P/K response adjustment)
+SOIL_TEST_PPM = {
+    SoilTestLevel.VERY_LOW: 5,
+    SoilTestLevel.LOW: 10,
+    SoilTestLevel.MEDIUM: 20,
+    SoilTestLevel.HIGH: 40,
+    SoilTestLevel.VERY_HIGH: 80,
+}
+
 # Commodity prices (defaults, should be updated)
 DEFAULT_COMMODITY_PRICES = {
     "corn": 4.50,           # $/bushel
@@ -199,6 +213,19 @@ class YieldPoint:
     marginal_return: float  # $/$ invested (return per dollar spent)
 
 
+@dataclass(frozen=True)
+class ResponseCoefficients:
+    """Response curve parameters for one crop/nutrient/soil/previous-crop combination"""
+    model: ResponseModel
+    base: float
+    linear: float           # adjusted for soil test response
+    quadratic: float
+    plateau: float
+    plateau_rate: float     # linear-plateau breakpoint
+    curvature: float        # Mitscherlich rate constant
+    n_credit: float         # lb N credited from previous crop
+
+
 @dataclass
 class EconomicOptimum:
     """Economic Optimum Rate calculation result"""
@@ -340,6 +367,278 @@ class YieldResponseOptimizer:
         # Cap at plateau yield
         return min(predicted, plateau)
 
+    # ------------------------------------------------------------------
+    # Vectorized evaluation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _get_params(crop: str, nutrient: str) -> Dict[str, Any]:
+        params = YIELD_RESPONSE_PARAMS.get(crop.lower(), {}).get(nutrient.lower(), {})
+        if not params:
+            raise ValueError(f"No response data for {crop} {nutrient}")
+        return params
+
+    @staticmethod
+    def _response_factor(
+        params: Dict[str, Any],
+        nutrient: str,
+        soil_test_level: Optional[float],
+        boost_deficient: bool = True
+    ) -> float:
+        """Soil test adjustment to the linear response (P and K only)"""
+        if soil_test_level is None or nutrient.lower() not in ["phosphorus", "potassium"]:
+            return 1.0
+        critical = params.get("critical_soil_test", 20)
+        if soil_test_level >= critical * 2:
+            return 0.1
+        if soil_test_level >= critical:
+            return 0.5
+        if boost_deficient:
+            return 1.0 + (critical - soil_test_level) / critical * 0.3
+        return 1.0
+
+    def get_response_coefficients(
+        self,
+        crop: str,
+        nutrient: str,
+        soil_test_level: Optional[float] = None,
+        previous_crop: Optional[str] = None
+    ) -> ResponseCoefficients:
+        """Resolve the curve parameters used by calculate_yield_response"""
+        if crop.lower() not in YIELD_RESPONSE_PARAMS:
+            raise ValueError(f"Crop '{crop}' not supported")
+        if nutrient.lower() not in YIELD_RESPONSE_PARAMS[crop.lower()]:
+            raise ValueError(f"Nutrient '{nutrient}' not supported for {crop}")
+
+        params = YIELD_RESPONSE_PARAMS[crop.lower()][nutrient.lower()]
+        model = params["model"]
+
+        n_credit = 0
+        if nutrient.lower() == "nitrogen" and previous_crop:
+            n_credit = params.get("soil_n_credit", {}).get(previous_crop.lower(), 0)
+
+        default_quadratic = 0.001 if model == ResponseModel.SQUARE_ROOT else 0.0
+        return ResponseCoefficients(
+            model=model,
+            base=params["base_yield"],
+            linear=params["linear_coefficient"] * self._response_factor(params, nutrient, soil_test_level),
+            quadratic=params.get("quadratic_coefficient", default_quadratic),
+            plateau=params.get("plateau_yield", 300),
+            plateau_rate=params.get("plateau_rate", 50),
+            curvature=params.get("curvature", 0.02),
+            n_credit=n_credit
+        )
+
+    @staticmethod
+    def evaluate_yield_grid(coef: ResponseCoefficients, rates: np.ndarray) -> np.ndarray:
+        """
+        Predicted yields for an array of applied rates
+
+        Same model equations as calculate_yield_response, evaluated for the
+        whole array at once.
+        """
+        x = np.asarray(rates, dtype=float) + coef.n_credit
+        model = coef.model
+
+        if model == ResponseModel.QUADRATIC:
+            predicted = coef.base + (coef.linear * x) - (coef.quadratic * x ** 2)
+
+        elif model == ResponseModel.QUADRATIC_PLATEAU:
+            if coef.linear > 0 and coef.quadratic > 0:
+                plateau_rate = coef.linear / (2 * coef.quadratic)
+                curve = coef.base + (coef.linear * x) - (coef.quadratic * x ** 2)
+                predicted = np.where(x <= plateau_rate, curve, coef.plateau)
+            else:
+                predicted = np.full_like(x, coef.base)
+
+        elif model == ResponseModel.LINEAR_PLATEAU:
+            predicted = np.where(x <= coef.plateau_rate, coef.base + (coef.linear * x), coef.plateau)
+
+        elif model == ResponseModel.MITSCHERLICH:
+            predicted = coef.base + (coef.plateau - coef.base) * (1 - np.exp(-coef.curvature * x))
+
+        elif model == ResponseModel.SQUARE_ROOT:
+            predicted = coef.base + (coef.linear * np.sqrt(x)) - (coef.quadratic * x)
+
+        else:
+            predicted = np.full_like(x, coef.base)
+
+        return np.minimum(predicted, coef.plateau)
+
+    def yield_response_grid(
+        self,
+        crop: str,
+        nutrient: str,
+        rates,
+        soil_test_level: Optional[float] = None,
+        previous_crop: Optional[str] = None
+    ) -> np.ndarray:
+        """Predicted yields (bu/acre) for an array of rates in one call"""
+        coef = self.get_response_coefficients(crop, nutrient, soil_test_level, previous_crop)
+        return self.evaluate_yield_grid(coef, rates)
+
+    @staticmethod
+    def _plateau_crossing(coef: ResponseCoefficients) -> float:
+        """Effective rate where a square-root curve reaches the plateau cap"""
+        need = coef.plateau - coef.base
+        if need <= 0:
+            return 0.0
+        b, q = coef.linear, coef.quadratic
+        if q > 0:
+            disc = b * b - 4 * q * need
+            if disc < 0:
+                return math.inf
+            root = (b - math.sqrt(disc)) / (2 * q)
+        else:
+            root = need / b
+        return root * root
+
+    def _curvilinear_optimum(
+        self,
+        coef: ResponseCoefficients,
+        grain_prices: np.ndarray,
+        fert_costs: np.ndarray,
+        app_cost: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Closed-form optima for Mitscherlich and square-root curves
+
+        Solves grain_price * dY/dN = nutrient_price on the uncapped curve,
+        caps square-root optima where the curve meets the plateau, then keeps
+        the rate only if it beats not applying (application cost included).
+
+        Returns:
+            (eor, agronomic_max) applied rates in lb/acre
+        """
+        price_ratio = fert_costs / grain_prices
+        zeros = np.zeros_like(price_ratio)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if coef.model == ResponseModel.MITSCHERLICH:
+                gain = coef.plateau - coef.base
+                c = coef.curvature
+                if gain > 0 and c > 0:
+                    # dY/dN = gain * c * e^(-cN)
+                    eor_eff = np.log(np.maximum(gain * c / price_ratio, 1.0)) / c
+                    # Asymptotic - report the rate reaching 99% of the response
+                    agro_eff = np.full_like(price_ratio, math.log(100) / c)
+                else:
+                    eor_eff, agro_eff = zeros, zeros.copy()
+            else:
+                b, q = coef.linear, coef.quadratic
+                if b > 0:
+                    # dY/dN = b / (2 sqrt(N)) - q
+                    eor_eff = (b / (2 * (q + price_ratio))) ** 2
+                    agro_eff = np.full_like(price_ratio, (b / (2 * q)) ** 2 if q > 0 else math.inf)
+                    cap = self._plateau_crossing(coef)
+                    eor_eff = np.minimum(eor_eff, cap)
+                    agro_eff = np.minimum(agro_eff, cap)
+                else:
+                    eor_eff, agro_eff = zeros, zeros.copy()
+
+        eor = np.clip(eor_eff - coef.n_credit, 0, MAX_SEARCH_RATE)
+        agro = np.clip(agro_eff - coef.n_credit, 0, MAX_SEARCH_RATE)
+
+        # Compare against skipping the application entirely
+        yields = self.evaluate_yield_grid(coef, eor)
+        base_yield = float(self.evaluate_yield_grid(coef, np.zeros(1))[0])
+        net = yields * grain_prices - (eor * fert_costs + app_cost)
+        eor = np.where(net > base_yield * grain_prices, eor, 0.0)
+        return eor, agro
+
+    def _optimum_rates(
+        self,
+        crop: str,
+        nutrient: str,
+        soil_test_level: Optional[float],
+        previous_crop: Optional[str],
+        grain_prices: np.ndarray,
+        fert_costs: np.ndarray,
+        app_cost: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Economic and agronomic optimum applied rates for arrays of prices
+
+        Closed-form solve of the EOR conditions in calculate_economic_optimum,
+        one element per (grain price, nutrient cost) pair.
+
+        Returns:
+            (eor, agronomic_max) applied rates in lb/acre, one per price pair
+        """
+        params = self._get_params(crop, nutrient)
+        grain_prices = np.asarray(grain_prices, dtype=float)
+        fert_costs = np.asarray(fert_costs, dtype=float)
+        price_ratio = fert_costs / grain_prices
+
+        model = params["model"]
+        linear_adj = params["linear_coefficient"] * self._response_factor(
+            params, nutrient, soil_test_level, boost_deficient=False
+        )
+
+        if model in [ResponseModel.QUADRATIC, ResponseModel.QUADRATIC_PLATEAU]:
+            quadratic = params["quadratic_coefficient"]
+
+            if quadratic > 0 and linear_adj > 0:
+                eor = np.maximum(0, (linear_adj - price_ratio) / (2 * quadratic))
+                # Agronomic max (ignoring cost): N = b / (2c)
+                agro = np.full_like(price_ratio, linear_adj / (2 * quadratic))
+
+                # For plateau model, cap at plateau
+                if model == ResponseModel.QUADRATIC_PLATEAU:
+                    eor = np.minimum(eor, agro)
+            else:
+                eor = np.zeros_like(price_ratio)
+                agro = np.zeros_like(price_ratio)
+
+        elif model == ResponseModel.LINEAR_PLATEAU:
+            plateau_rate = params.get("plateau_rate", 50)
+
+            # For linear, any rate up to plateau is economical if linear > price_ratio
+            eor = np.where(linear_adj > price_ratio, float(plateau_rate), 0.0)
+            agro = np.full_like(price_ratio, float(plateau_rate))
+
+        else:
+            # Curvilinear models solve in applied-rate space (credit included)
+            coef = self.get_response_coefficients(crop, nutrient, soil_test_level, previous_crop)
+            return self._curvilinear_optimum(coef, grain_prices, fert_costs, app_cost)
+
+        # Adjust for N credits
+        if nutrient.lower() == "nitrogen" and previous_crop:
+            credit = params.get("soil_n_credit", {}).get(previous_crop.lower(), 0)
+            eor = np.maximum(0, eor - credit)
+            agro = np.maximum(0, agro - credit)
+
+        return eor, agro
+
+    def _optimum_grid(
+        self,
+        crop: str,
+        nutrient: str,
+        soil_test_level: Optional[float],
+        previous_crop: Optional[str],
+        grain_prices: np.ndarray,
+        fert_costs: np.ndarray,
+        app_cost: float
+    ) -> Dict[str, np.ndarray]:
+        """Optimum rate, yield and per-acre economics for arrays of prices"""
+        grain_prices = np.asarray(grain_prices, dtype=float)
+        fert_costs = np.asarray(fert_costs, dtype=float)
+        eor, _ = self._optimum_rates(
+            crop, nutrient, soil_test_level, previous_crop,
+            grain_prices, fert_costs, app_cost
+        )
+        coef = self.get_response_coefficients(crop, nutrient, soil_test_level, previous_crop)
+        yields = self.evaluate_yield_grid(coef, eor)
+        input_cost = (eor * fert_costs) + np.where(eor > 0, app_cost, 0.0)
+        gross_revenue = yields * grain_prices
+        return {
+            "rate": eor,
+            "yield": yields,
+            "input_cost": input_cost,
+            "gross_revenue": gross_revenue,
+            "net_return": gross_revenue - input_cost,
+        }
+
     def generate_response_curve(
         self,
         crop: str,
@@ -371,24 +670,23 @@ class YieldResponseOptimizer:
         fert_cost = nutrient_cost or self.input_costs.get(nutrient_lower, 0.50)
         app_cost = application_cost or self.input_costs.get("application", 8.0)
 
-        # Generate curve points
-        curve_points = []
-        rates = []
-        rate = rate_range[0]
-
-        while rate <= rate_range[1]:
-            predicted_yield = self.calculate_yield_response(
-                crop, nutrient, rate, soil_test_level, previous_crop
-            )
+        if rate_step <= 0:
+            raise ValueError("rate_step must be positive")
 
-            input_cost = (rate * fert_cost) + (app_cost if rate > 0 else 0)
-            gross_revenue = predicted_yield * grain_price
-            net_return = gross_revenue - input_cost
+        # Evaluate the whole rate grid at once
+        n_points = max(0, int(math.floor((rate_range[1] - rate_range[0]) / rate_step + 1e-9)) + 1)
+        rates = rate_range[0] + rate_step * np.arange(n_points)
+        yields = self.yield_response_grid(crop, nutrient, rates, soil_test_level, previous_crop)
 
-            # Calculate marginal return (return per dollar)
-            marginal_return = (gross_revenue / input_cost) if input_cost > 0 else 0
+        input_costs = (rates * fert_cost) + np.where(rates > 0, app_cost, 0.0)
+        gross_revenues = yields * grain_price
+        net_returns = gross_revenues - input_costs
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Return per dollar of input
+            marginal_returns = np.where(input_costs > 0, gross_revenues / input_costs, 0.0)
 
-            point = YieldPoint(
+        curve_points = [
+            YieldPoint(
                 input_rate=rate,
                 predicted_yield=round(predicted_yield, 1),
                 input_cost=round(input_cost, 2),
@@ -396,9 +694,11 @@ class YieldResponseOptimizer:
                 net_return=round(net_return, 2),
                 marginal_return=round(marginal_return, 2)
             )
-            curve_points.append(point)
-            rates.append(rate)
-            rate += rate_step
+            for rate, predicted_yield, input_cost, gross_revenue, net_return, marginal_return in zip(
+                rates.tolist(), yields.tolist(), input_costs.tolist(),
+                gross_revenues.tolist(), net_returns.tolist(), marginal_returns.tolist()
+            )
+        ]
 
         # Find economic optimum
         eor = self.calculate_economic_optimum(
@@ -470,10 +770,6 @@ class YieldResponseOptimizer:
         crop_lower = crop.lower()
         nutrient_lower = nutrient.lower()
 
-        params = YIELD_RESPONSE_PARAMS.get(crop_lower, {}).get(nutrient_lower, {})
-        if not params:
-            raise ValueError(f"No response data for {crop} {nutrient}")
-
         # Get prices
         grain_price = commodity_price or self.commodity_prices.get(crop_lower, 5.0)
         fert_cost = nutrient_cost or self.input_costs.get(nutrient_lower, 0.50)
@@ -481,67 +777,12 @@ class YieldResponseOptimizer:
 
         price_ratio = fert_cost / grain_price
 
-        model = params["model"]
-        _base = params["base_yield"]
-        linear = params["linear_coefficient"]
-        _plateau = params.get("plateau_yield", 300)
-
-        # Adjust for soil test response
-        response_factor = 1.0
-        if soil_test_level is not None and nutrient_lower in ["phosphorus", "potassium"]:
-            critical = params.get("critical_soil_test", 20)
-            if soil_test_level >= critical * 2:
-                response_factor = 0.1
-            elif soil_test_level >= critical:
-                response_factor = 0.5
-
-        linear_adj = linear * response_factor
-
-        # Calculate optimum based on model
-        if model in [ResponseModel.QUADRATIC, ResponseModel.QUADRATIC_PLATEAU]:
-            quadratic = params["quadratic_coefficient"]
-
-            if quadratic > 0 and linear_adj > 0:
-                # EOR: N = (b - price_ratio) / (2c)
-                eor_rate = (linear_adj - price_ratio) / (2 * quadratic)
-                eor_rate = max(0, eor_rate)  # Can't be negative
-
-                # Agronomic max (ignoring cost): N = b / (2c)
-                agro_max_rate = linear_adj / (2 * quadratic)
-
-                # For plateau model, cap at plateau
-                if model == ResponseModel.QUADRATIC_PLATEAU:
-                    plateau_rate = linear_adj / (2 * quadratic)
-                    eor_rate = min(eor_rate, plateau_rate)
-                    agro_max_rate = plateau_rate
-            else:
-                eor_rate = 0
-                agro_max_rate = 0
-
-        elif model == ResponseModel.LINEAR_PLATEAU:
-            plateau_rate = params.get("plateau_rate", 50)
-
-            # For linear, any rate up to plateau is economical if linear > price_ratio
-            if linear_adj > price_ratio:
-                eor_rate = plateau_rate  # Go to plateau
-            else:
-                eor_rate = 0  # Not economical
-            agro_max_rate = plateau_rate
-
-        else:
-            # Default - use iterative approach
-            eor_rate = self._find_optimum_iterative(
-                crop, nutrient, soil_test_level, previous_crop,
-                grain_price, fert_cost, app_cost
-            )
-            agro_max_rate = eor_rate * 1.2  # Estimate
-
-        # Adjust for N credits
-        if nutrient_lower == "nitrogen" and previous_crop:
-            n_credits = params.get("soil_n_credit", {})
-            credit = n_credits.get(previous_crop.lower(), 0)
-            eor_rate = max(0, eor_rate - credit)
-            agro_max_rate = max(0, agro_max_rate - credit)
+        eor_rates, agro_rates = self._optimum_rates(
+            crop, nutrient, soil_test_level, previous_crop,
+            np.array([grain_price]), np.array([fert_cost]), app_cost
+        )
+        eor_rate = float(eor_rates[0])
+        agro_max_rate = float(agro_rates[0])
 
         # Calculate yields and economics at optimum
         yield_at_eor = self.calculate_yield_response(
@@ -590,33 +831,6 @@ class YieldResponseOptimizer:
             sensitivity=sensitivity
         )
 
-    def _find_optimum_iterative(
-        self,
-        crop: str,
-        nutrient: str,
-        soil_test_level: Optional[float],
-        previous_crop: Optional[str],
-        grain_price: float,
-        fert_cost: float,
-        app_cost: float
-    ) -> float:
-        """Find EOR through iterative search (for complex models)"""
-        best_rate = 0
-        best_return = -float('inf')
-
-        for rate in range(0, 301, 5):
-            yield_pred = self.calculate_yield_response(
-                crop, nutrient, rate, soil_test_level, previous_crop
-            )
-            cost = (rate * fert_cost) + (app_cost if rate > 0 else 0)
-            net_return = (yield_pred * grain_price) - cost
-
-            if net_return > best_return:
-                best_return = net_return
-                best_rate = rate
-
-        return float(best_rate)
-
     def _find_breakeven_rate(
         self,
         crop: str,
@@ -629,17 +843,16 @@ class YieldResponseOptimizer:
         base_revenue: float
     ) -> float:
         """Find rate where applying fertilizer breaks even vs. not applying"""
-        for rate in range(5, 301, 5):
-            yield_pred = self.calculate_yield_response(
-                crop, nutrient, rate, soil_test_level, previous_crop
-            )
-            cost = (rate * fert_cost) + app_cost
-            revenue = yield_pred * grain_price
+        rates = np.arange(5, MAX_SEARCH_RATE + 1, 5, dtype=float)
+        yields = self.yield_response_grid(crop, nutrient, rates, soil_test_level, previous_crop)
+        cost = (rates * fert_cost) + app_cost
+        revenue = yields * grain_price
 
-            if revenue - cost < base_revenue:
-                return float(rate - 5)
+        losing = np.flatnonzero(revenue - cost < base_revenue)
+        if losing.size:
+            return float(rates[losing[0]] - 5)
 
-        return 300.0  # Never breaks even in range
+        return float(MAX_SEARCH_RATE)  # Never breaks even in range
 
     def _calculate_sensitivity(
         self,
@@ -651,32 +864,16 @@ class YieldResponseOptimizer:
         base_fert_cost: float
     ) -> Dict[str, float]:
         """Calculate how EOR changes with price changes"""
-        # +/- 20% grain price (pass _skip_sensitivity=True to avoid infinite recursion)
-        eor_base = self.calculate_economic_optimum(
-            crop, nutrient, soil_test_level, previous_crop,
-            base_grain_price, base_fert_cost, _skip_sensitivity=True
-        ).optimum_rate
-
-        eor_high_grain = self.calculate_economic_optimum(
+        # Base, grain +/- 20%, fertilizer +/- 20% evaluated together
+        grain_prices = np.array([1.0, 1.2, 0.8, 1.0, 1.0]) * base_grain_price
+        fert_costs = np.array([1.0, 1.0, 1.0, 1.2, 0.8]) * base_fert_cost
+        eor, _ = self._optimum_rates(
             crop, nutrient, soil_test_level, previous_crop,
-            base_grain_price * 1.2, base_fert_cost, _skip_sensitivity=True
-        ).optimum_rate
-
-        eor_low_grain = self.calculate_economic_optimum(
-            crop, nutrient, soil_test_level, previous_crop,
-            base_grain_price * 0.8, base_fert_cost, _skip_sensitivity=True
-        ).optimum_rate
-
-        # +/- 20% fertilizer price
-        eor_high_fert = self.calculate_economic_optimum(
-            crop, nutrient, soil_test_level, previous_crop,
-            base_grain_price, base_fert_cost * 1.2, _skip_sensitivity=True
-        ).optimum_rate
-
-        eor_low_fert = self.calculate_economic_optimum(
-            crop, nutrient, soil_test_level, previous_crop,
-            base_grain_price, base_fert_cost * 0.8, _skip_sensitivity=True
-        ).optimum_rate
+            grain_prices, fert_costs, self.input_costs.get("application", 8.0)
+        )
+        eor_base, eor_high_grain, eor_low_grain, eor_high_fert, eor_low_fert = (
+            round(rate, 1) for rate in eor.tolist()
+        )
 
         return {
             "grain_price_up_20pct": round(eor_high_grain - eor_base, 1),
@@ -786,12 +983,9 @@ class YieldResponseOptimizer:
         app_cost = application_cost or self.input_costs.get("application", 8.0)
 
         scenarios = []
+        yields = self.yield_response_grid(crop, nutrient, rates, soil_test_level, previous_crop).tolist()
 
-        for rate in rates:
-            yield_pred = self.calculate_yield_response(
-                crop, nutrient, rate, soil_test_level, previous_crop
-            )
-
+        for rate, yield_pred in zip(rates, yields):
             input_cost = (rate * fert_cost) + (app_cost if rate > 0 else 0)
             total_cost = input_cost * acres
 
@@ -1038,6 +1232,154 @@ class YieldResponseOptimizer:
             "usage_note": "Find your price ratio, look up optimal rate. Adjust for soil test, previous crop, and field conditions."
         }
 
+    def batch_economic_optimum(
+        self,
+        fields: List[Dict[str, Any]],
+        price_ratios: List[float],
+        application_cost: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Economic optimum rates for many fields across many price ratios
+
+        Each field dict needs crop and nutrient, and may include field_id,
+        soil_test_level (ppm), previous_crop, commodity_price and acres.
+        Nutrient cost for a ratio is ratio * commodity price, as in
+        generate_price_ratio_guide. Fields sharing the same crop, nutrient,
+        soil test, previous crop and grain price are solved once, with all
+        price ratios evaluated together.
+        """
+        ratios = np.asarray(price_ratios, dtype=float)
+        app_cost = application_cost or self.input_costs.get("application", 8.0)
+
+        solved: Dict[Tuple, Dict[str, List[float]]] = {}
+        results = []
+
+        for field in fields:
+            crop = field["crop"]
+            nutrient = field["nutrient"]
+            soil_test_level = field.get("soil_test_level")
+            previous_crop = field.get("previous_crop")
+            acres = field.get("acres", 1.0)
+            grain_price = field.get("commodity_price") or self.commodity_prices.get(crop.lower(), 5.0)
+
+            entry = {
+                "field_id": field.get("field_id"),
+                "crop": crop,
+                "nutrient": nutrient,
+                "acres": acres,
+                "commodity_price": grain_price,
+            }
+
+            key = (
+                crop.lower(), nutrient.lower(), soil_test_level,
+                previous_crop.lower() if previous_crop else None, grain_price
+            )
+            grid = solved.get(key)
+            if grid is None:
+                try:
+                    arrays = self._optimum_grid(
+                        crop, nutrient, soil_test_level, previous_crop,
+                        np.full_like(ratios, grain_price), ratios * grain_price, app_cost
+                    )
+                except ValueError as e:
+                    entry["error"] = str(e)
+                    results.append(entry)
+                    continue
+                grid = solved[key] = {name: values.tolist() for name, values in arrays.items()}
+
+            entry["results"] = [
+                {
+                    "price_ratio": ratio,
+                    "nutrient_cost": round(ratio * grain_price, 4),
+                    "optimum_rate": round(rate, 1),
+                    "optimum_yield": round(yield_at_rate, 1),
+                    "total_input_cost": round(input_cost, 2),
+                    "net_return": round(net_return, 2),
+                    "field_net_return": round(net_return * acres, 2),
+                }
+                for ratio, rate, yield_at_rate, input_cost, net_return in zip(
+                    ratios.tolist(), grid["rate"], grid["yield"], grid["input_cost"], grid["net_return"]
+                )
+            ]
+            results.append(entry)
+
+        return {
+            "field_count": len(fields),
+            "price_ratios": ratios.tolist(),
+            "application_cost": app_cost,
+            "unique_scenarios": len(solved),
+            "fields": results,
+        }
+
+    def analyze_price_sensitivity(
+        self,
+        crop: str,
+        nutrient: str,
+        base_nutrient_price: float,
+        base_grain_price: float,
+        nutrient_price_range_pct: float = 30,
+        grain_price_range_pct: float = 30,
+        soil_test_level: Optional[SoilTestLevel] = None,
+        steps: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Economic optimum across a grid of nutrient and grain prices
+
+        Prices vary by up to +/- the given percentages in `steps` even
+        increments each. The whole grid is solved in one vectorized call.
+        """
+        soil_ppm = SOIL_TEST_PPM.get(soil_test_level) if soil_test_level is not None else None
+        offsets = np.linspace(-1.0, 1.0, steps) if steps > 1 else np.zeros(1)
+        nutrient_prices = base_nutrient_price * (1 + offsets * nutrient_price_range_pct / 100)
+        grain_prices = base_grain_price * (1 + offsets * grain_price_range_pct / 100)
+
+        # Rows are nutrient prices, columns are grain prices
+        fert_grid, grain_grid = np.meshgrid(nutrient_prices, grain_prices, indexing="ij")
+        grid = self._optimum_grid(
+            crop, nutrient, soil_ppm, None,
+            grain_grid.ravel(), fert_grid.ravel(),
+            self.input_costs.get("application", 8.0)
+        )
+        rates = grid["rate"]
+
+        scenarios = [
+            {
+                "nutrient_price": round(fert, 4),
+                "grain_price": round(grain, 2),
+                "price_ratio": round(fert / grain, 4) if grain > 0 else None,
+                "optimum_rate": round(rate, 1),
+                "optimum_yield": round(yield_at_rate, 1),
+                "net_return": round(net_return, 2),
+            }
+            for fert, grain, rate, yield_at_rate, net_return in zip(
+                fert_grid.ravel().tolist(), grain_grid.ravel().tolist(),
+                rates.tolist(), grid["yield"].tolist(), grid["net_return"].tolist()
+            )
+        ]
+
+        base = self.calculate_economic_optimum(
+            crop, nutrient, soil_ppm, None,
+            base_grain_price, base_nutrient_price, _skip_sensitivity=True
+        )
+
+        return {
+            "crop": crop,
+            "nutrient": nutrient,
+            "base_prices": {
+                "nutrient_price": base_nutrient_price,
+                "grain_price": base_grain_price,
+                "price_ratio": base.price_ratio,
+            },
+            "base_optimum_rate": base.optimum_rate,
+            "optimum_rate_range": {
+                "min": round(float(rates.min()), 1),
+                "max": round(float(rates.max()), 1),
+            },
+            "nutrient_prices": [round(p, 4) for p in nutrient_prices.tolist()],
+            "grain_prices": [round(p, 2) for p in grain_prices.tolist()],
+            "scenarios": scenarios,
+        }
+
 
 # Singleton instance
 _yield_optimizer = None
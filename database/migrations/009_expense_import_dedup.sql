@@ -0,0 +1,5 @@
+-- Migration 009: Expense import duplicate check
+-- Lets CSV and accounting imports look up existing expenses by
+-- (reference, date, amount) in one set-based query per chunk
+
+CREATE INDEX IF NOT EXISTS idx_expenses_import_dedup ON expenses(quickbooks_id, expense_date, amount);
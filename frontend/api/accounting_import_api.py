@@ -7,7 +7,7 @@ AgTools v2.9.0
 
 import json
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
 from .client import APIClient, get_api_client
 
@@ -182,7 +182,8 @@ class AccountingImportAPI:
         file_path: str,
         account_mappings: Dict[str, str],
         tax_year: Optional[int] = None,
-        save_mappings: bool = True
+        save_mappings: bool = True,
+        progress_callback: Optional[Callable[[int, int], None]] = None
     ) -> Tuple[Optional[QBImportSummary], Optional[str]]:
         """
         Import expenses from an accounting software CSV export.
@@ -192,6 +193,8 @@ class AccountingImportAPI:
             account_mappings: Dict of account -> agtools_category
             tax_year: Optional tax year override
             save_mappings: Whether to save mappings for future use
+            progress_callback: Called with (rows_processed, total_rows) as
+                the server works through the file
 
         Returns:
             Tuple of (QBImportSummary or None, error message or None)
@@ -207,11 +210,23 @@ class AccountingImportAPI:
                 if tax_year:
                     data['tax_year'] = str(tax_year)
 
-                response = self.client.post_file(
-                    '/accounting-import/import',
-                    files=files,
-                    data=data
-                )
+                if progress_callback:
+                    data['stream_progress'] = 'true'
+                    response = self.client.post_file_stream(
+                        '/accounting-import/import',
+                        files=files,
+                        data=data,
+                        on_event=lambda event: progress_callback(
+                            event.get("rows_processed", 0), event.get("total_rows", 0)
+                        ),
+                        result_key="total_processed"
+                    )
+                else:
+                    response = self.client.post_file(
+                        '/accounting-import/import',
+                        files=files,
+                        data=data
+                    )
 
             if response.success and response.data:
                 return QBImportSummary.from_dict(response.data), None
@@ -7,6 +7,7 @@ Handles connection management, error handling, offline fallback,
 and HTTPS/SSL configuration for production deployments.
 """
 
+import json
 import logging
 import httpx
 from typing import Any, Optional, Callable
@@ -308,6 +309,54 @@ class APIClient:
         except Exception as e:
             return self._handle_exception(e)
 
+    def post_file_stream(
+        self,
+        endpoint: str,
+        files: dict,
+        data: Optional[dict] = None,
+        on_event: Optional[Callable[[dict], None]] = None,
+        result_key: Optional[str] = None
+    ) -> APIResponse:
+        """
+        Upload a file to an endpoint that answers with newline-delimited JSON.
+
+        Every line except the last is passed to on_event as it arrives
+        (e.g. import progress); the last line is the result. A stream that
+        ends early (the server failed mid-import) leaves a progress event
+        last, which is reported as an error rather than returned.
+
+        Args:
+            endpoint: API endpoint
+            files: Dict of field_name -> (filename, file_object, content_type)
+            data: Optional form data fields
+            on_event: Called with each intermediate event
+            result_key: Field only the final result carries
+
+        Returns:
+            APIResponse whose data is the final line
+        """
+        try:
+            client = self._get_client()
+            with client.stream("POST", endpoint, files=files, data=data, timeout=None) as response:
+                if not response.is_success:
+                    response.read()
+                    return self._handle_response(response)
+
+                result = None
+                for line in response.iter_lines():
+                    if not line.strip():
+                        continue
+                    if result is not None and on_event:
+                        on_event(result)
+                    result = json.loads(line)
+            if not isinstance(result, dict) or (result_key and result_key not in result):
+                return APIResponse.error(
+                    "Server ended the response before sending the result", response.status_code
+                )
+            return APIResponse.ok(result, response.status_code)
+        except Exception as e:
+            return self._handle_exception(e)
+
     # -------------------------------------------------------------------------
     # Offline-Capable Methods
     # -------------------------------------------------------------------------
@@ -38,13 +38,15 @@ class GeoJSONFeatureCollection:
     """GeoJSON Feature Collection"""
     type: str
     features: List[GeoJSONFeature]
+    truncated: bool = False
 
     @classmethod
     def from_dict(cls, data: dict) -> "GeoJSONFeatureCollection":
         features = [GeoJSONFeature.from_dict(f) for f in data.get("features", [])]
         return cls(
             type=data.get("type", "FeatureCollection"),
-            features=features
+            features=features,
+            truncated=data.get("truncated", False)
         )
 
 
@@ -151,6 +153,9 @@ class ImportResult:
     message: str
     imported_count: int = 0
     matched_count: int = 0
+    stored_count: int = 0
+    failed_count: int = 0
+    cancelled: bool = False
     errors: List[str] = field(default_factory=list)
     features: List[Dict[str, Any]] = field(default_factory=list)
 
@@ -161,11 +166,33 @@ class ImportResult:
             message=data.get("message", ""),
             imported_count=data.get("imported_count", 0),
             matched_count=data.get("matched_count", 0),
+            stored_count=data.get("stored_count", 0),
+            failed_count=data.get("failed_count", 0),
+            cancelled=data.get("cancelled", False),
             errors=data.get("errors", []),
             features=data.get("features", [])
         )
 
 
+@dataclass
+class ImportJobInfo:
+    """Status of a background import"""
+    job_id: str
+    status: str
+    progress: Dict[str, Any] = field(default_factory=dict)
+    result: Optional[ImportResult] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ImportJobInfo":
+        result = data.get("result")
+        return cls(
+            job_id=data.get("job_id", ""),
+            status=data.get("status", ""),
+            progress=data.get("progress") or {},
+            result=ImportResult.from_dict(result) if result else None
+        )
+
+
 @dataclass
 class ExportResult:
     """Export operation result"""
@@ -224,6 +251,19 @@ class QGISProjectResult:
 # GIS API CLIENT
 # ============================================================================
 
+def _viewport_params(
+    bbox: Optional[Tuple[float, float, float, float]],
+    zoom: Optional[int]
+) -> Dict[str, Any]:
+    """Query parameters restricting a feature request to the visible map area."""
+    if bbox is None:
+        return {}
+    params: Dict[str, Any] = {"bbox": ",".join(f"{v:.6f}" for v in bbox)}
+    if zoom is not None:
+        params["zoom"] = int(zoom)
+    return params
+
+
 class GISAPI:
     """GIS API client for field boundaries, layers, and QGIS integration."""
 
@@ -237,7 +277,9 @@ class GISAPI:
     def get_field_boundaries(
         self,
         field_ids: Optional[List[int]] = None,
-        farm_name: Optional[str] = None
+        farm_name: Optional[str] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        zoom: Optional[int] = None
     ) -> Tuple[Optional[GeoJSONFeatureCollection], Optional[str]]:
         """
         Get field boundaries as GeoJSON FeatureCollection.
@@ -245,11 +287,13 @@ class GISAPI:
         Args:
             field_ids: Optional list of field IDs to include
             farm_name: Optional farm name filter
+            bbox: Optional visible area as (west, south, east, north)
+            zoom: Optional map zoom, used with bbox to thin tiny fields
 
         Returns:
             Tuple of (GeoJSONFeatureCollection, error_message)
         """
-        params = {}
+        params = _viewport_params(bbox, zoom)
         if field_ids:
             params["field_ids"] = ",".join(str(i) for i in field_ids)
         if farm_name:
@@ -295,28 +339,73 @@ class GISAPI:
         self,
         file_path: str,
         file_type: str = "auto",
-        match_by: str = "name"
+        match_by: str = "name",
+        layer_id: Optional[int] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None
     ) -> Tuple[Optional[ImportResult], Optional[str]]:
         """
-        Import a GIS file (shapefile, KML, GeoJSON).
+        Import a GIS file (shapefile, zipped shapefile, GeoPackage, KML, GeoJSON).
 
         Args:
             file_path: Path to file to import
-            file_type: File type (auto, shapefile, kml, geojson)
+            file_type: File type (auto, shapefile, kml, geojson, geopackage)
             match_by: How to match to existing fields (name, location, none)
+            layer_id: Optional layer to save unmatched features to
+            bbox: Optional (west, south, east, north) area to import
 
         Returns:
             Tuple of (ImportResult, error_message)
         """
+        response, error = self._upload_import(file_path, file_type, match_by, layer_id, bbox)
+        if error:
+            return None, error
+        return ImportResult.from_dict(response.data), None
+
+    def start_import(
+        self,
+        file_path: str,
+        file_type: str = "auto",
+        match_by: str = "name",
+        layer_id: Optional[int] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None
+    ) -> Tuple[Optional[ImportJobInfo], Optional[str]]:
+        """
+        Start a GIS file import in the background; poll with get_import_job.
+
+        Returns:
+            Tuple of (ImportJobInfo, error_message)
+        """
+        response, error = self._upload_import(file_path, file_type, match_by, layer_id, bbox, background=True)
+        if error:
+            return None, error
+        return ImportJobInfo.from_dict(response.data), None
+
+    def _upload_import(
+        self,
+        file_path: str,
+        file_type: str,
+        match_by: str,
+        layer_id: Optional[int],
+        bbox: Optional[Tuple[float, float, float, float]],
+        background: bool = False
+    ) -> Tuple[Any, Optional[str]]:
+        """Upload a file to the import endpoint."""
         import os
 
         if not os.path.exists(file_path):
             return None, f"File not found: {file_path}"
 
+        data: Dict[str, Any] = {"file_type": file_type, "match_by": match_by}
+        if layer_id is not None:
+            data["layer_id"] = layer_id
+        if bbox is not None:
+            data.update(_viewport_params(bbox, None))
+        if background:
+            data["background"] = "true"
+
         # Upload file
         with open(file_path, "rb") as f:
             files = {"file": (os.path.basename(file_path), f)}
-            data = {"file_type": file_type, "match_by": match_by}
 
             response = self._client.post_multipart(
                 "/gis/import",
@@ -326,8 +415,25 @@ class GISAPI:
 
         if not response.success:
             return None, response.error_message
+        return response, None
 
-        return ImportResult.from_dict(response.data), None
+    def get_import_job(self, job_id: str) -> Tuple[Optional[ImportJobInfo], Optional[str]]:
+        """Get progress, and once finished the result, of a background import."""
+        response = self._client.get(f"/gis/import/jobs/{job_id}")
+
+        if not response.success:
+            return None, response.error_message
+
+        return ImportJobInfo.from_dict(response.data), None
+
+    def cancel_import_job(self, job_id: str) -> Tuple[Optional[ImportJobInfo], Optional[str]]:
+        """Stop a background import after its current chunk."""
+        response = self._client.post(f"/gis/import/jobs/{job_id}/cancel")
+
+        if not response.success:
+            return None, response.error_message
+
+        return ImportJobInfo.from_dict(response.data), None
 
     def export_to_format(
         self,
@@ -384,6 +490,29 @@ class GISAPI:
 
         return AreaResult.from_dict(response.data), None
 
+    def recalculate_acreage(
+        self,
+        field_ids: Optional[List[int]] = None,
+        farm_name: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Recompute field acreage from boundaries on the server.
+
+        Args:
+            field_ids: Optional list of field IDs (default: all with boundaries)
+            farm_name: Optional farm name filter
+
+        Returns:
+            Tuple of (result dict with fields_checked/fields_updated, error_message)
+        """
+        data = {"field_ids": field_ids, "farm_name": farm_name}
+        response = self._client.post("/gis/fields/recalculate-acreage", data=data)
+
+        if not response.success:
+            return None, response.error_message
+
+        return response.data, None
+
     def validate_boundary(
         self,
         boundary: str
@@ -572,10 +701,13 @@ class GISAPI:
 
     def get_layer_features(
         self,
-        layer_id: int
+        layer_id: int,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        zoom: Optional[int] = None
     ) -> Tuple[Optional[GeoJSONFeatureCollection], Optional[str]]:
-        """Get all features in a layer as GeoJSON."""
-        response = self._client.get(f"/gis/layers/{layer_id}/features")
+        """Get features in a layer as GeoJSON, optionally only those within bbox."""
+        params = _viewport_params(bbox, zoom)
+        response = self._client.get(f"/gis/layers/{layer_id}/features", params=params if params else None)
 
         if not response.success:
             return None, response.error_message
@@ -9,6 +9,7 @@ from database.local_db import (
     get_local_db,
     reset_local_db,
     CacheEntry,
+    MemoryCache,
     DB_PATH
 )
 
@@ -17,5 +18,6 @@ __all__ = [
     "get_local_db",
     "reset_local_db",
     "CacheEntry",
+    "MemoryCache",
     "DB_PATH",
 ]
@@ -5,12 +5,16 @@ SQLite database for caching API data and enabling offline functionality.
 Stores prices, pest/disease data, crop parameters, and user preferences.
 """
 
+import atexit
 import sqlite3
-from typing import Any, Optional, List, Dict
+from collections import OrderedDict
+from typing import Any, Optional, List, Dict, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 import json
 import threading
+import time
+import zlib
 
 from config import USER_DATA_DIR
 
@@ -21,6 +25,22 @@ DB_PATH = USER_DATA_DIR / "agtools_cache.db"
 # Schema version for migrations
 SCHEMA_VERSION = 1
 
+# Budget for the in-process cache tier, in bytes of JSON text
+MEMORY_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Pending cache writes are flushed to SQLite once this many are queued,
+# or on the first write after WRITE_FLUSH_SECONDS
+WRITE_BATCH_SIZE = 50
+WRITE_FLUSH_SECONDS = 5.0
+
+# Expired cache rows are deleted in bulk at most this often
+EXPIRY_SWEEP_SECONDS = 300.0
+
+# JSON payloads longer than this are stored zlib-compressed (None = never)
+COMPRESS_THRESHOLD_BYTES = 64 * 1024
+
+_MISSING = object()
+
 
 @dataclass
 class CacheEntry:
@@ -38,6 +58,91 @@ class CacheEntry:
         return datetime.now(timezone.utc) > self.expires_at
 
 
+class MemoryCache:
+    """
+    Size-bounded LRU of cached JSON text.
+
+    Entries are kept as text and decoded by the caller on every hit, so no
+    two readers share a mutable value. max_bytes bounds the text held.
+    """
+
+    def __init__(self, max_bytes: int = MEMORY_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, Optional[float], int]]" = OrderedDict()
+        self._size = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, category: str, key: str) -> Any:
+        """Return the cached JSON text, or _MISSING if absent or expired."""
+        cache_key = (category, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return _MISSING
+            text, expires_at, size = entry
+            if expires_at is not None and time.time() >= expires_at:
+                del self._entries[cache_key]
+                self._size -= size
+                return _MISSING
+            self._entries.move_to_end(cache_key)
+            return text
+
+    def put(self, category: str, key: str, text: str, expires_at: Optional[float]) -> None:
+        """Store JSON text, evicting least recently used entries to fit."""
+        cache_key = (category, key)
+        size = len(text)
+        with self._lock:
+            old = self._entries.pop(cache_key, None)
+            if old is not None:
+                self._size -= old[2]
+            if size > self.max_bytes:
+                return
+
+            self._entries[cache_key] = (text, expires_at, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._evictions += 1
+
+    def discard(self, category: str, key: Optional[str] = None) -> None:
+        """Drop one key, or the whole category when key is None."""
+        with self._lock:
+            if key is not None:
+                doomed = [(category, key)] if (category, key) in self._entries else []
+            else:
+                doomed = [k for k in self._entries if k[0] == category]
+            for cache_key in doomed:
+                self._size -= self._entries.pop(cache_key)[2]
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry."""
+        now = time.time()
+        with self._lock:
+            doomed = [k for k, (_, expires_at, _) in self._entries.items()
+                      if expires_at is not None and now >= expires_at]
+            for cache_key in doomed:
+                self._size -= self._entries.pop(cache_key)[2]
+        return len(doomed)
+
+    def clear(self) -> None:
+        """Drop everything."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict:
+        """Entry count, size and eviction count."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'evictions': self._evictions,
+            }
+
+
 class LocalDatabase:
     """
     SQLite database manager for offline caching.
@@ -47,6 +152,8 @@ class LocalDatabase:
     - Automatic schema initialization
     - Cache invalidation by TTL
     - Category-based data organization
+    - In-memory LRU tier in front of the SQLite cache table
+    - Batched cache writes and bulk expiry of stale rows
 
     Usage:
         db = get_local_db()
@@ -56,8 +163,22 @@ class LocalDatabase:
 
     _local = threading.local()
 
-    def __init__(self):
+    def __init__(
+        self,
+        memory_max_bytes: int = MEMORY_CACHE_MAX_BYTES,
+        compress_threshold: Optional[int] = COMPRESS_THRESHOLD_BYTES
+    ):
+        self._memory = MemoryCache(memory_max_bytes)
+        self._compress_threshold = compress_threshold
+        self._pending: Dict[Tuple[str, str], Tuple] = {}
+        self._pending_lock = threading.RLock()
+        self._last_flush = time.monotonic()
+        self._last_sweep = time.monotonic()
+        self._hits = {'memory': 0, 'disk': 0}
+        self._misses = 0
+        self._stats_lock = threading.Lock()
         self._init_db()
+        atexit.register(self.flush)
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get thread-local database connection."""
@@ -239,34 +360,47 @@ class LocalDatabase:
         """
         Store data in the cache.
 
+        The value is readable immediately from the memory tier; the SQLite
+        write is queued and flushed in batches (see flush()).
+
         Args:
             category: Cache category (e.g., "prices", "pests", "yield_response")
             key: Unique key within the category
             data: Data to cache (will be JSON serialized)
             ttl_hours: Optional TTL in hours (None = never expires)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
         now = datetime.now(timezone.utc)
         expires_at = (now + timedelta(hours=ttl_hours)) if ttl_hours else None
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO cache (category, cache_key, data, cached_at, expires_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            category,
-            key,
-            json.dumps(data),
-            now.isoformat(),
-            expires_at.isoformat() if expires_at else None
-        ))
-        conn.commit()
+        text = json.dumps(data)
+        if self._compress_threshold is not None and len(text) > self._compress_threshold:
+            stored = zlib.compress(text.encode('utf-8'))
+        else:
+            stored = text
+
+        # Cache the JSON text, not data itself, so later changes to data (or
+        # to a returned value) never reach the cache
+        self._memory.put(category, key, text, expires_at.timestamp() if expires_at else None)
+
+        with self._pending_lock:
+            self._pending[(category, key)] = (
+                category,
+                key,
+                stored,
+                now.isoformat(),
+                expires_at.isoformat() if expires_at else None
+            )
+            if (len(self._pending) >= WRITE_BATCH_SIZE
+                    or time.monotonic() - self._last_flush >= WRITE_FLUSH_SECONDS):
+                self.flush()
 
     def cache_get(self, category: str, key: str) -> Optional[Any]:
         """
         Retrieve data from the cache.
 
+        Served from the memory tier when possible. Each call decodes its own
+        copy, so callers may modify what they get back.
+
         Args:
             category: Cache category
             key: Cache key
@@ -274,30 +408,46 @@ class LocalDatabase:
         Returns:
             Cached data or None if not found/expired
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT data, expires_at FROM cache
-            WHERE category = ? AND cache_key = ?
-        """, (category, key))
+        text = self._memory.get(category, key)
+        if text is not _MISSING:
+            self._count('memory')
+            return json.loads(text)
+
+        with self._pending_lock:
+            pending = self._pending.get((category, key))
+        if pending is not None:
+            stored, expires_iso = pending[2], pending[4]
+        else:
+            cursor = self._get_connection().cursor()
+            cursor.execute("""
+                SELECT data, expires_at FROM cache
+                WHERE category = ? AND cache_key = ?
+            """, (category, key))
+            row = cursor.fetchone()
+            if not row:
+                self._count('miss')
+                return None
+            stored, expires_iso = row['data'], row['expires_at']
 
-        row = cursor.fetchone()
-        if not row:
+        # Check expiration; stale rows are left for the next bulk sweep
+        expires_at = datetime.fromisoformat(expires_iso).timestamp() if expires_iso else None
+        if expires_at is not None and time.time() >= expires_at:
+            self._count('miss')
+            self._sweep_expired_if_due()
             return None
 
-        # Check expiration
-        if row['expires_at']:
-            expires_at = datetime.fromisoformat(row['expires_at'])
-            if datetime.now(timezone.utc) > expires_at:
-                # Expired - delete and return None
-                cursor.execute("""
-                    DELETE FROM cache WHERE category = ? AND cache_key = ?
-                """, (category, key))
-                conn.commit()
-                return None
+        text = zlib.decompress(stored).decode('utf-8') if isinstance(stored, bytes) else stored
+        self._memory.put(category, key, text, expires_at)
+        self._count('disk')
+        return json.loads(text)
 
-        return json.loads(row['data'])
+    def _count(self, outcome: str) -> None:
+        """Record a memory hit, disk hit or miss for get_cache_stats()."""
+        with self._stats_lock:
+            if outcome == 'miss':
+                self._misses += 1
+            else:
+                self._hits[outcome] += 1
 
     def cache_delete(self, category: str, key: Optional[str] = None) -> int:
         """
@@ -310,6 +460,9 @@ class LocalDatabase:
         Returns:
             Number of deleted entries
         """
+        self._memory.discard(category, key or None)
+        self.flush()
+
         conn = self._get_connection()
         cursor = conn.cursor()
 
@@ -325,17 +478,72 @@ class LocalDatabase:
 
     def cache_clear_expired(self) -> int:
         """Remove all expired cache entries."""
+        self._memory.purge_expired()
+        self.flush()
+
         conn = self._get_connection()
-        cursor = conn.cursor()
+        count = self._delete_expired(conn.cursor())
+        conn.commit()
+        return count
 
+    def flush(self) -> int:
+        """
+        Write queued cache entries to SQLite in one transaction.
+
+        Also sweeps expired rows when a sweep is due.
+
+        Returns:
+            Number of entries written
+        """
+        with self._pending_lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return 0
+            rows = list(self._pending.values())
+
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR REPLACE INTO cache (category, cache_key, data, cached_at, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+            if time.monotonic() - self._last_sweep >= EXPIRY_SWEEP_SECONDS:
+                self._delete_expired(cursor)
+            conn.commit()
+            self._pending.clear()
+            return len(rows)
+
+    def _sweep_expired_if_due(self) -> None:
+        """Bulk-delete expired rows if EXPIRY_SWEEP_SECONDS have passed."""
+        if time.monotonic() - self._last_sweep >= EXPIRY_SWEEP_SECONDS:
+            conn = self._get_connection()
+            self._delete_expired(conn.cursor())
+            conn.commit()
+
+    def _delete_expired(self, cursor: sqlite3.Cursor) -> int:
+        """Delete every expired cache row; the caller commits."""
+        self._last_sweep = time.monotonic()
         now = datetime.now(timezone.utc).isoformat()
         cursor.execute("""
             DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at < ?
         """, (now,))
-
-        conn.commit()
         return cursor.rowcount
 
+    def get_cache_stats(self) -> Dict:
+        """Hit/miss counts and size of the memory cache tier."""
+        stats = self._memory.stats()
+        with self._stats_lock:
+            hits, misses = dict(self._hits), self._misses
+        lookups = hits['memory'] + hits['disk'] + misses
+        stats.update({
+            'memory_hits': hits['memory'],
+            'disk_hits': hits['disk'],
+            'misses': misses,
+            'hit_rate': round((lookups - misses) / lookups, 3) if lookups else 0.0,
+            'pending_writes': len(self._pending),
+        })
+        return stats
+
     # -------------------------------------------------------------------------
     # Product/Price Methods
     # -------------------------------------------------------------------------
@@ -721,11 +929,13 @@ class LocalDatabase:
 
     def vacuum(self) -> None:
         """Optimize database file size."""
+        self.flush()
         conn = self._get_connection()
         conn.execute("VACUUM")
 
     def get_stats(self) -> Dict:
         """Get database statistics."""
+        self.flush()
         conn = self._get_connection()
         cursor = conn.cursor()
 
@@ -744,7 +954,8 @@ class LocalDatabase:
         return stats
 
     def close(self) -> None:
-        """Close database connection."""
+        """Flush queued cache writes and close the database connection."""
+        self.flush()
         if hasattr(self._local, 'connection') and self._local.connection:
             self._local.connection.close()
             self._local.connection = None
@@ -767,4 +978,5 @@ def reset_local_db() -> None:
     global _local_db
     if _local_db:
         _local_db.close()
+        atexit.unregister(_local_db.flush)
     _local_db = None
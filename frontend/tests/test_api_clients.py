@@ -62,6 +62,35 @@ class TestAPIClientBase:
         # offline_error uses default message, check it exists
         assert response.error_message is not None
 
+    def test_post_file_stream_requires_final_result(self):
+        """Test a stream cut off after a progress line is an error."""
+        import httpx
+        from api.client import APIClient
+
+        def stream_client(*lines):
+            client = APIClient()
+            body = "".join(line + "\n" for line in lines)
+            client._client = httpx.Client(
+                base_url="http://test",
+                transport=httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+            )
+            return client
+
+        progress = '{"rows_processed": 500}'
+        events = []
+        response = stream_client(progress, '{"total_processed": 800}').post_file_stream(
+            "/import", files={"file": ("a.csv", b"x", "text/csv")},
+            on_event=events.append, result_key="total_processed"
+        )
+        assert response.success and response.data == {"total_processed": 800}
+        assert events == [{"rows_processed": 500}]
+
+        response = stream_client(progress).post_file_stream(
+            "/import", files={"file": ("a.csv", b"x", "text/csv")}, result_key="total_processed"
+        )
+        assert response.success is False
+        assert "before sending the result" in response.error_message
+
 
 class TestFieldAPI:
     """Tests for Field API client."""
@@ -264,3 +264,108 @@ class TestDatabaseConcurrency:
         # Verify some entries
         assert db.cache_get("rapid", "key_0")["index"] == 0
         assert db.cache_get("rapid", "key_99")["index"] == 99
+
+
+class TestTwoTierCache:
+    """Tests for the in-memory tier and batched writes."""
+
+    def test_reads_served_from_memory(self):
+        """Test repeated reads do not go back to SQLite."""
+        from database.local_db import LocalDatabase
+
+        db = LocalDatabase()
+        db.cache_set("tier_test", "fields", [{"name": "North 40"}], ttl_hours=1)
+        db.cache_get("tier_test", "fields")
+        db.cache_get("tier_test", "fields")
+
+        stats = db.get_cache_stats()
+        assert stats['memory_hits'] == 2
+        assert stats['disk_hits'] == 0
+        db.close()
+
+    def test_memory_hits_are_private_copies(self):
+        """Test changing a returned or stored value does not alter the cache."""
+        from database.local_db import LocalDatabase
+
+        db = LocalDatabase()
+        fields = [{"name": "North 40"}]
+        db.cache_set("tier_test", "copies", fields, ttl_hours=1)
+        fields.append({"name": "South 80"})
+        db.cache_get("tier_test", "copies")[0]["name"] = "Changed"
+
+        assert db.cache_get("tier_test", "copies") == [{"name": "North 40"}]
+        assert db.get_cache_stats()['memory_hits'] == 2
+        db.close()
+
+    def test_writes_flushed_to_sqlite(self):
+        """Test queued writes reach SQLite and load back after a restart."""
+        from database.local_db import LocalDatabase
+
+        db = LocalDatabase()
+        db.cache_set("tier_test", "flushed", {"value": 7}, ttl_hours=1)
+        db.close()
+
+        reopened = LocalDatabase()
+        assert reopened.cache_get("tier_test", "flushed") == {"value": 7}
+        assert reopened.get_cache_stats()['disk_hits'] == 1
+        reopened.close()
+
+    def test_lru_eviction_by_size(self):
+        """Test least recently used entries are evicted to fit the budget."""
+        from database.local_db import MemoryCache
+
+        cache = MemoryCache(max_bytes=100)
+        cache.put("c", "a", "A" * 40, None)
+        cache.put("c", "b", "B" * 40, None)
+        cache.get("c", "a")
+        cache.put("c", "d", "D" * 40, None)
+
+        stats = cache.stats()
+        assert stats['entries'] == 2
+        assert stats['size_bytes'] == 80
+        assert stats['evictions'] == 1
+        assert cache.get("c", "a") == "A" * 40
+
+    def test_expired_entries_not_returned(self):
+        """Test expired entries miss in both tiers."""
+        from database.local_db import LocalDatabase, MemoryCache, _MISSING
+
+        cache = MemoryCache()
+        cache.put("c", "old", '"stale"', 0.0)
+        assert cache.get("c", "old") is _MISSING
+
+        db = LocalDatabase()
+        db.cache_set("tier_test", "expired", {"data": 1}, ttl_hours=-1)
+        db.flush()
+        assert db.cache_get("tier_test", "expired") is None
+        db.close()
+
+    def test_large_payload_compressed(self):
+        """Test payloads over the threshold round-trip through compression."""
+        from database.local_db import LocalDatabase
+
+        db = LocalDatabase(compress_threshold=100)
+        payload = {"prices": ["urea"] * 500}
+        db.cache_set("tier_test", "large", payload, ttl_hours=1)
+        db.close()
+
+        row = db._get_connection().execute(
+            "SELECT data FROM cache WHERE category = ? AND cache_key = ?",
+            ("tier_test", "large")
+        ).fetchone()
+        assert isinstance(row['data'], bytes)
+
+        reopened = LocalDatabase()
+        assert reopened.cache_get("tier_test", "large") == payload
+        reopened.close()
+
+    def test_delete_clears_pending_and_memory(self):
+        """Test deleting a category drops queued and memory entries."""
+        from database.local_db import LocalDatabase
+
+        db = LocalDatabase()
+        db.cache_set("tier_delete", "k", {"data": 1}, ttl_hours=1)
+        db.cache_delete("tier_delete")
+
+        assert db.cache_get("tier_delete", "k") is None
+        db.close()
@@ -60,6 +60,7 @@ class PreviewWorker(QThread):
 class ImportWorker(QThread):
     """Background worker for importing QB data."""
     finished = pyqtSignal(object, str)  # (summary, error)
+    progress = pyqtSignal(int, int)  # (rows_processed, total_rows)
 
     def __init__(self, api: AccountingImportAPI, file_path: str, mappings: dict,
                  tax_year: int = None, save_mappings: bool = True):
@@ -72,7 +73,8 @@ class ImportWorker(QThread):
 
     def run(self):
         summary, error = self.api.import_data(
-            self.file_path, self.mappings, self.tax_year, self.save_mappings
+            self.file_path, self.mappings, self.tax_year, self.save_mappings,
+            progress_callback=self.progress.emit
         )
         self.finished.emit(summary, error or "")
 
@@ -496,9 +498,16 @@ class AccountingImportScreen(QWidget):
         self.worker = ImportWorker(
             self.api, self.selected_file, mappings, tax_year, save_mappings
         )
+        self.worker.progress.connect(self._on_import_progress)
         self.worker.finished.connect(self._on_import_complete)
         self.worker.start()
 
+    def _on_import_progress(self, rows_processed: int, total_rows: int):
+        """Switch the progress bar to determinate once row counts arrive."""
+        if total_rows > 0:
+            self._progress_bar.setRange(0, total_rows)
+            self._progress_bar.setValue(min(rows_processed, total_rows))
+
     def _on_import_complete(self, summary: QBImportSummary, error: str):
         """Handle import completion."""
         self._progress_bar.hide()
@@ -370,10 +370,26 @@ class GISScreen(QWidget):
     └─────────────────────────────────────────────────────────────┘
     """
 
+    FIELD_STYLE = {
+        "fill_color": "#00868B",
+        "fill_opacity": 0.3,
+        "stroke_color": "#004040",
+        "stroke_width": 2
+    }
+
+    # Wait for panning/zooming to settle before fetching the new viewport
+    VIEWPORT_DEBOUNCE_MS = 250
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._gis_api = get_gis_api()
         self._current_tool = "pan"
+        self._layer_info: Dict[str, Any] = {}
+        self._viewport: Optional[dict] = None
+        self._viewport_timer = QTimer(self)
+        self._viewport_timer.setSingleShot(True)
+        self._viewport_timer.setInterval(self.VIEWPORT_DEBOUNCE_MS)
+        self._viewport_timer.timeout.connect(self._load_viewport_features)
         self._setup_ui()
         self._load_initial_data()
 
@@ -404,6 +420,7 @@ class GISScreen(QWidget):
         self._map_canvas.feature_clicked.connect(self._on_feature_clicked)
         self._map_canvas.feature_drawn.connect(self._on_feature_drawn)
         self._map_canvas.map_clicked.connect(self._on_map_clicked)
+        self._map_canvas.bounds_changed.connect(self._on_bounds_changed)
         splitter.addWidget(self._map_canvas)
 
         # Properties panel (right) - hidden by default
@@ -581,44 +598,78 @@ class GISScreen(QWidget):
             return
 
         if fc and fc.features:
-            # Convert to dict for map canvas
-            geojson_dict = {
-                "type": "FeatureCollection",
-                "features": [
-                    {
-                        "type": f.type,
-                        "geometry": f.geometry,
-                        "properties": f.properties,
-                        "id": f.id
-                    }
-                    for f in fc.features
-                ]
-            }
-
-            style = {
-                "fill_color": "#00868B",
-                "fill_opacity": 0.3,
-                "stroke_color": "#004040",
-                "stroke_width": 2
-            }
-
-            self._map_canvas.add_geojson_layer("fields", geojson_dict, style, "Fields")
+            self._map_canvas.add_geojson_layer(
+                "fields", self._to_geojson(fc), self.FIELD_STYLE, "Fields"
+            )
 
             # Fit to bounds if we have features
             if fc.features:
                 self._fit_to_features(fc.features)
 
-        # Load custom layers
+        # Load custom layers; their features are fetched per viewport
         layers, error = self._gis_api.list_layers(visible_only=False)
         if not error:
             for layer in layers:
                 if layer.name != "Fields":  # Skip built-in fields layer
-                    self._layer_panel.add_layer(
-                        str(layer.id),
-                        layer.name,
-                        layer.layer_type,
-                        layer.is_visible
-                    )
+                    if str(layer.id) not in self._layer_info:
+                        self._layer_panel.add_layer(
+                            str(layer.id),
+                            layer.name,
+                            layer.layer_type,
+                            layer.is_visible
+                        )
+                    self._layer_info[str(layer.id)] = layer
+
+    @staticmethod
+    def _to_geojson(fc) -> Dict[str, Any]:
+        """Convert a GeoJSONFeatureCollection to a dict for the map canvas."""
+        return {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": f.type,
+                    "geometry": f.geometry,
+                    "properties": f.properties,
+                    "id": f.id
+                }
+                for f in fc.features
+            ]
+        }
+
+    @pyqtSlot(dict)
+    def _on_bounds_changed(self, bounds: dict) -> None:
+        """Reload visible features once the map stops moving."""
+        self._viewport = bounds
+        self._viewport_timer.start()
+
+    def _load_viewport_features(self) -> None:
+        """Fetch only the fields and layer features inside the current view."""
+        if not self._viewport:
+            return
+        bbox = (
+            self._viewport["west"], self._viewport["south"],
+            self._viewport["east"], self._viewport["north"]
+        )
+        zoom = self._viewport.get("zoom")
+
+        for layer_id in self._layer_panel.get_visible_layers():
+            if layer_id == "fields":
+                fc, error = self._gis_api.get_field_boundaries(bbox=bbox, zoom=zoom)
+                style, name = self.FIELD_STYLE, "Fields"
+            elif layer_id in self._layer_info:
+                info = self._layer_info[layer_id]
+                fc, error = self._gis_api.get_layer_features(info.id, bbox=bbox, zoom=zoom)
+                style = info.style.to_dict() if info.style else LayerStyle().to_dict()
+                name = info.name
+            else:
+                continue
+
+            if error:
+                logger.error("Failed to load features for layer %s: %s", layer_id, error)
+                continue
+            self._map_canvas.add_geojson_layer(layer_id, self._to_geojson(fc), style, name)
+            if fc.truncated:
+                logger.info("Layer %s has more features in view than were loaded", layer_id)
 
     def _fit_to_features(self, features: list) -> None:
         """Fit map to bounds of features."""
@@ -366,6 +366,39 @@ class DataManagementTab(QWidget):
 
         cache_layout.addLayout(self._stats_grid)
 
+        # In-memory tier in front of the cache table
+        memory_label = QLabel("Memory Cache")
+        memory_label.setStyleSheet("font-weight: 600; margin-top: 8px;")
+        cache_layout.addWidget(memory_label)
+
+        memory_grid = QGridLayout()
+        memory_grid.setSpacing(8)
+
+        self._memory_stat_labels = {}
+        memory_stats = [
+            ("entries", "Entries"),
+            ("size_bytes", "Memory Used"),
+            ("memory_hits", "Memory Hits"),
+            ("disk_hits", "Disk Hits"),
+            ("misses", "Misses"),
+            ("hit_rate", "Hit Rate"),
+        ]
+
+        for i, (key, label) in enumerate(memory_stats):
+            row = i // 2
+            col = (i % 2) * 2
+
+            label_widget = QLabel(f"{label}:")
+            label_widget.setStyleSheet(f"color: {COLORS['text_secondary']};")
+            memory_grid.addWidget(label_widget, row, col)
+
+            value_widget = QLabel("--")
+            value_widget.setStyleSheet("font-weight: 600;")
+            memory_grid.addWidget(value_widget, row, col + 1)
+            self._memory_stat_labels[key] = value_widget
+
+        cache_layout.addLayout(memory_grid)
+
         refresh_btn = QPushButton("Refresh Statistics")
         refresh_btn.clicked.connect(self._refresh_stats)
         cache_layout.addWidget(refresh_btn)
@@ -431,6 +464,17 @@ class DataManagementTab(QWidget):
             else:
                 label.setText(str(value))
 
+        memory_stats = self._db.get_cache_stats()
+
+        for key, label in self._memory_stat_labels.items():
+            value = memory_stats.get(key, 0)
+            if key == "size_bytes":
+                label.setText(f"{value / (1024 * 1024):.2f} MB")
+            elif key == "hit_rate":
+                label.setText(f"{value:.0%}")
+            else:
+                label.setText(str(value))
+
     def _clear_expired(self) -> None:
         """Clear expired cache entries."""
         count = self._db.cache_clear_expired()
@@ -120,6 +120,7 @@ class MapCanvas(QFrame):
     feature_edited = pyqtSignal(int, dict)
     map_clicked = pyqtSignal(float, float)
     coordinates_changed = pyqtSignal(float, float)  # Cursor position
+    bounds_changed = pyqtSignal(dict)  # north, south, east, west, zoom
 
     # Default map center (central US)
     DEFAULT_CENTER = (39.8283, -98.5795)
@@ -171,6 +172,7 @@ class MapCanvas(QFrame):
         self._bridge.feature_drawn.connect(self.feature_drawn.emit)
         self._bridge.feature_edited.connect(self.feature_edited.emit)
         self._bridge.map_clicked.connect(self.map_clicked.emit)
+        self._bridge.bounds_changed.connect(self.bounds_changed.emit)
 
         # Load map HTML
         html_content = self._generate_map_html()
@@ -288,17 +290,20 @@ class MapCanvas(QFrame):
             }}
         }});
 
-        map.on('moveend', function() {{
+        function reportBounds() {{
             if (bridge) {{
                 var bounds = map.getBounds();
                 bridge.onBoundsChanged(JSON.stringify({{
                     north: bounds.getNorth(),
                     south: bounds.getSouth(),
                     east: bounds.getEast(),
-                    west: bounds.getWest()
+                    west: bounds.getWest(),
+                    zoom: map.getZoom()
                 }}));
             }}
-        }});
+        }}
+
+        map.on('moveend', reportBounds);
 
         map.on('mousemove', function(e) {{
             // Update coordinate display (handled in Python)
@@ -326,6 +331,7 @@ class MapCanvas(QFrame):
         // Functions called from Python
         function mapReady() {{
             console.log('Map ready');
+            reportBounds();
         }}
 
         function setView(lat, lng, zoom) {{
@@ -506,7 +512,8 @@ class MapCanvas(QFrame):
             "name": name or layer_id
         }
 
-        geojson_str = json.dumps(geojson).replace("'", "\\'")
+        # Compact separators: large layers cross the Qt bridge as one string
+        geojson_str = json.dumps(geojson, separators=(",", ":")).replace("'", "\\'")
         style_str = json.dumps(style or {}).replace("'", "\\'")
         name_escaped = (name or layer_id).replace("'", "\\'")
 
@@ -580,6 +587,7 @@ class SimpleMapCanvas(QFrame):
     feature_edited = pyqtSignal(int, dict)
     map_clicked = pyqtSignal(float, float)
     coordinates_changed = pyqtSignal(float, float)
+    bounds_changed = pyqtSignal(dict)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Benchmark the GenFin financial reports against the per-account query path.
+
+Seeds a throwaway database with a year of activity across the default chart
+of accounts, then runs a 12-month comparative P&L, a comparative balance
+sheet and a cash flow statement twice: once with the set-based report engine
+and once with the previous per-account / per-period lookups, which are
+reproduced here as they were: each one sums the journal lines up to its
+date. Prints SQL statement counts and wall-clock latency for each.
+
+Usage:
+    python scripts/benchmark_genfin_reports.py
+    python scripts/benchmark_genfin_reports.py --entries 5000 --runs 5
+"""
+
+import sys
+import os
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, BACKEND_DIR)
+
+from services import genfin_reports_service as reports_module
+from services.genfin_core_service import GenFinCoreService
+
+
+def build_services(db_path: str):
+    """Core and reports services bound to db_path (bypassing the singletons)"""
+    core = object.__new__(GenFinCoreService)
+    core._initialized = False
+    core.__init__(db_path)
+
+    reports_module.genfin_core_service = core
+    reports = object.__new__(reports_module.GenFinReportsService)
+    reports._initialized = False
+    reports.__init__(db_path)
+    return core, reports
+
+
+def seed(core, entries: int, year: int) -> None:
+    """Post random two-line entries across the prior and current year"""
+    rng = random.Random(42)
+    accounts = core.list_accounts()
+    cash = [a for a in accounts if a["sub_type"] in ("cash", "bank")]
+    revenue = [a for a in accounts if a["account_type"] == "revenue"]
+    expense = [a for a in accounts if a["account_type"] == "expense"]
+    start = date(year - 1, 1, 1)
+
+    for _ in range(entries):
+        entry_date = (start + timedelta(days=rng.randrange(730))).isoformat()
+        amount = round(rng.uniform(10, 5000), 2)
+        bank = rng.choice(cash)["account_id"]
+        if rng.random() < 0.5:
+            debit, credit = bank, rng.choice(revenue)["account_id"]
+        else:
+            debit, credit = rng.choice(expense)["account_id"], bank
+        core.create_journal_entry(
+            entry_date=entry_date,
+            lines=[
+                {"account_id": debit, "debit": amount, "credit": 0},
+                {"account_id": credit, "debit": 0, "credit": amount},
+            ],
+            auto_post=True,
+        )
+
+
+def legacy_account_balance(core, account_id: str, as_of: str) -> float:
+    """Previous account balance: opening balance plus every posted line up to as_of"""
+    with core._get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM genfin_accounts WHERE account_id = ?", (account_id,))
+        account = cursor.fetchone()
+        if not account:
+            return 0.0
+
+        balance = account["opening_balance"] or 0.0
+        cursor.execute("""
+            SELECT l.debit, l.credit FROM genfin_journal_entry_lines l
+            JOIN genfin_journal_entries e ON l.entry_id = e.entry_id
+            WHERE l.account_id = ? AND e.status IN ('posted', 'reconciled')
+            AND e.entry_date <= ?
+        """, (account_id, as_of))
+        for row in cursor.fetchall():
+            if account["account_type"] in ("asset", "expense"):
+                balance += row["debit"] - row["credit"]
+            else:
+                balance += row["credit"] - row["debit"]
+    return round(balance, 2)
+
+
+def legacy_period_balance(core, account_id: str, s_date: date, e_date: date) -> float:
+    """Previous period balance: an account lookup, then every posted line in the period"""
+    account = core.get_account(account_id)
+    if not account:
+        return 0.0
+
+    balance = 0.0
+    with core._get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT l.debit, l.credit, l.class_id, l.location_id
+            FROM genfin_journal_entry_lines l
+            JOIN genfin_journal_entries e ON l.entry_id = e.entry_id
+            WHERE l.account_id = ?
+            AND e.status IN ('posted', 'reconciled')
+            AND e.entry_date >= ?
+            AND e.entry_date <= ?
+        """, (account_id, s_date.isoformat(), e_date.isoformat()))
+        for row in cursor.fetchall():
+            if account["account_type"] == "revenue":
+                balance += (row["credit"] or 0) - (row["debit"] or 0)
+            elif account["account_type"] == "expense":
+                balance += (row["debit"] or 0) - (row["credit"] or 0)
+    return round(balance, 2)
+
+
+def legacy_profit_loss(core, reports, s_date: date, e_date: date) -> float:
+    """Previous P&L shape: one lookup per account, per column, per month"""
+    accounts = [a for a in core.list_accounts() if a["account_type"] in ("revenue", "expense")]
+    listed = [a for a in accounts if legacy_period_balance(core, a["account_id"], s_date, e_date)]
+
+    prior_end = s_date - timedelta(days=1)
+    prior_start = prior_end - timedelta(days=(e_date - s_date).days)
+    py_start, py_end = reports._prior_year(s_date), reports._prior_year(e_date)
+    total = 0.0
+    for start, end in [(prior_start, prior_end), (py_start, py_end)] + reports._month_ranges(s_date, e_date):
+        total += sum(legacy_period_balance(core, a["account_id"], start, end) for a in listed)
+    return total
+
+
+def legacy_balance_sheet(core, as_of: str, prior_year: str) -> float:
+    """Previous balance sheet shape: one balance lookup per account and date"""
+    total = 0.0
+    for account in core.list_accounts():
+        total += legacy_account_balance(core, account["account_id"], as_of)
+        total += legacy_account_balance(core, account["account_id"], prior_year)
+    return total
+
+
+def legacy_cash_flow(core, s_date: date, e_date: date) -> float:
+    """Previous cash flow shape: two balance lookups per account per sub-type"""
+    prev_day = (s_date - timedelta(days=1)).isoformat()
+    sub_types = ["cash", "accounts_receivable", "inventory", "prepaid_expense", "accounts_payable",
+                 "payroll_liability", "fixed_asset", "short_term_loan", "long_term_loan",
+                 "owner_equity", "owner_draw"]
+    total = 0.0
+    for sub_type in sub_types:
+        for account in core.list_accounts():
+            if account["sub_type"] == sub_type:
+                total += legacy_account_balance(core, account["account_id"], e_date.isoformat())
+                total -= legacy_account_balance(core, account["account_id"], prev_day)
+    for account in core.list_accounts():
+        total += legacy_period_balance(core, account["account_id"], s_date, e_date)
+    return total
+
+
+def measure(core, label: str, func, runs: int) -> dict:
+    """Run func `runs` times, counting SQL statements issued via the core service"""
+    statements = []
+    original = core._get_connection
+
+    def counting_connection():
+        conn = original()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    core._get_connection = counting_connection
+    try:
+        timings = []
+        for _ in range(runs):
+            statements.clear()
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+    finally:
+        core._get_connection = original
+
+    return {"label": label, "queries": len(statements), "ms": min(timings) * 1000}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark GenFin report query counts and latency")
+    parser.add_argument("--entries", type=int, default=2000, help="Journal entries to seed")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per report (best is reported)")
+    args = parser.parse_args()
+
+    year = date.today().year
+    s_date, e_date = date(year, 1, 1), date(year, 12, 31)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        core, reports = build_services(os.path.join(tmp, "benchmark.db"))
+        print(f"Seeding {args.entries} journal entries...")
+        seed(core, args.entries, year)
+
+        cases = [
+            ("P&L (12 months + prior period + prior year)",
+             lambda: reports.get_profit_loss(
+                 s_date.isoformat(), e_date.isoformat(),
+                 compare_prior_period=True, compare_prior_year=True, group_by_month=True),
+             lambda: legacy_profit_loss(core, reports, s_date, e_date)),
+            ("Balance sheet (with prior year)",
+             lambda: reports.get_balance_sheet(e_date.isoformat(), compare_prior_year=True),
+             lambda: legacy_balance_sheet(core, e_date.isoformat(), reports._prior_year(e_date).isoformat())),
+            ("Cash flow",
+             lambda: reports.get_cash_flow(s_date.isoformat(), e_date.isoformat()),
+             lambda: legacy_cash_flow(core, s_date, e_date)),
+        ]
+
+        print(f"\n{'Report':<46} {'set-based':>22} {'per-account':>22}")
+        for label, current, legacy in cases:
+            new = measure(core, label, current, args.runs)
+            old = measure(core, label, legacy, args.runs)
+            print(f"{label:<46} {new['queries']:>6} q {new['ms']:>9.1f} ms "
+                  f"{old['queries']:>6} q {old['ms']:>9.1f} ms")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CPU-only image inference throughput by batch size.
+
+Runs a burst of concurrent requests through BatchInferenceWorker for
+max batch sizes 1 to 32 and reports images/sec. Batch size 1 is the old
+one-image-per-request behaviour.
+
+Uses a Keras model when --model is given (GPU hidden), otherwise a numpy
+stand-in classifier so the batching overhead can be measured without
+TensorFlow installed.
+
+Usage:
+    python scripts/benchmark_image_inference.py
+    python scripts/benchmark_image_inference.py --model models/scout.keras --images 256
+"""
+
+import os
+
+# CPU only: hide GPUs before TensorFlow can be imported
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+
+import sys
+import argparse
+import asyncio
+import io
+import time
+
+import numpy as np
+from PIL import Image
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, BACKEND_DIR)
+
+from services.inference_worker import BatchInferenceWorker
+
+BATCH_SIZES = [1, 2, 4, 8, 16, 32]
+
+
+def build_images(count: int, rng: np.random.Generator) -> list:
+    """Phone-sized JPEGs of random noise"""
+    images = []
+    for _ in range(count):
+        pixels = rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, "JPEG", quality=85)
+        images.append(buffer.getvalue())
+    return images
+
+
+def stand_in_model(classes: int, rng: np.random.Generator):
+    """Linear classifier over the full 224x224x3 input"""
+    weights = rng.standard_normal((224 * 224 * 3, classes)).astype(np.float32) * 0.01
+
+    def predict(batch: np.ndarray) -> np.ndarray:
+        logits = batch.reshape(len(batch), -1) @ weights
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    return predict
+
+
+def keras_model(path: str):
+    import tensorflow as tf
+    model = tf.keras.models.load_model(path)
+    return model.predict
+
+
+async def run_burst(worker: BatchInferenceWorker, images: list) -> None:
+    await asyncio.gather(*(worker.submit(image) for image in images))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Batched image inference benchmark")
+    parser.add_argument("--model", help="Keras model file (default: numpy stand-in)")
+    parser.add_argument("--images", type=int, default=128, help="Concurrent requests per run")
+    parser.add_argument("--max-wait-ms", type=float, default=10.0, help="Batch fill timeout")
+    parser.add_argument("--workers", type=int, default=None, help="Preprocessing processes")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(5)
+    images = build_images(args.images, rng)
+    predict = keras_model(args.model) if args.model else stand_in_model(20, rng)
+    model_name = os.path.basename(args.model) if args.model else "numpy stand-in"
+
+    print(f"{args.images} concurrent images, model: {model_name}, CPU only\n")
+    print(f"{'max batch':>9} {'mean batch':>11} {'total s':>9} {'images/s':>10}")
+
+    baseline = None
+    for batch_size in BATCH_SIZES:
+        worker = BatchInferenceWorker(
+            predict,
+            max_batch_size=batch_size,
+            max_wait_ms=args.max_wait_ms,
+            preprocess_workers=args.workers
+        )
+        # Warm up the process pool and model outside the timed run
+        asyncio.run(run_burst(worker, images[:min(batch_size, len(images))]))
+
+        started = time.perf_counter()
+        asyncio.run(run_burst(worker, images))
+        seconds = time.perf_counter() - started
+        stats = worker.get_stats()
+        worker.stop()
+
+        throughput = args.images / seconds
+        baseline = baseline or throughput
+        print(f"{batch_size:>9} {stats['mean_batch_size']:>11.1f} {seconds:>9.3f} {throughput:>10.1f}")
+
+    print(f"\nSpeedup (batch 1 -> batch {BATCH_SIZES[-1]}): {throughput / baseline:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark backend startup and report where import time goes.
+
+Each measurement runs in a fresh interpreter so module and service caches
+start cold, the same as a desktop launch or container restart:
+
+- import:   time to ``import main`` (module imports + route registration)
+- ready:    import plus the first response from GET /
+- eager:    import plus constructing every registered service, i.e. what
+            startup cost before services were created lazily
+
+With --profile, the script also runs ``python -X importtime`` and prints the
+slowest modules by cumulative import time.
+
+Usage:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --runs 5 --profile --top 25
+"""
+
+import sys
+import os
+import argparse
+import json
+import statistics
+import subprocess
+import tempfile
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+CHILD = r"""
+import json, sys, time
+sys.path.insert(0, {backend!r})
+started = time.perf_counter()
+import main
+result = {{"import": time.perf_counter() - started}}
+
+mode = {mode!r}
+if mode == "ready":
+    from fastapi.testclient import TestClient
+    with TestClient(main.app) as client:
+        client.get("/")
+    result["ready"] = time.perf_counter() - started
+elif mode == "eager":
+    from services.registry import initialize_services
+    initialize_services()
+    result["eager"] = time.perf_counter() - started
+
+from services.registry import get_registry_stats
+stats = get_registry_stats()
+result["services_registered"] = stats["registered"]
+result["services_initialized"] = stats["initialized"]
+print("RESULT " + json.dumps(result))
+"""
+
+
+def run_child(mode: str, workdir: str) -> dict:
+    """Run one cold-start measurement in a fresh interpreter"""
+    env = dict(os.environ, AGTOOLS_DEV_MODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD.format(backend=BACKEND_DIR, mode=mode)],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True
+    )
+    line = next(l for l in proc.stdout.splitlines() if l.startswith("RESULT "))
+    return json.loads(line[len("RESULT "):])
+
+
+def import_profile(workdir: str, top: int) -> list:
+    """(cumulative_seconds, self_seconds, module) for the slowest imports"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {BACKEND_DIR!r}); import main"],
+        cwd=workdir, env=dict(os.environ, AGTOOLS_DEV_MODE="1"), capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us) / 1e6, int(self_us) / 1e6, module.rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure cold backend startup")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts per mode (median is reported)")
+    parser.add_argument("--profile", action="store_true", help="Print an import-time profile")
+    parser.add_argument("--top", type=int, default=20, help="Modules to show in the profile")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # First start against an empty database creates the schemas
+        first = run_child("eager", workdir)
+        print(f"First start (empty database, all schemas created): {first['eager']:.2f}s\n")
+
+        print(f"{'Mode':<10} {'median s':>9} {'min s':>7} {'services built':>15}")
+        for mode in ("import", "ready", "eager"):
+            results = [run_child(mode, workdir) for _ in range(args.runs)]
+            times = [r[mode] for r in results]
+            built = f"{results[-1]['services_initialized']}/{results[-1]['services_registered']}"
+            print(f"{mode:<10} {statistics.median(times):>9.2f} {min(times):>7.2f} {built:>15}")
+
+        if args.profile:
+            print(f"\nSlowest imports (cumulative, self):")
+            for cumulative, own, module in import_profile(workdir, args.top):
+                print(f"  {cumulative:7.3f}s {own:7.3f}s  {module}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
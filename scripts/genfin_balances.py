@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Verify or rebuild GenFin materialized account balances.
+
+Checks the genfin_account_balances table against the raw posted journal
+lines and optionally rebuilds it.
+
+Usage:
+    python scripts/genfin_balances.py            # verify only
+    python scripts/genfin_balances.py --rebuild  # rebuild, then verify
+"""
+
+import sys
+import os
+import argparse
+
+# Run against the backend database (services use a path relative to backend/)
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from services.genfin_core_service import genfin_core_service
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Verify or rebuild GenFin account balances")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild balances from journal lines first")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        result = genfin_core_service.rebuild_account_balances()
+        print(f"Rebuilt {result['rows_rebuilt']} balance rows")
+
+    report = genfin_core_service.verify_account_balances()
+    print(f"Checked {report['rows_checked']} rows across {report['accounts_checked']} accounts")
+
+    if report["consistent"]:
+        print("Balances are consistent with the general ledger.")
+        return 0
+
+    print(f"Found {len(report['mismatches'])} inconsistent rows:")
+    for m in report["mismatches"][:50]:
+        print(f"  {m['account_id']} {m['balance_date']}: {m['problem']} "
+              f"(expected={m['expected']}, actual={m['actual']})")
+    print("Run with --rebuild to repair.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
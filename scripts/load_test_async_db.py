@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Load test: event-loop latency with blocking vs executor-backed report calls.
+
+Seeds a throwaway GenFin database, then serves the same profit & loss report
+from two endpoints on one FastAPI app:
+
+    /inline/profit-loss   calls the service directly inside ``async def``
+    /executor/profit-loss awaits it on the shared DatabaseExecutor
+
+For each mode, a batch of concurrent report requests is fired together with a
+stream of /ping probes. The probes do no database work, so their latency
+(measured from when each probe was due) shows how long other users wait
+while reports run. Requests go through the ASGI app in-process (httpx
+ASGITransport) on a single event loop, the same arrangement as one uvicorn
+worker.
+
+Usage:
+    python scripts/load_test_async_db.py
+    python scripts/load_test_async_db.py --entries 5000 --reports 32 --workers 8
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import date
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(SCRIPTS_DIR, '..', 'backend')
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, SCRIPTS_DIR)
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from benchmark_genfin_reports import build_services, seed
+from database.async_db import DatabaseExecutor
+
+
+def build_app(reports, executor: DatabaseExecutor) -> FastAPI:
+    """Minimal app exposing the report both ways plus a no-op probe"""
+    app = FastAPI()
+    year = date.today().year
+    start, end = f"{year}-01-01", f"{year}-12-31"
+
+    def get_executor() -> DatabaseExecutor:
+        return executor
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/inline/profit-loss")
+    async def inline_profit_loss():
+        return reports.get_profit_loss(start, end, True, True, True)
+
+    @app.get("/executor/profit-loss")
+    async def executor_profit_loss(db: DatabaseExecutor = Depends(get_executor)):
+        return await db.run(reports.get_profit_loss, start, end, True, True, True)
+
+    return app
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_mode(app: FastAPI, path: str, reports: int, probe_interval: float) -> dict:
+    """Fire `reports` concurrent report requests while probing /ping"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        await client.get(path)  # warm caches and connections
+
+        probe_latencies = []
+        report_latencies = []
+        done = asyncio.Event()
+
+        async def report_call():
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            report_latencies.append(time.perf_counter() - started)
+
+        async def prober():
+            # Latency is measured from when the probe was due, so time spent
+            # waiting for a blocked event loop to wake the prober counts too
+            while not done.is_set():
+                due = time.perf_counter() + probe_interval
+                await asyncio.sleep(probe_interval)
+                await client.get("/ping")
+                probe_latencies.append(time.perf_counter() - due)
+
+        probe_task = asyncio.create_task(prober())
+        started = time.perf_counter()
+        await asyncio.gather(*(report_call() for _ in range(reports)))
+        wall = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    return {
+        "wall_s": wall,
+        "report_p50_ms": statistics.median(report_latencies) * 1000,
+        "report_p95_ms": percentile(report_latencies, 95) * 1000,
+        "ping_n": len(probe_latencies),
+        "ping_p50_ms": statistics.median(probe_latencies) * 1000,
+        "ping_p95_ms": percentile(probe_latencies, 95) * 1000,
+        "ping_max_ms": max(probe_latencies) * 1000,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Event-loop latency under concurrent report load")
+    parser.add_argument("--entries", type=int, default=3000, help="Journal entries to seed")
+    parser.add_argument("--reports", type=int, default=24, help="Concurrent report requests")
+    parser.add_argument("--workers", type=int, default=4, help="Database executor workers")
+    parser.add_argument("--probe-interval", type=float, default=0.005, help="Seconds between /ping probes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        core, reports = build_services(os.path.join(tmp, "loadtest.db"))
+        print(f"Seeding {args.entries} journal entries...")
+        seed(core, args.entries, date.today().year)
+
+        executor = DatabaseExecutor(max_workers=args.workers, thread_name_prefix="loadtest-db")
+        app = build_app(reports, executor)
+        try:
+            results = [
+                ("inline (blocking)", asyncio.run(run_mode(app, "/inline/profit-loss", args.reports, args.probe_interval))),
+                (f"executor ({args.workers} workers)", asyncio.run(run_mode(app, "/executor/profit-loss", args.reports, args.probe_interval))),
+            ]
+        finally:
+            executor.shutdown()
+
+    print(f"\n{args.reports} concurrent P&L requests with /ping probes\n")
+    print(f"{'Mode':<24} {'wall s':>7} {'report p50':>11} {'report p95':>11} "
+          f"{'pings':>6} {'ping p50':>9} {'ping p95':>9} {'ping max':>9}")
+    for label, r in results:
+        print(f"{label:<24} {r['wall_s']:>7.2f} {r['report_p50_ms']:>9.1f}ms {r['report_p95_ms']:>9.1f}ms "
+              f"{r['ping_n']:>6} {r['ping_p50_ms']:>7.1f}ms {r['ping_p95_ms']:>7.1f}ms {r['ping_max_ms']:>7.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
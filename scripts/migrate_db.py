@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Apply service schemas to the AgTools database ahead of time.
+
+Services create their tables and seed defaults on first use, recording the
+schema version in the schema_versions table so it only happens once per
+database. Running this script after an install or upgrade does that work
+up front, so the first request after a restart does not pay for it.
+
+Run it from the directory the backend runs in; services resolve their
+database path (agtools.db) relative to it.
+
+Usage:
+    python scripts/migrate_db.py
+    python scripts/migrate_db.py --list
+"""
+
+import sys
+import os
+import argparse
+import importlib
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, BACKEND_DIR)
+
+from database.schema import get_schema_versions
+from services.registry import initialize_services, registered_services
+
+# Modules whose import registers a schema-owning lazy service
+SERVICE_MODULES = (
+    "services.genfin_core_service",
+    "services.genfin_banking_service",
+    "services.genfin_payables_service",
+    "services.genfin_receivables_service",
+    "services.genfin_payroll_service",
+    "services.genfin_inventory_service",
+    "services.genfin_classes_service",
+    "services.genfin_budget_service",
+    "services.genfin_reports_service",
+    "services.genfin_advanced_reports_service",
+    "services.genfin_bank_feeds_service",
+    "services.genfin_fixed_assets_service",
+    "services.receipt_ocr_service",
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Create and seed service schemas")
+    parser.add_argument("--list", action="store_true", help="Only list applied schema versions")
+    args = parser.parse_args()
+
+    for module in SERVICE_MODULES:
+        importlib.import_module(module)
+
+    if not args.list:
+        started = time.perf_counter()
+        timings = initialize_services(registered_services())
+        for name, seconds in sorted(timings.items()):
+            print(f"  {name:<28} {seconds * 1000:8.1f} ms")
+        print(f"Initialized {len(timings)} services in {time.perf_counter() - started:.2f}s")
+
+    from services.genfin_core_service import genfin_core_service
+    versions = get_schema_versions(genfin_core_service.db_path)
+    print(f"\nSchema versions in {genfin_core_service.db_path}:")
+    for component, version in sorted(versions.items()):
+        print(f"  {component:<28} v{version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Tests for the AI image result cache.
+"""
+
+import asyncio
+import io
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from PIL import Image
+
+from services.ai_image_service import AIImageService, AIProvider, ImageAnalysisResult
+
+
+def photo_bytes(size=(320, 240), fmt="JPEG", quality=90, seed=0):
+    """A smooth synthetic 'field photo' that survives resizing."""
+    image = Image.new("RGB", size)
+    pixels = image.load()
+    for x in range(size[0]):
+        for y in range(size[1]):
+            pixels[x, y] = ((x * 255 // size[0] + seed * 97) % 256, (y * 255 // size[1]) % 256, (x * y + seed) % 64)
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, quality=quality)
+    return buffer.getvalue()
+
+
+def make_service(tmp_path, **kwargs):
+    return AIImageService(
+        db_path=str(tmp_path / "ai.db"),
+        models_dir=str(tmp_path / "models"),
+        training_data_dir=str(tmp_path / "training"),
+        **kwargs
+    )
+
+
+@pytest.fixture
+def hf_calls(monkeypatch):
+    calls = []
+
+    async def fake_huggingface(self, image_bytes, crop):
+        calls.append(crop)
+        return ImageAnalysisResult(
+            provider=AIProvider.HUGGINGFACE,
+            raw_labels=[{"label": "gray leaf spot", "score": 0.9}],
+            mapped_identifications=[{"name": "Gray Leaf Spot", "confidence": 90.0}],
+            confidence=90.0,
+            processing_time_ms=0,
+            image_hash="",
+            notes=[]
+        )
+
+    monkeypatch.setattr(AIImageService, "_analyze_with_huggingface", fake_huggingface)
+    return calls
+
+
+def analyze(service, image_bytes, crop="corn"):
+    return asyncio.run(service.analyze_image(image_bytes, crop, save_for_training=False))
+
+
+class TestResultCache:
+    """Repeat uploads skip inference"""
+
+    def test_same_image_served_from_cache(self, tmp_path, hf_calls):
+        service = make_service(tmp_path, cache_ttl_hours=24)
+        image = photo_bytes()
+
+        first = analyze(service, image)
+        second = analyze(service, image)
+
+        assert len(hf_calls) == 1
+        assert second.image_hash == first.image_hash
+        assert second.mapped_identifications == first.mapped_identifications
+        assert "Returned cached result for this image" in second.notes
+
+    def test_cache_is_per_crop(self, tmp_path, hf_calls):
+        service = make_service(tmp_path, cache_ttl_hours=24)
+        image = photo_bytes()
+
+        analyze(service, image, "corn")
+        analyze(service, image, "soybean")
+
+        assert hf_calls == ["corn", "soybean"]
+
+    def test_zero_ttl_disables_cache(self, tmp_path, hf_calls):
+        service = make_service(tmp_path, cache_ttl_hours=0)
+        image = photo_bytes()
+
+        analyze(service, image)
+        analyze(service, image)
+
+        assert len(hf_calls) == 2
+
+    def test_near_duplicate_matched_by_perceptual_hash(self, tmp_path, hf_calls):
+        service = make_service(tmp_path, cache_ttl_hours=24, perceptual_cache_distance=4)
+        original = photo_bytes()
+        resized = photo_bytes(size=(160, 120), quality=60)
+
+        first = analyze(service, original)
+        second = asyncio.run(service.analyze_image(resized, "corn"))
+
+        assert len(hf_calls) == 1
+        assert second.image_hash == service._hash_image(resized) != first.image_hash
+        assert any(f"near-duplicate image {first.image_hash}" in note for note in second.notes)
+        # Feedback on the new upload reaches a prediction stored under its own hash
+        assert service.submit_feedback(second.image_hash, is_correct=True)
+        conn = sqlite3.connect(service.db_path)
+        try:
+            hashes = {row[0] for row in conn.execute("SELECT image_hash FROM ai_predictions")}
+        finally:
+            conn.close()
+        assert hashes == {second.image_hash}
+
+    def test_different_image_not_matched(self, tmp_path, hf_calls):
+        service = make_service(tmp_path, cache_ttl_hours=24, perceptual_cache_distance=4)
+
+        original = photo_bytes()
+        mirrored = io.BytesIO()
+        Image.open(io.BytesIO(original)).transpose(Image.Transpose.FLIP_LEFT_RIGHT).save(mirrored, "JPEG")
+
+        analyze(service, original)
+        analyze(service, mirrored.getvalue())
+
+        assert len(hf_calls) == 2
+
+    def test_empty_results_not_cached(self, tmp_path, monkeypatch):
+        calls = []
+
+        async def failing_huggingface(self, image_bytes, crop):
+            calls.append(crop)
+            return ImageAnalysisResult(AIProvider.HUGGINGFACE, [], [], 0.0, 0, "", [])
+
+        monkeypatch.setattr(AIImageService, "_analyze_with_huggingface", failing_huggingface)
+        service = make_service(tmp_path, cache_ttl_hours=24)
+        image = photo_bytes()
+
+        analyze(service, image)
+        analyze(service, image)
+
+        assert len(calls) == 2
+
+    def test_cloud_fallback_result_reused_while_local_model_fails(self, tmp_path, hf_calls, monkeypatch):
+        async def broken_local_model(self, image_bytes, crop):
+            raise RuntimeError("model file unreadable")
+
+        monkeypatch.setattr(AIImageService, "_analyze_with_local_model", broken_local_model)
+        service = make_service(tmp_path, cache_ttl_hours=24)
+        service.local_model_path, service.local_model_version = "model.h5", "v1"
+        image = photo_bytes()
+
+        first = analyze(service, image)
+        second = analyze(service, image)
+
+        assert len(hf_calls) == 1
+        assert second.provider == first.provider == AIProvider.HUGGINGFACE
+        assert "Returned cached result for this image" in second.notes
+
+    def test_reload_invalidates_local_model_results(self, tmp_path, hf_calls):
+        service = make_service(tmp_path, cache_ttl_hours=24)
+        analyze(service, photo_bytes())
+
+        assert service.invalidate_result_cache(AIProvider.LOCAL_MODEL) == 0
+        assert service.reload_local_model() == {"model_version": None, "invalidated": 0}
+        assert service.invalidate_result_cache() == 1
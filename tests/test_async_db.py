@@ -0,0 +1,108 @@
+"""
+Async Database Executor Tests
+
+Tests for the bounded thread-pool executor in database.async_db that keeps
+blocking SQLite calls off the FastAPI event loop.
+
+Run with: pytest tests/test_async_db.py -v
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "backend"))
+
+from database.async_db import DatabaseExecutor
+from database.db_utils import get_pooled_connection
+
+
+@pytest.fixture
+def executor():
+    """Small executor so concurrency limits are easy to observe."""
+    ex = DatabaseExecutor(max_workers=2, thread_name_prefix="test-db")
+    yield ex
+    ex.shutdown()
+
+
+class TestDatabaseExecutor:
+    """Work runs on worker threads, bounded, with errors propagated."""
+
+    def test_runs_off_the_event_loop_thread(self, executor):
+        async def main():
+            return threading.get_ident(), await executor.run(threading.get_ident)
+
+        loop_thread, worker_thread = asyncio.run(main())
+        assert loop_thread != worker_thread
+
+    def test_exceptions_propagate(self, executor):
+        def boom():
+            raise ValueError("bad query")
+
+        with pytest.raises(ValueError, match="bad query"):
+            asyncio.run(executor.run(boom))
+        assert executor.get_stats()["failed"] == 1
+
+    def test_concurrency_bounded_by_workers(self, executor):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+
+        async def main():
+            await asyncio.gather(*(executor.run(slow) for _ in range(8)))
+
+        asyncio.run(main())
+        stats = executor.get_stats()
+        assert max(peak) <= 2
+        assert stats["completed"] == 8
+        assert stats["in_flight"] == 0
+        assert stats["wait_seconds_max"] > 0
+
+    def test_event_loop_stays_responsive(self, executor, test_db_path):
+        def slow_query():
+            conn = get_pooled_connection(test_db_path)
+            try:
+                time.sleep(0.2)
+                return conn.execute("SELECT 1").fetchone()[0]
+            finally:
+                conn.close()
+
+        async def main():
+            query = asyncio.ensure_future(executor.run(slow_query))
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            tick = time.perf_counter() - started
+            return tick, await query
+
+        tick, value = asyncio.run(main())
+        assert value == 1
+        assert tick < 0.15
+
+
+class TestExecutorEndpoints:
+    """Converted endpoints still respond normally."""
+
+    def test_genfin_report_through_executor(self, client, auth_headers):
+        response = client.get("/api/v1/genfin/reports/cash-flow", headers=auth_headers)
+        assert response.status_code == 200
+
+    def test_pool_stats_include_executor(self, client, auth_headers):
+        client.get("/api/v1/genfin/reports/profit-loss", headers=auth_headers)
+        response = client.get("/api/v1/system/db-pool", headers=auth_headers)
+        assert response.status_code == 200
+        executor = response.json()["executor"]
+        assert executor["max_workers"] >= 1
+        assert executor["submitted"] >= 1
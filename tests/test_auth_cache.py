@@ -0,0 +1,145 @@
+"""
+Tests for the authenticated-user cache used by the auth middleware.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import middleware.auth_middleware as auth_middleware
+from services.auth_service import (
+    AuthenticatedUserCache,
+    UserCreate,
+    UserRole,
+    UserUpdate,
+    get_auth_service,
+)
+from services.user_service import UserService
+
+
+class TestAuthenticatedUserCache:
+    """Bounded TTL/LRU behaviour of the cache itself"""
+
+    def test_lru_bound_evicts_oldest(self):
+        cache = AuthenticatedUserCache(max_entries=2, ttl_seconds=60)
+        cache.put("a", 1, "user-a")
+        cache.put("b", 2, "user-b")
+        assert cache.get("a") == "user-a"  # a is now most recent
+
+        cache.put("c", 3, "user-c")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "user-a"
+        assert cache.get_stats()["evicted"] == 1
+
+    def test_entry_never_outlives_token(self):
+        cache = AuthenticatedUserCache(max_entries=10, ttl_seconds=60)
+        cache.put("t", 1, "user", token_expires=datetime.now() - timedelta(seconds=1))
+
+        assert cache.get("t") is None
+        assert cache.get_stats()["expired"] == 1
+
+    def test_ttl_expiry(self):
+        cache = AuthenticatedUserCache(max_entries=10, ttl_seconds=0.05)
+        cache.put("t", 1, "user")
+        assert cache.get("t") == "user"
+
+        time.sleep(0.06)
+        assert cache.get("t") is None
+
+    def test_load_racing_invalidation_is_not_cached(self):
+        cache = AuthenticatedUserCache(max_entries=10, ttl_seconds=60)
+        generation = cache.generation(7)
+
+        cache.invalidate_user(7)  # e.g. role change committed mid-lookup
+        cache.put("t", 7, "stale-user", generation=generation)
+
+        assert cache.get("t") is None
+
+
+@pytest.fixture
+def user_env(tmp_path, monkeypatch):
+    """UserService on a temp database wired into the middleware, auth enforced"""
+    auth_service = get_auth_service()
+    monkeypatch.setattr(auth_service, "user_cache", AuthenticatedUserCache(max_entries=100, ttl_seconds=60))
+
+    service = UserService(str(tmp_path / "auth_cache.db"))
+    monkeypatch.setattr(auth_middleware, "get_user_service", lambda: service)
+    monkeypatch.setattr(auth_middleware, "DEV_MODE", False)
+
+    user, error = service.create_user(UserCreate(
+        username="cachecrew", email="cachecrew@example.com",
+        password="CrewPass123!", role=UserRole.CREW
+    ))
+    assert error is None
+    tokens = auth_service.create_tokens(user.id, user.username, user.role)
+
+    lookups = []
+    original = service.get_user_by_id
+
+    def counting_get_user_by_id(user_id):
+        lookups.append(user_id)
+        return original(user_id)
+
+    monkeypatch.setattr(service, "get_user_by_id", counting_get_user_by_id)
+    return service, user, tokens.access_token, lookups
+
+
+def _current_user(token):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return asyncio.run(auth_middleware.get_current_active_user(None, credentials))
+
+
+class TestMiddlewareUserCache:
+    """get_current_active_user serves repeat tokens from the cache"""
+
+    def test_repeat_requests_skip_user_lookup(self, user_env):
+        service, user, token, lookups = user_env
+
+        for _ in range(5):
+            assert _current_user(token).id == user.id
+
+        assert lookups == [user.id]
+        stats = get_auth_service().user_cache.get_stats()
+        assert stats["hits"] == 4
+        assert stats["hit_rate"] == 0.8
+
+    def test_role_change_invalidates(self, user_env):
+        service, user, token, lookups = user_env
+        assert _current_user(token).role == UserRole.CREW
+
+        service.update_user(user.id, UserUpdate(role=UserRole.MANAGER), updated_by=1)
+
+        assert _current_user(token).role == UserRole.MANAGER
+
+    def test_deactivation_invalidates(self, user_env):
+        service, user, token, lookups = user_env
+        _current_user(token)
+
+        ok, error = service.delete_user(user.id, deleted_by=user.id + 1)
+        assert ok, error
+
+        with pytest.raises(HTTPException) as exc:
+            _current_user(token)
+        assert exc.value.status_code == 403
+
+    def test_password_change_and_logout_invalidate(self, user_env):
+        service, user, token, lookups = user_env
+        cache = get_auth_service().user_cache
+
+        _current_user(token)
+        service.change_password(user.id, "CrewPass123!", "NewCrewPass456!")
+        assert cache.get_stats()["size"] == 0
+
+        _current_user(token)
+        service.logout(token, user.id)
+        assert cache.get_stats()["size"] == 0
+        assert len(lookups) == 2
@@ -0,0 +1,131 @@
+"""
+Database Connection Pool Tests
+
+Tests for the pooled, WAL-mode SQLite connection manager in database.db_utils.
+
+Run with: pytest tests/test_db_pool.py -v
+"""
+
+import os
+import sys
+import sqlite3
+import threading
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "backend"))
+
+from database.db_utils import ConnectionPool, get_db_connection
+
+
+@pytest.fixture
+def pool():
+    """Fresh pool so counters are isolated per test."""
+    p = ConnectionPool(max_idle_per_thread=2, max_idle_total=4)
+    yield p
+    p.close_all()
+
+
+class TestConnectionPool:
+    """Connection reuse, configuration and isolation."""
+
+    def test_connection_is_reused_after_close(self, pool, test_db_path):
+        conn = pool.acquire(test_db_path)
+        first_id = id(conn)
+        conn.close()
+
+        again = pool.acquire(test_db_path)
+        assert id(again) == first_id
+        again.close()
+
+        stats = pool.get_stats()["databases"][test_db_path]
+        assert stats["opened"] == 1
+        assert stats["reused"] == 1
+        assert stats["in_use"] == 0
+
+    def test_pragmas_applied(self, pool, test_db_path):
+        conn = pool.acquire(test_db_path)
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        finally:
+            conn.close()
+
+    def test_nested_checkouts_get_distinct_connections(self, pool, test_db_path):
+        outer = pool.acquire(test_db_path)
+        inner = pool.acquire(test_db_path)
+        assert outer is not inner
+        inner.close()
+        outer.close()
+
+    def test_uncommitted_work_rolled_back_on_release(self, pool, test_db_path):
+        conn = pool.acquire(test_db_path)
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+        conn.close()
+
+        conn = pool.acquire(test_db_path)
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        conn.close()
+
+    def test_with_block_commits_and_releases(self, pool, test_db_path):
+        with pool.acquire(test_db_path, row_factory=sqlite3.Row) as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.execute("INSERT INTO t VALUES (7)")
+
+        assert pool.get_stats()["databases"][test_db_path]["in_use"] == 0
+
+        conn = pool.acquire(test_db_path)
+        # Row factory is reset between checkouts
+        assert conn.execute("SELECT x FROM t").fetchone() == (7,)
+        conn.close()
+
+    def test_idle_limit_per_thread(self, pool, test_db_path):
+        conns = [pool.acquire(test_db_path) for _ in range(4)]
+        for conn in conns:
+            conn.close()
+
+        stats = pool.get_stats()["databases"][test_db_path]
+        assert stats["idle"] == 2
+        assert stats["discarded"] == 2
+
+    def test_connections_not_shared_across_threads(self, pool, test_db_path):
+        conn = pool.acquire(test_db_path)
+        conn.close()
+
+        seen = {}
+
+        def worker():
+            c = pool.acquire(test_db_path)
+            seen["id"] = id(c)
+            c.close()
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+
+        assert seen["id"] != id(conn)
+
+    def test_memory_database_not_pooled(self, pool):
+        conn = pool.acquire(":memory:")
+        conn.close()
+        assert ":memory:" not in pool.get_stats()["databases"]
+
+    def test_get_db_connection_uses_pool(self, test_db_path):
+        with get_db_connection(test_db_path) as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.commit()
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+
+
+class TestPoolStatsEndpoint:
+    """Admin pool statistics endpoint."""
+
+    def test_returns_stats(self, client, auth_headers):
+        response = client.get("/api/v1/system/db-pool", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert "databases" in data
+        assert data["max_idle_per_thread"] >= 1
@@ -0,0 +1,265 @@
+"""
+Tests for the SQLite domain store behind the in-memory planning services.
+"""
+
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.domain_store import DomainStore, StaleEntityError, decode, encode, unit_of_work
+from services.enterprise_operations_service import EnterpriseOperationsService
+from services.food_safety_service import FoodSafetyService, HarvestLotStatus
+from services.grain_storage_service import GrainStorageService
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+@dataclass
+class Part:
+    name: str
+    color: Color
+
+
+@dataclass
+class Widget:
+    id: str
+    owner: str
+    color: Color
+    made: date
+    parts: List[Part]
+    tags: List[str] = field(default_factory=list)
+    sizes: Dict[str, float] = field(default_factory=dict)
+    outline: List[Tuple[float, float]] = field(default_factory=list)
+    shipped: Optional[datetime] = None
+    count: int = 0
+
+
+def widget(widget_id="W-0001", owner="ann", count=0):
+    return Widget(
+        id=widget_id, owner=owner, color=Color.RED, made=date(2024, 5, 1),
+        parts=[Part("bolt", Color.BLUE)], tags=["a"], sizes={"h": 1.5},
+        outline=[(1.0, 2.0)], shipped=datetime(2024, 5, 2, 8, 30), count=count
+    )
+
+
+class WidgetService:
+    def __init__(self, db_path):
+        self._store = DomainStore("shop", db_path)
+        self.widgets = self._store.map("widgets", Widget, indexes=("owner", "color"))
+        self.log = self._store.list("log", str)
+
+    @unit_of_work
+    def bump(self, widget_id, fail=False):
+        self.widgets[widget_id].count += 1
+        if fail:
+            raise RuntimeError("boom")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "domain.db")
+
+
+class TestCodec:
+    """encode/decode round-trip through the type annotations"""
+
+    def test_dataclass_round_trip(self):
+        original = widget()
+        restored = decode(Widget, encode(original))
+
+        assert restored == original
+        assert restored.parts[0].color is Color.BLUE
+        assert restored.outline == [(1.0, 2.0)]
+
+    def test_missing_fields_get_defaults(self):
+        data = encode(widget())
+        del data["tags"], data["count"]
+
+        restored = decode(Widget, data)
+
+        assert restored.tags == [] and restored.count == 0
+
+    def test_optional_and_plain_values(self):
+        assert decode(Optional[Widget], None) is None
+        assert decode(Dict[str, List[int]], {"a": [1, 2]}) == {"a": [1, 2]}
+
+
+class TestEntityMap:
+    """Write-through cache, versions and indexed lookups"""
+
+    def test_visible_across_instances(self, db_path):
+        first, second = WidgetService(db_path), WidgetService(db_path)
+        first.widgets["W-0001"] = widget()
+
+        assert second.widgets["W-0001"] == widget()
+        assert "W-0001" in second.widgets and len(second.widgets) == 1
+
+        first.widgets["W-0001"] = widget(count=5)
+        assert second.widgets["W-0001"].count == 5
+
+        del first.widgets["W-0001"]
+        assert second.widgets.get("W-0001") is None
+        with pytest.raises(KeyError):
+            second.widgets["W-0001"]
+
+    def test_cache_reused_until_version_changes(self, db_path):
+        service = WidgetService(db_path)
+        service.widgets["W-0001"] = widget()
+
+        cached = service.widgets._cache["W-0001"]
+        service.widgets["W-0001"], service.widgets.values()
+        assert service.widgets._cache["W-0001"] is cached
+
+        WidgetService(db_path).widgets["W-0001"] = widget(count=2)
+        assert service.widgets["W-0001"].count == 2
+        assert service.widgets._cache["W-0001"][0] == 2
+
+    def test_reads_are_private_copies(self, db_path):
+        service = WidgetService(db_path)
+        service.widgets["W-0001"] = widget()
+
+        read = service.widgets["W-0001"]
+        read.count = 99
+        read.parts.append(Part("nut", Color.RED))
+
+        assert service.widgets["W-0001"] == widget()
+        assert service.widgets.values()[0] == widget()
+
+    def test_find_and_get_many(self, db_path):
+        service = WidgetService(db_path)
+        service.widgets["W-0001"] = widget("W-0001", "ann")
+        service.widgets["W-0002"] = widget("W-0002", "bob")
+        service.widgets["W-0003"] = widget("W-0003", "ann")
+
+        assert [w.id for w in service.widgets.find(owner="ann")] == ["W-0001", "W-0003"]
+        assert len(service.widgets.find(owner="ann", color=Color.RED)) == 2
+        assert service.widgets.find(color=Color.BLUE) == []
+        with pytest.raises(KeyError):
+            service.widgets.find(made=date(2024, 5, 1))
+
+        assert sorted(service.widgets.get_many(["W-0002", "W-0003", "W-9999"])) == ["W-0002", "W-0003"]
+
+    def test_list_keeps_order(self, db_path):
+        service = WidgetService(db_path)
+        service.log.append("first")
+        service.log.extend(["second", "third"])
+        service.log.remove("second")
+
+        other = WidgetService(db_path)
+        assert list(other.log) == ["first", "third"]
+        assert other.log[-1] == "third" and len(other.log) == 2 and other.log
+
+
+class TestUnitOfWork:
+    """In-place changes are flushed, failures are rolled back"""
+
+    def test_in_place_change_persists(self, db_path):
+        service = WidgetService(db_path)
+        service.widgets["W-0001"] = widget()
+
+        service.bump("W-0001")
+        service.bump("W-0001")
+
+        assert WidgetService(db_path).widgets["W-0001"].count == 2
+
+    def test_rollback_evicts_cached_entity(self, db_path):
+        service = WidgetService(db_path)
+        service.widgets["W-0001"] = widget()
+
+        with pytest.raises(RuntimeError):
+            service.bump("W-0001", fail=True)
+
+        assert service.widgets["W-0001"].count == 0
+        assert WidgetService(db_path).widgets["W-0001"].count == 0
+
+    def test_uncommitted_edits_hidden_from_other_threads(self, db_path):
+        service = WidgetService(db_path)
+        service.widgets["W-0001"] = widget()
+        service.widgets["W-0001"]  # Cached before the unit of work
+
+        seen = []
+        with service._store.unit_of_work():
+            service.widgets["W-0001"].count = 10
+            reader = threading.Thread(target=lambda: seen.append(service.widgets["W-0001"].count))
+            reader.start()
+            reader.join()
+
+        assert seen == [0]
+        assert service.widgets["W-0001"].count == 10
+
+    def test_conflicting_write_is_rejected(self, db_path):
+        service, other = WidgetService(db_path), WidgetService(db_path)
+        service.widgets["W-0001"] = widget()
+
+        with pytest.raises(StaleEntityError):
+            with service._store.unit_of_work():
+                service.widgets["W-0001"].count = 10
+                # Row changed behind the tracked entity's back
+                service._store._uow.conn.execute("UPDATE shop_widgets SET version = version + 1")
+
+        assert other.widgets["W-0001"].count == 0
+
+
+class TestSequences:
+    """Database sequences replace per-process counters"""
+
+    def test_next_id_shared(self, db_path):
+        first, second = DomainStore("shop", db_path), DomainStore("shop", db_path)
+
+        assert [first.next_id("widget"), second.next_id("widget"), first.next_id("widget")] == [1, 2, 3]
+        assert DomainStore("other", db_path).next_id("widget") == 1
+
+    def test_migrate_counters_starts_after_stored_ids(self, db_path):
+        service = WidgetService(db_path)
+        service.widgets["W-0041"] = widget("W-0041")
+        service.widgets["WX-0099"] = widget("WX-0099")
+
+        service._store.migrate_counters({"widget": (service.widgets, "W")})
+        assert service._store.next_id("widget") == 42
+
+        service._store.migrate_counters({"widget": (service.widgets, "W")})
+        assert service._store.next_id("widget") == 43
+
+
+class TestServices:
+    """Converted services share state between instances (workers)"""
+
+    def test_grain_bins_and_transactions(self, db_path):
+        first, second = GrainStorageService(db_path), GrainStorageService(db_path)
+        bin_id = first.add_bin("Bin 1", "round_steel", 10000)["id"]
+
+        second.load_bin(bin_id, "corn", 6000, 15.5, 56, "North 40")
+        first.unload_bin(bin_id, 1000, "Elevator")
+
+        status = GrainStorageService(db_path).get_bin_status(bin_id)
+        assert status["bins"][0]["stored"] == 5000
+        history = second.get_transaction_history(grain_type="corn")
+        assert history["transaction_count"] == 2
+        assert second.add_bin("Bin 2", "round_steel", 5000)["id"] == "BIN-0002"
+
+    def test_enterprise_default_entity_created_once(self, db_path):
+        EnterpriseOperationsService(db_path)
+        service = EnterpriseOperationsService(db_path)
+
+        assert list(service.entities) == ["ENTITY-0001"]
+        assert service.create_entity("Partnership", "partnership")["id"] == "ENTITY-0002"
+
+    def test_food_safety_lot_status(self, db_path):
+        first = FoodSafetyService(db_path)
+        lot = first.create_harvest_lot({"field_id": "F1", "crop_type": "corn", "harvest_date": date(2024, 9, 1)})
+
+        first.update_lot_status(lot["lot_id"], HarvestLotStatus.SOLD, {"buyer": "Co-op"})
+
+        stored = FoodSafetyService(db_path).harvest_lots[0]
+        assert stored.status is HarvestLotStatus.SOLD and stored.buyer == "Co-op"
@@ -0,0 +1,198 @@
+"""
+Tests for batch expense categorization and its use by the CSV importers.
+"""
+
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import services.expense_categorization_service as categorization
+from services.accounting_import import AccountingImportService
+from services.cost_tracking_service import ColumnMapping, CostTrackingService
+from services.cost_tracking_service import ExpenseCategory as CostCategory
+from services.expense_categorization_service import (
+    CATEGORY_KEYWORDS,
+    ExpenseCategorizationService,
+    ExpenseCategory,
+    KeywordMatcher,
+)
+
+WORDS = ["corn seed", "pioneer", "urea", "dap", "roundup", "diesel", "fuel", "repair",
+         "parts", "john deere", "labor", "rent", "crop insurance", "map", "misc", "supply",
+         "trucking", "bin", "interest", "n/a"]
+VENDORS = ["", "", "Pioneer", "Nutrien", "Casey's", "Unknown Co", "John Deere Financial"]
+
+
+def random_expenses(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            "description": " ".join(rng.sample(WORDS, rng.randint(0, 3))).title(),
+            "vendor": rng.choice(VENDORS),
+            "amount": rng.uniform(10, 5000),
+        }
+        for _ in range(count)
+    ]
+
+
+class CountingModel:
+    """Stand-in classifier that records predict_proba calls"""
+
+    classes_ = np.array(["seed", "fertilizer", "fuel"])
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_proba(self, descriptions):
+        self.calls.append(list(descriptions))
+        return np.array([
+            [0.8, 0.1, 0.1] if "seed" in d.lower() else [0.1, 0.2, 0.7]
+            for d in descriptions
+        ])
+
+
+@pytest.fixture
+def service(tmp_path):
+    return ExpenseCategorizationService(
+        db_path=str(tmp_path / "categorize.db"),
+        model_path=str(tmp_path / "missing.pkl")
+    )
+
+
+class TestKeywordMatcher:
+    """Trie scan finds the same keywords as a per-keyword search"""
+
+    def test_keywords_match_substring_search(self):
+        matcher = KeywordMatcher(CATEGORY_KEYWORDS)
+        keywords = {k for words in CATEGORY_KEYWORDS.values() for k in words}
+
+        for expense in random_expenses(300):
+            text = expense["description"].lower()
+            assert matcher.keywords_in(text) == {k for k in keywords if k in text}
+
+    def test_overlapping_and_prefix_keywords(self):
+        matcher = KeywordMatcher({
+            ExpenseCategory.SEED: ["seed", "seed treatment"],
+            ExpenseCategory.FUEL: ["eed"],
+        })
+
+        assert matcher.keywords_in("bulk seed treatment") == {"seed", "seed treatment", "eed"}
+        scores = matcher.score_many(["seeds", "no match"])
+        seed, fuel = ExpenseCategory.SEED.value, ExpenseCategory.FUEL.value
+        column = {c.value: i for i, c in enumerate(matcher.categories)}
+        # Substring-only hits count 1, so 0.3 + 0.15
+        assert scores[0, column[seed]] == pytest.approx(0.45)
+        assert scores[0, column[fuel]] == pytest.approx(0.45)
+        assert not scores[1].any()
+
+
+class TestCategorizeBatch:
+    """Batch results equal one-at-a-time categorization"""
+
+    def test_batch_matches_scalar(self, service):
+        expenses = random_expenses(200)
+
+        batch = service.categorize_batch(expenses)
+
+        for expense, result in zip(expenses, batch):
+            single = service.categorize(expense["description"], vendor=expense["vendor"])
+            assert result == single
+
+    def test_no_signal_is_other(self, service):
+        result = service.categorize("zzz", vendor="nobody in particular")
+
+        assert result.predicted_category == ExpenseCategory.OTHER
+        assert result.confidence == 0.5
+
+    def test_ml_scores_distinct_descriptions_once(self, service, monkeypatch):
+        monkeypatch.setattr(categorization, "HAS_SKLEARN", True)
+        service.model, service.vectorizer = CountingModel(), True
+
+        results = service.categorize_batch([
+            {"description": "Bulk bag"}, {"description": "Seed corn"}, {"description": "Bulk bag"},
+        ])
+
+        assert service.model.calls == [["Bulk bag", "Seed corn"]]
+        assert results[0] == results[2]
+        assert results[0].predicted_category == ExpenseCategory.FUEL
+        assert results[1].predicted_category == ExpenseCategory.SEED
+        assert "ml_model" in results[1].matching_rules
+
+
+class TestImportCategorization:
+    """Importers categorize all rows through one batch call"""
+
+    @pytest.fixture
+    def categorizer(self, service, monkeypatch):
+        monkeypatch.setattr(categorization, "_expense_categorization_service", service)
+        calls = []
+        categorize_batch = service.categorize_batch
+
+        def counting_batch(expenses, use_ml=True):
+            calls.append(len(expenses))
+            return categorize_batch(expenses, use_ml)
+
+        monkeypatch.setattr(service, "categorize_batch", counting_batch)
+        return calls
+
+    def test_suggest_categories(self, tmp_path, categorizer):
+        cost_service = CostTrackingService(db_path=str(tmp_path / "costs.db"))
+
+        suggestions = cost_service.suggest_categories([
+            (None, "anything", "Crop Insurance"),
+            ("Nutrien", "spring application", None),
+            (None, "grain bin aeration", None),
+            (None, "zzz", None),
+        ])
+
+        assert suggestions[:3] == [CostCategory.CROP_INSURANCE, CostCategory.FERTILIZER, CostCategory.STORAGE]
+        assert suggestions[3] == CostCategory.OTHER
+        assert cost_service.suggest_categories([(None, "zzz", None)], fallback=False) == [None]
+        assert categorizer == [3, 1]
+
+    def test_import_csv_uses_one_batch(self, tmp_path, categorizer):
+        cost_service = CostTrackingService(db_path=str(tmp_path / "costs.db"))
+        csv_content = "\n".join([
+            "Date,Vendor,Memo,Amount",
+            "03/01/2025,Nutrien,spring application,1200.00",
+            "03/02/2025,Pioneer,,4800.00",
+            "03/03/2025,Casey's,,bad",
+            "03/04/2025,Corner Store,tractor tire repair,350.00",
+        ])
+
+        result = cost_service.import_csv(
+            csv_content,
+            ColumnMapping(amount="Amount", date="Date", vendor="Vendor", description="Memo"),
+            user_id=1
+        )
+
+        assert (result.successful, result.failed) == (3, 1)
+        assert categorizer == [3]
+        expenses = cost_service.list_expenses(user_id=1).expenses
+        by_vendor = {e.vendor: e.category for e in expenses}
+        assert by_vendor == {"Nutrien": "fertilizer", "Pioneer": "seed", "Corner Store": "repairs"}
+
+    def test_preview_suggests_unmapped_accounts(self, tmp_path, categorizer):
+        importer = AccountingImportService(db_path=str(tmp_path / "qb.db"))
+        csv_content = "\n".join([
+            "Type,Date,Num,Name,Memo,Account,Amount",
+            "Check,03/01/2025,101,Co-op,Anhydrous ammonia,Account 6110,1500.00",
+            "Check,03/02/2025,102,Co-op,Anhydrous,Account 6110,900.00",
+            "Check,03/03/2025,103,Pioneer,,Seed,4000.00",
+            "Check,03/04/2025,104,Somebody,zzz,Account 6999,20.00",
+        ])
+
+        preview = importer.preview_import(csv_content, user_id=1)
+
+        accounts = {a["account"]: a for a in preview.accounts_found}
+        assert accounts["Seed"]["suggestion_source"] == "mapping"
+        assert accounts["Account 6110"]["suggested_category"] == "fertilizer"
+        assert accounts["Account 6110"]["suggestion_source"] == "categorizer"
+        assert accounts["Account 6999"]["suggested_category"] is None
+        assert preview.unmapped_accounts == ["Account 6999"]
+        assert categorizer == [2]
@@ -0,0 +1,302 @@
+"""
+GenFin Bank Feeds Matching Tests
+================================
+Tests for the bank-feed matching engine in GenFinBankFeedsService.
+
+Run with: pytest tests/test_genfin_bank_feeds.py -v
+"""
+
+import os
+import sys
+from datetime import date
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "backend"))
+
+
+def _isolated(service_class, db_path):
+    """Instantiate a singleton service against an isolated database."""
+    service = object.__new__(service_class)
+    service._initialized = False
+    service.__init__(db_path)
+    return service
+
+
+@pytest.fixture
+def banking(test_db_path):
+    from services.genfin_banking_service import GenFinBankingService
+    return _isolated(GenFinBankingService, test_db_path)
+
+
+@pytest.fixture
+def feeds(test_db_path, banking):
+    from services.genfin_bank_feeds_service import GenFinBankFeedsService
+    return _isolated(GenFinBankFeedsService, test_db_path)
+
+
+@pytest.fixture
+def bank_account(banking):
+    result = banking.create_bank_account(
+        account_name="Farm Operating",
+        account_type="checking",
+        bank_name="First Ag Bank",
+        routing_number="123456789",
+        account_number="987654321",
+    )
+    return result["bank_account_id"]
+
+
+def _ofx(*transactions):
+    """Minimal SGML OFX body with (fit_id, yyyymmdd, amount, name, check_number) rows."""
+    blocks = []
+    for fit_id, posted, amount, name, check_number in transactions:
+        trntype = "CHECK" if check_number else ("DEBIT" if amount < 0 else "CREDIT")
+        block = (
+            f"<STMTTRN><TRNTYPE>{trntype}<DTPOSTED>{posted}<TRNAMT>{amount:.2f}"
+            f"<FITID>{fit_id}<NAME>{name}"
+        )
+        if check_number:
+            block += f"<CHECKNUM>{check_number}"
+        blocks.append(block + "</STMTTRN>")
+    return "<OFX><BANKID>123456789<ACCTID>987654321" + "".join(blocks) + "</OFX>"
+
+
+class TestMatchCandidateIndex:
+    """Scoring and ranking without a database."""
+
+    def _imported(self, amount, day, name="", check_number=""):
+        from services.genfin_bank_feeds_service import ImportedTransaction, TransactionType
+        return ImportedTransaction(
+            import_id="imp", file_id="file", fit_id="fit", date=day, amount=amount,
+            transaction_type=TransactionType.DEBIT, name=name, check_number=check_number
+        )
+
+    def test_exact_match_scores_highest(self):
+        from services.genfin_bank_feeds_service import MatchCandidate, MatchCandidateIndex
+
+        index = MatchCandidateIndex([
+            MatchCandidate("far", "bank_transaction", date(2024, 5, 8), -120.00, "Caseys"),
+            MatchCandidate("near", "bank_transaction", date(2024, 5, 2), -120.00, "Casey's General Store"),
+            MatchCandidate("other", "bank_transaction", date(2024, 5, 2), -99.00, "Caseys"),
+        ])
+
+        ranked = index.rank(self._imported(-120.00, date(2024, 5, 1), "CASEYS GENERAL STORE #2231"))
+
+        assert [c.transaction_id for _, c in ranked] == ["near", "far"]
+        assert ranked[0][0] > ranked[1][0]
+
+    def test_check_number_mismatch_lowers_score(self):
+        from services.genfin_bank_feeds_service import MatchCandidate, MatchCandidateIndex
+
+        index = MatchCandidateIndex([
+            MatchCandidate("right", "check", date(2024, 5, 3), -500.00, "Co-op", "1042"),
+            MatchCandidate("wrong", "check", date(2024, 5, 3), -500.00, "Co-op", "1043"),
+        ])
+
+        ranked = index.rank(self._imported(-500.00, date(2024, 5, 3), "CHECK", "0001042"))
+        assert ranked[0][1].transaction_id == "right"
+        assert ranked[1][0] < ranked[0][0]
+
+    def test_claimed_and_out_of_window_candidates_skipped(self):
+        from services.genfin_bank_feeds_service import MatchCandidate, MatchCandidateIndex
+
+        index = MatchCandidateIndex([
+            MatchCandidate("claimed", "bank_transaction", date(2024, 5, 1), -10.00),
+            MatchCandidate("stale", "bank_transaction", date(2024, 3, 1), -10.00),
+        ], claimed={"claimed"})
+
+        assert index.rank(self._imported(-10.00, date(2024, 5, 1))) == []
+
+
+class TestBankFeedMatching:
+    """Imports auto-match against GenFin records using a prebuilt index."""
+
+    def test_import_auto_matches_withdrawal(self, feeds, banking, bank_account):
+        withdrawal = banking.record_withdrawal(
+            bank_account, "2024-06-03", 245.18, payee="Farmers Co-op Fuel"
+        )
+
+        result = feeds.import_ofx_content(_ofx(
+            ("F1", "20240604", -245.18, "FARMERS COOP FUEL", ""),
+            ("F2", "20240605", -19.99, "STREAMING SERVICE", ""),
+        ))
+
+        assert result["success"]
+        assert result["auto_matched"] == 1
+        rows = {t["name"]: t for t in feeds.get_imported_transactions()["transactions"]}
+        assert rows["FARMERS COOP FUEL"]["status"] == "matched"
+        assert rows["STREAMING SERVICE"]["status"] == "unmatched"
+
+        matched = feeds._get_transaction_by_id(rows["FARMERS COOP FUEL"]["import_id"])
+        assert matched.matched_transaction_id == withdrawal["transaction_id"]
+
+    def test_record_is_matched_only_once(self, feeds, banking, bank_account):
+        banking.record_deposit(bank_account, "2024-06-10", 1500.00, memo="Grain check")
+
+        result = feeds.import_ofx_content(_ofx(
+            ("D1", "20240610", 1500.00, "DEPOSIT", ""),
+            ("D2", "20240612", 1500.00, "DEPOSIT", ""),
+        ))
+
+        assert result["transactions_imported"] == 2
+        assert result["auto_matched"] <= 1
+
+    def test_candidates_are_ranked_for_review(self, feeds, banking, bank_account):
+        banking.record_withdrawal(bank_account, "2024-07-01", 80.00, payee="Hardware Store")
+        banking.record_withdrawal(bank_account, "2024-07-05", 80.00, payee="Parts Depot")
+
+        feeds.import_ofx_content(_ofx(("H1", "20240702", -80.00, "PARTS DEPOT", "")))
+        import_id = feeds.get_imported_transactions()["transactions"][0]["import_id"]
+
+        result = feeds.get_match_candidates(import_id)
+
+        assert result["success"]
+        scores = [c["score"] for c in result["candidates"]]
+        assert len(scores) == 2
+        assert scores == sorted(scores, reverse=True)
+
+    def test_bulk_import_uses_fixed_query_count(self, feeds, banking, bank_account):
+        for day in range(1, 29):
+            banking.record_withdrawal(bank_account, f"2024-02-{day:02d}", 10.0 + day, payee=f"Vendor {day}")
+
+        rows = [
+            (f"B{i}", f"2024{(i % 12) + 1:02d}{(i % 28) + 1:02d}", -round(11.0 + i * 1.37, 2), f"VENDOR {i % 40}", "")
+            for i in range(600)
+        ]
+        statements = []
+        original = feeds._get_connection
+
+        def counting_connection():
+            conn = original()
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        feeds._get_connection = counting_connection
+        try:
+            result = feeds.import_ofx_content(_ofx(*rows))
+        finally:
+            feeds._get_connection = original
+        issued = list(statements)
+
+        assert result["success"]
+        assert result["transactions_imported"] == 600
+        assert len([s for s in issued if s.lstrip().upper().startswith("SELECT")]) < 20
+
+    def test_auto_match_all_matches_later_records(self, feeds, banking, bank_account):
+        feeds.import_ofx_content(_ofx(("L1", "20240801", -64.50, "SEED SUPPLY", "")))
+
+        banking.record_withdrawal(bank_account, "2024-08-01", 64.50, payee="Seed Supply")
+        result = feeds.auto_match_all()
+
+        assert result["transactions_processed"] == 1
+        assert result["transactions_matched"] == 1
+
+
+class TestCategoryRuleMatcher:
+    """Compiled rule matcher agrees with rule-by-rule evaluation."""
+
+    def test_matches_rule_by_rule_evaluation(self, feeds):
+        import random
+        from services.genfin_bank_feeds_service import (
+            CategoryRule, CategoryRuleMatcher, ImportedTransaction, TransactionType
+        )
+
+        rng = random.Random(7)
+        words = ["fuel", "seed", "coop", "deere", "fert", "ag", "bank", "fee", "rent", "store"]
+        rules = []
+        for i in range(300):
+            rules.append(CategoryRule(
+                rule_id=f"r{i}",
+                name=f"Rule {i}",
+                priority=rng.randrange(10),
+                match_name_contains=rng.choice(["", "", rng.choice(words), rng.choice(words)[:2]]),
+                match_name_exact=rng.choice([""] * 8 + ["DEERE"]),
+                match_memo_contains=rng.choice(["", "", "", rng.choice(words)]),
+                match_amount_min=rng.choice([None, None, 0.0, 50.0, 100.0]),
+                match_amount_max=rng.choice([None, None, 50.0, 500.0]),
+                match_type=rng.choice([None, None, TransactionType.DEBIT, TransactionType.CHECK]),
+            ))
+        rules.sort(key=lambda r: -r.priority)
+        matcher = CategoryRuleMatcher(rules)
+
+        for i in range(2000):
+            trans = ImportedTransaction(
+                import_id=f"t{i}", file_id="f", fit_id=f"fit{i}", date=date(2024, 1, 1),
+                amount=rng.choice([-50.0, 50.0, -100.0, rng.uniform(-900, 900)]),
+                transaction_type=rng.choice(list(TransactionType)),
+                name=" ".join(rng.sample(words, 2)).upper(),
+                memo=rng.choice(["", " ".join(rng.sample(words, 3))]),
+            )
+            expected = next((r for r in rules if feeds._rule_matches(r, trans)), None)
+            assert matcher.match(trans) is expected
+
+    def test_matcher_rebuilt_after_rule_changes(self, feeds):
+        from services.genfin_bank_feeds_service import ImportedTransaction, TransactionType
+
+        trans = ImportedTransaction(
+            import_id="t", file_id="f", fit_id="fit", date=date(2024, 1, 1), amount=-42.0,
+            transaction_type=TransactionType.DEBIT, name="PIONEER SEED 0042"
+        )
+        assert feeds._get_rule_matcher().match(trans) is None
+
+        rule_id = feeds.create_category_rule("Seed", match_name_contains="pioneer",
+                                             assign_account_id="5100", priority=50)["rule_id"]
+        assert feeds._get_rule_matcher().match(trans).rule_id == rule_id
+
+        feeds.delete_category_rule(rule_id)
+        assert feeds._get_rule_matcher().match(trans) is None
+
+    def test_matcher_sees_rule_changes_from_other_workers(self, feeds, test_db_path):
+        from services.genfin_bank_feeds_service import GenFinBankFeedsService, ImportedTransaction, TransactionType
+
+        other = _isolated(GenFinBankFeedsService, test_db_path)
+        trans = ImportedTransaction(
+            import_id="t", file_id="f", fit_id="fit", date=date(2024, 1, 1), amount=-42.0,
+            transaction_type=TransactionType.DEBIT, name="PIONEER SEED 0042"
+        )
+        assert feeds._get_rule_matcher().match(trans) is None
+        cached = feeds._get_rule_matcher()
+
+        rule_id = other.create_category_rule("Seed", match_name_contains="pioneer",
+                                             assign_account_id="5100", priority=50)["rule_id"]
+        assert feeds._get_rule_matcher().match(trans).rule_id == rule_id
+        assert feeds._get_rule_matcher() is feeds._get_rule_matcher()
+        assert feeds._get_rule_matcher() is not cached
+
+        other.delete_category_rule(rule_id)
+        assert feeds._get_rule_matcher().match(trans) is None
+
+    def test_auto_categorize_all_uses_rules(self, feeds):
+        feeds.import_ofx_content(_ofx(
+            ("C1", "20240301", -88.40, "CENEX FUEL STOP", ""),
+            ("C2", "20240302", -12.00, "UNKNOWN MERCHANT", ""),
+        ))
+        rule_id = feeds.create_category_rule("Fuel", match_name_contains="cenex",
+                                             assign_account_id="5400", priority=50)["rule_id"]
+
+        result = feeds.auto_categorize_all()
+
+        assert result["transactions_processed"] == 2
+        assert result["transactions_categorized"] >= 1
+        rows = {t["name"]: t for t in feeds.get_imported_transactions()["transactions"]}
+        assert feeds._get_transaction_by_id(rows["CENEX FUEL STOP"]["import_id"]).category_rule_id == rule_id
+
+    def test_unparseable_amount_bounds_are_ignored(self, feeds):
+        rule_id = feeds.create_category_rule("Legacy", match_name_contains="amazon",
+                                             assign_account_id="5000", priority=50)["rule_id"]
+        with feeds._get_connection() as conn:
+            conn.execute("""
+                UPDATE genfin_category_rules
+                SET match_amount_min = 'contains', match_amount_max = 'description'
+                WHERE rule_id = ?
+            """, (rule_id,))
+            conn.commit()
+        feeds._rule_matcher = None
+
+        feeds.import_ofx_content(_ofx(("A1", "20240301", -25.00, "AMAZON MKTPLACE", "")))
+
+        assert feeds.auto_categorize_all()["success"]
+        imported = feeds.get_imported_transactions()["transactions"][0]
+        assert feeds._get_transaction_by_id(imported["import_id"]).category_rule_id == rule_id
@@ -0,0 +1,196 @@
+"""
+Tests for GenFin inventory cost layers and bulk sales posting.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.genfin_inventory_service import CostLayers, GenFinInventoryService
+
+
+@pytest.fixture
+def make_service(tmp_path):
+    """Build fresh (non-singleton) services on per-test databases"""
+    saved = GenFinInventoryService._instance
+
+    def make(name="inventory.db"):
+        GenFinInventoryService._instance = None
+        return GenFinInventoryService(db_path=str(tmp_path / name))
+
+    yield make
+    GenFinInventoryService._instance = saved
+
+
+def stock_item(service, valuation_method, lots, name="Urea"):
+    item_id = service.create_item("inventory", name, valuation_method=valuation_method)["item"]["item_id"]
+    for received_date, quantity, cost in lots:
+        service.receive_inventory(item_id, quantity, cost, received_date)
+    return item_id
+
+
+LOTS = [("2025-03-01", 10, 400.0), ("2025-04-01", 10, 450.0), ("2025-02-01", 5, 380.0)]
+
+
+class TestCostLayers:
+    """Deque of lots with running totals"""
+
+    def test_lots_kept_in_received_order(self):
+        layers = CostLayers([("b", "2025-03-01", 10, 4.0), ("c", "2025-04-01", 10, 5.0),
+                             ("a", "2025-02-01", 5, 3.0), ("b2", "2025-03-01", 1, 4.5)])
+
+        assert [lot[0] for lot in layers.lots] == ["a", "b", "b2", "c"]
+        assert layers.quantity == 26
+        assert layers.cost == pytest.approx(15 + 40 + 4.5 + 50)
+
+    def test_consume_from_either_end(self):
+        layers = CostLayers([("a", "2025-02-01", 5, 3.0), ("b", "2025-03-01", 10, 4.0)])
+
+        assert layers.consume(7) == (pytest.approx(15 + 8.0), 7, [("a", 0.0), ("b", 8)])
+        assert layers.consume(3, newest_first=True) == (pytest.approx(12.0), 3, [("b", 5)])
+        assert (layers.quantity, layers.cost) == (5, pytest.approx(20.0))
+
+        cost, taken, changed = layers.consume(9)
+        assert (cost, taken, changed) == (pytest.approx(20.0), 5, [("b", 0.0)])
+        assert not layers.lots and layers.quantity == layers.cost == 0
+
+
+class TestSellInventory:
+    """Per-method COGS against the persisted lots"""
+
+    def test_fifo(self, make_service):
+        service = make_service()
+        item_id = stock_item(service, "fifo", LOTS)
+
+        result = service.sell_inventory(item_id, 12, "2025-05-01")
+
+        assert result["cogs"] == 5 * 380 + 7 * 400
+        remaining = {lot["received_date"]: lot["remaining_quantity"] for lot in service.list_lots(item_id)["lots"]}
+        assert remaining == {"2025-02-01": 0, "2025-03-01": 3, "2025-04-01": 10}
+
+    def test_lifo(self, make_service):
+        service = make_service()
+        item_id = stock_item(service, "lifo", LOTS)
+
+        assert service.sell_inventory(item_id, 12, "2025-05-01")["cogs"] == 10 * 450 + 2 * 400
+
+    def test_average(self, make_service):
+        service = make_service()
+        item_id = stock_item(service, "average", LOTS)
+        average = (10 * 400 + 10 * 450 + 5 * 380) / 25
+
+        result = service.sell_inventory(item_id, 12, "2025-05-01")
+
+        assert result["cogs"] == round(12 * average, 2)
+        assert result["remaining_value"] == pytest.approx(13 * average, abs=0.01)
+        # Physical flow still drains the oldest lots
+        assert service.list_lots(item_id)["total_value"] == pytest.approx(3 * 400 + 10 * 450)
+
+    def test_quantity_without_lots_costed_at_average(self, make_service):
+        service = make_service()
+        item_id = service.create_item(
+            "inventory", "Carryover seed", cost=200.0, quantity_on_hand=10,
+            average_cost=200.0, valuation_method="fifo"
+        )["item"]["item_id"]
+        service.receive_inventory(item_id, 5, 260.0, "2025-03-01")
+
+        result = service.sell_inventory(item_id, 8, "2025-05-01")
+
+        average = (10 * 200 + 5 * 260) / 15
+        assert result["cogs"] == round(5 * 260 + 3 * average, 2)
+
+
+class TestSellInventoryBatch:
+    """Bulk posting in one pass"""
+
+    def test_batch_matches_one_at_a_time(self, make_service):
+        sales = [("fifo", 4), ("lifo", 6), ("fifo", 9), ("average", 11), ("lifo", 3), ("fifo", 2)]
+
+        single = make_service("single.db")
+        items = {method: stock_item(single, method, LOTS) for method in ("fifo", "lifo", "average")}
+        expected = [single.sell_inventory(items[method], qty, "2025-06-01") for method, qty in sales]
+        expected_lots = {m: single.list_lots(item_id)["lots"] for m, item_id in items.items()}
+
+        batch_service = make_service("batch.db")
+        items = {method: stock_item(batch_service, method, LOTS) for method in ("fifo", "lifo", "average")}
+        batch = batch_service.sell_inventory_batch([
+            {"item_id": items[method], "quantity": qty, "sale_date": "2025-06-01"} for method, qty in sales
+        ])
+
+        assert batch["results"] == expected
+        assert batch["sales_posted"] == len(sales)
+        assert batch["total_cogs"] == pytest.approx(sum(r["cogs"] for r in expected))
+        for method, item_id in items.items():
+            lots = batch_service.list_lots(item_id)["lots"]
+            assert [lot["remaining_quantity"] for lot in lots] == [
+                lot["remaining_quantity"] for lot in expected_lots[method]
+            ]
+
+    def test_failed_sales_do_not_block_the_rest(self, make_service):
+        service = make_service()
+        item_id = stock_item(service, "fifo", LOTS)
+        service_item = service.create_service_item("Custom spraying")["item"]["item_id"]
+
+        batch = service.sell_inventory_batch([
+            {"item_id": item_id, "quantity": 20, "sale_date": "2025-06-01"},
+            {"item_id": "missing", "quantity": 1, "sale_date": "2025-06-01"},
+            {"item_id": service_item, "quantity": 1, "sale_date": "2025-06-01"},
+            {"item_id": item_id, "quantity": 6, "sale_date": "2025-06-02"},
+        ])
+
+        assert [r.get("error") for r in batch["results"]] == [
+            None, "Item not found", "Item is not an inventory item", "Insufficient quantity on hand"
+        ]
+        assert (batch["sales_posted"], batch["sales_failed"], batch["success"]) == (1, 3, False)
+        assert service.get_item(item_id)["quantity_on_hand"] == 5
+
+    def test_layers_persist_and_feed_valuation(self, make_service):
+        service = make_service()
+        item_id = stock_item(service, "fifo", LOTS)
+        service.sell_inventory(item_id, 12, "2025-05-01")
+        service.receive_inventory(item_id, 4, 500.0, "2025-05-15")
+
+        report = service.get_inventory_valuation_report()
+        entry = report["items"][0]
+        assert (entry["open_lots"], entry["lot_quantity"]) == (3, 17)
+        assert entry["lot_value"] == entry["asset_value"] == 3 * 400 + 10 * 450 + 4 * 500
+
+        # A fresh service reloads the same layers from the lots table
+        reloaded = make_service().get_inventory_valuation_report()
+        assert reloaded["items"][0]["lot_value"] == entry["lot_value"]
+        assert reloaded["total_lot_value"] == service.list_lots(item_id)["total_value"]
+
+    def test_sales_from_two_workers_share_the_lots(self, make_service):
+        first = make_service()
+        item_id = stock_item(first, "fifo", LOTS)
+        first.sell_inventory(item_id, 3, "2025-05-01")
+        second = make_service()
+
+        assert second.sell_inventory(item_id, 4, "2025-05-02")["cogs"] == 2 * 380 + 2 * 400
+        assert first.sell_inventory(item_id, 10, "2025-05-03")["cogs"] == 8 * 400 + 2 * 450
+
+        remaining = [lot["remaining_quantity"] for lot in second.list_lots(item_id)["lots"]]
+        assert sorted(remaining) == [0, 0, 8]
+        assert first.get_item(item_id)["quantity_on_hand"] == 8
+
+    def test_batch_endpoint(self, client, auth_headers):
+        created = client.post("/api/v1/genfin/items/inventory", params={
+            "name": "Glyphosate 2.5 gal", "cost": 60.0
+        }, headers=auth_headers).json()
+        item_id = created["item"]["item_id"]
+        client.post("/api/v1/genfin/inventory/receive", params={
+            "item_id": item_id, "quantity": 40, "cost_per_unit": 55.0, "received_date": "2025-03-01"
+        }, headers=auth_headers)
+
+        response = client.post("/api/v1/genfin/inventory/sell-batch", json={"sales": [
+            {"item_id": item_id, "quantity": 10, "sale_date": "2025-05-01"},
+            {"item_id": item_id, "quantity": 5, "sale_date": "2025-05-02"},
+        ]}, headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["sales_posted"] == 2
+        assert data["results"][-1]["remaining_quantity"] == 25
@@ -0,0 +1,260 @@
+"""
+GenFin General Ledger Tests
+===========================
+Tests for materialized account balances in GenFinCoreService and the
+set-based report engine in GenFinReportsService.
+
+Run with: pytest tests/test_genfin_ledger.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "backend"))
+
+
+@pytest.fixture
+def core(test_db_path):
+    """GenFinCoreService bound to an isolated database (bypasses the singleton)."""
+    from services.genfin_core_service import GenFinCoreService
+
+    service = object.__new__(GenFinCoreService)
+    service._initialized = False
+    service.__init__(test_db_path)
+    return service
+
+
+@pytest.fixture
+def reports(core, monkeypatch):
+    """GenFinReportsService reading from the isolated core service."""
+    from services import genfin_reports_service as module
+
+    monkeypatch.setattr(module, "genfin_core_service", core)
+    service = object.__new__(module.GenFinReportsService)
+    service._initialized = False
+    service.__init__(core.db_path)
+    return service
+
+
+def _count_queries(core):
+    """Install a statement counter on every connection the core hands out."""
+    statements = []
+    original = core._get_connection
+
+    def counting_connection():
+        conn = original()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    core._get_connection = counting_connection
+    return statements
+
+
+def _scan_balance(core, account_id, as_of_date=None):
+    """Reference balance computed by scanning raw journal lines."""
+    with core._get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM genfin_accounts WHERE account_id = ?", (account_id,))
+        account = cursor.fetchone()
+        query = """
+            SELECT l.debit, l.credit FROM genfin_journal_entry_lines l
+            JOIN genfin_journal_entries e ON l.entry_id = e.entry_id
+            WHERE l.account_id = ? AND e.status IN ('posted', 'reconciled')
+        """
+        params = [account_id]
+        if as_of_date:
+            query += " AND e.entry_date <= ?"
+            params.append(as_of_date)
+        cursor.execute(query, params)
+        balance = account["opening_balance"] or 0.0
+        for row in cursor.fetchall():
+            balance += core._signed_balance(account["account_type"], row["debit"], row["credit"])
+    return round(balance, 2)
+
+
+def _entry(core, entry_date, debit_acct, credit_acct, amount, auto_post=True):
+    result = core.create_journal_entry(
+        entry_date=entry_date,
+        lines=[
+            {"account_id": debit_acct, "debit": amount, "credit": 0},
+            {"account_id": credit_acct, "debit": 0, "credit": amount},
+        ],
+        auto_post=auto_post,
+    )
+    assert result["success"]
+    return result["entry_id"]
+
+
+class TestMaterializedBalances:
+    """Balance table stays in step with postings, voids and reversals."""
+
+    def test_balances_match_line_scan(self, core):
+        cash = core.get_account_by_number("1010")["account_id"]
+        revenue = core.get_account_by_number("4000")["account_id"]
+        expense = core.get_account_by_number("5000")["account_id"]
+
+        _entry(core, "2024-03-01", cash, revenue, 1000.00)
+        _entry(core, "2024-01-15", cash, revenue, 250.50)   # back-dated
+        _entry(core, "2024-03-01", expense, cash, 99.99)
+        _entry(core, "2024-06-30", expense, cash, 400.00)
+
+        for account_id in (cash, revenue, expense):
+            for as_of in (None, "2024-01-14", "2024-01-15", "2024-03-01", "2024-05-01", "2024-12-31"):
+                assert core.get_account_balance(account_id, as_of) == _scan_balance(core, account_id, as_of)
+
+        assert core.get_account_balance(cash) == 750.51
+        assert core.verify_account_balances()["consistent"]
+
+    def test_draft_post_void_and_reverse(self, core):
+        cash = core.get_account_by_number("1010")["account_id"]
+        revenue = core.get_account_by_number("4000")["account_id"]
+
+        draft_id = _entry(core, "2024-02-01", cash, revenue, 500.00, auto_post=False)
+        assert core.get_account_balance(cash) == 0.0
+
+        core.post_journal_entry(draft_id)
+        assert core.get_account_balance(cash) == 500.00
+
+        other_id = _entry(core, "2024-02-10", cash, revenue, 75.00)
+        core.void_journal_entry(other_id, "duplicate")
+        assert core.get_account_balance(cash) == 500.00
+
+        core.reverse_journal_entry(draft_id, "2024-04-01")
+        assert core.get_account_balance(cash, "2024-03-31") == 500.00
+        assert core.get_account_balance(cash) == 0.0
+
+        assert core.verify_account_balances()["consistent"]
+
+    def test_trial_balance_balances(self, core):
+        cash = core.get_account_by_number("1010")["account_id"]
+        revenue = core.get_account_by_number("4000")["account_id"]
+        _entry(core, "2024-05-05", cash, revenue, 1234.56)
+
+        trial = core.get_trial_balance()
+        assert trial["balanced"]
+        assert trial["total_debits"] == 1234.56
+
+    def test_account_activity_between_dates(self, core):
+        cash = core.get_account_by_number("1010")["account_id"]
+        revenue = core.get_account_by_number("4000")["account_id"]
+        _entry(core, "2024-01-10", cash, revenue, 100.00)
+        _entry(core, "2024-02-10", cash, revenue, 200.00)
+        _entry(core, "2024-03-10", cash, revenue, 300.00)
+
+        activity = core.get_account_activity(cash, "2024-02-01", "2024-02-29")
+        assert activity["total_debits"] == 200.00
+        assert activity["net_change"] == 200.00
+
+    def test_verify_detects_drift_and_rebuild_repairs(self, core):
+        cash = core.get_account_by_number("1010")["account_id"]
+        revenue = core.get_account_by_number("4000")["account_id"]
+        _entry(core, "2024-07-01", cash, revenue, 42.00)
+
+        with core._get_connection() as conn:
+            conn.execute("UPDATE genfin_account_balances SET running_debit = running_debit + 1")
+            conn.commit()
+
+        report = core.verify_account_balances()
+        assert not report["consistent"]
+        assert report["mismatches"][0]["problem"] == "mismatch"
+
+        core.rebuild_account_balances()
+        assert core.verify_account_balances()["consistent"]
+        assert core.get_account_balance(cash) == 42.00
+
+
+class TestSetBasedReports:
+    """Reports aggregate all accounts and periods in a fixed number of queries."""
+
+    @pytest.fixture
+    def ledger(self, core):
+        accounts = {
+            number: core.get_account_by_number(number)["account_id"]
+            for number in ("1010", "4000", "4010", "5000", "6700", "1100")
+        }
+        cash, crops, livestock, cogs, depreciation, receivable = (
+            accounts["1010"], accounts["4000"], accounts["4010"],
+            accounts["5000"], accounts["6700"], accounts["1100"]
+        )
+        for month in range(1, 13):
+            _entry(core, f"2023-{month:02d}-15", cash, crops, 100.0 * month)
+            _entry(core, f"2024-{month:02d}-15", cash, crops, 150.0 * month)
+            _entry(core, f"2024-{month:02d}-20", cogs, cash, 40.0 * month)
+        _entry(core, "2024-06-01", receivable, livestock, 900.00)
+        _entry(core, "2024-09-30", depreciation, cash, 250.00)
+        return accounts
+
+    def test_profit_loss_matches_per_account_scan(self, reports, ledger):
+        from datetime import date
+
+        report = reports.get_profit_loss(
+            "2024-01-01", "2024-12-31",
+            compare_prior_period=True, compare_prior_year=True, group_by_month=True
+        )
+
+        revenue = sum(
+            reports._get_account_balance_for_period(ledger[n], date(2024, 1, 1), date(2024, 12, 31))
+            for n in ("4000", "4010")
+        )
+        assert report["revenue"]["total"] == revenue == 12600.00
+        assert report["cost_of_goods_sold"]["total"] == 3120.00
+        assert report["operating_expenses"]["total"] == 250.00
+        assert report["net_income"] == 9230.00
+
+        assert report["comparison"]["prior_year"]["total_revenue"] == 7800.00
+        assert report["comparison"]["prior_period"]["end_date"] == "2023-12-31"
+        assert report["comparison"]["prior_period"]["net_income"] == 7800.00
+
+        months = report["monthly_breakdown"]
+        assert len(months) == 12
+        assert months[5]["revenue"] == 1800.00
+        assert months[5]["cogs"] == 240.00
+        assert sum(m["net_income"] for m in months) == pytest.approx(report["net_income"])
+
+    def test_profit_loss_query_count_is_constant(self, core, reports, ledger):
+        statements = _count_queries(core)
+        reports.get_profit_loss("2024-01-01", "2024-01-31")
+        single = len(statements)
+
+        statements.clear()
+        reports.get_profit_loss(
+            "2024-01-01", "2024-12-31",
+            compare_prior_period=True, compare_prior_year=True, group_by_month=True
+        )
+        assert len(statements) == single <= 3
+
+    def test_class_filter_applies_to_comparisons(self, core, reports, ledger):
+        farm = core.create_class("North Farm")["class_id"]
+        core.create_journal_entry(
+            entry_date="2024-03-01",
+            lines=[
+                {"account_id": ledger["1010"], "debit": 60.0, "credit": 0, "class_id": farm},
+                {"account_id": ledger["4000"], "debit": 0, "credit": 60.0, "class_id": farm},
+            ],
+            auto_post=True,
+        )
+
+        report = reports.get_profit_loss("2024-01-01", "2024-12-31", compare_prior_year=True, class_id=farm)
+        assert report["revenue"]["total"] == 60.00
+        assert report["comparison"]["prior_year"]["total_revenue"] == 0.00
+
+    def test_balance_sheet_and_cash_flow(self, core, reports, ledger):
+        sheet = reports.get_balance_sheet("2024-12-31", compare_prior_year=True)
+        assert sheet["equity"]["total"] == 9230.00  # current year earnings
+        assert sheet["assets"]["total"] == core.get_account_balance(ledger["1010"], "2024-12-31") + 900.00
+        assert sheet["comparison"]["prior_year"]["total_assets"] == 7800.00
+
+        flow = reports.get_cash_flow("2024-01-01", "2024-12-31")
+        assert flow["beginning_cash"] == 7800.00
+        assert flow["operating_activities"]["adjustments"]["depreciation"] == 250.00
+        assert flow["operating_activities"]["adjustments"]["ar_change"] == -900.00
+        assert flow["ending_cash"] == core.get_account_balance(ledger["1010"], "2024-12-31")
+
+    def test_balances_at_several_dates(self, core, ledger):
+        dates = ["2023-06-30", "2024-06-30", None]
+        balances = core.get_account_balances_at(dates)
+        for as_of in dates:
+            assert balances[as_of] == core.get_account_balances(as_of)
@@ -568,6 +568,116 @@ class TestPayrollReporting:
         assert response.status_code in [200, 404]
 
 
+# ============================================================================
+# BATCHED PAY RUN CALCULATION
+# ============================================================================
+
+@pytest.fixture
+def payroll_service(test_db_path):
+    """GenFinPayrollService bound to an isolated database (bypasses the singleton)."""
+    from services.genfin_payroll_service import GenFinPayrollService
+
+    service = object.__new__(GenFinPayrollService)
+    service._initialized = False
+    service.__init__(test_db_path)
+    return service
+
+
+def _hourly_crew(service, size, state="IA"):
+    """Create hourly employees and log 40 regular hours each."""
+    employee_ids = []
+    for i in range(size):
+        emp = service.create_employee(
+            first_name=f"Crew{i}", last_name="Member", state=state,
+            employee_type="seasonal", pay_type="hourly", pay_rate=20.0,
+            pay_frequency="weekly"
+        )
+        service.record_time(emp["employee_id"], "2024-09-02", regular_hours=40.0)
+        employee_ids.append(emp["employee_id"])
+    return employee_ids
+
+
+def _calculate_counting_queries(service, pay_run_id):
+    """Run calculate_pay_run and return it with the SQL statements it issued."""
+    statements = []
+    original = service._get_connection
+
+    def counting_connection():
+        conn = original()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    service._get_connection = counting_connection
+    try:
+        result = service.calculate_pay_run(pay_run_id)
+    finally:
+        service._get_connection = original
+    # Pooled connections keep the callback, so snapshot what this run issued
+    return result, list(statements)
+
+
+class TestPayRunBatchCalculation:
+    """calculate_pay_run preloads the whole crew instead of querying per line."""
+
+    def test_crew_pay_is_calculated(self, payroll_service):
+        _hourly_crew(payroll_service, 3)
+        run = payroll_service.create_pay_run("2024-09-01", "2024-09-07", "2024-09-13", "bank-1")
+
+        result = payroll_service.calculate_pay_run(run["pay_run_id"])
+
+        assert result["success"]
+        pay_run = result["pay_run"]
+        assert pay_run["status"] == "calculated"
+        assert pay_run["total_gross"] == 2400.00
+        assert pay_run["total_net"] < pay_run["total_gross"]
+
+    def test_query_count_does_not_grow_with_crew(self, payroll_service):
+        small = _hourly_crew(payroll_service, 2)
+        run = payroll_service.create_pay_run(
+            "2024-09-01", "2024-09-07", "2024-09-13", "bank-1", employee_ids=small
+        )
+        _, small_statements = _calculate_counting_queries(payroll_service, run["pay_run_id"])
+
+        large = _hourly_crew(payroll_service, 25)
+        run = payroll_service.create_pay_run(
+            "2024-09-01", "2024-09-07", "2024-09-13", "bank-1", employee_ids=large
+        )
+        result, large_statements = _calculate_counting_queries(payroll_service, run["pay_run_id"])
+
+        assert result["pay_run"]["total_gross"] == 25 * 800.00
+        assert len([s for s in large_statements if s.lstrip().startswith("SELECT")]) == \
+            len([s for s in small_statements if s.lstrip().startswith("SELECT")])
+
+    def test_ytd_earnings_cap_futa(self, payroll_service):
+        employee_ids = _hourly_crew(payroll_service, 2)
+        first = payroll_service.create_pay_run("2024-09-01", "2024-09-07", "2024-09-13", "bank-1")
+        payroll_service.calculate_pay_run(first["pay_run_id"])
+        with payroll_service._get_connection() as conn:
+            conn.execute(
+                "UPDATE genfin_pay_run_lines SET gross_pay = 7000 WHERE employee_id = ?",
+                (employee_ids[0],)
+            )
+            conn.execute(
+                "UPDATE genfin_pay_runs SET status = 'approved' WHERE pay_run_id = ?",
+                (first["pay_run_id"],)
+            )
+            conn.commit()
+
+        second = payroll_service.create_pay_run("2024-09-01", "2024-09-07", "2024-09-20", "bank-1")
+        payroll_service.calculate_pay_run(second["pay_run_id"])
+
+        with payroll_service._get_connection() as conn:
+            futa = {
+                row["employee_id"]: row["futa"]
+                for row in conn.execute(
+                    "SELECT employee_id, futa FROM genfin_pay_run_lines WHERE pay_run_id = ?",
+                    (second["pay_run_id"],)
+                )
+            }
+        assert futa[employee_ids[0]] == 0.0  # FUTA wage base already reached
+        assert futa[employee_ids[1]] > 0.0
+
+
 # ============================================================================
 # UNIT TESTS FOR SERVICE LAYER
 # ============================================================================
@@ -0,0 +1,184 @@
+"""
+Tests for zoom-level geometry simplification and its cache.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services import geometry_simplification as gs
+from services.geometry_simplification import (
+    SimplifiedGeometryCache,
+    coordinate_precision,
+    douglas_peucker,
+    simplification_tolerance,
+    simplify_geometry,
+)
+from services.gis_layers_service import GISLayersService, FeatureCreate, FeatureUpdate
+
+
+def rtk_outline(west=-93.5, south=42.0, size=0.01, per_side=2000, jitter=1e-7):
+    """Square field outline with a vertex every few centimetres, slightly noisy"""
+    rng = np.random.default_rng(1)
+    t = np.linspace(0, size, per_side, endpoint=False)
+    sides = [
+        np.column_stack((west + t, np.full_like(t, south))),
+        np.column_stack((np.full_like(t, west + size), south + t)),
+        np.column_stack((west + size - t, np.full_like(t, south + size))),
+        np.column_stack((np.full_like(t, west), south + size - t)),
+    ]
+    ring = np.vstack(sides) + rng.normal(0, jitter, (4 * per_side, 2))
+    ring = np.vstack((ring, ring[:1]))
+    return {"type": "Polygon", "coordinates": [ring.tolist()]}
+
+
+class TestDouglasPeucker:
+    """Vertex selection"""
+
+    def test_collinear_points_dropped(self):
+        points = np.column_stack((np.arange(10.0), np.zeros(10)))
+        assert douglas_peucker(points, 0.1).tolist() == [True] + [False] * 8 + [True]
+
+    def test_corner_kept(self):
+        points = np.array([[0, 0], [1, 0.01], [2, 0], [2, 1], [2, 2.0]])
+        assert douglas_peucker(points, 0.1).tolist() == [True, False, True, False, True]
+
+    def test_closed_ring(self):
+        points = np.array([[0, 0], [1, 0], [1, 1], [0, 1], [0, 0.0]])
+        assert douglas_peucker(points, 0.1).all()
+
+    def test_tolerance_halves_per_zoom(self):
+        assert simplification_tolerance(13) == pytest.approx(simplification_tolerance(12) / 2)
+        assert coordinate_precision(20) > coordinate_precision(10)
+
+
+class TestSimplifyGeometry:
+    """GeoJSON shapes are simplified within a pixel"""
+
+    def test_rtk_outline_reduced_to_corners(self):
+        outline = rtk_outline()
+        simplified = simplify_geometry(outline, 14)
+        ring = simplified["coordinates"][0]
+
+        assert 5 <= len(ring) < 20
+        assert ring[0] == ring[-1]
+        assert min(x for x, _ in ring) == pytest.approx(-93.5, abs=simplification_tolerance(14))
+
+    def test_full_resolution_past_max_zoom(self):
+        outline = rtk_outline(per_side=50)
+        assert simplify_geometry(outline, gs.MAX_SIMPLIFY_ZOOM + 1) is outline
+
+    def test_small_holes_dropped_and_outer_ring_kept(self):
+        hole = [[-93.495, 42.005], [-93.49499, 42.005], [-93.49499, 42.00501], [-93.495, 42.005]]
+        polygon = {"type": "Polygon", "coordinates": [rtk_outline(per_side=50)["coordinates"][0], hole]}
+        simplified = simplify_geometry(polygon, 10)
+
+        assert len(simplified["coordinates"]) == 1
+
+        tiny = {"type": "Polygon", "coordinates": [[[0, 0], [1e-7, 0], [1e-7, 1e-7], [0, 1e-7], [0, 0]]]}
+        assert len(simplify_geometry(tiny, 5)["coordinates"][0]) == 5
+
+    def test_points_rounded(self):
+        point = {"type": "Point", "coordinates": [-93.123456789, 42.987654321]}
+        digits = coordinate_precision(12)
+        assert simplify_geometry(point, 12)["coordinates"] == [round(-93.123456789, digits), round(42.987654321, digits)]
+
+    def test_multi_and_collections(self):
+        outline = rtk_outline(per_side=200)
+        multi = {"type": "MultiPolygon", "coordinates": [outline["coordinates"], outline["coordinates"]]}
+        collection = {"type": "GeometryCollection", "geometries": [outline]}
+
+        assert all(len(part[0]) < 20 for part in simplify_geometry(multi, 14)["coordinates"])
+        assert len(simplify_geometry(collection, 14)["geometries"][0]["coordinates"][0]) < 20
+
+
+class TestSimplifiedGeometryCache:
+    """Simplified geometries are stored per zoom and version"""
+
+    @pytest.fixture
+    def cursor(self, tmp_path):
+        conn = sqlite3.connect(str(tmp_path / "cache.db"))
+        cache = SimplifiedGeometryCache("fields")
+        cache.create(conn.cursor())
+        yield conn.cursor()
+        conn.close()
+
+    def test_hit_miss_and_version(self, cursor, monkeypatch):
+        cache = SimplifiedGeometryCache("fields")
+        calls = []
+        real = gs.simplify_geometry
+        monkeypatch.setattr(gs, "simplify_geometry", lambda g, z: calls.append(z) or real(g, z))
+        text = json.dumps(rtk_outline(per_side=100))
+
+        first = cache.get(cursor, [(1, "v1", text)], 12)
+        again = cache.get(cursor, [(1, "v1", text)], 12)
+        cache.get(cursor, [(1, "v1", text)], 13)
+        cache.get(cursor, [(1, "v1", text)], 14)
+        edited = cache.get(cursor, [(1, "v2", text)], 12)
+
+        assert calls == [12, 14, 12]
+        assert first == again == edited
+
+    def test_sources_kept_apart_and_invalidated(self, cursor):
+        fields, features = SimplifiedGeometryCache("fields"), SimplifiedGeometryCache("gis_features")
+        fields.get(cursor, [(1, "v1", rtk_outline(per_side=20))], 10)
+        features.get(cursor, [(1, "v1", rtk_outline(per_side=20))], 10)
+
+        fields.invalidate(cursor, [1])
+
+        rows = cursor.execute("SELECT source FROM gis_simplified_geometries").fetchall()
+        assert rows == [("gis_features",)]
+
+    def test_oldest_entries_evicted(self, cursor, monkeypatch):
+        monkeypatch.setattr(gs, "MAX_CACHE_ENTRIES", 4)
+        monkeypatch.setattr(gs, "CACHE_EVICT_TO", 2)
+        cache = SimplifiedGeometryCache("fields")
+        for row_id in range(1, 6):
+            cache.get(cursor, [(row_id, "v1", rtk_outline(per_side=20))], 10)
+
+        rows = cursor.execute("SELECT id FROM gis_simplified_geometries ORDER BY id").fetchall()
+        assert rows == [(4,), (5,)]
+
+    def test_prune_inactive(self, cursor):
+        cursor.execute("CREATE TABLE fields (id INTEGER PRIMARY KEY, is_active INTEGER)")
+        cursor.executemany("INSERT INTO fields VALUES (?, ?)", [(1, 1), (2, 0)])
+        cache = SimplifiedGeometryCache("fields")
+        cache.get(cursor, [(1, "v1", rtk_outline(per_side=20)), (2, "v1", rtk_outline(per_side=20))], 10)
+
+        cache.prune(cursor, "SELECT id FROM fields WHERE is_active = 1")
+
+        assert cursor.execute("SELECT id FROM gis_simplified_geometries").fetchall() == [(1,)]
+
+    def test_unreadable_and_full_resolution_omitted(self, cursor):
+        cache = SimplifiedGeometryCache("fields")
+        assert cache.get(cursor, [(1, "v1", "{not json")], 10) == {}
+        assert cache.get(cursor, [(1, "v1", rtk_outline(per_side=20))], gs.MAX_SIMPLIFY_ZOOM + 1) == {}
+
+
+class TestLayerFeatureSimplification:
+    """get_layer_features serves cached, simplified geometry for a zoom"""
+
+    def test_zoom_simplifies_and_edit_invalidates(self, tmp_path):
+        service = GISLayersService(str(tmp_path / "gis.db"))
+        conn = sqlite3.connect(service.db_path)
+        layer_id = conn.execute("INSERT INTO gis_layers (name) VALUES ('Fields')").lastrowid
+        conn.commit()
+        conn.close()
+
+        feature, _ = service.create_feature(layer_id, FeatureCreate(geometry=rtk_outline()), user_id=1)
+
+        full = service.get_layer_features(layer_id)
+        coarse = service.get_layer_features(layer_id, bbox=(-94, 41, -93, 43), zoom=14)
+        assert len(full.features[0]["geometry"]["coordinates"][0]) == 8001
+        assert len(coarse.features[0]["geometry"]["coordinates"][0]) < 20
+
+        moved = rtk_outline(west=-93.4, per_side=10)
+        service.update_feature(feature.id, FeatureUpdate(geometry=moved), user_id=1)
+        ring = service.get_layer_features(layer_id, zoom=14).features[0]["geometry"]["coordinates"][0]
+        assert min(x for x, _ in ring) == pytest.approx(-93.4, abs=1e-4)
@@ -0,0 +1,165 @@
+"""
+Tests for batch area/perimeter calculation and bulk acreage recalculation.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+import pyproj
+import pytest
+from shapely.geometry import shape
+from shapely.ops import transform
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services import gis_service as gis_module
+from services.gis_service import GISService
+
+
+def rectangle(west, south, width=0.01, height=0.008):
+    return {
+        "type": "Polygon",
+        "coordinates": [[
+            [west, south], [west + width, south], [west + width, south + height],
+            [west, south + height], [west, south]
+        ]]
+    }
+
+
+def reference_area(geometry):
+    """Area and perimeter the way calculate_area used to compute them"""
+    geom = shape(geometry)
+    zone = int((geom.centroid.x + 180) / 6) + 1
+    transformer = pyproj.Transformer.from_crs("EPSG:4326", f"EPSG:326{zone:02d}", always_xy=True)
+    utm = transform(transformer.transform, geom)
+    return utm.area, utm.length
+
+
+@pytest.fixture
+def gis(tmp_path):
+    db_path = str(tmp_path / "fields.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE fields (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT, farm_name TEXT, acreage REAL, current_crop TEXT, soil_type TEXT,
+            location_lat REAL, location_lng REAL, boundary TEXT,
+            is_active INTEGER DEFAULT 1, updated_at TEXT
+        )
+    """)
+    conn.commit()
+    conn.close()
+    return GISService(db_path)
+
+
+def add_fields(db_path, rows):
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO fields (name, farm_name, acreage, boundary, updated_at) VALUES (?, ?, ?, ?, 't1')", rows
+    )
+    conn.commit()
+    conn.close()
+
+
+def acreages(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = dict(conn.execute("SELECT name, acreage FROM fields").fetchall())
+    conn.close()
+    return rows
+
+
+class TestCalculateAreas:
+    """Batch results match per-geometry UTM measurement"""
+
+    def test_matches_reference_across_zones(self, gis):
+        # Iowa (zone 15), Nebraska (14), Ohio (17)
+        geometries = [rectangle(-93.5, 42.0), rectangle(-99.2, 41.1, 0.02, 0.02), rectangle(-83.0, 40.0)]
+        results = gis.calculate_areas(geometries)
+
+        for geometry, result in zip(geometries, results):
+            area, perimeter = reference_area(geometry)
+            assert result.area_sq_meters == pytest.approx(area, abs=0.01)
+            assert result.perimeter_meters == pytest.approx(perimeter, abs=0.01)
+            assert result.area_acres == round(area / 4046.8564224, 2)
+
+    def test_multipolygon_and_holes(self, gis):
+        outer = rectangle(-93.5, 42.0)["coordinates"][0]
+        hole = rectangle(-93.498, 42.002, 0.002, 0.002)["coordinates"][0]
+        with_hole = {"type": "Polygon", "coordinates": [outer, hole]}
+        multi = {"type": "MultiPolygon", "coordinates": [[outer], rectangle(-93.4, 42.0)["coordinates"]]}
+
+        results = gis.calculate_areas([with_hole, multi])
+
+        assert results[0].area_sq_meters == pytest.approx(reference_area(with_hole)[0], abs=0.01)
+        assert results[1].area_sq_meters == pytest.approx(reference_area(multi)[0], abs=0.01)
+
+    def test_invalid_and_empty_are_none(self, gis):
+        results = gis.calculate_areas([{"type": "Bogus"}, {"type": "Polygon", "coordinates": []}, rectangle(-93.5, 42.0)])
+
+        assert results[0] is None and results[1] is None
+        assert results[2].area_acres > 0
+
+    def test_strings_3d_and_short_rings(self, gis):
+        flat = rectangle(-93.5, 42.0)
+        with_z = {"type": "Polygon", "coordinates": [[[x, y, 300.0] for x, y in flat["coordinates"][0]]]}
+        short = {"type": "Polygon", "coordinates": [[[0, 0], [1, 1], [0, 0]]]}
+        point = {"type": "Point", "coordinates": [-93.5, 42.0]}
+
+        results = gis.calculate_areas([json.dumps(flat), with_z, short, point])
+
+        assert results[0] == results[1] == gis.calculate_area(flat)
+        assert results[2] is None
+        assert results[3].area_sq_meters == 0
+
+    def test_single_area_uses_batch_path(self, gis):
+        geometry = rectangle(-93.5, 42.0)
+        assert gis.calculate_area(geometry) == gis.calculate_areas([geometry])[0]
+        with pytest.raises(ValueError):
+            gis.calculate_area({"type": "Polygon", "coordinates": []})
+
+    def test_transformers_reused(self, gis):
+        gis_module._get_transformer.cache_clear()
+        gis.calculate_areas([rectangle(-93.5 + i * 0.02, 42.0) for i in range(50)])
+        gis.calculate_area(rectangle(-93.0, 42.0))
+
+        info = gis_module._get_transformer.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+
+class TestRecalculateFieldAcreage:
+    """Acreage is written back for changed fields in one pass"""
+
+    def test_updates_changed_fields_only(self, gis):
+        exact = gis.calculate_area(rectangle(-93.4, 42.0)).area_acres
+        add_fields(gis.db_path, [
+            ("North", "Home", None, json.dumps(rectangle(-93.5, 42.0))),
+            ("South", "Home", exact, json.dumps(rectangle(-93.4, 42.0))),
+            ("Broken", "Home", 10.0, "{not json"),
+            ("Rented", "Other", None, json.dumps(rectangle(-93.3, 42.0))),
+            ("Unmapped", "Home", 55.0, None),
+        ])
+
+        result = gis.recalculate_field_acreage(farm_name="Home")
+
+        assert result.success
+        assert result.fields_checked == 3
+        assert result.fields_updated == 1
+        assert len(result.errors) == 1 and "3" in result.errors[0]
+        values = acreages(gis.db_path)
+        assert values["North"] == gis.calculate_area(rectangle(-93.5, 42.0)).area_acres
+        assert values["Broken"] == 10.0 and values["Unmapped"] == 55.0 and values["Rented"] is None
+
+    def test_field_ids_and_batches(self, gis, monkeypatch):
+        monkeypatch.setattr(gis_module, "AREA_BATCH_SIZE", 7)
+        add_fields(gis.db_path, [
+            (f"F{i}", "Home", None, json.dumps(rectangle(-96 + i * 0.05, 41 + (i % 5) * 0.05))) for i in range(30)
+        ])
+
+        assert gis.recalculate_field_acreage(field_ids=[1, 2]).fields_updated == 2
+        result = gis.recalculate_field_acreage()
+
+        assert result.fields_checked == 30 and result.fields_updated == 28
+        assert all(value > 0 for value in acreages(gis.db_path).values())
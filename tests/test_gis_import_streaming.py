@@ -0,0 +1,319 @@
+"""
+Tests for the streaming, chunked GIS file import.
+"""
+
+import asyncio
+import io
+import json
+import os
+import sqlite3
+import sys
+import threading
+from types import SimpleNamespace
+
+import fiona
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services import gis_service as gis_module
+from services.gis_service import GISService
+from services.gis_layers_service import GISLayersService
+
+
+def rectangle(west, south, width=0.01, height=0.008):
+    return {
+        "type": "Polygon",
+        "coordinates": [[
+            (west, south), (west + width, south), (west + width, south + height),
+            (west, south + height), (west, south)
+        ]]
+    }
+
+
+def write_features(path, features, geometry="Polygon", driver="GeoJSON", crs="EPSG:4326"):
+    schema = {"geometry": geometry, "properties": {"name": "str", "yield": "float"}}
+    with fiona.open(str(path), "w", driver=driver, schema=schema, crs=crs) as dst:
+        for geometry_dict, props in features:
+            dst.write({"geometry": geometry_dict, "properties": props})
+    return str(path)
+
+
+@pytest.fixture
+def gis(tmp_path):
+    db_path = str(tmp_path / "fields.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE fields (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT, farm_name TEXT, acreage REAL, current_crop TEXT, soil_type TEXT,
+            location_lat REAL, location_lng REAL, boundary TEXT,
+            is_active INTEGER DEFAULT 1, updated_at TEXT
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO fields (name, acreage, boundary, updated_at) VALUES (?, 1.0, ?, 't1')",
+        [("North 40", json.dumps(rectangle(-93.5, 42.0))), ("Creek", json.dumps(rectangle(-93.4, 42.0)))]
+    )
+    conn.commit()
+    conn.close()
+    return GISService(db_path)
+
+
+@pytest.fixture
+def layer_id(gis):
+    conn = sqlite3.connect(GISLayersService(gis.db_path).db_path)
+    layer_id = conn.execute("INSERT INTO gis_layers (name) VALUES ('Imported')").lastrowid
+    conn.commit()
+    conn.close()
+    return layer_id
+
+
+def field(db_path, name):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    row = conn.execute("SELECT * FROM fields WHERE name = ?", (name,)).fetchone()
+    conn.close()
+    return row
+
+
+class TestChunkedImport:
+    """Features are read, written and reported chunk by chunk"""
+
+    def test_chunks_progress_and_layer_storage(self, gis, layer_id, tmp_path, monkeypatch):
+        monkeypatch.setattr(gis_module, "IMPORT_CHUNK_SIZE", 4)
+        path = write_features(tmp_path / "samples.geojson", [
+            ({"type": "Point", "coordinates": (-95 + i * 0.01, 41.0)}, {"name": f"S{i}", "yield": 200.0 + i})
+            for i in range(10)
+        ], geometry="Point")
+        events = []
+
+        result = gis.import_file(path, match_by="none", layer_id=layer_id, progress=events.append)
+
+        assert result.success
+        assert result.imported_count == result.stored_count == 10
+        assert [e.features_read for e in events] == [4, 8, 10]
+        assert events[-1].total_features == 10
+        features = GISLayersService(gis.db_path).get_layer_features(layer_id, bbox=(-95.001, 40.9, -94.975, 41.1))
+        assert len(features.features) == 3
+        assert features.features[0]["properties"]["yield"] == 200.0
+
+    def test_bbox_filter(self, gis, tmp_path):
+        path = write_features(tmp_path / "samples.geojson", [
+            ({"type": "Point", "coordinates": (-95 + i, 41.0)}, {"name": f"S{i}", "yield": 1.0})
+            for i in range(5)
+        ], geometry="Point")
+
+        result = gis.import_file(path, match_by="none", bbox=(-93.5, 40, -91.5, 42))
+
+        assert result.imported_count == 2
+        assert sorted(f["name"] for f in result.features) == ["S2", "S3"]
+
+    def test_preview_limited(self, gis, tmp_path, monkeypatch):
+        monkeypatch.setattr(gis_module, "IMPORT_PREVIEW_LIMIT", 3)
+        monkeypatch.setattr(gis_module, "IMPORT_CHUNK_SIZE", 2)
+        path = write_features(tmp_path / "samples.geojson", [
+            ({"type": "Point", "coordinates": (-95 + i * 0.1, 41.0)}, {"name": f"S{i}", "yield": 1.0})
+            for i in range(7)
+        ], geometry="Point")
+
+        result = gis.import_file(path, match_by="none")
+
+        assert result.imported_count == 7
+        assert [f["name"] for f in result.features] == ["S0", "S1", "S2"]
+
+    def test_unknown_layer_and_match_mode(self, gis, tmp_path):
+        path = write_features(tmp_path / "one.geojson", [(rectangle(-93, 42), {"name": "A", "yield": 1.0})])
+
+        assert not gis.import_file(path, layer_id=999).success
+        assert not gis.import_file(path, match_by="overlap").success
+
+
+class TestMatching:
+    """Imported polygons replace existing field boundaries"""
+
+    def test_match_by_name(self, gis, tmp_path):
+        moved = rectangle(-93.6, 42.1, 0.02, 0.01)
+        path = write_features(tmp_path / "fields.geojson", [
+            (moved, {"name": "north 40", "yield": 1.0}),
+            (rectangle(-90, 40), {"name": "Unknown", "yield": 1.0}),
+        ])
+
+        result = gis.import_file(path, match_by="name")
+
+        assert result.matched_count == 1 and result.imported_count == 1
+        row = field(gis.db_path, "North 40")
+        assert json.loads(row["boundary"])["coordinates"][0][0] == [-93.6, 42.1]
+        assert row["acreage"] == gis.calculate_area(moved).area_acres
+        assert row["location_lng"] == pytest.approx(-93.59)
+        # Index and simplification cache follow the new boundary
+        found = gis.get_field_boundaries(bbox=(-93.62, 42.09, -93.57, 42.12), zoom=14)
+        assert [f.properties["name"] for f in found.features] == ["North 40"]
+
+    def test_match_by_location(self, gis, tmp_path):
+        redrawn = rectangle(-93.4005, 42.0005, 0.0105, 0.0075)
+        path = write_features(tmp_path / "fields.geojson", [
+            (redrawn, {"name": "Field 7", "yield": 1.0}),
+            (rectangle(-93.495, 42.0, 0.02, 0.008), {"name": "Straddles", "yield": 1.0}),
+        ])
+
+        result = gis.import_file(path, match_by="location")
+
+        assert result.matched_count == 1 and result.imported_count == 1
+        assert json.loads(field(gis.db_path, "Creek")["boundary"])["coordinates"][0][0] == [-93.4005, 42.0005]
+        assert json.loads(field(gis.db_path, "North 40")["boundary"])["coordinates"][0][0] == [-93.5, 42.0]
+
+    def test_points_tagged_with_containing_field(self, gis, layer_id, tmp_path):
+        path = write_features(tmp_path / "samples.geojson", [
+            ({"type": "Point", "coordinates": (-93.395, 42.004)}, {"name": "S1", "yield": 1.0}),
+            ({"type": "Point", "coordinates": (-80.0, 42.0)}, {"name": "S2", "yield": 1.0}),
+        ], geometry="Point")
+
+        result = gis.import_file(path, match_by="location", layer_id=layer_id)
+
+        assert result.matched_count == 0 and result.stored_count == 2
+        creek = field(gis.db_path, "Creek")["id"]
+        assert [f["properties"].get("field_id") for f in result.features] == [creek, None]
+
+
+class TestFormatsAndJobs:
+    """Shapefiles in other CRSs, geopackages and cancellable jobs"""
+
+    def test_shapefile_reprojected(self, gis, tmp_path):
+        transformer = gis_module._get_transformer("EPSG:4326", "EPSG:26915")
+        ring = [transformer.transform(x, y) for x, y in rectangle(-93.5, 42.0)["coordinates"][0]]
+        path = write_features(
+            tmp_path / "fields.shp", [({"type": "Polygon", "coordinates": [ring]}, {"name": "North 40", "yield": 1.0})],
+            driver="ESRI Shapefile", crs="EPSG:26915"
+        )
+
+        result = gis.import_file(path, match_by="location")
+
+        assert result.matched_count == 1
+        x, y = json.loads(field(gis.db_path, "North 40")["boundary"])["coordinates"][0][0]
+        assert (x, y) == (pytest.approx(-93.5), pytest.approx(42.0))
+
+    def test_geopackage(self, gis, tmp_path):
+        path = write_features(tmp_path / "fields.gpkg", [(rectangle(-91, 41), {"name": "Gpkg", "yield": 2.5})],
+                              driver="GPKG")
+
+        result = gis.import_file(path, match_by="none")
+
+        assert result.imported_count == 1
+        assert result.features[0]["properties"] == {"name": "Gpkg", "yield": 2.5}
+
+    def test_cancel_between_chunks(self, gis, layer_id, tmp_path, monkeypatch):
+        monkeypatch.setattr(gis_module, "IMPORT_CHUNK_SIZE", 3)
+        path = write_features(tmp_path / "samples.geojson", [
+            ({"type": "Point", "coordinates": (-95 + i * 0.01, 41.0)}, {"name": f"S{i}", "yield": 1.0})
+            for i in range(10)
+        ], geometry="Point")
+        job = gis.create_import_job()
+
+        result = gis.import_file(path, match_by="none", layer_id=layer_id,
+                                 progress=lambda p: p.features_read >= 6 and job.cancel(), job=job)
+
+        assert result.cancelled and result.stored_count == 6
+        assert gis.get_import_job(job.job_id).info().status == "cancelled"
+        assert job.progress.features_read == 6
+        assert len(GISLayersService(gis.db_path).get_layer_features(layer_id).features) == 6
+
+    def test_finished_jobs_pruned(self, gis, monkeypatch):
+        monkeypatch.setattr(gis_module, "MAX_FINISHED_IMPORT_JOBS", 2)
+        jobs = [gis.create_import_job() for _ in range(3)]
+        for job in jobs:
+            job.finish(gis_module.ImportResult(success=True, message="done"))
+
+        gis.create_import_job()
+
+        assert gis.get_import_job(jobs[0].job_id) is None
+        assert gis.get_import_job(jobs[2].job_id) is not None
+
+    def test_jobs_visible_only_to_owner(self, gis):
+        job = gis.create_import_job(user_id=1)
+
+        assert gis.get_import_job(job.job_id, 1) is job
+        assert gis.get_import_job(job.job_id, 2) is None
+        assert gis.get_import_job(job.job_id) is None
+
+
+class TestImportEndpoint:
+    """Upload endpoint streams progress or runs as a background job"""
+
+    def upload(self, tmp_path):
+        path = write_features(tmp_path / "samples.geojson", [
+            ({"type": "Point", "coordinates": (-95 + i * 0.01, 41.0)}, {"name": f"S{i}", "yield": 1.0})
+            for i in range(3)
+        ], geometry="Point")
+        with open(path, "rb") as f:
+            return {"file": ("samples.geojson", f.read(), "application/geo+json")}
+
+    def test_streams_ndjson(self, client, auth_headers, tmp_path):
+        response = client.post(
+            "/api/v1/gis/import",
+            files=self.upload(tmp_path),
+            data={"match_by": "none", "stream_progress": "true"},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0]["features_read"] == lines[0]["total_features"] == 3
+        assert lines[-1]["success"] and lines[-1]["imported_count"] == 3
+
+    def test_background_job(self, client, auth_headers, tmp_path):
+        response = client.post(
+            "/api/v1/gis/import",
+            files=self.upload(tmp_path),
+            data={"match_by": "none", "background": "true", "bbox": "-95.001,40,-94.995,42"},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        job_id = response.json()["job_id"]
+
+        job = client.get(f"/api/v1/gis/import/jobs/{job_id}", headers=auth_headers).json()
+
+        assert job["status"] == "completed"
+        assert job["result"]["imported_count"] == 1
+        assert client.post("/api/v1/gis/import/jobs/unknown/cancel", headers=auth_headers).status_code == 404
+
+    def test_disconnect_cancels_stream_and_file_outlives_it(self, gis, tmp_path, monkeypatch):
+        import main
+        from fastapi import BackgroundTasks, UploadFile
+        from database.async_db import DatabaseExecutor
+
+        monkeypatch.setattr(main, "get_gis_service", lambda: gis)
+        seen = {}
+        cancelled = threading.Event()
+
+        def slow_import(file_path, progress=None, job=None, **kwargs):
+            seen["job"] = job
+            progress(gis_module.GISImportProgress(features_read=1))
+            assert cancelled.wait(5)
+            seen["file_during_import"] = os.path.exists(file_path)
+            seen["path"] = file_path
+            return gis_module.ImportResult(success=True, message="done")
+
+        monkeypatch.setattr(gis, "import_file", slow_import)
+        executor = DatabaseExecutor(max_workers=1)
+
+        async def disconnect_after_first_line():
+            response = await main.import_gis_file(
+                background_tasks=BackgroundTasks(),
+                file=UploadFile(io.BytesIO(b"{}"), filename="samples.geojson"),
+                file_type="auto", match_by="none", layer_id=None, bbox=None,
+                stream_progress=True, background=False,
+                user=SimpleNamespace(id=1), db=executor
+            )
+            lines = response.body_iterator
+            assert json.loads(await lines.__anext__())["features_read"] == 1
+            await lines.aclose()
+
+        asyncio.run(disconnect_after_first_line())
+        assert seen["job"].cancel_requested
+        cancelled.set()
+        executor.shutdown(wait=True)
+
+        assert seen["file_during_import"]
+        assert not os.path.exists(seen["path"])
@@ -0,0 +1,247 @@
+"""
+Tests for the GIS spatial index and viewport (bbox) feature queries.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.spatial_index import geometry_bounds, parse_bbox, thinning_cell_size
+from services.gis_layers_service import GISLayersService, FeatureCreate, FeatureUpdate
+from services.gis_service import GISService
+
+
+def square(west, south, size=0.01):
+    return {
+        "type": "Polygon",
+        "coordinates": [[
+            [west, south], [west + size, south], [west + size, south + size],
+            [west, south + size], [west, south]
+        ]]
+    }
+
+
+def point(lng, lat):
+    return {"type": "Point", "coordinates": [lng, lat]}
+
+
+def add_layer(db_path, name="Soil samples"):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.execute("INSERT INTO gis_layers (name) VALUES (?)", (name,))
+    conn.commit()
+    conn.close()
+    return cursor.lastrowid
+
+
+def feature_ids(collection):
+    return sorted(f["id"] for f in collection.features)
+
+
+@pytest.fixture
+def layers(tmp_path):
+    return GISLayersService(str(tmp_path / "gis.db"))
+
+
+class TestHelpers:
+    """Bounds and bbox parsing"""
+
+    def test_geometry_bounds(self):
+        assert geometry_bounds(point(-93.5, 42.1)) == (-93.5, 42.1, -93.5, 42.1)
+        assert geometry_bounds(square(-93.0, 42.0, 0.5)) == (-93.0, 42.0, -92.5, 42.5)
+        multi = {"type": "MultiPolygon", "coordinates": [square(0, 0)["coordinates"], square(5, 5)["coordinates"]]}
+        assert geometry_bounds(multi) == (0, 0, 5.01, 5.01)
+        collection = {"type": "GeometryCollection", "geometries": [point(1, 2), point(-3, 4)]}
+        assert geometry_bounds(collection) == (-3, 2, 1, 4)
+        assert geometry_bounds({"type": "Polygon", "coordinates": []}) is None
+        assert geometry_bounds(None) is None
+
+    def test_parse_bbox(self):
+        assert parse_bbox("-94,41.5,-93,42.5") == (-94.0, 41.5, -93.0, 42.5)
+        for bad in ("1,2,3", "a,b,c,d", "-93,41,-94,42", "-94,42,-93,41"):
+            with pytest.raises(ValueError):
+                parse_bbox(bad)
+
+    def test_thinning_cell_halves_per_zoom(self):
+        assert thinning_cell_size(11) == pytest.approx(thinning_cell_size(10) / 2)
+
+
+class TestLayerFeatures:
+    """Layer feature queries use the index maintained on writes"""
+
+    def test_bbox_returns_only_intersecting(self, layers):
+        layer_id = add_layer(layers.db_path)
+        inside, _ = layers.create_feature(layer_id, FeatureCreate(geometry=square(-93.5, 42.0)), user_id=1)
+        straddling, _ = layers.create_feature(layer_id, FeatureCreate(geometry=square(-93.005, 42.0)), user_id=1)
+        outside, _ = layers.create_feature(layer_id, FeatureCreate(geometry=square(-90.0, 42.0)), user_id=1)
+
+        result = layers.get_layer_features(layer_id, bbox=(-94.0, 41.5, -93.0, 42.5))
+
+        assert feature_ids(result) == [inside.id, straddling.id]
+        assert not result.truncated
+        assert len(layers.get_layer_features(layer_id).features) == 3
+        assert outside.id not in feature_ids(result)
+
+    def test_bbox_is_per_layer(self, layers):
+        first, second = add_layer(layers.db_path, "A"), add_layer(layers.db_path, "B")
+        layers.create_feature(first, FeatureCreate(geometry=point(-93.2, 42.2)), user_id=1)
+        other, _ = layers.create_feature(second, FeatureCreate(geometry=point(-93.2, 42.2)), user_id=1)
+
+        assert feature_ids(layers.get_layer_features(second, bbox=(-94, 41, -93, 43))) == [other.id]
+
+    def test_update_and_delete_maintain_index(self, layers):
+        layer_id = add_layer(layers.db_path)
+        feature, _ = layers.create_feature(layer_id, FeatureCreate(geometry=point(-93.2, 42.2)), user_id=1)
+        here, there = (-94, 41, -93, 43), (-89, 41, -88, 43)
+
+        layers.update_feature(feature.id, FeatureUpdate(geometry=point(-88.5, 42.0)), user_id=1)
+        assert feature_ids(layers.get_layer_features(layer_id, bbox=here)) == []
+        assert feature_ids(layers.get_layer_features(layer_id, bbox=there)) == [feature.id]
+
+        # Property-only updates keep the indexed bounds
+        layers.update_feature(feature.id, FeatureUpdate(properties={"ph": 6.4}), user_id=1)
+        assert feature_ids(layers.get_layer_features(layer_id, bbox=there)) == [feature.id]
+
+        layers.delete_feature(feature.id, user_id=1)
+        assert feature_ids(layers.get_layer_features(layer_id, bbox=there)) == []
+        conn = sqlite3.connect(layers.db_path)
+        assert conn.execute("SELECT COUNT(*) FROM gis_features_rtree").fetchone()[0] == 0
+        conn.close()
+
+    def test_zoom_thins_dense_points(self, layers):
+        layer_id = add_layer(layers.db_path)
+        # 100 sample points within about 100 m, plus one large polygon
+        for i in range(100):
+            layers.create_feature(
+                layer_id, FeatureCreate(geometry=point(-93.2 + (i % 10) * 1e-4, 42.2 + (i // 10) * 1e-4)), user_id=1
+            )
+        big, _ = layers.create_feature(layer_id, FeatureCreate(geometry=square(-93.5, 42.0, 0.5)), user_id=1)
+        bbox = (-94, 41, -92, 43)
+
+        assert len(layers.get_layer_features(layer_id, bbox=bbox).features) == 101
+        assert len(layers.get_layer_features(layer_id, bbox=bbox, zoom=18).features) == 101
+
+        thinned = layers.get_layer_features(layer_id, bbox=bbox, zoom=8)
+        assert big.id in feature_ids(thinned)
+        assert len(thinned.features) == 2
+
+    def test_limit_sets_truncated(self, layers):
+        layer_id = add_layer(layers.db_path)
+        for i in range(5):
+            layers.create_feature(layer_id, FeatureCreate(geometry=point(-93.2 + i * 0.01, 42.2)), user_id=1)
+
+        limited = layers.get_layer_features(layer_id, bbox=(-94, 41, -92, 43), limit=3)
+        exact = layers.get_layer_features(layer_id, bbox=(-94, 41, -92, 43), limit=5)
+
+        assert len(limited.features) == 3 and limited.truncated
+        assert len(exact.features) == 5 and not exact.truncated
+
+    def test_existing_features_backfilled(self, tmp_path):
+        db_path = str(tmp_path / "gis.db")
+        GISLayersService(db_path)
+        layer_id = add_layer(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE gis_features_rtree")
+        conn.executemany(
+            "INSERT INTO gis_features (layer_id, geometry) VALUES (?, ?)",
+            [(layer_id, json.dumps(point(-93.2, 42.2))), (layer_id, json.dumps(point(-80.0, 35.0)))]
+        )
+        conn.commit()
+        conn.close()
+
+        service = GISLayersService(db_path)
+
+        assert len(service.get_layer_features(layer_id, bbox=(-94, 41, -92, 43)).features) == 1
+
+
+class TestFieldBoundaries:
+    """Field queries index fields written by any service"""
+
+    @pytest.fixture
+    def gis(self, tmp_path):
+        db_path = str(tmp_path / "fields.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE fields (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT, farm_name TEXT, acreage REAL, current_crop TEXT, soil_type TEXT,
+                location_lat REAL, location_lng REAL, boundary TEXT,
+                is_active INTEGER DEFAULT 1, updated_at TEXT
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO fields (name, location_lat, location_lng, boundary, updated_at) VALUES (?, ?, ?, ?, ?)",
+            [
+                ("North 80", None, None, json.dumps(square(-93.5, 42.0)), "t1"),
+                ("River bottom", 42.3, -93.3, None, "t1"),
+                ("Home place", 35.0, -80.0, None, "t1"),
+            ]
+        )
+        conn.commit()
+        conn.close()
+        return GISService(db_path)
+
+    def names(self, collection):
+        return sorted(f.properties["name"] for f in collection.features)
+
+    def test_bbox_uses_boundary_or_location(self, gis):
+        result = gis.get_field_boundaries(bbox=(-94, 41.5, -93, 42.5))
+
+        assert self.names(result) == ["North 80", "River bottom"]
+        assert len(gis.get_field_boundaries().features) == 3
+
+    def test_external_edits_reindexed(self, gis):
+        gis.get_field_boundaries(bbox=(-94, 41.5, -93, 42.5))
+
+        conn = sqlite3.connect(gis.db_path)
+        conn.execute("UPDATE fields SET location_lat = 35.1, location_lng = -80.1, updated_at = 't2' WHERE name = 'River bottom'")
+        conn.execute("UPDATE fields SET is_active = 0 WHERE name = 'North 80'")
+        conn.execute("INSERT INTO fields (name, location_lat, location_lng, updated_at) VALUES ('New lease', 42.1, -93.9, 't2')")
+        conn.commit()
+        conn.close()
+
+        assert self.names(gis.get_field_boundaries(bbox=(-94, 41.5, -93, 42.5))) == ["New lease"]
+        assert self.names(gis.get_field_boundaries(bbox=(-81, 34, -79, 36))) == ["Home place", "River bottom"]
+
+    def test_unchanged_fields_not_rescanned(self, gis, monkeypatch):
+        conn = sqlite3.connect(gis.db_path)
+        conn.execute("INSERT INTO fields (name, updated_at) VALUES ('Unmapped', 't1')")
+        conn.commit()
+        conn.close()
+        scanned = []
+        monkeypatch.setattr(gis, "_field_bounds", lambda *row: scanned.append(row) or GISService._field_bounds(*row))
+
+        gis.get_field_boundaries(bbox=(-94, 41.5, -93, 42.5))
+        gis.get_field_boundaries(bbox=(-81, 34, -79, 36))
+        assert len(scanned) == 4
+
+        conn = sqlite3.connect(gis.db_path)
+        conn.execute("UPDATE fields SET location_lat = 42.2, location_lng = -93.2, updated_at = 't2' WHERE name = 'Unmapped'")
+        conn.commit()
+        conn.close()
+
+        assert "Unmapped" in self.names(gis.get_field_boundaries(bbox=(-94, 41.5, -93, 42.5)))
+        assert len(scanned) == 5
+
+    def test_deactivated_fields_leave_simplification_cache(self, gis):
+        gis.get_field_boundaries(zoom=12)
+        conn = sqlite3.connect(gis.db_path)
+        assert conn.execute("SELECT COUNT(*) FROM gis_simplified_geometries").fetchone()[0] == 1
+
+        conn.execute("UPDATE fields SET is_active = 0, updated_at = 't2' WHERE name = 'North 80'")
+        conn.commit()
+        gis.get_field_boundaries(zoom=12)
+        cached = conn.execute("SELECT COUNT(*) FROM gis_simplified_geometries").fetchone()[0]
+        conn.close()
+
+        assert cached == 0
+
+    def test_limit_sets_truncated(self, gis):
+        result = gis.get_field_boundaries(bbox=(-180, -90, 180, 90), limit=2)
+
+        assert len(result.features) == 2
+        assert result.truncated
@@ -0,0 +1,204 @@
+"""
+Tests for the micro-batching local-model inference worker.
+"""
+
+import asyncio
+import io
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from PIL import Image
+
+from services.ai_image_service import AIImageService, AIProvider
+from services import inference_worker
+from services.inference_worker import BatchInferenceWorker, preprocess_image_array
+
+
+def image_bytes(shade, size=(64, 48)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (shade, shade, shade)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class RecordingModel:
+    """Returns each image's mean pixel value and records batch sizes"""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.threads = set()
+
+    def __call__(self, batch):
+        self.batch_sizes.append(len(batch))
+        self.threads.add(threading.current_thread().name)
+        return batch.reshape(len(batch), -1).mean(axis=1, keepdims=True)
+
+
+async def submit_all(worker, images):
+    return await asyncio.gather(*(worker.submit(image) for image in images))
+
+
+class TestBatchInferenceWorker:
+    """Requests are grouped into batches and answered individually"""
+
+    def test_burst_is_batched(self):
+        model = RecordingModel()
+        worker = BatchInferenceWorker(model, max_batch_size=8, max_wait_ms=200, preprocess_workers=0)
+        images = [image_bytes(shade) for shade in range(0, 240, 10)]
+
+        try:
+            results = asyncio.run(submit_all(worker, images))
+        finally:
+            worker.stop()
+
+        assert sum(model.batch_sizes) == len(images)
+        assert max(model.batch_sizes) == 8
+        assert model.threads == {"ai-inference"}
+        # Each caller gets its own image's output back
+        expected = [preprocess_image_array(image).mean() for image in images]
+        assert np.allclose([r[0] for r in results], expected)
+
+    def test_single_request_not_held_past_max_wait(self):
+        model = RecordingModel()
+        worker = BatchInferenceWorker(model, max_batch_size=32, max_wait_ms=5, preprocess_workers=0)
+
+        try:
+            result = asyncio.run(asyncio.wait_for(worker.submit(image_bytes(255)), timeout=5))
+        finally:
+            worker.stop()
+
+        assert model.batch_sizes == [1]
+        assert result[0] == pytest.approx(1.0)
+
+    def test_model_error_fails_whole_batch(self):
+        def broken(batch):
+            raise RuntimeError("out of memory")
+
+        worker = BatchInferenceWorker(broken, max_batch_size=4, max_wait_ms=50, preprocess_workers=0)
+
+        async def run():
+            return await asyncio.gather(
+                *(worker.submit(image_bytes(shade)) for shade in (10, 20)), return_exceptions=True
+            )
+
+        try:
+            results = asyncio.run(run())
+        finally:
+            worker.stop()
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    def test_process_pool_preprocessing(self):
+        model = RecordingModel()
+        worker = BatchInferenceWorker(model, max_batch_size=4, max_wait_ms=50, preprocess_workers=2)
+
+        try:
+            results = asyncio.run(submit_all(worker, [image_bytes(0, (224, 224)), image_bytes(255, (224, 224))]))
+        finally:
+            worker.stop()
+
+        assert [round(float(r[0]), 3) for r in results] == [0.0, 1.0]
+
+    def test_submit_after_stop_raises(self):
+        worker = BatchInferenceWorker(RecordingModel(), preprocess_workers=0)
+        worker.stop()
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(worker.submit(image_bytes(0)))
+
+    def test_stats(self):
+        model = RecordingModel()
+        worker = BatchInferenceWorker(model, max_batch_size=4, max_wait_ms=100, preprocess_workers=0)
+
+        try:
+            asyncio.run(submit_all(worker, [image_bytes(s) for s in range(4)]))
+            stats = worker.get_stats()
+        finally:
+            worker.stop()
+
+        assert stats["images"] == 4
+        assert stats["running"] is True
+        assert worker.get_stats()["running"] is False
+
+
+class TestLocalModelPath:
+    """AIImageService routes local-model requests through the worker"""
+
+    def test_local_model_loaded_lazily_and_batched(self, tmp_path):
+        models_dir = tmp_path / "models"
+        models_dir.mkdir()
+        (models_dir / "scout.keras").write_bytes(b"")
+        (models_dir / "classes.json").write_text('["aphid", "rust"]')
+
+        service = AIImageService(
+            db_path=str(tmp_path / "ai.db"),
+            models_dir=str(models_dir),
+            training_data_dir=str(tmp_path / "training"),
+            cache_ttl_hours=0
+        )
+        assert service.local_model is None
+        assert service.local_model_path.name == "scout.keras"
+
+        batch_sizes = []
+
+        def fake_predict(batch):
+            batch_sizes.append(len(batch))
+            return np.tile([0.2, 0.8], (len(batch), 1))
+
+        service._inference_worker = BatchInferenceWorker(
+            fake_predict, max_batch_size=8, max_wait_ms=200, preprocess_workers=0
+        )
+
+        async def burst():
+            return await asyncio.gather(*(
+                service.analyze_image(image_bytes(shade), "soybean", save_for_training=False)
+                for shade in (30, 60, 90)
+            ))
+
+        try:
+            results = asyncio.run(burst())
+        finally:
+            service._inference_worker.stop()
+
+        assert batch_sizes == [3]
+        assert all(r.provider == AIProvider.LOCAL_MODEL for r in results)
+        assert results[0].raw_labels[0] == {"label": "rust", "score": 0.8}
+
+    def test_reload_while_request_is_preprocessing(self, tmp_path, monkeypatch):
+        service = AIImageService(
+            db_path=str(tmp_path / "ai.db"),
+            models_dir=str(tmp_path / "models"),
+            training_data_dir=str(tmp_path / "training"),
+            cache_ttl_hours=0
+        )
+        worker = BatchInferenceWorker(RecordingModel(), max_wait_ms=5, preprocess_workers=0)
+        service._inference_worker = worker
+        started, release = threading.Event(), threading.Event()
+
+        def slow_preprocess(image, target_size):
+            started.set()
+            release.wait(5)
+            return preprocess_image_array(image, target_size)
+
+        monkeypatch.setattr(inference_worker, "preprocess_image_array", slow_preprocess)
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            request = asyncio.ensure_future(worker.submit(image_bytes(0)))
+            await loop.run_in_executor(None, started.wait, 5)
+            # reload blocks until preprocessing finishes, so run it off the loop
+            reload = loop.run_in_executor(None, service.reload_local_model)
+            while not worker._stopped:
+                await asyncio.sleep(0.01)
+            release.set()
+            await reload
+            return await asyncio.wait_for(request, timeout=5)
+
+        with pytest.raises(RuntimeError, match="stopped"):
+            asyncio.run(run())
+        assert service._inference_worker is None
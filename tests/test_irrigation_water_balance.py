@@ -0,0 +1,166 @@
+"""
+Tests for the daily soil-water-balance irrigation scheduler.
+"""
+
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.irrigation_optimizer import EFFECTIVE_RAIN_FRACTION, IrrigationOptimizer
+
+
+@pytest.fixture
+def optimizer():
+    return IrrigationOptimizer()
+
+
+def field_season(**overrides):
+    field = {
+        "field_id": "pivot-1",
+        "crop": "corn",
+        "acres": 130,
+        "irrigation_type": "center_pivot",
+        "water_source": "groundwater_well",
+        "season_start": date(2024, 5, 15),
+        "season_end": date(2024, 9, 15),
+        "expected_rainfall_inches": 10,
+    }
+    field.update(overrides)
+    return field
+
+
+class TestSimulateWaterBalance:
+    """Day-step depletion engine"""
+
+    def test_constant_et_hand_computed(self, optimizer):
+        # 0.25 in/day against a 1.0 in trigger: irrigate on day 3, then every 4 days
+        result = optimizer.simulate_water_balance(
+            crop_et=np.full((1, 12), 0.25),
+            effective_rain=np.zeros((1, 12)),
+            available_water=np.array([2.0]),
+            application_inches=np.array([1.0]),
+            min_days_between_events=1
+        )
+
+        assert np.flatnonzero(result["irrigation"][0]).tolist() == [3, 7, 11]
+        np.testing.assert_allclose(result["depletion"][0, :4], [0.25, 0.5, 0.75, 0.0])
+        assert not result["stress"].any()
+
+    def test_rows_are_independent_and_capacity_limits_cause_stress(self, optimizer):
+        result = optimizer.simulate_water_balance(
+            crop_et=np.array([[0.25] * 10, [0.6] * 10]),
+            effective_rain=np.zeros((2, 10)),
+            available_water=np.array([2.0, 2.0]),
+            application_inches=np.array([1.0, 1.0]),
+            min_days_between_events=np.array([1, 4]),
+            season_days=np.array([10, 8])
+        )
+
+        assert np.flatnonzero(result["irrigation"][0]).tolist() == [3, 7]
+        # Second row outruns a pivot limited to one pass every 4 days
+        assert np.flatnonzero(result["irrigation"][1]).tolist() == [1, 5]
+        assert result["stress"][1].any()
+        assert result["depletion"][1].max() <= 2.0
+        assert not result["stress"][1, 8:].any()
+
+    def test_rain_refills_and_surplus_drains(self, optimizer):
+        result = optimizer.simulate_water_balance(
+            crop_et=np.full((1, 4), 0.3),
+            effective_rain=np.array([[0.0, 0.0, 1.0, 0.0]]),
+            available_water=np.array([2.0]),
+            application_inches=np.array([1.0])
+        )
+
+        assert not result["irrigation"].any()
+        assert result["depletion"][0, 2] == 0.0
+        assert result["drainage"][0, 2] == pytest.approx(0.1)  # 0.6 + 0.3 - 1.0
+
+
+class TestScheduleIrrigationBatch:
+    """Many field-seasons in one simulation"""
+
+    def test_batch_matches_single_field_runs(self, optimizer):
+        fields = [
+            field_season(field_id="a"),
+            field_season(field_id="b", crop="soybean", acres=60, soil_water_holding_capacity=3.0),
+            field_season(field_id="c", season_start=date(2023, 5, 1), season_end=date(2023, 8, 1),
+                         expected_rainfall_inches=4, water_source="surface_water"),
+        ]
+
+        batch = optimizer.schedule_irrigation_batch(fields)
+
+        for field, planned in zip(fields, batch["fields"]):
+            single = optimizer.schedule_irrigation_batch([field])["fields"][0]
+            assert planned == single
+        assert batch["totals"]["irrigation_events"] == sum(f["number_of_irrigations"] for f in batch["fields"])
+
+    def test_events_cover_the_water_deficit(self, optimizer):
+        planned = optimizer.schedule_irrigation_batch([field_season()])["fields"][0]
+        balance = planned["water_balance"]
+
+        dates = [e["target_date"] for e in planned["schedule"]]
+        assert dates == sorted(dates)
+        assert dates[0] > "2024-05-15" and dates[-1] <= "2024-09-15"
+        assert balance["stress_days"] == 0
+        # Same 70% effective rainfall as the previous seasonal estimate
+        assert balance["effective_rainfall_inches"] == pytest.approx(10 * 0.70, abs=0.1)
+        # Irrigation plus effective rain covers crop ET up to the soil carryover
+        assert balance["net_irrigation_inches"] + balance["effective_rainfall_inches"] == pytest.approx(
+            balance["crop_et_inches"], abs=1.2
+        )
+        cost = planned["cost_analysis"]
+        assert cost["variable_costs"]["total_variable_cost"] == pytest.approx(
+            cost["variable_costs"]["cost_per_irrigation_event"] * planned["number_of_irrigations"], abs=0.05
+        )
+
+    def test_observed_weather_overrides_season_defaults(self, optimizer):
+        dry = optimizer.schedule_irrigation_batch([field_season()])["fields"][0]
+        wet_start = optimizer.schedule_irrigation_batch([
+            field_season(daily_rainfall=[0.6] * 30)
+        ])["fields"][0]
+
+        assert wet_start["schedule"][0]["target_date"] > dry["schedule"][0]["target_date"]
+        assert wet_start["water_balance"]["effective_rainfall_inches"] == pytest.approx(
+            (10 / 124 * 94 + 0.6 * 30) * EFFECTIVE_RAIN_FRACTION, abs=0.1
+        )
+
+    def test_invalid_field_reported_not_raised(self, optimizer):
+        batch = optimizer.schedule_irrigation_batch([
+            field_season(field_id="bad", season_end=date(2024, 5, 1)),
+            field_season(field_id="good"),
+        ])
+
+        assert batch["fields"][0] == {"field_id": "bad", "error": "season_end must not be before season_start"}
+        assert batch["fields"][1]["number_of_irrigations"] > 0
+
+    def test_season_schedule_uses_simulation(self, optimizer):
+        result = optimizer.optimize_irrigation_schedule(
+            crop="corn", acres=130, irrigation_type="center_pivot", water_source="groundwater_well",
+            season_start=date(2024, 5, 15), season_end=date(2024, 9, 15), expected_rainfall_inches=10
+        )
+        planned = optimizer.schedule_irrigation_batch([field_season()])["fields"][0]
+
+        assert result["recommended_schedule"] == planned["schedule"]
+        assert result["season_summary"]["number_of_irrigations"] == planned["number_of_irrigations"]
+
+    def test_batch_endpoint(self, client):
+        response = client.post("/api/v1/optimize/irrigation/batch-schedule", json={
+            "fields": [
+                {"field_id": "north", "crop": "corn", "acres": 125, "irrigation_type": "center_pivot",
+                 "water_source": "groundwater_well", "season_start": "2024-05-15", "season_end": "2024-09-15"},
+                {"field_id": "south", "crop": "soybean", "acres": 80, "irrigation_type": "linear_move",
+                 "water_source": "surface_water", "season_start": "2024-05-20", "season_end": "2024-09-10",
+                 "daily_reference_et": [0.2] * 14},
+            ],
+            "allowable_depletion": 0.4,
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [f["field_id"] for f in data["fields"]] == ["north", "south"]
+        assert all(f["number_of_irrigations"] > 0 for f in data["fields"])
@@ -0,0 +1,211 @@
+"""
+Tests for the Monte Carlo profit risk engine.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services import profitability_service as ps
+from services.profitability_service import (
+    CropType,
+    DistributionType,
+    ProfitabilityService,
+    RiskDistribution,
+    RiskFieldInput,
+    RiskSimulationRequest,
+)
+
+
+@pytest.fixture
+def service(tmp_path):
+    return ProfitabilityService(str(tmp_path / "profit.db"))
+
+
+def normal(mean, std_dev):
+    return RiskDistribution(distribution=DistributionType.NORMAL, mean=mean, std_dev=std_dev)
+
+
+def single_field_request(**kwargs):
+    defaults = dict(
+        fields=[RiskFieldInput(field_id="f1", crop=CropType.CORN, acres=100, cost_per_acre=800)],
+        price_distributions={CropType.CORN: normal(4.5, 0.5)},
+        yield_distributions={CropType.CORN: normal(180, 20)},
+        n_draws=200_000,
+        seed=11,
+    )
+    defaults.update(kwargs)
+    return RiskSimulationRequest(**defaults)
+
+
+class TestSampling:
+    """Distributions map standard normal draws correctly"""
+
+    def test_normal_cdf(self):
+        z = np.array([-3.0, -1.0, 0.0, 1.0, 1.6448536])
+        expected = np.array([0.0013499, 0.1586553, 0.5, 0.8413447, 0.95])
+        assert np.allclose(ps._normal_cdf(z), expected, atol=1e-6)
+
+    def test_triangular_moments(self):
+        z = np.random.default_rng(1).standard_normal(400_000)
+        samples = ps.sample_distribution((DistributionType.TRIANGULAR, 140.0, 180.0, 220.0), z)
+
+        assert samples.min() >= 140 and samples.max() <= 220
+        assert samples.mean() == pytest.approx(180, abs=0.2)
+
+    def test_lognormal_matches_mean_and_spread(self):
+        z = np.random.default_rng(2).standard_normal(400_000)
+        samples = ps.sample_distribution((DistributionType.LOGNORMAL, 11.5, 1.5), z)
+
+        assert samples.mean() == pytest.approx(11.5, rel=0.01)
+        assert samples.std() == pytest.approx(1.5, rel=0.02)
+
+    def test_empirical_stays_within_history(self):
+        history = RiskDistribution(distribution=DistributionType.EMPIRICAL, values=[150, 210, 175, 190])
+        params = ps.resolve_distribution(history, 180, (140, 220))
+        samples = ps.sample_distribution(params, np.random.default_rng(3).standard_normal(10_000))
+
+        assert params[1:] == (150.0, 175.0, 190.0, 210.0)
+        assert samples.min() >= 150 and samples.max() <= 210
+
+    def test_defaults_use_crop_range(self):
+        assert ps.resolve_distribution(None, 180, (140, 220)) == (DistributionType.TRIANGULAR, 140.0, 180.0, 220.0)
+
+    def test_invalid_distributions_rejected(self):
+        with pytest.raises(ValueError):
+            ps.resolve_distribution(RiskDistribution(distribution=DistributionType.EMPIRICAL, values=[1]), 1, (0, 2))
+        with pytest.raises(ValueError):
+            ps.resolve_distribution(RiskDistribution(low=10, mode=5, high=20), 15, (0, 30))
+
+
+class TestSimulation:
+    """Risk metrics agree with direct computation on the same inputs"""
+
+    def test_single_field_matches_analytic_mean(self, service):
+        result = service.simulate_profit_risk(single_field_request())
+        metrics = result.fields[0].metrics
+
+        # Independent price and yield: E[profit] = (E[Y] * E[P] - cost) * acres
+        assert metrics.expected_profit == pytest.approx((180 * 4.5 - 800) * 100, abs=150)
+        assert result.crops["corn"].expected_profit == metrics.expected_profit
+        assert result.farm.expected_profit == metrics.expected_profit
+        assert 0.3 < metrics.probability_of_loss < 0.6
+
+    def test_var_and_cvar_ordering(self, service):
+        metrics = service.simulate_profit_risk(single_field_request()).fields[0].metrics
+
+        assert metrics.value_at_risk["95%"] == pytest.approx(-metrics.profit_percentiles["p5"], rel=0.01)
+        assert metrics.conditional_value_at_risk["95%"] > metrics.value_at_risk["95%"]
+        assert metrics.value_at_risk["99%"] > metrics.value_at_risk["95%"]
+
+    def test_break_even_percentiles(self, service):
+        metrics = service.simulate_profit_risk(single_field_request()).fields[0].metrics
+
+        # Break-even price is cost / yield, so its median is cost / median yield
+        assert metrics.break_even_price_percentiles["p50"] == pytest.approx(800 / 180, rel=0.01)
+        assert metrics.break_even_yield_percentiles["p50"] == pytest.approx(800 / 4.5, rel=0.01)
+
+    def test_price_yield_correlation(self, service, monkeypatch):
+        captured = {}
+        real_summarize = ps.summarize_profit
+
+        def capture(profit, *args, **kwargs):
+            if kwargs.get("break_even_yield") is not None and "price" not in captured:
+                captured["price"] = 800 / kwargs["break_even_yield"][:, 0]
+                captured["yield"] = 800 / kwargs["break_even_price"][:, 0]
+            return real_summarize(profit, *args, **kwargs)
+
+        monkeypatch.setattr(ps, "summarize_profit", capture)
+        service.simulate_profit_risk(single_field_request(price_yield_correlation=-0.6))
+
+        corr = np.corrcoef(captured["price"], captured["yield"])[0, 1]
+        assert corr == pytest.approx(-0.6, abs=0.01)
+
+    def test_natural_hedge_narrows_spread(self, service):
+        independent = service.simulate_profit_risk(single_field_request(price_yield_correlation=0.0))
+        hedged = service.simulate_profit_risk(single_field_request(price_yield_correlation=-0.8))
+
+        assert hedged.farm.profit_std_dev < independent.farm.profit_std_dev
+
+    def test_many_fields_roll_up_to_crops_and_farm(self, service, monkeypatch):
+        # Force several blocks so cross-block accumulation is exercised
+        monkeypatch.setattr(ps, "RISK_BLOCK_VALUES", 3 * 5_000)
+        fields = [
+            RiskFieldInput(field_id=f"f{i}", crop=[CropType.CORN, CropType.SOYBEANS, CropType.WHEAT][i % 3], acres=50 + i)
+            for i in range(20)
+        ]
+        result = service.simulate_profit_risk(RiskSimulationRequest(fields=fields, n_draws=5_000, seed=3))
+
+        assert len(result.fields) == 20
+        assert set(result.crops) == {"corn", "soybeans", "wheat"}
+        field_sum = sum(f.metrics.expected_profit for f in result.fields)
+        crop_sum = sum(c.expected_profit for c in result.crops.values())
+        assert crop_sum == pytest.approx(field_sum, abs=1)
+        assert result.farm.expected_profit == pytest.approx(crop_sum, abs=1)
+        assert result.farm.acres == sum(50 + i for i in range(20))
+        assert result.farm.break_even_price_percentiles is None
+        assert len(result.riskiest_fields) == 5
+
+    def test_seed_makes_runs_reproducible(self, service):
+        first = service.simulate_profit_risk(single_field_request(seed=5, n_draws=10_000))
+        service.clear_risk_cache()
+        second = service.simulate_profit_risk(single_field_request(seed=5, n_draws=10_000))
+
+        assert first.farm == second.farm
+
+    def test_bad_confidence_level(self, service):
+        with pytest.raises(ValueError):
+            service.simulate_profit_risk(single_field_request(confidence_levels=[1.5]))
+
+
+class TestRiskCache:
+    """Identical inputs are served from the cache"""
+
+    def test_repeat_request_cached(self, service, monkeypatch):
+        calls = []
+        real_run = service._run_risk_simulation
+        monkeypatch.setattr(service, "_run_risk_simulation", lambda *a: calls.append(1) or real_run(*a))
+
+        first = service.simulate_profit_risk(single_field_request(n_draws=5_000))
+        second = service.simulate_profit_risk(single_field_request(n_draws=5_000))
+        third = service.simulate_profit_risk(single_field_request(n_draws=6_000))
+
+        assert len(calls) == 2
+        assert not first.cached and second.cached and not third.cached
+        assert second.farm == first.farm
+        assert second.input_hash == first.input_hash != third.input_hash
+
+    def test_unseeded_runs_derive_seed_from_inputs(self, service):
+        first = service.simulate_profit_risk(single_field_request(seed=None, n_draws=5_000))
+        service.clear_risk_cache()
+        second = service.simulate_profit_risk(single_field_request(seed=None, n_draws=5_000))
+
+        assert first.seed == second.seed == int(first.input_hash[:8], 16)
+
+    def test_cache_bounded(self, service, monkeypatch):
+        monkeypatch.setattr(ps, "RISK_CACHE_MAX_ENTRIES", 2)
+        for seed in range(4):
+            service.simulate_profit_risk(single_field_request(seed=seed, n_draws=1_000))
+
+        assert service.clear_risk_cache() == 2
+
+
+class TestRiskEndpoint:
+    """The endpoint runs the simulation through the executor"""
+
+    def test_simulation_and_validation_errors(self, client, auth_headers):
+        if not auth_headers:
+            pytest.skip("Authentication not available")
+        body = single_field_request(n_draws=1_000).model_dump(mode="json")
+
+        response = client.post("/api/v1/profitability/risk", json=body, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["n_draws"] == 1_000
+
+        body["confidence_levels"] = [1.5]
+        response = client.post("/api/v1/profitability/risk", json=body, headers=auth_headers)
+        assert response.status_code in (400, 422)
@@ -0,0 +1,120 @@
+"""
+Tests for the lazy service registry and schema versioning.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from database.schema import ensure_schema, get_schema_version, get_schema_versions
+from services.registry import LazyService, get_registry_stats
+
+
+class _Counter:
+    created = 0
+
+    def __init__(self):
+        type(self).created += 1
+        self.value = 1
+
+    def double(self):
+        return self.value * 2
+
+
+class TestLazyService:
+    """LazyService constructs on first use and forwards transparently"""
+
+    def test_not_constructed_until_used(self):
+        _Counter.created = 0
+        proxy = LazyService("test_counter", _Counter)
+
+        assert not proxy.is_initialized
+        assert _Counter.created == 0
+
+        assert proxy.double() == 2
+        assert proxy.is_initialized
+        assert _Counter.created == 1
+
+        proxy.double()
+        assert _Counter.created == 1
+
+    def test_attribute_writes_reach_instance(self):
+        proxy = LazyService("test_counter_writes", _Counter)
+        proxy.value = 21
+
+        assert proxy.resolve().value == 21
+        assert proxy.double() == 42
+
+    def test_registry_stats_report_main_services(self):
+        import main  # noqa: F401  registers the app's lazy services
+
+        stats = get_registry_stats()
+        assert "genfin_core" in stats["services"]
+        assert stats["registered"] >= 13
+
+
+class TestEnsureSchema:
+    """Schema steps run once per database and again on a version bump"""
+
+    def test_runs_once_per_version(self, tmp_path):
+        db_path = str(tmp_path / "schema.db")
+        calls = []
+
+        assert ensure_schema(db_path, "widgets", 1, lambda: calls.append("v1"))
+        assert not ensure_schema(db_path, "widgets", 1, lambda: calls.append("v1"))
+        assert calls == ["v1"]
+        assert get_schema_version(db_path, "widgets") == 1
+
+        assert ensure_schema(db_path, "widgets", 2, lambda: calls.append("v2"))
+        assert calls == ["v1", "v2"]
+        assert get_schema_versions(db_path) == {"widgets": 2}
+
+    def test_failed_step_does_not_record_version(self, tmp_path):
+        db_path = str(tmp_path / "schema.db")
+
+        def broken():
+            raise RuntimeError("migration failed")
+
+        with pytest.raises(RuntimeError):
+            ensure_schema(db_path, "widgets", 1, broken)
+        assert get_schema_version(db_path, "widgets") == 0
+
+    def test_service_restart_skips_table_setup(self, tmp_path):
+        from services.genfin_bank_feeds_service import GenFinBankFeedsService
+
+        db_path = str(tmp_path / "feeds.db")
+        first = object.__new__(GenFinBankFeedsService)
+        first._initialized = False
+        first.__init__(db_path)
+        rule = first.create_category_rule(name="Fuel", match_name_contains="FUEL", assign_account_id="acct-1")
+        assert rule["success"]
+
+        # A second process start must not drop and recreate the tables
+        second = object.__new__(GenFinBankFeedsService)
+        second._initialized = False
+        second.__init__(db_path)
+        assert any(r["name"] == "Fuel" for r in second.list_category_rules()["rules"])
+
+    def test_rerunning_table_setup_keeps_data(self, tmp_path):
+        import sqlite3
+        from services.genfin_bank_feeds_service import GenFinBankFeedsService
+
+        db_path = str(tmp_path / "feeds.db")
+        first = object.__new__(GenFinBankFeedsService)
+        first._initialized = False
+        first.__init__(db_path)
+        first.create_category_rule(name="Fuel", match_name_contains="FUEL", assign_account_id="acct-1")
+
+        # First start after an upgrade: the version is not recorded yet
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM schema_versions WHERE component = 'genfin_bank_feeds'")
+        conn.commit()
+        conn.close()
+
+        second = object.__new__(GenFinBankFeedsService)
+        second._initialized = False
+        second.__init__(db_path)
+        assert any(r["name"] == "Fuel" for r in second.list_category_rules()["rules"])
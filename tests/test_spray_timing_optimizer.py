@@ -0,0 +1,161 @@
+"""
+Tests for the columnar spray-window scanner.
+"""
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.spray_timing_optimizer import (
+    ForecastColumns,
+    SprayTimingOptimizer,
+    SprayType,
+    WeatherCondition,
+)
+
+
+def make_forecast(hours, seed, start=datetime(2026, 6, 1, 0)):
+    rng = random.Random(seed)
+    return [
+        WeatherCondition(
+            datetime=start + timedelta(hours=i),
+            temp_f=rng.uniform(40, 95),
+            humidity_pct=rng.uniform(20, 100),
+            wind_mph=rng.choice([rng.uniform(0, 16), 3.0, 8.0, 10.0]),
+            wind_direction="SW",
+            precip_chance_pct=rng.choice([0, 0, 10, 31, 50, 60]),
+            precip_amount_in=rng.choice([0, 0, 0, 0.1]),
+            cloud_cover_pct=rng.uniform(0, 100),
+            dew_point_f=rng.uniform(30, 80),
+        )
+        for i in range(hours)
+    ]
+
+
+def calm_hour(when, **overrides):
+    values = dict(
+        datetime=when, temp_f=70, humidity_pct=60, wind_mph=6, wind_direction="S",
+        precip_chance_pct=0, precip_amount_in=0, cloud_cover_pct=50, dew_point_f=50,
+    )
+    values.update(overrides)
+    return WeatherCondition(**values)
+
+
+def reference_windows(optimizer, forecast, spray_type, min_window_hours):
+    """Per-hour evaluate_current_conditions walk: (start, end, quality, warnings)"""
+    windows = []
+    run = []
+
+    def close(end):
+        if run and (end - run[0][0]).total_seconds() / 3600 >= min_window_hours:
+            excellent = sum(1 for _, level, _ in run if level == "excellent")
+            warnings = list(dict.fromkeys(w for _, _, hour_warnings in run for w in hour_warnings))
+            windows.append((run[0][0].isoformat(), end.isoformat(),
+                            "excellent" if excellent >= len(run) * 0.7 else "good", warnings))
+
+    for weather in forecast:
+        evaluation = optimizer.evaluate_current_conditions(weather, spray_type)["evaluation"]
+        if evaluation["risk_level"] in ("excellent", "good"):
+            run.append((weather.datetime, evaluation["risk_level"], evaluation["warnings"]))
+        else:
+            close(weather.datetime)
+            run = []
+    close(forecast[-1].datetime)
+    return windows
+
+
+@pytest.fixture
+def optimizer():
+    return SprayTimingOptimizer()
+
+
+class TestColumnarScoring:
+    """Vectorized scores agree with the scalar evaluator"""
+
+    @pytest.mark.parametrize("spray_type", list(SprayType))
+    def test_scores_match_evaluate_current_conditions(self, optimizer, spray_type):
+        forecast = make_forecast(360, seed=11)
+
+        scores = optimizer.score_columns(ForecastColumns.from_conditions(forecast), spray_type)
+
+        assert scores.tolist() == [
+            optimizer.evaluate_current_conditions(w, spray_type)["evaluation"]["score"]
+            for w in forecast
+        ]
+
+    @pytest.mark.parametrize("spray_type", list(SprayType))
+    @pytest.mark.parametrize("seed", [1, 2, 3, 4])
+    def test_windows_match_hourly_walk(self, optimizer, spray_type, seed):
+        forecast = make_forecast(120, seed=seed)
+
+        result = optimizer.find_spray_windows(forecast, spray_type, min_window_hours=2)
+
+        got = [(w["start"], w["end"], w["quality"], w["limiting_factors"]) for w in result["windows"]]
+        assert got == reference_windows(optimizer, forecast, spray_type, 2)
+
+
+class TestBatchScan:
+    """scan_spray_windows over many fields and spray types"""
+
+    def test_matches_single_field_results(self, optimizer):
+        forecasts = {f"field-{i}": make_forecast(96, seed=100 + i) for i in range(6)}
+        spray_types = [SprayType.HERBICIDE, SprayType.FUNGICIDE]
+
+        batch = optimizer.scan_spray_windows(forecasts, spray_types, min_window_hours=2)
+
+        assert batch["fields_analyzed"] == 6
+        assert batch["forecast_hours_analyzed"] == 6 * 96
+        for field_id, forecast in forecasts.items():
+            for spray_type in spray_types:
+                single = optimizer.find_spray_windows(forecast, spray_type, min_window_hours=2)
+                entry = batch["fields"][field_id][spray_type.value]
+                assert entry["windows"] == single["windows"]
+                assert entry["best_window"] == single["best_window"]
+                assert entry["recommendation"] == single["recommendation"]
+
+    def test_windows_do_not_span_fields(self, optimizer):
+        start = datetime(2026, 6, 1, 10)
+        forecasts = {
+            "a": [calm_hour(start + timedelta(hours=i)) for i in range(3)],
+            "b": [calm_hour(start + timedelta(hours=3 + i)) for i in range(3)],
+        }
+
+        batch = optimizer.scan_spray_windows(forecasts, [SprayType.HERBICIDE], min_window_hours=2)
+
+        for field_id in ("a", "b"):
+            windows = batch["fields"][field_id]["herbicide"]["windows"]
+            assert len(windows) == 1
+            assert windows[0]["duration_hours"] == 2.0
+            assert windows[0]["quality"] == "excellent"
+
+    def test_empty_field_reported(self, optimizer):
+        batch = optimizer.scan_spray_windows(
+            {"empty": [], "full": make_forecast(24, seed=5)}, [SprayType.INSECTICIDE]
+        )
+
+        assert batch["fields"]["empty"] == {"error": "No forecast data provided"}
+        assert "insecticide" in batch["fields"]["full"]
+
+    def test_batch_endpoint(self, client):
+        start = datetime(2026, 6, 1, 10)
+        forecast = [
+            {"datetime": (start + timedelta(hours=i)).isoformat(), "temp_f": 70,
+             "humidity_pct": 60, "wind_mph": 6}
+            for i in range(6)
+        ]
+
+        response = client.post("/api/v1/spray-timing/batch-windows", json={
+            "fields": [{"field_id": "north", "forecast": forecast}],
+            "spray_types": ["herbicide", "fungicide"],
+            "min_window_hours": 3,
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["spray_types"] == ["herbicide", "fungicide"]
+        assert data["fields"]["north"]["herbicide"]["windows_found"] == 1
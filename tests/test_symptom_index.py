@@ -0,0 +1,107 @@
+"""
+Tests for the inverted symptom index behind pest and disease identification.
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.disease_identification import DISEASE_INDEXES, DiseaseIdentifier
+from services.pest_identification import PEST_INDEXES, PEST_SYMPTOM_KEYWORDS, PestIdentifier
+from services.symptom_index import SymptomIndex
+
+WORDS = ["holes", "whorl", "silk", "root", "lodging", "yellow", "stunted", "mite",
+         "web", "curl", "pod", "seed", "stem", "ear", "kernel", "beetle", "larva", "tunnel"]
+
+
+def random_catalog(rng, size):
+    return [
+        {
+            "common_name": f"Pest {i}",
+            "damage_symptoms": " ".join(rng.sample(WORDS, 3)),
+            "identification_features": " ".join(rng.sample(WORDS, 2)).upper(),
+        }
+        for i in range(size)
+    ]
+
+
+def linear_symptom_score(entry, symptoms):
+    """The per-entry substring scan the index replaces."""
+    text = entry["damage_symptoms"].lower() + " " + entry["identification_features"].lower()
+    matches = 0
+    for symptom in symptoms:
+        symptom = symptom.lower()
+        if symptom in text:
+            matches += 1
+        elif symptom in PEST_SYMPTOM_KEYWORDS and any(k in text for k in PEST_SYMPTOM_KEYWORDS[symptom]):
+            matches += 0.8
+    return matches / len(symptoms)
+
+
+class TestSymptomIndex:
+    """Index lookups agree with a linear scan"""
+
+    def test_scores_match_linear_scan(self):
+        rng = random.Random(7)
+        catalog = random_catalog(rng, 200)
+        index = SymptomIndex(catalog, ("damage_symptoms", "identification_features"), PEST_SYMPTOM_KEYWORDS)
+        vocabulary = list(PEST_SYMPTOM_KEYWORDS) + WORDS + ["Holes", "beetle larva", "nothing"]
+
+        for _ in range(100):
+            symptoms = rng.sample(vocabulary, rng.randint(1, 4))
+            scores = index.score_symptoms(symptoms)
+            for i, entry in enumerate(catalog):
+                assert scores.get(i, 0.0) == linear_symptom_score(entry, symptoms)
+
+    def test_match_does_not_span_entries(self):
+        index = SymptomIndex([{"text": "leaf"}, {"text": "roll"}], ("text",), {})
+
+        assert index.entries_containing("leaf") == {0}
+        assert index.entries_containing("leafroll") == frozenset()
+        assert index.entries_containing("f r") == frozenset()
+
+    def test_top_matches_include_context_only_entries(self):
+        catalog = [{"text": "aphid"}, {"text": "borer"}, {"text": "mite"}]
+        index = SymptomIndex(catalog, ("text",), {})
+        boost = {"borer": 0.3, "mite": 0.25, "aphid": 0.0}
+
+        matches = index.top_matches(["aphid"], 0.6, "ctx", lambda entry: (boost[entry["text"]],), limit=2)
+
+        assert matches == [(0, 0.6), (1, 0.3)]
+
+    def test_ties_keep_catalog_order(self):
+        catalog = [{"text": "a"}, {"text": "b"}, {"text": "c"}]
+        index = SymptomIndex(catalog, ("text",), {})
+
+        matches = index.top_matches([], 0.6, "flat", lambda entry: (0.5,), limit=3)
+
+        assert [idx for idx, _ in matches] == [0, 1, 2]
+
+
+class TestIdentifiers:
+    """Identifiers rank through the prebuilt indexes"""
+
+    def test_indexes_cover_catalogs(self):
+        identifier = PestIdentifier()
+        assert len(PEST_INDEXES["corn"]) == len(identifier.corn_pests)
+        assert len(PEST_INDEXES["all"]) == len(identifier.corn_pests) + len(identifier.soybean_pests)
+        assert len(DISEASE_INDEXES["soybean"]) == len(DiseaseIdentifier().soybean_diseases)
+
+    def test_pest_results_sorted_and_limited(self):
+        results = PestIdentifier().identify_by_symptoms(
+            "soybean", ["curled_leaves", "yellowing", "sticky_residue"], "R2", {"weather": {"hot_dry": False}}
+        )
+
+        confidences = [r["confidence"] for r in results]
+        assert 0 < len(results) <= 5
+        assert confidences == sorted(confidences, reverse=True)
+        assert all(c > 0.2 for c in confidences)
+
+    def test_disease_symptoms_drive_ranking(self):
+        results = DiseaseIdentifier().identify_by_symptoms(
+            "corn", ["rectangular_lesions", "gray_lesions"], "R2", "warm, humid"
+        )
+
+        assert results[0]["common_name"] == "Gray Leaf Spot"
@@ -0,0 +1,139 @@
+"""
+Tests for the vectorized yield response evaluator and economic optimum solver.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services import yield_response_optimizer as yro
+from services.yield_response_optimizer import ResponseModel, SoilTestLevel, YieldResponseOptimizer
+
+SOIL_LEVELS = [None, 5, 12, 15, 25, 40, 130, 260]
+PREVIOUS_CROPS = [None, "soybean", "corn", "alfalfa_1yr"]
+
+
+@pytest.fixture
+def optimizer():
+    return YieldResponseOptimizer()
+
+
+class TestYieldGrid:
+    """Grid evaluation matches the scalar model for every crop/nutrient"""
+
+    def test_grid_matches_scalar(self, optimizer):
+        rates = np.arange(0, 305, 2.5)
+        for crop, nutrients in yro.YIELD_RESPONSE_PARAMS.items():
+            for nutrient in nutrients:
+                for soil in SOIL_LEVELS:
+                    for previous in PREVIOUS_CROPS:
+                        grid = optimizer.yield_response_grid(crop, nutrient, rates, soil, previous)
+                        scalar = [
+                            optimizer.calculate_yield_response(crop, nutrient, rate, soil, previous)
+                            for rate in rates.tolist()
+                        ]
+                        np.testing.assert_allclose(grid, scalar, rtol=0, atol=1e-9)
+
+    def test_curve_points_and_step_validation(self, optimizer):
+        curve = optimizer.generate_response_curve("corn", "nitrogen", rate_range=(0, 250), rate_step=25)
+
+        assert [p["rate"] for p in curve["curve_data"]] == [25.0 * i for i in range(11)]
+        assert curve["curve_data"][4]["yield"] == round(
+            optimizer.calculate_yield_response("corn", "nitrogen", 100), 1
+        )
+        with pytest.raises(ValueError):
+            optimizer.generate_response_curve("corn", "nitrogen", rate_step=0)
+
+
+class TestClosedFormOptimum:
+    """Curvilinear models use closed-form optima instead of a 5 lb grid search"""
+
+    @pytest.mark.parametrize("params", [
+        {"model": ResponseModel.MITSCHERLICH, "base_yield": 120, "linear_coefficient": 0.0,
+         "plateau_yield": 210, "curvature": 0.018},
+        {"model": ResponseModel.SQUARE_ROOT, "base_yield": 100, "linear_coefficient": 6.0,
+         "quadratic_coefficient": 0.15, "plateau_yield": 400},
+        # Plateau cap binds before the uncapped optimum
+        {"model": ResponseModel.SQUARE_ROOT, "base_yield": 100, "linear_coefficient": 6.0,
+         "quadratic_coefficient": 0.15, "plateau_yield": 150},
+    ])
+    def test_matches_fine_brute_force(self, optimizer, monkeypatch, params):
+        monkeypatch.setitem(yro.YIELD_RESPONSE_PARAMS, "testcrop", {"nitrogen": params})
+        rates = np.arange(0, yro.MAX_SEARCH_RATE + 0.01, 0.01)
+
+        for grain_price, fert_cost in [(4.5, 0.5), (6.0, 0.3), (3.0, 1.2)]:
+            result = optimizer.calculate_economic_optimum(
+                "testcrop", "nitrogen", commodity_price=grain_price,
+                nutrient_cost=fert_cost, application_cost=8.0, _skip_sensitivity=True
+            )
+            yields = optimizer.yield_response_grid("testcrop", "nitrogen", rates)
+            net = yields * grain_price - (rates * fert_cost + np.where(rates > 0, 8.0, 0.0))
+
+            assert result.net_return == pytest.approx(net.max(), abs=0.01)
+            assert result.optimum_rate == pytest.approx(rates[net.argmax()], abs=0.2)
+
+
+class TestBatchOptimum:
+    """batch_economic_optimum agrees with the single-field solver"""
+
+    def test_matches_single_field_solver(self, optimizer):
+        ratios = [0.05, 0.1, 0.15, 0.3, 0.6]
+        fields = [
+            {"field_id": "north", "crop": "corn", "nutrient": "nitrogen", "previous_crop": "soybean", "acres": 80},
+            {"field_id": "south", "crop": "corn", "nutrient": "nitrogen", "previous_crop": "soybean", "acres": 40},
+            {"field_id": "east", "crop": "soybean", "nutrient": "potassium", "soil_test_level": 90},
+            {"field_id": "west", "crop": "wheat", "nutrient": "sulfur", "commodity_price": 7.25},
+        ]
+
+        batch = optimizer.batch_economic_optimum(fields, ratios, application_cost=10.0)
+
+        assert batch["unique_scenarios"] == 3
+        for field, entry in zip(fields, batch["fields"]):
+            grain = field.get("commodity_price") or optimizer.commodity_prices[field["crop"]]
+            for ratio, row in zip(ratios, entry["results"]):
+                single = optimizer.calculate_economic_optimum(
+                    field["crop"], field["nutrient"], field.get("soil_test_level"),
+                    field.get("previous_crop"), grain, ratio * grain, 10.0, _skip_sensitivity=True
+                )
+                assert row["optimum_rate"] == single.optimum_rate
+                assert row["optimum_yield"] == single.optimum_yield
+                assert row["net_return"] == pytest.approx(single.net_return, abs=0.01)
+                assert row["field_net_return"] == pytest.approx(single.net_return * field.get("acres", 1.0), abs=0.5)
+
+    def test_unsupported_field_reported_not_raised(self, optimizer):
+        batch = optimizer.batch_economic_optimum(
+            [{"crop": "corn", "nutrient": "zinc"}, {"crop": "corn", "nutrient": "nitrogen"}], [0.1]
+        )
+
+        assert "error" in batch["fields"][0]
+        assert batch["fields"][1]["results"][0]["optimum_rate"] > 0
+
+    def test_price_sensitivity_grid(self, optimizer):
+        result = optimizer.analyze_price_sensitivity(
+            "corn", "nitrogen", base_nutrient_price=0.5, base_grain_price=4.5,
+            soil_test_level=SoilTestLevel.MEDIUM
+        )
+
+        assert len(result["scenarios"]) == 25
+        base = next(s for s in result["scenarios"]
+                    if s["nutrient_price"] == 0.5 and s["grain_price"] == 4.5)
+        assert base["optimum_rate"] == result["base_optimum_rate"]
+        assert result["optimum_rate_range"]["min"] < base["optimum_rate"] < result["optimum_rate_range"]["max"]
+
+    def test_batch_endpoint(self, client):
+        response = client.post("/api/v1/yield-response/batch-optimum", json={
+            "fields": [
+                {"field_id": "f1", "crop": "corn", "nutrient": "nitrogen", "previous_crop": "soybean"},
+                {"field_id": "f2", "crop": "corn", "nutrient": "phosphorus", "soil_test_level": "low"},
+            ],
+            "price_ratios": [0.1, 0.2],
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [f["field_id"] for f in data["fields"]] == ["f1", "f2"]
+        assert len(data["fields"][0]["results"]) == 2